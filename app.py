@@ -1,12 +1,80 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, Response, abort, g, render_template, request, jsonify, session, redirect, url_for
+from src import api
 from src.bank import AxizuloAfricanBank
+from src.cache import ResponseCache
+from src.events import BufferedSink, EventBus
+from src.ledger import Ledger
+from src.metrics import CONTENT_TYPE, Metrics
+from src.money import Money
+from src.push import KEEPALIVE, PushHub
+from src.storage import MemoryStorage, SQLiteStorage
+import csv
+import io
+import os
+import queue
 import uuid
+from time import perf_counter_ns
 
 app = Flask(__name__)
 app.secret_key = 'axizulo-bank-secret-key-2024'
 
-# Initialize bank
-bank = AxizuloAfricanBank()
+MAX_BATCH_TRANSFERS = 100000
+KEEPALIVE_SECONDS = 15.0
+
+# Operation and request metrics served at /metrics; AXIZULO_METRICS=0 turns them off
+metrics = Metrics(enabled=os.environ.get('AXIZULO_METRICS', '1') != '0')
+
+if os.environ.get('AXIZULO_DATABASE'):
+    # Accounts live in a SQLite file shared by every worker process, so the
+    # app can run under several workers (gunicorn -w 4 app:app)
+    storage = SQLiteStorage(os.environ['AXIZULO_DATABASE'])
+else:
+    # Initialize bank, recovering state from the durable ledger; console output
+    # is written by a background thread so requests never wait on stdout. Older
+    # history is paged out to memory-mapped files under the cold directory, and
+    # with AXIZULO_RESIDENT_ACCOUNTS idle accounts go back to the snapshot image
+    resident = os.environ.get('AXIZULO_RESIDENT_ACCOUNTS')
+    storage = MemoryStorage(AxizuloAfricanBank(
+        ledger=Ledger(os.environ.get('AXIZULO_LEDGER_DIR', 'data/ledger'), snapshot_every=100000),
+        events=EventBus([BufferedSink()]),
+        cold_storage=os.environ.get('AXIZULO_COLD_DIR', 'data/cold'),
+        metrics=metrics,
+        resident_limit=int(resident) if resident else None))
+
+# Serialized /balance and /transaction_history bodies, keyed by account version
+responses = ResponseCache(epoch=storage.epoch)
+
+# Balance and new-transaction updates for open dashboards (/events); they
+# follow the bank's events, which other workers' changes never reach
+push = PushHub(storage.bank) if isinstance(storage, MemoryStorage) else None
+
+def conditional_response(result: api.CachedResponse):
+    """Send a versioned API response with its ETag and caching headers"""
+    response = app.response_class(result.body, status=result.status, mimetype='application/json')
+    if result.etag is not None:
+        response.headers['ETag'] = result.etag
+        response.headers.update(api.CACHE_HEADERS)
+    return response
+
+@app.before_request
+def start_request_timer():
+    if metrics.enabled:
+        g.request_start = perf_counter_ns()
+
+@app.after_request
+def record_request(response):
+    start = g.pop('request_start', None)
+    if start is not None:
+        # Label by route template so account numbers never become label values
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        metrics.observe_request(route, response.status_code, start)
+    return response
+
+@app.route('/metrics')
+def metrics_endpoint():
+    if not metrics.enabled:
+        abort(404)
+    return Response(metrics.render(), content_type=CONTENT_TYPE)
 
 @app.route('/')
 def index():
@@ -17,13 +85,13 @@ def create_account():
     if request.method == 'POST':
         account_holder = request.form['account_holder']
         account_type = request.form['account_type']
-        initial_deposit = float(request.form['initial_deposit'])
+        initial_deposit = Money.parse(request.form['initial_deposit'])
         
-        account = bank.create_account(account_holder, account_type, initial_deposit)
+        account_number = storage.create_account(account_holder, account_type, initial_deposit)
         
-        if account:
+        if account_number:
             # Store account number in session
-            session['account_number'] = account.account_number
+            session['account_number'] = account_number
             return redirect(url_for('dashboard'))
     
     return render_template('create_account.html')
@@ -34,95 +102,95 @@ def dashboard():
     if not account_number:
         return redirect(url_for('index'))
     
-    account = bank.get_account(account_number)
+    account = storage.account_info(account_number)
     if not account:
         return redirect(url_for('index'))
     
+    events_url = os.environ.get('AXIZULO_EVENTS_URL', url_for('events')) if push is not None else None
     return render_template('dashboard.html', 
                          account=account, 
-                         bank=bank,
-                         transactions=account.get_transaction_history()[-5:])  # Last 5 transactions
+                         transactions=storage.recent_transactions(account_number, 5),  # Last 5 transactions
+                         events_url=events_url)
 
 @app.route('/deposit', methods=['POST'])
 def deposit():
-    account_number = session.get('account_number')
-    if not account_number:
-        return jsonify({'success': False, 'message': 'No account selected'})
-    
-    account = bank.get_account(account_number)
-    if not account:
-        return jsonify({'success': False, 'message': 'Account not found'})
-    
-    amount = float(request.form['amount'])
+    amount = Money.parse(request.form['amount'])
     description = request.form.get('description', 'Deposit')
-    
-    success = account.deposit(amount, description)
-    
-    if success:
-        return jsonify({'success': True, 'message': f'Successfully deposited R{amount:.2f}', 'balance': account.balance})
-    else:
-        return jsonify({'success': False, 'message': 'Deposit failed'})
+    return jsonify(api.deposit(storage, session.get('account_number'), amount, description))
 
 @app.route('/withdraw', methods=['POST'])
 def withdraw():
-    account_number = session.get('account_number')
-    if not account_number:
-        return jsonify({'success': False, 'message': 'No account selected'})
-    
-    account = bank.get_account(account_number)
-    if not account:
-        return jsonify({'success': False, 'message': 'Account not found'})
-    
-    amount = float(request.form['amount'])
+    amount = Money.parse(request.form['amount'])
     description = request.form.get('description', 'Withdrawal')
-    
-    success = account.withdraw(amount, description)
-    
-    if success:
-        return jsonify({'success': True, 'message': f'Successfully withdrew R{amount:.2f}', 'balance': account.balance})
-    else:
-        return jsonify({'success': False, 'message': 'Withdrawal failed'})
+    return jsonify(api.withdraw(storage, session.get('account_number'), amount, description))
 
 @app.route('/balance')
 def balance():
-    account_number = session.get('account_number')
-    if not account_number:
-        return jsonify({'success': False, 'message': 'No account selected'})
-    
-    account = bank.get_account(account_number)
-    if not account:
-        return jsonify({'success': False, 'message': 'Account not found'})
-    
-    return jsonify({'success': True, 'balance': account.balance})
+    return conditional_response(api.cached_balance(responses, storage, session.get('account_number'),
+                                                   request.headers.get('If-None-Match')))
 
 @app.route('/transaction_history')
 def transaction_history():
-    account_number = session.get('account_number')
-    if not account_number:
-        return jsonify({'success': False, 'message': 'No account selected'})
-    
-    account = bank.get_account(account_number)
-    if not account:
-        return jsonify({'success': False, 'message': 'Account not found'})
-    
-    transactions = [t.to_dict() for t in account.get_transaction_history()]
-    return jsonify({'success': True, 'transactions': transactions})
+    return conditional_response(api.cached_transaction_history(responses, storage, session.get('account_number'),
+                                                               request.args, request.headers.get('If-None-Match')))
+
+@app.route('/events')
+def events():
+    # Each open stream holds a worker thread here; async_app.py serves /events
+    # from one event loop for deployments with many open dashboards
+    if push is None:
+        abort(404)
+    frames = queue.SimpleQueue()
+    subscription, error = api.subscribe_events(push, storage, session.get('account_number'), frames.put)
+    if error:
+        return jsonify(error)
+    
+    def stream():
+        try:
+            while True:
+                try:
+                    yield frames.get(timeout=KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    yield KEEPALIVE
+        finally:
+            subscription.cancel()
+    
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @app.route('/transfer', methods=['POST'])
 def transfer():
+    to_account_num = request.form['to_account']
+    amount = Money.parse(request.form['amount'])
+    return jsonify(api.transfer(storage, session.get('account_number'), to_account_num, amount))
+
+@app.route('/transfers/batch', methods=['POST'])
+def transfer_batch():
     from_account_num = session.get('account_number')
     if not from_account_num:
         return jsonify({'success': False, 'message': 'No account selected'})
     
-    to_account_num = request.form['to_account']
-    amount = float(request.form['amount'])
-    
-    success = bank.transfer_funds(from_account_num, to_account_num, amount)
-    
-    if success:
-        return jsonify({'success': True, 'message': f'Successfully transferred R{amount:.2f}'})
-    else:
-        return jsonify({'success': False, 'message': 'Transfer failed'})
+    # Accept a JSON body {"transfers": [{"to_account", "amount"}], "atomic": bool}
+    # or an uploaded CSV file with to_account,amount columns
+    try:
+        if 'file' in request.files:
+            rows = csv.DictReader(io.TextIOWrapper(request.files['file'].stream, encoding='utf-8'))
+            atomic = request.form.get('atomic', 'true').lower() != 'false'
+        else:
+            payload = request.get_json(force=True)
+            rows = payload['transfers']
+            atomic = bool(payload.get('atomic', True))
+        
+        transfers = []
+        for row in rows:
+            transfers.append((from_account_num, str(row['to_account']).strip().upper(), Money.of(row['amount'])))
+            if len(transfers) > MAX_BATCH_TRANSFERS:
+                return jsonify({'success': False, 'message': f'Batch exceeds {MAX_BATCH_TRANSFERS} transfers'})
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'Invalid transfer batch'})
+    
+    report = storage.transfer_batch(transfers, atomic=atomic)
+    return jsonify(report)
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
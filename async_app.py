@@ -0,0 +1,326 @@
+"""Asyncio HTTP server for the JSON banking API
+
+Serves /deposit, /withdraw, /balance, /transaction_history and /transfer on a
+single event loop, using the same handlers (src/api.py), storage and signed
+session cookie as the Flask app, so a browser logged in through app.py can
+call this server directly. /events streams the session account's balance and
+new transactions as Server-Sent Events; an idle stream costs a socket and a
+few hundred bytes, so thousands of open dashboards fit on one loop.
+
+Usage:
+    python async_app.py [--host 0.0.0.0] [--port 5001]
+"""
+import argparse
+import asyncio
+import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.cookies import CookieError, SimpleCookie
+from typing import Any, Dict, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlsplit
+from itsdangerous import BadSignature
+from src import api
+from src.cache import ResponseCache
+from src.money import Money
+from src.push import KEEPALIVE, PushHub
+from src.storage import Storage
+
+MAX_BODY_SIZE = 1024 * 1024
+MAX_HEADER_COUNT = 100
+KEEPALIVE_SECONDS = 15.0
+MAX_PENDING_FRAMES = 256  # A client this far behind is disconnected and resyncs on reconnect
+
+
+class HTTPError(Exception):
+    def __init__(self, status: HTTPStatus):
+        super().__init__(status.phrase)
+        self.status = status
+
+
+class EventStream:
+    """Frames waiting to be written to one /events connection"""
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self.frames: 'deque[bytes]' = deque()
+        self.ready = asyncio.Event()
+        self.finished = False
+        self.subscription = None
+    
+    def deliver(self, frame: bytes) -> None:
+        """Called by the push hub from its dispatcher thread"""
+        try:
+            self._loop.call_soon_threadsafe(self._append, frame)
+        except RuntimeError:
+            pass  # Event loop already closed
+    
+    def finish(self) -> None:
+        """Write what is queued, then end the stream"""
+        self.finished = True
+        self.ready.set()
+    
+    def _append(self, frame: bytes) -> None:
+        if len(self.frames) >= MAX_PENDING_FRAMES:
+            self.finish()
+        else:
+            self.frames.append(frame)
+            self.ready.set()
+
+
+class AsyncBankServer:
+    """Minimal HTTP/1.1 keep-alive server dispatching to the shared API handlers
+    
+    Reads run directly on the event loop. Mutations run on a small thread pool
+    because a durable ledger blocks each commit until its fsync, and running
+    them concurrently lets the ledger batch those fsyncs (group commit).
+    Balance and history answer conditional requests from the account version,
+    through the same kind of response cache as the Flask app. With a push hub,
+    /events holds the connection open and writes each update as it arrives.
+    """
+    
+    def __init__(self, storage: Storage, flask_app, workers: int = 32,
+                 cache: Optional[ResponseCache] = None, push: Optional[PushHub] = None):
+        self._storage = storage
+        self._cache = cache if cache is not None else ResponseCache()
+        self._push = push
+        self._streams: Dict[EventStream, asyncio.Task] = {}
+        # Reuse Flask's own cookie serializer so sessions are interchangeable
+        self._serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+        self._cookie_name = flask_app.config['SESSION_COOKIE_NAME']
+        self._max_age = int(flask_app.permanent_session_lifetime.total_seconds())
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bank-worker")
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._routes = {
+            ('POST', '/deposit'): self._deposit,
+            ('POST', '/withdraw'): self._withdraw,
+            ('GET', '/balance'): self._balance,
+            ('GET', '/transaction_history'): self._transaction_history,
+            ('POST', '/transfer'): self._transfer,
+            ('GET', '/events'): self._events,
+        }
+    
+    @property
+    def port(self) -> Optional[int]:
+        return self._server.sockets[0].getsockname()[1] if self._server else None
+    
+    async def start(self, host: str = '127.0.0.1', port: int = 5001) -> None:
+        self._server = await asyncio.start_server(self._handle_connection, host, port, limit=64 * 1024)
+    
+    async def serve_forever(self) -> None:
+        async with self._server:
+            await self._server.serve_forever()
+    
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        streams = list(self._streams.items())
+        for stream, _ in streams:
+            stream.finish()
+        await asyncio.gather(*(task for _, task in streams), return_exceptions=True)
+        self._executor.shutdown(wait=True)
+    
+    # Routes
+    async def _deposit(self, account_number, query, form, headers) -> Dict[str, Any]:
+        amount = Money.parse(form['amount'])
+        return await self._run(api.deposit, self._storage, account_number, amount, form.get('description', 'Deposit'))
+    
+    async def _withdraw(self, account_number, query, form, headers) -> Dict[str, Any]:
+        amount = Money.parse(form['amount'])
+        return await self._run(api.withdraw, self._storage, account_number, amount,
+                               form.get('description', 'Withdrawal'))
+    
+    async def _balance(self, account_number, query, form, headers) -> api.CachedResponse:
+        return api.cached_balance(self._cache, self._storage, account_number, headers.get('if-none-match'))
+    
+    async def _transaction_history(self, account_number, query, form, headers) -> api.CachedResponse:
+        return api.cached_transaction_history(self._cache, self._storage, account_number, query,
+                                              headers.get('if-none-match'))
+    
+    async def _transfer(self, account_number, query, form, headers) -> Dict[str, Any]:
+        amount = Money.parse(form['amount'])
+        return await self._run(api.transfer, self._storage, account_number, form['to_account'], amount)
+    
+    async def _events(self, account_number, query, form, headers) -> Union[Dict[str, Any], EventStream]:
+        if self._push is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND)
+        stream = EventStream(asyncio.get_running_loop())
+        stream.subscription, error = api.subscribe_events(self._push, self._storage, account_number, stream.deliver)
+        return error or stream
+    
+    async def _run(self, handler, *args) -> Dict[str, Any]:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, handler, *args)
+    
+    # HTTP
+    def _session_account(self, headers: Dict[str, str]) -> Optional[str]:
+        """Account number from the signed Flask session cookie, if valid"""
+        try:
+            morsel = SimpleCookie(headers.get('cookie', '')).get(self._cookie_name)
+        except CookieError:
+            return None
+        if morsel is None:
+            return None
+        try:
+            session = self._serializer.loads(morsel.value, max_age=self._max_age)
+        except BadSignature:
+            return None
+        return session.get('account_number')
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, target, headers, body, keep_alive = request
+                    status, payload = await self._dispatch(method, target, headers, body)
+                except HTTPError as error:
+                    status, payload, keep_alive = error.status, {'success': False, 'message': error.status.phrase}, False
+                
+                if isinstance(payload, EventStream):
+                    await self._stream_events(reader, writer, payload)
+                    break
+                writer.write(self._response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+    
+    async def _stream_events(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                             stream: EventStream) -> None:
+        """Write pushed frames until the client disconnects; the stream ends with the connection"""
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                     b"Connection: close\r\n\r\n")
+        # Clients send nothing more on this connection, so any read completing means it closed
+        closed = asyncio.ensure_future(reader.read(1))
+        self._streams[stream] = asyncio.current_task()
+        try:
+            while True:
+                if not stream.ready.is_set():
+                    ready = asyncio.ensure_future(stream.ready.wait())
+                    await asyncio.wait((ready, closed), timeout=KEEPALIVE_SECONDS,
+                                       return_when=asyncio.FIRST_COMPLETED)
+                    ready.cancel()
+                    if closed.done():
+                        break
+                if stream.ready.is_set():
+                    stream.ready.clear()
+                    writer.write(b"".join(stream.frames))
+                    stream.frames.clear()
+                else:
+                    writer.write(KEEPALIVE)
+                await writer.drain()
+                if stream.finished:
+                    break
+        finally:
+            closed.cancel()
+            stream.subscription.cancel()
+            del self._streams[stream]
+    
+    @staticmethod
+    async def _readline(reader: asyncio.StreamReader) -> bytes:
+        try:
+            return await reader.readline()
+        except ValueError:
+            # A line longer than the stream limit
+            raise HTTPError(HTTPStatus.BAD_REQUEST)
+    
+    @classmethod
+    async def _read_request(cls, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes, bool]]:
+        request_line = await cls._readline(reader)
+        if not request_line.strip():
+            return None
+        try:
+            method, target, version = request_line.decode('latin-1').split()
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST)
+        
+        headers: Dict[str, str] = {}
+        while True:
+            line = await cls._readline(reader)
+            if line in (b'\r\n', b'\n', b''):
+                break
+            if len(headers) >= MAX_HEADER_COUNT:
+                raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST)
+        if length > MAX_BODY_SIZE:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        body = await reader.readexactly(length) if length > 0 else b''
+        
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+        return method.upper(), target, headers, body, keep_alive
+    
+    async def _dispatch(self, method: str, target: str, headers: Dict[str, str],
+                        body: bytes) -> Tuple[HTTPStatus, Union[Dict[str, Any], api.CachedResponse, EventStream]]:
+        url = urlsplit(target)
+        handler = self._routes.get((method, url.path))
+        if handler is None:
+            allowed = any(path == url.path for _, path in self._routes)
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED if allowed else HTTPStatus.NOT_FOUND)
+        
+        try:
+            query = dict(parse_qsl(url.query))
+            form = dict(parse_qsl(body.decode('utf-8'))) if body else {}
+            return HTTPStatus.OK, await handler(self._session_account(headers), query, form, headers)
+        except (KeyError, ValueError):
+            raise HTTPError(HTTPStatus.BAD_REQUEST)
+    
+    @staticmethod
+    def _response(status: HTTPStatus, payload: Union[Dict[str, Any], api.CachedResponse], keep_alive: bool) -> bytes:
+        headers = {}
+        if isinstance(payload, api.CachedResponse):
+            status, body = HTTPStatus(payload.status), payload.body
+            if payload.etag is not None:
+                headers = {'ETag': payload.etag, **api.CACHE_HEADERS}
+        else:
+            body = json.dumps(payload).encode('utf-8')
+        
+        head = f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        if status != HTTPStatus.NOT_MODIFIED:
+            head += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+        for name, value in headers.items():
+            head += f"{name}: {value}\r\n"
+        head += f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        return head.encode('latin-1') + body
+
+
+async def serve(host: str, port: int) -> None:
+    # Share the Flask app's storage, session secret and response cache
+    from app import app, push, responses, storage
+    
+    server = AsyncBankServer(storage, app, cache=responses, push=push)
+    await server.start(host, port)
+    print(f"Serving API on http://{host}:{server.port}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.stop()
+        storage.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5001)
+    args = parser.parse_args()
+    
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
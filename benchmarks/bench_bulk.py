@@ -0,0 +1,110 @@
+"""Bulk import/export benchmark
+
+Generates a migrated book of accounts (each with a short history) as JSON
+Lines and as CSV, loads it with bulk.import_accounts / import_transactions,
+and compares the rate with calling create_account once per row. Then times
+a consistent export of the loaded bank. Use --ledger to include the cost of
+journaling the import (written without waiting for each record).
+
+Usage:
+    python -m benchmarks.bench_bulk [--accounts 1000000] [--history 3] [--ledger]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+from src import bulk
+from src.bank import AxizuloAfricanBank
+from src.events import EventBus
+from src.ledger import Ledger
+
+START = datetime(2024, 1, 1)
+
+
+def generate(accounts: int, history: int):
+    """Yield account records in the export format without holding them in memory"""
+    for i in range(accounts):
+        account_type = "current" if i % 2 else "savings"
+        yield {
+            "account_number": f"M{i:09d}",
+            "account_type": account_type,
+            "account_holder": f"Migrated User {i}",
+            "is_active": True,
+            "interest_rate": 2.5 if account_type == "savings" else None,
+            "overdraft_limit": "1000.00" if account_type == "current" else None,
+            "transactions": [{
+                "transaction_id": None,
+                "transaction_type": "deposit",
+                "amount": f"{100 + j}.50",
+                "description": "Migrated",
+                "timestamp": (START + timedelta(minutes=j)).isoformat()
+            } for j in range(history)]
+        }
+
+
+def new_bank(directory, ledger: bool) -> AxizuloAfricanBank:
+    return AxizuloAfricanBank(ledger=Ledger(directory, sync=False) if ledger else None, events=EventBus())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=1000000)
+    parser.add_argument("--history", type=int, default=3, help="transactions per account")
+    parser.add_argument("--ledger", action="store_true", help="journal the import to a temporary ledger")
+    args = parser.parse_args()
+    
+    directory = tempfile.mkdtemp()
+    try:
+        jsonl = os.path.join(directory, "accounts.jsonl")
+        accounts_csv = os.path.join(directory, "accounts.csv")
+        transactions_csv = os.path.join(directory, "transactions.csv")
+        with open(jsonl, "w", encoding="utf-8") as stream:
+            bulk.write_jsonl(generate(args.accounts, args.history), stream)
+        with open(accounts_csv, "w", newline="", encoding="utf-8") as accounts, \
+                open(transactions_csv, "w", newline="", encoding="utf-8") as transactions:
+            bulk.write_csv(generate(args.accounts, args.history), accounts, transactions)
+        
+        sample = min(args.accounts, 100000)
+        bank = new_bank(os.path.join(directory, "create"), args.ledger)
+        start = time.perf_counter()
+        for i in range(sample):
+            account = bank.create_account(f"Migrated User {i}", "current" if i % 2 else "savings", 0.0)
+            for j in range(args.history):
+                account.deposit(f"{100 + j}.50", "Migrated")
+        rate = sample / (time.perf_counter() - start)
+        print(f"create_account loop  {rate:12,.0f} accounts/sec (history as new deposits)")
+        bank.close()
+        
+        bank = new_bank(os.path.join(directory, "jsonl"), args.ledger)
+        start = time.perf_counter()
+        with open(jsonl, encoding="utf-8") as stream:
+            report = bulk.import_accounts(bank, bulk.read_jsonl(stream))
+        elapsed = time.perf_counter() - start
+        print(f"import JSON Lines    {report['accounts'] / elapsed:12,.0f} accounts/sec  "
+              f"{report['transactions']:,} transactions in {elapsed:.1f}s")
+        
+        start = time.perf_counter()
+        with open(os.devnull, "w") as stream:
+            exported = bulk.write_jsonl(bulk.export_accounts(bank), stream)
+        elapsed = time.perf_counter() - start
+        print(f"export JSON Lines    {exported / elapsed:12,.0f} accounts/sec")
+        bank.close()
+        
+        bank = new_bank(os.path.join(directory, "csv"), args.ledger)
+        start = time.perf_counter()
+        with open(accounts_csv, newline="", encoding="utf-8") as accounts:
+            report = bulk.import_accounts(bank, bulk.read_csv(accounts))
+        with open(transactions_csv, newline="", encoding="utf-8") as transactions:
+            posted = bulk.import_transactions(bank, bulk.read_csv(transactions))["transactions"]
+        elapsed = time.perf_counter() - start
+        print(f"import CSV           {report['accounts'] / elapsed:12,.0f} accounts/sec  "
+              f"{posted:,} transactions in {elapsed:.1f}s")
+        bank.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""ID benchmark: uuid4-derived IDs versus the sequential allocator
+
+Times generating account numbers and transaction IDs the old way
+(uuid4 sliced to a few hex characters) and with IdAllocator, reports how
+soon the old 6-character transaction IDs collided, and times resolving a
+transaction ID through the bank-wide index versus scanning every account.
+
+Usage:
+    python -m benchmarks.bench_ids [--count 1000000] [--accounts 10000]
+"""
+import argparse
+import random
+import time
+import uuid
+from src.bank import AxizuloAfricanBank
+from src.events import EventBus
+from src.ids import IdAllocator
+
+
+def timed(function, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        function()
+    return time.perf_counter() - start
+
+
+def first_collision(count: int) -> int:
+    """Number of uuid4()[:6] IDs issued before the first repeat (0 if none)"""
+    seen = set()
+    for issued in range(1, count + 1):
+        transaction_id = str(uuid.uuid4())[:6].upper()
+        if transaction_id in seen:
+            return issued
+        seen.add(transaction_id)
+    return 0
+
+
+def scan(bank: AxizuloAfricanBank, transaction_id: str):
+    for account in bank.get_all_accounts():
+        for transaction in account.get_transaction_history():
+            if transaction.transaction_id == transaction_id:
+                return transaction
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1000000)
+    parser.add_argument("--accounts", type=int, default=10000)
+    args = parser.parse_args()
+    
+    allocator = IdAllocator(11)
+    for label, function in [("uuid4()[:6]", lambda: str(uuid.uuid4())[:6].upper()),
+                            ("IdAllocator", allocator.next_id)]:
+        elapsed = timed(function, args.count)
+        print(f"generate {label:12s} {args.count / elapsed:14,.0f} ids/sec")
+    print(f"uuid4()[:6] first collision after {first_collision(args.count):,} IDs (allocator: never)")
+    
+    bank = AxizuloAfricanBank(events=EventBus())
+    for i in range(args.accounts):
+        bank.create_account(f"User {i}", "savings", 100.0).deposit(10.0)
+    ids = [transaction.transaction_id for account in bank.get_all_accounts()
+           for transaction in account.get_transaction_history()]
+    sample = random.Random(5).sample(ids, 100)
+    
+    elapsed = timed(lambda: [bank.get_transaction(transaction_id) for transaction_id in sample], 100)
+    print(f"lookup   get_transaction  {10000 / elapsed:14,.0f} lookups/sec")
+    elapsed = timed(lambda: scan(bank, sample[0]), 3)
+    print(f"lookup   scan accounts    {3 / elapsed:14,.0f} lookups/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Account query benchmark: secondary indexes versus scanning every account
+
+Builds a bank with many accounts spread over holders, types, statuses and
+balances, then times admin queries through find_accounts() against the
+same filters applied to get_all_accounts(), including the first query after
+a burst of postings (when the balance index catches up).
+
+Usage:
+    python -m benchmarks.bench_indexes [--accounts 1000000] [--postings 100000]
+"""
+import argparse
+import random
+import time
+from src.bank import AxizuloAfricanBank
+from src.events import EventBus
+
+SURNAMES = ["Mokoena", "Nkosi", "Dlamini", "Khumalo", "Ndlovu", "Botha", "Naidoo", "Van Wyk"]
+
+QUERIES = [
+    ("holder exact", {"holder": "thabo dlamini 4242"},
+     lambda a: a.account_holder.casefold() == "thabo dlamini 4242"),
+    ("holder prefix", {"holder_prefix": "Thabo Dlamini 42"},
+     lambda a: a.account_holder.casefold().startswith("thabo dlamini 42")),
+    ("inactive current", {"account_type": "current", "is_active": False},
+     lambda a: a.__class__.__name__ == "CurrentAccount" and not a.is_active),
+    ("overdrawn beyond R900", {"max_balance": -900.01}, lambda a: a.balance_cents < -90000),
+    ("balance range", {"min_balance": 5000, "max_balance": 5001}, lambda a: 500000 <= a.balance_cents <= 500100),
+]
+
+
+def timed(function, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=1000000)
+    parser.add_argument("--postings", type=int, default=100000)
+    args = parser.parse_args()
+    
+    generator = random.Random(11)
+    bank = AxizuloAfricanBank(events=EventBus())
+    start = time.perf_counter()
+    for i in range(args.accounts):
+        account_type = "current" if i % 2 else "savings"
+        account = bank.create_account(f"Thabo {SURNAMES[i % len(SURNAMES)]} {i}", account_type,
+                                      generator.randint(0, 10000))
+        if account_type == "current" and i % 5 == 1:
+            account.withdraw(generator.randint(0, 1000) + account.balance)
+        if i % 10 == 3:
+            account.deactivate()
+    print(f"built {args.accounts:,} accounts in {time.perf_counter() - start:.1f}s")
+    
+    # A query matching nothing, so the time is spent bringing the indexes up to date
+    elapsed, _ = timed(lambda: bank.find_accounts(holder="nobody"))
+    print(f"first query (builds the indexes)            {elapsed * 1000:10.1f} ms")
+    
+    accounts = bank.get_all_accounts()
+    for _ in range(args.postings):
+        generator.choice(accounts).deposit(1.0)
+    elapsed, _ = timed(lambda: bank.find_accounts(holder="nobody"))
+    print(f"query after {args.postings:,} postings            {elapsed * 1000:10.1f} ms")
+    
+    for name, filters, predicate in QUERIES:
+        indexed, matches = timed(lambda: bank.find_accounts(**filters), 5)
+        scanned, _ = timed(lambda: [a for a in bank.get_all_accounts() if predicate(a)])
+        print(f"{name:22s} {len(matches):8,} matches  index {indexed * 1000:9.2f} ms  "
+              f"scan {scanned * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
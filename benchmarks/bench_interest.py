@@ -0,0 +1,49 @@
+"""Interest benchmark: per-account apply_interest loop versus bank.run_interest
+
+Usage:
+    python -m benchmarks.bench_interest [--accounts 200000]
+"""
+import argparse
+import contextlib
+import io
+import random
+import time
+from src.bank import AxizuloAfricanBank
+
+
+def build_bank(accounts: int) -> AxizuloAfricanBank:
+    generator = random.Random(11)
+    bank = AxizuloAfricanBank()
+    for i in range(accounts):
+        bank.create_account(f"User {i}", "savings", round(generator.uniform(0, 50000), 2),
+                            interest_rate=generator.choice([2.5, 3.0, 4.25, 5.0]))
+    return bank
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=200000)
+    args = parser.parse_args()
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        loop_bank = build_bank(args.accounts)
+        start = time.perf_counter()
+        for account in loop_bank.get_all_accounts():
+            account.apply_interest()
+        loop = time.perf_counter() - start
+        
+        batch_bank = build_bank(args.accounts)
+        start = time.perf_counter()
+        batch_bank.run_interest()
+        batch = time.perf_counter() - start
+    
+    expected = {account.account_holder: account.balance for account in loop_bank.get_all_accounts()}
+    matches = all(expected.get(account.account_holder, account.balance) == account.balance
+                  for account in batch_bank.get_all_accounts())
+    print(f"apply_interest loop  {loop:8.3f} s  ({args.accounts / loop:12,.0f} accounts/sec)")
+    print(f"run_interest batch   {batch:8.3f} s  ({args.accounts / batch:12,.0f} accounts/sec)")
+    print(f"speedup {loop / batch:.1f}x, balances identical: {matches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Ledger benchmark: durable ops/sec with group commit and recovery time
+
+Usage:
+    python -m benchmarks.bench_ledger [--ops 20000] [--threads 1 8 32] [--entries 10000000]
+"""
+import argparse
+import contextlib
+import io
+import shutil
+import tempfile
+import threading
+import time
+from src.bank import AxizuloAfricanBank
+from src.ledger import Ledger
+
+
+def quiet():
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def measure_throughput(ops: int, threads: int, sync: bool) -> float:
+    """Durable deposits per second with the given number of client threads"""
+    directory = tempfile.mkdtemp()
+    try:
+        with quiet():
+            bank = AxizuloAfricanBank(ledger=Ledger(directory, sync=sync))
+            accounts = [bank.create_account(f"User {i}", "savings", 0.0) for i in range(threads)]
+            per_thread = ops // threads
+            
+            def worker(account):
+                for _ in range(per_thread):
+                    account.deposit(1.0)
+            
+            workers = [threading.Thread(target=worker, args=(account,)) for account in accounts]
+            start = time.perf_counter()
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+            bank.ledger.flush()
+            elapsed = time.perf_counter() - start
+            bank.close()
+        return per_thread * threads / elapsed
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def measure_recovery(entries: int, accounts: int = 10000) -> tuple:
+    """Build a ledger with the given number of entries and time a cold recovery"""
+    directory = tempfile.mkdtemp()
+    try:
+        with quiet():
+            bank = AxizuloAfricanBank(ledger=Ledger(directory, sync=False))
+            opened = [bank.create_account(f"User {i}", "savings", 0.0) for i in range(min(accounts, entries))]
+            for i in range(entries - len(opened)):
+                opened[i % len(opened)].deposit(1.0)
+            bank.close()
+            
+            start = time.perf_counter()
+            recovered = AxizuloAfricanBank(ledger=Ledger(directory))
+            elapsed = time.perf_counter() - start
+            recovered.close()
+        return elapsed, entries / elapsed
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=20000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--entries", type=int, default=10_000_000)
+    args = parser.parse_args()
+    
+    for sync in (True, False):
+        for threads in args.threads:
+            rate = measure_throughput(args.ops, threads, sync)
+            mode = "sync " if sync else "async"
+            print(f"{mode} threads={threads:3d}  {rate:12,.0f} ops/sec")
+    
+    elapsed, rate = measure_recovery(args.entries)
+    print(f"recovery entries={args.entries:,}  {elapsed:8.2f} s  ({rate:,.0f} entries/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Velocity limits overhead benchmark
+
+Times withdrawals and transfers on a bank without limits and on one with
+hourly and daily count and value limits, set high enough that nothing is
+refused, alternating short rounds so drift and noise affect both equally.
+Reports the per-operation cost of checking and counting each debit and
+what fraction of the operation it is.
+
+Usage:
+    python -m benchmarks.bench_limits [--operations 200000] [--rounds 20] [--buckets 60]
+"""
+import argparse
+import time
+from src.bank import AxizuloAfricanBank
+from src.events import EventBus
+from src.limits import DAY, HOUR, Limit, VelocityLimits
+
+
+def operations(bank: AxizuloAfricanBank):
+    source = bank.create_account("Limits User", "savings", 1e12)
+    target = bank.create_account("Limits Payee", "current", 0.0)
+    return {
+        "withdraw": lambda: source.withdraw(10.0, "Groceries"),
+        "transfer_funds": lambda: bank.transfer_funds(source.account_number, target.account_number, 1.0),
+    }
+
+
+def time_round(operation, count: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(count):
+        operation()
+    return (time.perf_counter_ns() - start) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--operations", type=int, default=200000, help="operations per mode and kind")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--buckets", type=int, default=60, help="buckets per limit window")
+    args = parser.parse_args()
+    
+    limits = VelocityLimits([
+        Limit(HOUR, max_count=10 ** 9, max_value=1e12, buckets=args.buckets),
+        Limit(DAY, max_count=10 ** 9, max_value=1e12, buckets=args.buckets),
+    ])
+    unlimited = operations(AxizuloAfricanBank(events=EventBus()))
+    limited = operations(AxizuloAfricanBank(events=EventBus(), limits=limits))
+    per_round = max(1, args.operations // args.rounds)
+    
+    for name in unlimited:
+        off, on = [], []
+        for _ in range(args.rounds):
+            off.append(time_round(unlimited[name], per_round))
+            on.append(time_round(limited[name], per_round))
+        # Minimums are the least disturbed estimate of each mode's cost
+        cost_off, cost_on = min(off), min(on)
+        print(f"{name:15s} off {cost_off:8.0f} ns  on {cost_on:8.0f} ns  "
+              f"overhead {cost_on - cost_off:6.0f} ns ({(cost_on - cost_off) / cost_off:+.1%})")
+
+
+if __name__ == "__main__":
+    main()
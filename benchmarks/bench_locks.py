@@ -0,0 +1,57 @@
+"""Locking benchmark: transfer throughput as client threads are added
+
+Runs random transfers between accounts with the striped lock manager and,
+for comparison, with a single stripe (one global bank lock).
+
+Usage:
+    python -m benchmarks.bench_locks [--transfers 40000] [--accounts 1000] [--threads 1 2 4 8 16]
+"""
+import argparse
+import contextlib
+import io
+import random
+import threading
+import time
+from src.bank import AxizuloAfricanBank
+
+
+def run(transfers: int, accounts: int, threads: int, stripes: int) -> float:
+    with contextlib.redirect_stdout(io.StringIO()):
+        bank = AxizuloAfricanBank(lock_stripes=stripes)
+        numbers = [bank.create_account(f"User {i}", "current", 1000.0).account_number for i in range(accounts)]
+        total_before = bank.get_total_bank_balance()
+        per_thread = transfers // threads
+        
+        def worker(seed):
+            generator = random.Random(seed)
+            for _ in range(per_thread):
+                source, target = generator.sample(numbers, 2)
+                bank.transfer_funds(source, target, generator.randint(1, 100))
+        
+        workers = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+        start = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - start
+    
+    assert abs(bank.get_total_bank_balance() - total_before) < 1e-6, "Balances were not conserved"
+    return per_thread * threads / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transfers", type=int, default=40000)
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+    
+    for threads in args.threads:
+        striped = run(args.transfers, args.accounts, threads, stripes=256)
+        single = run(args.transfers, args.accounts, threads, stripes=1)
+        print(f"threads={threads:3d}  striped {striped:10,.0f} transfers/sec   global lock {single:10,.0f} transfers/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Metrics overhead benchmark
+
+Times deposits, withdrawals and transfers with metrics disabled and enabled,
+alternating short rounds so drift and noise affect both equally, and reports
+the per-operation cost of recording and what fraction of the operation it is.
+
+Usage:
+    python -m benchmarks.bench_metrics [--operations 200000] [--rounds 20]
+"""
+import argparse
+import time
+from src.bank import AxizuloAfricanBank
+from src.events import EventBus
+from src.metrics import Metrics
+
+
+def operations(bank: AxizuloAfricanBank):
+    source = bank.create_account("Metrics User", "savings", 1e12)
+    target = bank.create_account("Metrics Payee", "current", 0.0)
+    return {
+        "deposit": lambda: source.deposit(10.0, "Salary"),
+        "withdraw": lambda: source.withdraw(10.0, "Groceries"),
+        "transfer_funds": lambda: bank.transfer_funds(source.account_number, target.account_number, 1.0),
+    }
+
+
+def time_round(operation, count: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(count):
+        operation()
+    return (time.perf_counter_ns() - start) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--operations", type=int, default=200000, help="operations per mode and kind")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    
+    metrics = Metrics()
+    disabled = operations(AxizuloAfricanBank(events=EventBus(), metrics=Metrics(enabled=False)))
+    enabled = operations(AxizuloAfricanBank(events=EventBus(), metrics=metrics))
+    per_round = max(1, args.operations // args.rounds)
+    
+    for name in disabled:
+        off, on = [], []
+        for _ in range(args.rounds):
+            off.append(time_round(disabled[name], per_round))
+            on.append(time_round(enabled[name], per_round))
+        # Minimums are the least disturbed estimate of each mode's cost
+        cost_off, cost_on = min(off), min(on)
+        print(f"{name:15s} off {cost_off:8.0f} ns  on {cost_on:8.0f} ns  "
+              f"overhead {cost_on - cost_off:6.0f} ns ({(cost_on - cost_off) / cost_off:+.1%})")
+    print(f"recorded {metrics.operation_count('deposit'):,} deposits")
+
+
+if __name__ == "__main__":
+    main()
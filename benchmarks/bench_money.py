@@ -0,0 +1,131 @@
+"""Money benchmark: integer cents versus float and decimal.Decimal
+
+Times the operations the core performs on every posting (balance updates
+and limit checks), monthly interest, and the parse/format paths used by the
+web and CLI layers, and reports how far float drifts over the same postings.
+
+Usage:
+    python -m benchmarks.bench_money [--count 1000000]
+"""
+import argparse
+import random
+import time
+from decimal import Decimal, ROUND_HALF_EVEN
+from src.money import format_cents, monthly_interest_cents, parse_cents, to_rate_units
+
+CENT = Decimal("0.01")
+ACCOUNTS = 10000
+
+
+def timed(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+# Postings spread over many accounts: apply each amount unless it would take
+# the account past its overdraft limit
+def post_float(amounts):
+    balances = [0.0] * ACCOUNTS
+    for index, amount in enumerate(amounts):
+        account = index % ACCOUNTS
+        balance = balances[account] + amount
+        if balance >= -1000.0:
+            balances[account] = balance
+    return balances
+
+
+def post_cents(amounts):
+    balances = [0] * ACCOUNTS
+    for index, amount in enumerate(amounts):
+        account = index % ACCOUNTS
+        balance = balances[account] + amount
+        if balance >= -100000:
+            balances[account] = balance
+    return balances
+
+
+def post_decimal(amounts):
+    balances = [Decimal(0)] * ACCOUNTS
+    floor = Decimal(-1000)
+    for index, amount in enumerate(amounts):
+        account = index % ACCOUNTS
+        balance = balances[account] + amount
+        if balance >= floor:
+            balances[account] = balance
+    return balances
+
+
+# Monthly interest, rounded to the cent as a posting must be
+def interest_float(balances):
+    return [round(balance * 2.5 / 100 / 12, 2) for balance in balances]
+
+
+def interest_cents(balances):
+    rate = to_rate_units(2.5)
+    return [monthly_interest_cents(balance, rate) for balance in balances]
+
+
+def interest_decimal(balances):
+    rate = Decimal("2.5")
+    return [(balance * rate / 100 / 12).quantize(CENT, ROUND_HALF_EVEN) for balance in balances]
+
+
+# Parsing and formatting user-facing amounts
+def parse_float(texts):
+    return [float(text) for text in texts]
+
+
+def parse_decimal(texts):
+    return [Decimal(text) for text in texts]
+
+
+def parse_cents_all(texts):
+    return [parse_cents(text) for text in texts]
+
+
+def format_float(values):
+    return [f"{value:.2f}" for value in values]
+
+
+def format_decimal(values):
+    return [str(value.quantize(CENT)) for value in values]
+
+
+def format_cents_all(values):
+    return [format_cents(value) for value in values]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1000000)
+    args = parser.parse_args()
+    
+    generator = random.Random(3)
+    cents = [generator.randint(-50000, 100000) for _ in range(args.count)]
+    texts = [format_cents(value) for value in cents]
+    floats = [value / 100 for value in cents]
+    decimals = [Decimal(text) for text in texts]
+    
+    cases = [
+        ("postings", [("float", post_float, floats), ("int cents", post_cents, cents),
+                      ("Decimal", post_decimal, decimals)]),
+        ("monthly interest", [("float", interest_float, floats), ("int cents", interest_cents, cents),
+                              ("Decimal", interest_decimal, decimals)]),
+        ("parse", [("float", parse_float, texts), ("int cents", parse_cents_all, texts),
+                   ("Decimal", parse_decimal, texts)]),
+        ("format", [("float", format_float, floats), ("int cents", format_cents_all, cents),
+                    ("Decimal", format_decimal, decimals)]),
+    ]
+    for name, variants in cases:
+        for label, function, data in variants:
+            elapsed = timed(function, data)
+            print(f"{name:17s} {label:10s} {args.count / elapsed:14,.0f} ops/sec")
+    
+    exact = sum(cents)
+    drift = abs(sum(floats) - exact / 100)
+    print(f"float drift after {args.count:,} additions: R{drift:.10f} (int cents: R0)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Server-push benchmark: many open /events streams on the asyncio server
+
+Opens thousands of idle Server-Sent Events streams, each on its own account,
+plus a set of streams watching one busy account, then deposits into the busy
+account and times how long until every watcher has the update. Also times
+/balance with all streams open, to show idle subscribers cost the loop nothing
+per request. Server and clients share one process, so the memory figure
+covers both ends of each connection.
+
+Usage:
+    python -m benchmarks.bench_push [--streams 5000] [--watchers 100] [--deposits 200]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import resource
+import time
+from flask import Flask
+from async_app import AsyncBankServer
+from src.bank import AxizuloAfricanBank
+from src.events import EventBus
+from src.push import PushHub
+from src.storage import MemoryStorage
+
+
+def resident_kb() -> int:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+async def open_stream(port: int, cookie: str):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET /events HTTP/1.1\r\nHost: localhost\r\nCookie: {cookie}\r\n\r\n".encode())
+    await reader.readuntil(b"\r\n\r\n")
+    await reader.readuntil(b"\n\n")  # Initial balance
+    return reader, writer
+
+
+async def get_balance(port: int, cookie: str) -> float:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    start = time.perf_counter()
+    writer.write(f"GET /balance HTTP/1.1\r\nHost: localhost\r\nCookie: {cookie}\r\nConnection: close\r\n\r\n".encode())
+    await reader.read()
+    writer.close()
+    return time.perf_counter() - start
+
+
+async def run(streams: int, watchers: int, deposits: int) -> None:
+    flask_app = Flask(__name__)
+    flask_app.secret_key = "bench"
+    bank = AxizuloAfricanBank(events=EventBus())
+    with contextlib.redirect_stdout(io.StringIO()):
+        accounts = [bank.create_account(f"Push User {i}", "savings", 100.0) for i in range(streams + 1)]
+    push = PushHub(bank)
+    serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+    cookies = [f"session={serializer.dumps({'account_number': account.account_number})}" for account in accounts]
+    server = AsyncBankServer(MemoryStorage(bank), flask_app, workers=4, push=push)
+    await server.start("127.0.0.1", 0)
+    busy, cookie = accounts[0], cookies[0]
+    
+    base = resident_kb()
+    start = time.perf_counter()
+    idle = []
+    for i in range(1, streams + 1):
+        idle.append(await open_stream(server.port, cookies[i]))
+    opened = time.perf_counter() - start
+    per_stream = (resident_kb() - base) / streams
+    watching = [await open_stream(server.port, cookie) for _ in range(watchers)]
+    
+    latencies = sorted([await get_balance(server.port, cookie) for _ in range(200)])
+    
+    fan_out = []
+    for _ in range(deposits):
+        start = time.perf_counter()
+        busy.deposit(1, "Push")
+        await asyncio.gather(*(reader.readuntil(b"\n\n") for reader, _ in watching))
+        fan_out.append(time.perf_counter() - start)
+    fan_out.sort()
+    
+    print(f"{streams:,} idle streams opened in {opened:.2f}s, {per_stream:.1f} KiB each (both ends)")
+    print(f"/balance with streams open: p50 {latencies[100] * 1e3:.2f} ms  p99 {latencies[197] * 1e3:.2f} ms")
+    print(f"deposit -> {watchers} watchers updated: p50 {fan_out[len(fan_out) // 2] * 1e3:.2f} ms  "
+          f"p99 {fan_out[int(len(fan_out) * 0.99)] * 1e3:.2f} ms")
+    
+    for _, writer in idle + watching:
+        writer.close()
+    await server.stop()
+    push.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--streams", type=int, default=5000, help="idle streams, one account each")
+    parser.add_argument("--watchers", type=int, default=100, help="streams watching the busy account")
+    parser.add_argument("--deposits", type=int, default=200)
+    args = parser.parse_args()
+    
+    # Each stream needs a descriptor at both ends
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    needed = 2 * (args.streams + args.watchers) + 256
+    if soft < needed:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(needed, hard), hard))
+    asyncio.run(run(args.streams, args.watchers, args.deposits))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Scheduler benchmark: tick cost against the number of orders due and the number waiting
+
+Schedules a book of daily standing orders spread evenly over the day, then
+ticks once per simulated minute. Each tick finds the same number of due
+orders whatever the size of the book, so its time should stay flat as the
+book grows and track only the due count. The per-payment cost is compared
+with calling transfer_funds once per payment.
+
+Usage:
+    python -m benchmarks.bench_scheduler [--orders 10000 100000 1000000] [--due 1000] [--ticks 20]
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from src.bank import AxizuloAfricanBank
+from src.events import EventBus
+from src.scheduler import Scheduler
+
+START = datetime(2024, 1, 1)
+MINUTE = timedelta(minutes=1)
+
+
+def build(orders: int, due: int, accounts: int):
+    bank = AxizuloAfricanBank(events=EventBus())
+    numbers = [bank.create_account(f"User {i}", "current", 1e9).account_number for i in range(accounts)]
+    scheduler = Scheduler(bank)
+    rng = random.Random(7)
+    for index in range(orders):
+        source, target = rng.sample(numbers, 2)
+        # Each minute of the simulated day gets `due` orders
+        scheduler.schedule(source, target, 10, START + (index // due) * MINUTE, every=timedelta(days=1))
+    return bank, numbers, scheduler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, nargs="+", default=[10000, 100000, 1000000], help="book sizes")
+    parser.add_argument("--due", type=int, default=1000, help="orders due per tick")
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--accounts", type=int, default=10000)
+    args = parser.parse_args()
+    
+    for orders in args.orders:
+        ticks = min(args.ticks, orders // args.due)
+        bank, numbers, scheduler = build(orders, args.due, args.accounts)
+        timings = []
+        for minute in range(ticks):
+            start = time.perf_counter()
+            report = scheduler.tick(START + minute * MINUTE)
+            timings.append(time.perf_counter() - start)
+            assert report['paid'] == args.due
+        # The minimum is the least disturbed estimate
+        best = min(timings)
+        print(f"{orders:>9,} orders  {args.due:,} due  tick {best * 1000:8.2f} ms  "
+              f"{best / args.due * 1e6:6.2f} us/payment")
+    
+    pairs = [random.Random(index).sample(numbers, 2) for index in range(args.due)]
+    start = time.perf_counter()
+    for source, target in pairs:
+        bank.transfer_funds(source, target, 10)
+    single = time.perf_counter() - start
+    print(f"transfer_funds per payment {single / args.due * 1e6:6.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Server load test: asyncio server vs the Flask development server
+
+Starts each server in its own process with a fresh in-memory bank, then opens
+many concurrent client connections that replay the dashboard's traffic: a
+deposit followed by /balance and /transaction_history fetches. Reports
+requests per second, latency and how many connections were served at once.
+
+Usage:
+    python -m benchmarks.bench_server [--connections 10 100 500] [--rounds 20] [--servers async flask]
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD_ROUND = [
+    ("POST", "/deposit", "amount=10&description=Load"),
+    ("GET", "/balance", ""),
+    ("GET", "/transaction_history?limit=5", ""),
+]
+
+
+def serve(kind: str, port: int) -> None:
+    """Child process: run one server and print the session cookie for a test account"""
+    import contextlib
+    import io
+    import tempfile
+    # app.py opens a ledger at import time; keep it away from real data
+    os.environ["AXIZULO_LEDGER_DIR"] = tempfile.mkdtemp()
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    from app import app
+    from async_app import AsyncBankServer
+    from src.bank import AxizuloAfricanBank
+    from src.events import EventBus
+    from src.storage import MemoryStorage
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        bank = AxizuloAfricanBank(events=EventBus())
+        account = bank.create_account("Load Test", "savings", 0.0)
+    serializer = app.session_interface.get_signing_serializer(app)
+    cookie = f"{app.config['SESSION_COOKIE_NAME']}={serializer.dumps({'account_number': account.account_number})}"
+    
+    if kind == "flask":
+        import app as flask_module
+        flask_module.storage = MemoryStorage(bank)
+        WSGIRequestHandler.log_request = lambda *args, **kwargs: None
+        server = make_server("127.0.0.1", port, app, threaded=True)
+        print(cookie, flush=True)
+        server.serve_forever()
+    else:
+        async def run():
+            server = AsyncBankServer(MemoryStorage(bank), app)
+            await server.start("127.0.0.1", port)
+            print(cookie, flush=True)
+            await server.serve_forever()
+        asyncio.run(run())
+
+
+async def request(connection, port: int, method: str, target: str, body: str, cookie: str):
+    """Send one request, reconnecting if the server closed the previous connection"""
+    if connection is None:
+        connection = await asyncio.open_connection("127.0.0.1", port)
+    reader, writer = connection
+    payload = body.encode()
+    writer.write(f"{method} {target} HTTP/1.1\r\nHost: localhost\r\nCookie: {cookie}\r\n"
+                 f"Content-Type: application/x-www-form-urlencoded\r\n"
+                 f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+    await writer.drain()
+    
+    status_line = await reader.readline()
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    await reader.readexactly(int(headers.get("content-length", 0)))
+    
+    if status_line.startswith(b"HTTP/1.0") or headers.get("connection", "").lower() == "close":
+        writer.close()
+        connection = None
+    return connection, int(status_line.split()[1])
+
+
+async def load(port: int, cookie: str, connections: int, rounds: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    active = peak = 0
+    
+    async def client():
+        nonlocal errors, active, peak
+        connection = None
+        active += 1
+        peak = max(peak, active)
+        try:
+            for _ in range(rounds):
+                for method, target, body in DASHBOARD_ROUND:
+                    start = time.perf_counter()
+                    try:
+                        connection, status = await request(connection, port, method, target, body, cookie)
+                    except (ConnectionError, asyncio.IncompleteReadError, OSError):
+                        connection, status = None, 0
+                    latencies.append(time.perf_counter() - start)
+                    errors += status != 200
+        finally:
+            active -= 1
+            if connection is not None:
+                connection[1].close()
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+    
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "peak_connections": peak,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+    }
+
+
+def benchmark(kind: str, port: int, connections: int, rounds: int) -> Dict[str, float]:
+    process = subprocess.Popen([sys.executable, "-m", "benchmarks.bench_server", "--serve", kind, "--port", str(port)],
+                               cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    try:
+        cookie = process.stdout.readline().strip()
+        if not cookie:
+            raise RuntimeError(f"{kind} server failed to start")
+        return asyncio.run(load(port, cookie, connections, rounds))
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--rounds", type=int, default=20, help="dashboard rounds per connection")
+    parser.add_argument("--servers", nargs="+", choices=["async", "flask"], default=["async", "flask"])
+    parser.add_argument("--port", type=int, default=5077)
+    parser.add_argument("--serve", choices=["async", "flask"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+    
+    for connections in args.connections:
+        for kind in args.servers:
+            result = benchmark(kind, args.port, connections, args.rounds)
+            print(f"{kind:5s} connections={connections:4d}  {result['rps']:8,.0f} req/sec  "
+                  f"p50 {result['p50_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms  "
+                  f"peak {result['peak_connections']:4d} connections  errors {result['errors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Sharded bank benchmark: transfer throughput as shards are added
+
+Opens the same accounts on a ShardedBank with 1, 2, 4... shard processes
+and has client threads run random transfers between them for a fixed time.
+With N shards about (N - 1) / N of the transfers cross shards and take the
+two-phase path, so the run shows both the extra round trips it costs and
+the cores extra shards put to work. An in-process AxizuloAfricanBank driven
+by the same clients is the single-process baseline. Shards only add
+throughput on a machine with a core to spare for each of them.
+
+Usage:
+    python -m benchmarks.bench_sharding [--shards 1,2,4] [--accounts 1000] [--clients 16] [--seconds 5]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import threading
+import time
+from src.bank import AxizuloAfricanBank
+from src.events import EventBus
+from src.sharding import ShardedBank
+
+
+def drive(transfer, accounts, clients: int, seconds: float):
+    """Run random transfers from client threads for a while; returns (completed, refused, elapsed)"""
+    counts = [[0, 0] for _ in range(clients)]
+    deadline = time.perf_counter() + seconds
+    
+    def client(index: int) -> None:
+        rng = random.Random(index)
+        tally = counts[index]
+        while time.perf_counter() < deadline:
+            from_account, to_account = rng.sample(accounts, 2)
+            tally[0 if transfer(from_account, to_account, rng.randint(1, 50)) else 1] += 1
+    
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return sum(tally[0] for tally in counts), sum(tally[1] for tally in counts), elapsed
+
+
+def report(label: str, completed: int, refused: int, elapsed: float) -> None:
+    print(f"{label:>14}  {(completed + refused) / elapsed:>10,.0f} transfers/sec  ({refused:,} refused)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shards", default="1,2,4", help="comma-separated shard counts to try")
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--clients", type=int, default=16, help="client threads issuing transfers")
+    parser.add_argument("--seconds", type=float, default=5.0, help="run time per configuration")
+    args = parser.parse_args()
+    print(f"{args.accounts:,} accounts, {args.clients} client threads, {os.cpu_count()} CPUs")
+    
+    bank = AxizuloAfricanBank(events=EventBus())
+    with contextlib.redirect_stdout(io.StringIO()):
+        accounts = [bank.create_account(f"Shard User {i}", "savings", 1000.0).account_number
+                    for i in range(args.accounts)]
+    report("in-process", *drive(bank.transfer_funds, accounts, args.clients, args.seconds))
+    
+    for shards in (int(count) for count in args.shards.split(",")):
+        sharded = ShardedBank(shards)
+        accounts = [sharded.create_account(f"Shard User {i}", "savings", 1000.0)['account_number']
+                    for i in range(args.accounts)]
+        total = sharded.get_total_bank_balance()
+        report(f"{shards} shard{'s' if shards > 1 else ''}",
+               *drive(sharded.transfer_funds, accounts, args.clients, args.seconds))
+        assert sharded.get_total_bank_balance() == total, "money was created or lost"
+        sharded.close()
+
+
+if __name__ == "__main__":
+    main()
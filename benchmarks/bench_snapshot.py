@@ -0,0 +1,108 @@
+"""Snapshot image benchmark: startup time and memory against the number of accounts
+
+Builds a ledger of accounts with a few transactions each, then recovers it
+in a fresh process two ways: replaying the whole log, and mapping a
+snapshot image written by a checkpoint. Replay rebuilds every account up
+front; the image leaves them dormant, so its startup time and resident
+memory should stay nearly flat as the account count grows. The first
+lookups of dormant accounts pay for hydrating them.
+
+Usage:
+    python -m benchmarks.bench_snapshot [--accounts 10000 100000] [--transactions 4] [--lookups 1000]
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+from src.bank import AxizuloAfricanBank
+from src.events import EventBus
+from src.ledger import Ledger
+
+
+def build(directory: str, accounts: int, transactions: int) -> List[str]:
+    """Write a ledger of accounts with transactions each, logged but never checkpointed"""
+    bank = AxizuloAfricanBank(ledger=Ledger(directory, sync=False), events=EventBus())
+    numbers = []
+    for i in range(accounts):
+        account = bank.create_account(f"Customer {i}", "savings" if i % 2 else "current", 100)
+        for _ in range(transactions - 1):
+            account.deposit(10)
+        numbers.append(account.account_number)
+    bank.close()
+    return numbers
+
+
+def peak_rss_kb() -> int:
+    """This process's peak resident memory; ru_maxrss would include the parent's on Linux"""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def recover(directory: str) -> None:
+    """Open a bank from directory, look up the account numbers read from stdin and print the timings as JSON"""
+    sample = json.loads(sys.stdin.read())
+    start = time.perf_counter()
+    bank = AxizuloAfricanBank(ledger=Ledger(directory, sync=False), events=EventBus())
+    startup = time.perf_counter() - start
+    rss = peak_rss_kb()
+    
+    start = time.perf_counter()
+    for number in sample:
+        bank.get_account(number).balance_cents
+    lookup = time.perf_counter() - start
+    print(json.dumps({'startup': startup, 'rss_kb': rss, 'lookup': lookup / len(sample)}))
+
+
+def measure(directory: str, sample: List[str]) -> Dict[str, float]:
+    """Recover in a fresh process, so peak RSS covers startup alone"""
+    output = subprocess.run([sys.executable, "-m", "benchmarks.bench_snapshot", "--recover", directory],
+                            input=json.dumps(sample), check=True, capture_output=True, text=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--transactions", type=int, default=4, help="per account")
+    parser.add_argument("--lookups", type=int, default=1000, help="dormant accounts looked up after startup")
+    parser.add_argument("--recover", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.recover:
+        recover(args.recover)
+        return
+    
+    for accounts in args.accounts:
+        root = tempfile.mkdtemp()
+        try:
+            replay, image = os.path.join(root, "replay"), os.path.join(root, "image")
+            numbers = build(replay, accounts, args.transactions)
+            sample = random.Random(7).sample(numbers, min(args.lookups, accounts))
+            shutil.copytree(replay, image)
+            bank = AxizuloAfricanBank(ledger=Ledger(image, sync=False), events=EventBus())
+            bank.checkpoint()
+            bank.close()
+            
+            for name, directory in (("replay", replay), ("image", image)):
+                result = measure(directory, sample)
+                print(f"{accounts:>9,} accounts  {name:<6}  startup {result['startup'] * 1000:9.1f} ms  "
+                      f"peak RSS {result['rss_kb'] / 1024:7.1f} MiB  "
+                      f"first lookup {result['lookup'] * 1e6:7.1f} us")
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
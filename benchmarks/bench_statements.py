@@ -0,0 +1,63 @@
+"""Monthly statement generation benchmark
+
+Builds a bank whose accounts each have a month of history before the
+statement period and another inside it, then renders every account's
+statement to a temporary file, first in this process and then with a
+worker pool. Reports throughput and the peak resident memory of the run.
+
+Usage:
+    python -m benchmarks.bench_statements [--accounts 200000] [--history 8] [--workers N]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from src.bank import AxizuloAfricanBank
+from src.events import EventBus
+from src.statements import INTEREST_DESCRIPTION, generate_statements, month_period
+from src.store import to_micros
+
+YEAR, MONTH = 2024, 3
+
+
+def build_bank(accounts: int, history: int) -> AxizuloAfricanBank:
+    bank = AxizuloAfricanBank(events=EventBus())
+    start, _ = month_period(YEAR, MONTH)
+    timestamps = [to_micros(start + timedelta(days=(day - history) * 28 / history)) for day in range(2 * history)]
+    for i in range(accounts):
+        account = bank.create_account(f"Statement User {i}", "current" if i % 2 else "savings", 0.0)
+        for j, timestamp in enumerate(timestamps):
+            if j % 4 == 3:
+                account._post("deposit", 125, INTEREST_DESCRIPTION, timestamp=timestamp)
+            elif j % 2:
+                account._post("withdrawal", 4000 + j, "Card purchase", timestamp=timestamp)
+            else:
+                account._post("deposit", 25000 + i % 1000, "Salary", timestamp=timestamp)
+    return bank
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=200000)
+    parser.add_argument("--history", type=int, default=8, help="transactions per account per month")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    
+    bank = build_bank(args.accounts, args.history)
+    start, end = month_period(YEAR, MONTH)
+    directory = tempfile.mkdtemp()
+    try:
+        for workers in (0, args.workers):
+            path = os.path.join(directory, f"statements-{workers}.txt")
+            report = generate_statements(bank, start, end, path, workers=workers)
+            label = "serial" if workers == 0 else f"{workers} workers"
+            print(f"{label:12s} {report['accounts_per_sec']:12,.0f} accounts/sec  "
+                  f"{report['transactions']:,} transactions in {report['seconds']:.1f}s  "
+                  f"{os.path.getsize(path) / 2 ** 20:,.0f} MiB written  peak RSS {report['peak_rss_kb'] or 0:,} KiB")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Tiered transaction history benchmark
+
+Posts a long history across a set of accounts, once with all history in
+memory and once with cold storage, each in a fresh process so resident
+memory is comparable. Reports posting throughput, resident memory at each
+quarter of the run, and the cost of reading recent (hot) and full (mostly
+cold) histories.
+
+Usage:
+    python -m benchmarks.bench_tiering [--accounts 10000] [--transactions 5000000] [--hot 100]
+                                       [--hot-rows 250000]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import time
+from src.bank import AxizuloAfricanBank
+from src.events import EventBus
+
+
+def resident_kb() -> int:
+    """Current resident set size (Linux), so growth is visible rather than the peak"""
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def run(label: str, accounts: int, transactions: int, hot: int, hot_rows: int, cold_storage) -> None:
+    bank = AxizuloAfricanBank(events=EventBus(), cold_storage=cold_storage, hot_transactions=hot,
+                              hot_rows=hot_rows)
+    opened = [bank.create_account(f"Tiering User {i}", "savings", 0.0) for i in range(accounts)]
+    generator = random.Random(5)
+    marks = []
+    start = time.perf_counter()
+    quarter = max(1, transactions // 4)
+    for step in range(transactions):
+        generator.choice(opened).deposit(1)
+        if (step + 1) % quarter == 0:
+            marks.append(resident_kb() // 1024)
+    elapsed = time.perf_counter() - start
+    
+    sample = opened[:1000]
+    start = time.perf_counter()
+    for account in sample:
+        account.get_recent_transactions(5)
+    recent = (time.perf_counter() - start) / len(sample) * 1e6
+    start = time.perf_counter()
+    for account in sample[:100]:
+        account.get_transaction_history()
+    full = (time.perf_counter() - start) / min(len(sample), 100) * 1e3
+    
+    print(f"{label:10s} {transactions / elapsed:10,.0f} postings/sec  RSS by quarter "
+          f"{' '.join(f'{mark:,}' for mark in marks)} MiB  recent(5) {recent:6.1f} us  "
+          f"full history {full:6.2f} ms")
+    bank.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=10000)
+    parser.add_argument("--transactions", type=int, default=5000000)
+    parser.add_argument("--hot", type=int, default=100, help="recent transactions kept in memory per account")
+    parser.add_argument("--hot-rows", type=int, default=250000, help="newest store rows kept in memory")
+    args = parser.parse_args()
+    
+    directory = tempfile.mkdtemp()
+    try:
+        for label, cold_storage in (("in memory", None), ("tiered", directory)):
+            process = multiprocessing.Process(target=run, args=(label, args.accounts, args.transactions,
+                                                                 args.hot, args.hot_rows, cold_storage))
+            process.start()
+            process.join()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
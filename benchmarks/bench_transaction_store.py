@@ -0,0 +1,74 @@
+"""Transaction storage benchmark: memory per transaction and append rate
+
+Compares the columnar TransactionStore against the previous layout of one
+Transaction object (with uuid-derived id and datetime) per history entry.
+
+Usage:
+    python -m benchmarks.bench_transaction_store [--count 200000]
+"""
+import argparse
+import contextlib
+import io
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+from src.account import SavingsAccount
+
+
+class LegacyTransaction:
+    """The pre-columnar Transaction layout (a plain object with __dict__)"""
+    
+    def __init__(self, transaction_id, transaction_type, amount, description=""):
+        self._transaction_id = transaction_id
+        self._transaction_type = transaction_type
+        self._amount = amount
+        self._description = description
+        self._timestamp = datetime.now()
+        self._status = "completed"
+
+
+def legacy_history(count: int) -> list:
+    history = []
+    for i in range(count):
+        history.append(LegacyTransaction(str(uuid.uuid4())[:6].upper(), "deposit", float(i), "Deposit"))
+    return history
+
+
+def columnar_history(count: int) -> SavingsAccount:
+    account = SavingsAccount("Benchmark User", 0.0)
+    for i in range(count):
+        account._post("deposit", i * 100, "Deposit")
+    return account
+
+
+def measure(build, count: int) -> tuple:
+    """Return (bytes per transaction, appends per second); timing runs untraced"""
+    start = time.perf_counter()
+    build(count)
+    elapsed = time.perf_counter() - start
+    
+    tracemalloc.start()
+    result = build(count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size / count, count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200000)
+    args = parser.parse_args()
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        legacy_bytes, legacy_rate = measure(legacy_history, args.count)
+        columnar_bytes, columnar_rate = measure(columnar_history, args.count)
+    
+    print(f"legacy objects   {legacy_bytes:8.1f} bytes/txn  {legacy_rate:12,.0f} appends/sec")
+    print(f"columnar store   {columnar_bytes:8.1f} bytes/txn  {columnar_rate:12,.0f} appends/sec")
+    print(f"memory reduction {legacy_bytes / columnar_bytes:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Transfer benchmark: one transfer_funds call per item versus transfer_batch
+
+Usage:
+    python -m benchmarks.bench_transfer_batch [--transfers 50000] [--accounts 1000]
+"""
+import argparse
+import contextlib
+import io
+import random
+import time
+from src.bank import AxizuloAfricanBank
+
+
+def build_bank(accounts: int) -> tuple:
+    bank = AxizuloAfricanBank()
+    numbers = [bank.create_account(f"User {i}", "current", 10000.0).account_number for i in range(accounts)]
+    return bank, numbers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transfers", type=int, default=50000)
+    parser.add_argument("--accounts", type=int, default=1000)
+    args = parser.parse_args()
+    
+    random.seed(7)
+    pairs = [random.sample(range(args.accounts), 2) + [round(random.uniform(1, 50), 2)]
+             for _ in range(args.transfers)]
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        bank, numbers = build_bank(args.accounts)
+        start = time.perf_counter()
+        for source, target, amount in pairs:
+            bank.transfer_funds(numbers[source], numbers[target], amount)
+        single = time.perf_counter() - start
+        
+        bank, numbers = build_bank(args.accounts)
+        start = time.perf_counter()
+        report = bank.transfer_batch([(numbers[source], numbers[target], amount) for source, target, amount in pairs])
+        batch = time.perf_counter() - start
+    
+    print(f"transfer_funds  {args.transfers / single:12,.0f} transfers/sec")
+    print(f"transfer_batch  {args.transfers / batch:12,.0f} transfers/sec  (applied {report['applied']:,})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Multi-worker load test: Flask workers sharing SQLite vs one in-memory process
+
+Runs app.py under N worker processes, each a threaded Flask server on its
+own port with AXIZULO_DATABASE pointing at one shared SQLite file, and
+spreads client connections across them round-robin, as a load balancer in
+front of ``gunicorn -w N`` would. Every connection replays the dashboard's
+traffic (a deposit, then /balance and /transaction_history) for its own
+account, plus a transfer to the next connection's account, so writes from
+different workers meet in the same database. The single-process baseline
+is app.py as it runs by default: one process with the in-memory bank and
+its ledger. Workers only add throughput on a machine with a core to spare
+for each of them.
+
+Usage:
+    python -m benchmarks.bench_workers [--workers 1 2 4] [--connections 64] [--rounds 10]
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+from benchmarks.bench_server import ROOT, request
+
+DASHBOARD_ROUND = [
+    ("POST", "/deposit", "amount=10&description=Load"),
+    ("GET", "/balance", ""),
+    ("GET", "/transaction_history?limit=5", ""),
+]
+
+
+def serve(port: int, accounts: int) -> None:
+    """Child process: run app.py on a port, opening accounts first and printing their session cookies"""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    
+    # The bank's console events are written later by a background thread; keep them off the pipe
+    pipe, sys.stdout = sys.stdout, open(os.devnull, "w")
+    from app import app, storage
+    numbers = [storage.create_account(f"Worker User {i}", "savings", 1000.0) for i in range(accounts)]
+    serializer = app.session_interface.get_signing_serializer(app)
+    cookies = [f"{app.config['SESSION_COOKIE_NAME']}={serializer.dumps({'account_number': number})}"
+               for number in numbers]
+    WSGIRequestHandler.log_request = lambda *args, **kwargs: None
+    server = make_server("127.0.0.1", port, app, threaded=True)
+    print(json.dumps({'cookies': cookies, 'numbers': numbers}), file=pipe, flush=True)
+    server.serve_forever()
+
+
+async def load(ports: List[int], cookies: List[str], numbers: List[str], rounds: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    
+    async def client(index: int):
+        nonlocal errors
+        port = ports[index % len(ports)]
+        payee = numbers[(index + 1) % len(numbers)]
+        steps = DASHBOARD_ROUND + [("POST", "/transfer", f"to_account={payee}&amount=1")]
+        connection = None
+        try:
+            for _ in range(rounds):
+                for method, target, body in steps:
+                    start = time.perf_counter()
+                    try:
+                        connection, status = await request(connection, port, method, target, body, cookies[index])
+                    except (ConnectionError, asyncio.IncompleteReadError, OSError):
+                        connection, status = None, 0
+                    latencies.append(time.perf_counter() - start)
+                    errors += status != 200
+        finally:
+            if connection is not None:
+                connection[1].close()
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(client(index) for index in range(len(cookies))))
+    elapsed = time.perf_counter() - start
+    
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+    }
+
+
+def benchmark(workers: int, database: bool, port: int, connections: int, rounds: int) -> Dict[str, float]:
+    directory = tempfile.mkdtemp()
+    environ = dict(os.environ, AXIZULO_LEDGER_DIR=os.path.join(directory, "ledger"),
+                   AXIZULO_COLD_DIR=os.path.join(directory, "cold"), AXIZULO_METRICS="0")
+    if database:
+        environ["AXIZULO_DATABASE"] = os.path.join(directory, "bank.db")
+    processes = []
+    try:
+        # The first worker opens every account; the rest find them in the shared database
+        for index in range(workers):
+            processes.append(subprocess.Popen(
+                [sys.executable, "-m", "benchmarks.bench_workers", "--serve", str(port + index),
+                 "--accounts", str(connections if index == 0 else 0)],
+                cwd=ROOT, env=environ, stdout=subprocess.PIPE, text=True))
+            line = processes[-1].stdout.readline()
+            if not line:
+                raise RuntimeError(f"worker {index} failed to start")
+            if index == 0:
+                accounts = json.loads(line)
+        ports = [port + index for index in range(workers)]
+        return asyncio.run(load(ports, accounts['cookies'], accounts['numbers'], rounds))
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="SQLite worker counts to try")
+    parser.add_argument("--connections", type=int, default=64, help="concurrent clients, each with its own account")
+    parser.add_argument("--rounds", type=int, default=10, help="dashboard rounds per connection")
+    parser.add_argument("--port", type=int, default=5177)
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--accounts", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.serve:
+        serve(args.serve, args.accounts)
+        return
+    
+    print(f"{args.connections} connections, {args.rounds} rounds each, {os.cpu_count()} CPUs")
+    configurations = [("memory", 1, False)] + [("sqlite", workers, True) for workers in args.workers]
+    for label, workers, database in configurations:
+        result = benchmark(workers, database, args.port, args.connections, args.rounds)
+        print(f"{label:6s} workers={workers}  {result['rps']:8,.0f} req/sec  "
+              f"p50 {result['p50_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms  errors {result['errors']}")
+
+
+if __name__ == "__main__":
+    main()
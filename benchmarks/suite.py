@@ -0,0 +1,312 @@
+"""Micro-benchmark suite for the banking core and the Flask routes
+
+Measures ops/sec and per-call latency percentiles for each case and writes
+them as JSON. With --compare, the run is checked against a stored baseline
+and the exit status is 1 when any case got slower than the threshold allows.
+
+Usage:
+    python -m benchmarks.suite [--quick] [--filter deposit] [--output results.json]
+    python -m benchmarks.suite --compare baseline.json [--threshold 0.25]
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from src.bank import AxizuloAfricanBank
+from src.events import EventBus
+from src.metrics import Metrics
+from src.storage import MemoryStorage
+
+# name -> (setup(quick) returning the operation to time, iterations)
+CASES: Dict[str, Tuple[Callable[[bool], Callable[[], Any]], int]] = {}
+
+
+def case(name: str, iterations: int):
+    """Register a benchmark whose setup function returns the operation to time"""
+    def register(setup):
+        CASES[name] = (setup, iterations)
+        return setup
+    return register
+
+
+def quiet_bank() -> AxizuloAfricanBank:
+    """In-memory bank with no event sinks, so output does not skew timings"""
+    return AxizuloAfricanBank(events=EventBus())
+
+
+def populated_bank(accounts: int) -> AxizuloAfricanBank:
+    bank = quiet_bank()
+    for i in range(accounts):
+        bank.create_account(f"User {i}", "savings" if i % 2 else "current", 1000.0)
+    return bank
+
+
+# Core cases
+@case("create_account", 20000)
+def bench_create_account(quick: bool):
+    bank = quiet_bank()
+    counter = itertools.count()
+    return lambda: bank.create_account(f"User {next(counter)}", "savings", 100.0)
+
+
+@case("deposit", 50000)
+def bench_deposit(quick: bool):
+    account = quiet_bank().create_account("Bench User", "savings", 0.0)
+    return lambda: account.deposit(10.0, "Salary")
+
+
+@case("deposit (metrics on)", 50000)
+def bench_deposit_metrics(quick: bool):
+    account = AxizuloAfricanBank(events=EventBus(), metrics=Metrics()).create_account("Bench User", "savings", 0.0)
+    return lambda: account.deposit(10.0, "Salary")
+
+
+@case("withdraw", 50000)
+def bench_withdraw(quick: bool):
+    account = quiet_bank().create_account("Bench User", "savings", 1e12)
+    return lambda: account.withdraw(10.0, "Groceries")
+
+
+@case("transfer_funds", 50000)
+def bench_transfer_funds(quick: bool):
+    bank = populated_bank(1000)
+    numbers = [account.account_number for account in bank.get_all_accounts()]
+    pairs = itertools.cycle([tuple(random.Random(seed).sample(numbers, 2)) for seed in range(1000)])
+    
+    def transfer():
+        source, target = next(pairs)
+        bank.transfer_funds(source, target, 1.0)
+    return transfer
+
+
+def history_case(length: int, iterations: int):
+    @case(f"get_transaction_history[{length}]", iterations)
+    def bench_history(quick: bool):
+        account = quiet_bank().create_account("Bench User", "savings", 0.0)
+        for _ in range(length - 1):
+            account.deposit(1.0)
+        return account.get_transaction_history
+
+
+history_case(10, 20000)
+history_case(100000, 20)
+
+
+@case("balance_at[100000]", 20000)
+def bench_balance_at(quick: bool):
+    account = quiet_bank().create_account("Bench User", "savings", 0.0)
+    for _ in range(100000 - 1):
+        account.deposit(1.0)
+    timestamps = [transaction.timestamp for transaction in account.get_recent_transactions(100000)[::97]]
+    counter = itertools.count()
+    return lambda: account.balance_at(timestamps[next(counter) % len(timestamps)])
+
+
+def total_balance_case(accounts: int, full_only: bool = False):
+    @case(f"get_total_bank_balance[{accounts}]", 20000)
+    def bench_total_balance(quick: bool):
+        if quick and full_only:
+            return None
+        return populated_bank(accounts).get_total_bank_balance
+
+
+total_balance_case(10000)
+total_balance_case(100000)
+total_balance_case(1000000, full_only=True)
+
+
+@case("find_accounts[100000]", 2000)
+def bench_find_accounts(quick: bool):
+    bank = populated_bank(100000)
+    counter = itertools.count()
+    return lambda: bank.find_accounts(holder_prefix=f"User {next(counter) % 100000}")
+
+
+# Flask routes, through the test client against an in-memory bank
+def route_case(name: str, method: str, path: str, iterations: int = 5000, data_for=None):
+    @case(f"route {name}", iterations)
+    def bench_route(quick: bool):
+        client, target = flask_client()
+        send = getattr(client, method)
+        if data_for is None:
+            return lambda: send(path)
+        return lambda: send(path, data=data_for(target))
+
+
+_flask: Dict[str, Any] = {}
+
+
+def flask_client():
+    """Test client logged in to a funded account, plus a second account to pay"""
+    if not _flask:
+        # app.py opens a ledger and cold storage at import time; keep them away from real data
+        os.environ.setdefault("AXIZULO_LEDGER_DIR", tempfile.mkdtemp())
+        os.environ.setdefault("AXIZULO_COLD_DIR", tempfile.mkdtemp())
+        import app as app_module
+        _flask["module"] = app_module
+    
+    app_module = _flask["module"]
+    bank = quiet_bank()
+    app_module.storage = MemoryStorage(bank)
+    app_module.responses.clear()
+    account = bank.create_account("Bench User", "savings", 1e12)
+    target = bank.create_account("Payee", "current", 0.0)
+    client = app_module.app.test_client()
+    with client.session_transaction() as session:
+        session["account_number"] = account.account_number
+    return client, target.account_number
+
+
+route_case("GET /", "get", "/")
+route_case("GET /create_account", "get", "/create_account")
+route_case("POST /create_account", "post", "/create_account", 2000,
+           lambda target: {"account_holder": "Bench User", "account_type": "savings", "initial_deposit": "100"})
+route_case("GET /dashboard", "get", "/dashboard")
+route_case("POST /deposit", "post", "/deposit", data_for=lambda target: {"amount": "10", "description": "Salary"})
+route_case("POST /withdraw", "post", "/withdraw", data_for=lambda target: {"amount": "10"})
+route_case("GET /balance", "get", "/balance")
+route_case("GET /transaction_history", "get", "/transaction_history")
+route_case("GET /transaction_history?limit=50", "get", "/transaction_history?limit=50")
+route_case("POST /transfer", "post", "/transfer", data_for=lambda target: {"to_account": target, "amount": "1"})
+
+
+@case("route GET /transaction_history (304)", 5000)
+def bench_route_not_modified(quick: bool):
+    client, _ = flask_client()
+    account = _flask["module"].storage.bank.find_accounts(holder="Bench User")[0]
+    for _ in range(1000):
+        account.deposit(1, "Salary")
+    etag = client.get("/transaction_history").headers["ETag"]
+    return lambda: client.get("/transaction_history", headers={"If-None-Match": etag})
+
+
+@case("route POST /transfers/batch", 500)
+def bench_route_transfer_batch(quick: bool):
+    client, target = flask_client()
+    payload = {"transfers": [{"to_account": target, "amount": 1} for _ in range(100)]}
+    return lambda: client.post("/transfers/batch", json=payload)
+
+
+# Running and comparing
+def measure(operation: Callable[[], Any], iterations: int, warmup: int) -> Dict[str, float]:
+    for _ in range(warmup):
+        operation()
+    
+    clock = time.perf_counter_ns
+    samples = []
+    record = samples.append
+    start = clock()
+    for _ in range(iterations):
+        began = clock()
+        operation()
+        record(clock() - began)
+    elapsed = clock() - start
+    
+    samples.sort()
+    
+    def percentile(fraction: float) -> float:
+        return samples[min(len(samples) - 1, int(len(samples) * fraction))] / 1000
+    
+    return {
+        "iterations": iterations,
+        "ops_per_sec": iterations / (elapsed / 1e9),
+        "mean_us": sum(samples) / len(samples) / 1000,
+        "p50_us": percentile(0.50),
+        "p95_us": percentile(0.95),
+        "p99_us": percentile(0.99),
+        "max_us": samples[-1] / 1000,
+    }
+
+
+def run_suite(names: Optional[List[str]] = None, quick: bool = False,
+              progress: Optional[Callable[[str, Dict[str, float]], None]] = None) -> Dict[str, Any]:
+    """Run the selected cases (all by default) and return the JSON-ready report"""
+    results = {}
+    for name, (setup, iterations) in CASES.items():
+        if names is not None and name not in names:
+            continue
+        operation = setup(quick)
+        if operation is None:
+            continue
+        if quick:
+            iterations = max(1, iterations // 10)
+        results[name] = measure(operation, iterations, warmup=max(1, iterations // 20))
+        if progress:
+            progress(name, results[name])
+    
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.25) -> List[Dict[str, Any]]:
+    """Return one row per case present in both reports, flagging slowdowns beyond threshold
+    
+    A case regresses when its throughput falls, or its median latency rises,
+    by more than ``threshold`` (a fraction) relative to the baseline.
+    """
+    rows = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        throughput = result["ops_per_sec"] / before["ops_per_sec"] - 1
+        latency = result["p50_us"] / before["p50_us"] - 1 if before["p50_us"] else 0.0
+        rows.append({
+            "name": name,
+            "ops_per_sec_change": throughput,
+            "p50_change": latency,
+            "regression": throughput < -threshold or latency > threshold,
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="fewer iterations, skip the 1M-account case")
+    parser.add_argument("--filter", help="only run cases whose name contains this text")
+    parser.add_argument("--output", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against this JSON report")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown as a fraction")
+    args = parser.parse_args()
+    
+    names = [name for name in CASES if args.filter in name] if args.filter else None
+    
+    def progress(name, result):
+        print(f"{name:40s} {result['ops_per_sec']:12,.0f} ops/sec  p50 {result['p50_us']:9.1f} us  "
+              f"p99 {result['p99_us']:9.1f} us", file=sys.stderr)
+    
+    report = run_suite(names, args.quick, progress)
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+    elif not args.compare:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            rows = compare(report, json.load(baseline_file), args.threshold)
+        for row in rows:
+            flag = "REGRESSION" if row["regression"] else "ok"
+            print(f"{row['name']:40s} ops/sec {row['ops_per_sec_change']:+7.1%}  p50 {row['p50_change']:+7.1%}  {flag}")
+        if any(row["regression"] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
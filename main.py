@@ -1,12 +1,14 @@
 from src.bank import AxizuloAfricanBank
 from src.account import Account
+from src.events import ConsoleSink, EventBus
+from src.money import Money
 import sys
 
 class BankingApp:
     """Main banking application interface"""
     
     def __init__(self):
-        self.bank = AxizuloAfricanBank()
+        self.bank = AxizuloAfricanBank(events=EventBus([ConsoleSink()]))
     
     def display_menu(self):
         """Display main menu"""
@@ -47,7 +49,7 @@ class BankingApp:
             account_type = "savings"
         
         try:
-            initial_deposit = float(input("Enter initial deposit amount (R): "))
+            initial_deposit = Money.parse(input("Enter initial deposit amount (R): "))
             if initial_deposit < 0:
                 print("Initial deposit cannot be negative. Setting to R0.00")
                 initial_deposit = 0.0
@@ -79,7 +81,7 @@ class BankingApp:
             return
         
         try:
-            amount = float(input("Enter deposit amount (R): "))
+            amount = Money.parse(input("Enter deposit amount (R): "))
             description = input("Enter description (optional): ")
             
             if not description:
@@ -98,7 +100,7 @@ class BankingApp:
             return
         
         try:
-            amount = float(input("Enter withdrawal amount (R): "))
+            amount = Money.parse(input("Enter withdrawal amount (R): "))
             description = input("Enter description (optional): ")
             
             if not description:
@@ -149,7 +151,7 @@ class BankingApp:
         to_account_num = input("Enter recipient account number: ").strip().upper()
         
         try:
-            amount = float(input("Enter transfer amount (R): "))
+            amount = Money.parse(input("Enter transfer amount (R): "))
         except ValueError:
             print("Invalid amount. Please enter a valid number.")
             return
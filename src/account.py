@@ -1,26 +1,79 @@
-from typing import List, Optional, Dict, Any
-import uuid
+from typing import List, Optional, Dict, Any, Tuple
+import base64
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from .events import (AccountStatusChanged, Deposited, OperationRejected, Withdrawn,
+                     default_bus)
+from .ids import IdAllocator
+from .metrics import disabled_metrics
+from .money import (Amount, Money, format_cents, from_cents, monthly_interest_cents, to_cents,
+                    to_rate_units, RATE_SCALE)
+from .store import TransactionStore, to_micros
 from .transaction import Transaction
 
+
+ACCOUNT_NUMBER_WIDTH = 9  # Digits before the check digit
+INSUFFICIENT_FUNDS = "Insufficient funds."  # Every shortfall reason starts with this
+_standalone_numbers = IdAllocator(ACCOUNT_NUMBER_WIDTH)  # For accounts created outside a bank
+
+
+def _encode_cursor(position: int) -> str:
+    """Encode a history position as an opaque pagination cursor"""
+    return base64.urlsafe_b64encode(f"h{position}".encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> int:
+    """Decode a pagination cursor back into a history position"""
+    try:
+        text = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        if text[0] != "h":
+            raise ValueError
+        return int(text[1:])
+    except (ValueError, IndexError, UnicodeDecodeError):
+        raise ValueError(f"Invalid cursor: {cursor}") from None
+
+
 class Account:
-    """Base account class with common banking functionality"""
+    """Base account class with common banking functionality
     
-    def __init__(self, account_holder: str, initial_deposit: float = 0.0):
-        self._account_number = str(uuid.uuid4())[:8].upper()
+    Public methods accept amounts in rands (float, int, str or Decimal) or as
+    ``Money``; inside the account every amount is held as integer cents.
+    """
+    
+    def __init__(self, account_holder: str, initial_deposit: Amount = 0.0,
+                 store: Optional[TransactionStore] = None, account_number: Optional[str] = None):
+        self._account_number = account_number or _standalone_numbers.next_id()
         self._account_holder = account_holder
-        self._balance = max(0.0, initial_deposit)  # Prevent negative initial deposit
-        self._transaction_history: List[Transaction] = []
+        self._balance = 0  # Cents
+        # History rows live in a columnar store, shared across the bank when one is given
+        self._store = store if store is not None else TransactionStore()
+        self._rows = array('q')
         self._is_active = True
+        self._version = 0  # Bumped after every change to the balance, history or status
+        self._ledger = None  # Set by the bank when the account is journaled
+        self._lock = threading.RLock()  # Replaced by the bank's striped lock once registered
+        self._aggregates = None  # Bank-wide totals notified of every balance/status change
+        self._indexes = None  # Bank-wide secondary indexes, notified the same way
+        self._events = default_bus  # Replaced by the bank's event bus once registered
+        self._metrics = disabled_metrics  # Replaced by the bank's metrics once registered
+        self._limits = None  # Bank-wide velocity limits, checked before every debit
+        self._velocity = None  # This account's sliding windows, kept by the limits
+        self._recently_used = False  # Set on every bank lookup, cleared by the bank's eviction sweeps
         
-        # Record initial deposit if any
+        # Record initial deposit if any (negative initial deposits are ignored)
+        initial_deposit = to_cents(initial_deposit)
         if initial_deposit > 0:
-            transaction = Transaction(
-                transaction_id=str(uuid.uuid4())[:6].upper(),
-                transaction_type="deposit",
-                amount=initial_deposit,
-                description="Initial deposit"
-            )
-            self._transaction_history.append(transaction)
+            self._post("deposit", initial_deposit, "Initial deposit")
+    
+    @classmethod
+    def _restore(cls, account_number: str, account_holder: str, is_active: bool = True,
+                 **kwargs) -> 'Account':
+        """Rebuild an empty account with a known number (used by ledger recovery)"""
+        account = cls(account_holder, 0.0, account_number=account_number, **kwargs)
+        account._is_active = is_active
+        return account
     
     # Encapsulated getters
     @property
@@ -33,150 +86,282 @@ class Account:
     
     @property
     def balance(self) -> float:
+        return from_cents(self._balance)
+    
+    @property
+    def balance_cents(self) -> int:
         return self._balance
     
     @property
     def is_active(self) -> bool:
         return self._is_active
     
-    def deposit(self, amount: float, description: str = "Deposit") -> bool:
+    def deposit(self, amount: Amount, description: str = "Deposit") -> bool:
         """Deposit money into account"""
-        if not self._is_active:
-            print("Account is inactive. Cannot deposit.")
-            return False
+        start = self._metrics.start("deposit") if self._metrics.enabled else 0
+        amount = to_cents(amount)
+        with self._lock:
+            error = self._check_deposit(amount)
+            if not error:
+                seq = self._journal(self._post("deposit", amount, description))
+                balance = self._balance
         
-        if amount <= 0:
-            print("Deposit amount must be positive.")
+        if error:
+            self._reject("deposit", error)
             return False
         
-        self._balance += amount
+        self._commit(seq)
+        if self._events.enabled:
+            self._events.publish(Deposited(self._account_number, amount, balance, description))
+        if start:
+            self._metrics.observe("deposit", start)
+        return True
+    
+    def withdraw(self, amount: Amount, description: str = "Withdrawal") -> bool:
+        """Withdraw money from account"""
+        start = self._metrics.start("withdrawal") if self._metrics.enabled else 0
+        amount = to_cents(amount)
+        with self._lock:
+            error = self._check_debit(amount)
+            if not error:
+                seq = self._journal(self._post("withdrawal", amount, description))
+                balance = self._balance
         
-        transaction = Transaction(
-            transaction_id=str(uuid.uuid4())[:6].upper(),
-            transaction_type="deposit",
-            amount=amount,
-            description=description
-        )
-        self._transaction_history.append(transaction)
+        if error:
+            self._reject("withdrawal", error)
+            return False
         
-        print(f"Successfully deposited R{amount:.2f}. New balance: R{self._balance:.2f}")
+        self._commit(seq)
+        if self._events.enabled:
+            self._events.publish(Withdrawn(self._account_number, amount, balance, description))
+        if start:
+            self._metrics.observe("withdrawal", start)
         return True
     
-    def withdraw(self, amount: float, description: str = "Withdrawal") -> bool:
-        """Withdraw money from account"""
+    def _reject(self, operation: str, reason: str) -> None:
+        """Publish and count why an operation on this account was refused"""
+        if self._metrics.enabled:
+            self._metrics.rejected(operation, reason)
+        if self._events.enabled:
+            self._events.publish(OperationRejected(operation, self._account_number, reason))
+    
+    def _journal(self, row: int) -> Optional[int]:
+        """Queue a posting in the ledger (caller holds the account lock)"""
+        if self._ledger is None:
+            return None
+        return self._ledger.log_posting(self, row)
+    
+    def _commit(self, seq: Optional[int]) -> None:
+        """Wait for a journaled record to become durable, after locks are released"""
+        if seq is not None:
+            self._ledger.commit(seq)
+    
+    def _check_deposit(self, amount: int) -> Optional[str]:
+        """Return the reason a deposit would be rejected, or None if it is allowed"""
         if not self._is_active:
-            print("Account is inactive. Cannot withdraw.")
-            return False
+            return "Account is inactive. Cannot deposit."
         
         if amount <= 0:
-            print("Withdrawal amount must be positive.")
-            return False
+            return "Deposit amount must be positive."
+        
+        return None
+    
+    def _check_withdrawal(self, amount: int) -> Optional[str]:
+        """Return the reason a withdrawal would be rejected, or None if it is allowed"""
+        if not self._is_active:
+            return "Account is inactive. Cannot withdraw."
+        
+        if amount <= 0:
+            return "Withdrawal amount must be positive."
         
         if amount > self._balance:
-            print("Insufficient funds.")
-            return False
+            return INSUFFICIENT_FUNDS
         
-        self._balance -= amount
+        return None
+    
+    def _check_debit(self, amount: int) -> Optional[str]:
+        """_check_withdrawal, then the velocity limits, which count the debit if it is allowed
         
-        transaction = Transaction(
-            transaction_id=str(uuid.uuid4())[:6].upper(),
-            transaction_type="withdrawal",
-            amount=amount,
-            description=description
-        )
-        self._transaction_history.append(transaction)
+        Only call this right before posting the debit, with the account lock held.
+        """
+        error = self._check_withdrawal(amount)
+        if error is None and self._limits is not None:
+            error = self._limits.admit(self, amount)
+        return error
+    
+    def _post(self, transaction_type: str, amount: int, description: str,
+              transaction_id: Optional[str] = None, timestamp: Optional[int] = None) -> int:
+        """Apply an already validated posting (in cents) to the balance and history, returning its row"""
+        delta = amount if transaction_type == "deposit" else -amount
+        row = self._store.append(transaction_type, amount, description, timestamp, transaction_id,
+                                 self._balance + delta)
+        self._rows.append(row)
+        self._adjust_balance(delta)
+        return row
+    
+    def _adjust_balance(self, delta: int) -> None:
+        """Change the balance and report it to the bank-wide aggregates and indexes
         
-        print(f"Successfully withdrew R{amount:.2f}. New balance: R{self._balance:.2f}")
-        return True
+        Called once the history row is in place, so the version bump comes
+        last and a reader that sees a version also sees all of its changes.
+        """
+        old_balance = self._balance
+        self._balance = old_balance + delta
+        if self._aggregates is not None:
+            self._aggregates.balance_changed(self, old_balance, self._balance)
+        if self._indexes is not None:
+            self._indexes.balance_changed(self)
+        self._version += 1
+    
+    def _change_status(self, is_active: bool) -> None:
+        """Change the active flag and report it to the bank-wide aggregates and indexes"""
+        if is_active != self._is_active:
+            self._is_active = is_active
+            if self._aggregates is not None:
+                self._aggregates.status_changed(is_active)
+            if self._indexes is not None:
+                self._indexes.status_changed(self, is_active)
+            self._version += 1
     
     def get_balance(self) -> float:
         """Check current balance"""
-        return self._balance
+        return from_cents(self._balance)
     
     def get_transaction_history(self) -> List[Transaction]:
         """Get transaction history (encapsulated)"""
-        return self._transaction_history.copy()  # Return copy to maintain encapsulation
+        # Transactions are materialized from the store, so callers never share state
+        transaction = self._store.transaction
+        return [transaction(row) for row in self._rows]
+    
+    def get_recent_transactions(self, count: int = 5) -> List[Transaction]:
+        """Get the last count transactions, oldest first, without copying the history"""
+        transaction = self._store.transaction
+        return [transaction(row) for row in self._rows[-count:]] if count > 0 else []
+    
+    def get_transaction_page(self, limit: int = 50, cursor: Optional[str] = None,
+                             since: Optional[datetime] = None,
+                             until: Optional[datetime] = None) -> Tuple[List[Transaction], Optional[str]]:
+        """Get one page of history, newest first, plus the cursor for the next (older) page"""
+        if limit <= 0:
+            raise ValueError("Page limit must be positive.")
+        
+        # History is ordered by timestamp, so the inclusive since/until bounds are
+        # found by binary search and a page costs O(log n + limit)
+        rows = self._rows
+        timestamp = self._store.timestamp
+        start = bisect_left(rows, to_micros(since), key=timestamp) if since else 0
+        end = bisect_right(rows, to_micros(until), key=timestamp) if until else len(rows)
+        if cursor is not None:
+            end = min(end, _decode_cursor(cursor))
+        
+        begin = max(start, end - limit)
+        transaction = self._store.transaction
+        page = [transaction(rows[position]) for position in range(end - 1, begin - 1, -1)]
+        next_cursor = _encode_cursor(begin) if begin > start else None
+        return page, next_cursor
+    
+    def balance_cents_at(self, timestamp: datetime) -> int:
+        """Balance in cents once every transaction at or before timestamp was applied"""
+        # Each row keeps the running balance after it, so this is one binary search
+        # over the time-ordered history rather than a replay: O(log n)
+        rows = self._rows
+        position = bisect_right(rows, to_micros(timestamp), key=self._store.timestamp)
+        return self._store.balance(rows[position - 1]) if position else 0
+    
+    def balance_at(self, timestamp: datetime) -> float:
+        """Balance as it stood at a past moment (0 before the first transaction)"""
+        return from_cents(self.balance_cents_at(timestamp))
+    
+    @property
+    def version(self) -> int:
+        """Increases with every change to the account, for caching and ETags"""
+        return self._version
+    
+    @property
+    def transaction_count(self) -> int:
+        return len(self._rows)
     
     def get_account_info(self) -> Dict[str, Any]:
         """Get account information as dictionary"""
         return {
             'account_number': self._account_number,
             'account_holder': self._account_holder,
-            'balance': self._balance,
+            'balance': from_cents(self._balance),
             'is_active': self._is_active,
             'account_type': self.__class__.__name__
         }
     
+    def _set_active(self, is_active: bool) -> Optional[int]:
+        """Change the account status and journal it (caller holds the account lock)"""
+        self._change_status(is_active)
+        if self._ledger is None:
+            return None
+        return self._ledger.log_status(self._account_number, is_active)
+    
     def deactivate(self) -> None:
         """Deactivate account"""
-        self._is_active = False
-        print("Account has been deactivated.")
+        with self._lock:
+            seq = self._set_active(False)
+        self._commit(seq)
+        if self._events.enabled:
+            self._events.publish(AccountStatusChanged(self._account_number, False))
     
     def activate(self) -> None:
         """Activate account"""
-        self._is_active = True
-        print("Account has been activated.")
+        with self._lock:
+            seq = self._set_active(True)
+        self._commit(seq)
+        if self._events.enabled:
+            self._events.publish(AccountStatusChanged(self._account_number, True))
 
 
 class SavingsAccount(Account):
     """Savings account with interest functionality"""
     
-    def __init__(self, account_holder: str, initial_deposit: float = 0.0, interest_rate: float = 2.5):
-        super().__init__(account_holder, initial_deposit)
-        self._interest_rate = interest_rate
+    def __init__(self, account_holder: str, initial_deposit: Amount = 0.0, interest_rate: float = 2.5,
+                 store: Optional[TransactionStore] = None, account_number: Optional[str] = None):
+        super().__init__(account_holder, initial_deposit, store, account_number)
+        self._interest_rate = to_rate_units(interest_rate)
     
     @property
     def interest_rate(self) -> float:
-        return self._interest_rate
+        return self._interest_rate / RATE_SCALE
     
     def calculate_interest(self) -> float:
         """Calculate monthly interest"""
-        return (self._balance * self._interest_rate) / 100 / 12
+        return from_cents(monthly_interest_cents(self._balance, self._interest_rate))
     
     def apply_interest(self) -> bool:
         """Apply monthly interest to account"""
-        interest = self.calculate_interest()
+        interest = monthly_interest_cents(self._balance, self._interest_rate)
         if interest > 0:
-            return self.deposit(interest, "Monthly interest")
+            return self.deposit(Money(interest), "Monthly interest")
         return True
 
 
 class CurrentAccount(Account):
     """Current account with overdraft facility"""
     
-    def __init__(self, account_holder: str, initial_deposit: float = 0.0, overdraft_limit: float = 1000.0):
-        super().__init__(account_holder, initial_deposit)
-        self._overdraft_limit = overdraft_limit
+    def __init__(self, account_holder: str, initial_deposit: Amount = 0.0, overdraft_limit: Amount = 1000.0,
+                 store: Optional[TransactionStore] = None, account_number: Optional[str] = None):
+        super().__init__(account_holder, initial_deposit, store, account_number)
+        self._overdraft_limit = to_cents(overdraft_limit)
     
     @property
     def overdraft_limit(self) -> float:
-        return self._overdraft_limit
+        return from_cents(self._overdraft_limit)
     
-    def withdraw(self, amount: float, description: str = "Withdrawal") -> bool:
-        """Override withdraw to allow overdraft within limit"""
+    def _check_withdrawal(self, amount: int) -> Optional[str]:
+        """Override withdrawal check to allow overdraft within limit"""
         if not self._is_active:
-            print("Account is inactive. Cannot withdraw.")
-            return False
+            return "Account is inactive. Cannot withdraw."
         
         if amount <= 0:
-            print("Withdrawal amount must be positive.")
-            return False
+            return "Withdrawal amount must be positive."
         
         available_balance = self._balance + self._overdraft_limit
         
         if amount > available_balance:
-            print(f"Insufficient funds. Available: R{available_balance:.2f}")
-            return False
+            return f"{INSUFFICIENT_FUNDS} Available: R{format_cents(available_balance)}"
         
-        self._balance -= amount
-        
-        transaction = Transaction(
-            transaction_id=str(uuid.uuid4())[:6].upper(),
-            transaction_type="withdrawal",
-            amount=amount,
-            description=description
-        )
-        self._transaction_history.append(transaction)
-        
-        print(f"Successfully withdrew R{amount:.2f}. New balance: R{self._balance:.2f}")
-        return True
+        return None
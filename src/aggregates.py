@@ -0,0 +1,110 @@
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .account import Account
+
+
+class BankAggregates:
+    """Bank-wide totals kept up to date on every balance or status change
+    
+    Accounts report each change as it happens, so every total is an O(1) read
+    instead of a scan over all accounts. ``compute()`` rebuilds the same totals
+    from scratch for consistency checks. All money totals are integer cents,
+    so maintained and recomputed totals match exactly.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._total_balance = 0
+        self._total_deposits = 0  # Sum of positive balances held for customers
+        self._overdraft_exposure = 0  # Sum of overdrawn amounts on current accounts
+        self._balance_by_type: Dict[str, int] = defaultdict(int)
+        self._active_accounts = 0
+        self._inactive_accounts = 0
+    
+    @classmethod
+    def compute(cls, accounts: Iterable['Account']) -> 'BankAggregates':
+        """Recompute every total with a full scan"""
+        aggregates = cls()
+        for account in accounts:
+            aggregates.add_account(account)
+        return aggregates
+    
+    @property
+    def total_balance(self) -> int:
+        return self._total_balance
+    
+    @property
+    def total_deposits(self) -> int:
+        return self._total_deposits
+    
+    @property
+    def overdraft_exposure(self) -> int:
+        return self._overdraft_exposure
+    
+    @property
+    def active_accounts(self) -> int:
+        return self._active_accounts
+    
+    @property
+    def inactive_accounts(self) -> int:
+        return self._inactive_accounts
+    
+    def balance_for_type(self, account_type: str) -> int:
+        return self._balance_by_type.get(account_type, 0)
+    
+    def add_account(self, account: 'Account') -> None:
+        """Start tracking an account with its current balance and status"""
+        self.add(account.__class__.__name__, account.is_active, account.balance_cents)
+    
+    def add(self, kind: str, is_active: bool, balance: int) -> None:
+        """Start tracking an account given by its class name, status and balance in cents"""
+        with self._lock:
+            if is_active:
+                self._active_accounts += 1
+            else:
+                self._inactive_accounts += 1
+            self._total_balance += balance
+            self._balance_by_type[kind] += balance
+            self._total_deposits += max(balance, 0)
+            self._overdraft_exposure += max(-balance, 0)
+    
+    def balance_changed(self, account: 'Account', old_balance: int, new_balance: int) -> None:
+        """Fold one balance change (in cents) into the totals"""
+        delta = new_balance - old_balance
+        with self._lock:
+            self._total_balance += delta
+            self._balance_by_type[account.__class__.__name__] += delta
+            self._total_deposits += max(new_balance, 0) - max(old_balance, 0)
+            self._overdraft_exposure += max(-new_balance, 0) - max(-old_balance, 0)
+    
+    def status_changed(self, is_active: bool) -> None:
+        """Move one account between the active and inactive counts"""
+        with self._lock:
+            step = 1 if is_active else -1
+            self._active_accounts += step
+            self._inactive_accounts -= step
+    
+    def restore(self, totals: Dict[str, Any]) -> None:
+        """Set every total from a saved to_dict(), for accounts that are not added one by one"""
+        with self._lock:
+            self._total_balance = totals['total_balance']
+            self._total_deposits = totals['total_deposits']
+            self._overdraft_exposure = totals['overdraft_exposure']
+            self._balance_by_type = defaultdict(int, totals['balance_by_type'])
+            self._active_accounts = totals['active_accounts']
+            self._inactive_accounts = totals['inactive_accounts']
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Get all totals as a dictionary (money in cents)"""
+        with self._lock:
+            return {
+                'total_balance': self._total_balance,
+                'total_deposits': self._total_deposits,
+                'overdraft_exposure': self._overdraft_exposure,
+                'balance_by_type': dict(self._balance_by_type),
+                'active_accounts': self._active_accounts,
+                'inactive_accounts': self._inactive_accounts
+            }
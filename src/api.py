@@ -0,0 +1,159 @@
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Optional, Tuple
+from .cache import ResponseCache, etag_matches
+from .money import Amount, Money
+from .push import Deliver, PushHub, Subscription
+from .storage import Storage
+
+# Request handlers shared by the Flask app and the asyncio server. Each takes
+# the storage backend and already-parsed arguments (amounts as Money) and
+# returns the JSON response body as a dict; the cached_* variants return a
+# CachedResponse instead.
+
+MAX_PAGE_SIZE = 500
+HISTORY_ARGS = ('limit', 'cursor', 'since', 'until')
+
+# Sent with every versioned response: it depends on the session cookie, and
+# browsers must revalidate (If-None-Match) rather than reuse it unasked
+CACHE_HEADERS = {'Cache-Control': 'private, no-cache', 'Vary': 'Cookie'}
+
+
+class CachedResponse(NamedTuple):
+    """A serialized response: 200 with a JSON body, or 304 with none"""
+    status: int
+    body: bytes
+    etag: Optional[str] = None
+
+
+def _lookup(storage: Storage, account_number: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Return the error response to send if the session has no existing account, else None"""
+    if not account_number:
+        return {'success': False, 'message': 'No account selected'}
+    
+    if storage.version(account_number) is None:
+        return {'success': False, 'message': 'Account not found'}
+    return None
+
+
+def deposit(storage: Storage, account_number: Optional[str], amount: Amount,
+            description: str = 'Deposit') -> Dict[str, Any]:
+    error = _lookup(storage, account_number)
+    if error:
+        return error
+    
+    amount = Money.of(amount)
+    new_balance = storage.deposit(account_number, amount, description)
+    if new_balance is not None:
+        return {'success': True, 'message': f'Successfully deposited R{amount}', 'balance': new_balance}
+    return {'success': False, 'message': 'Deposit failed'}
+
+
+def withdraw(storage: Storage, account_number: Optional[str], amount: Amount,
+             description: str = 'Withdrawal') -> Dict[str, Any]:
+    error = _lookup(storage, account_number)
+    if error:
+        return error
+    
+    amount = Money.of(amount)
+    new_balance = storage.withdraw(account_number, amount, description)
+    if new_balance is not None:
+        return {'success': True, 'message': f'Successfully withdrew R{amount}', 'balance': new_balance}
+    return {'success': False, 'message': 'Withdrawal failed'}
+
+
+def balance(storage: Storage, account_number: Optional[str]) -> Dict[str, Any]:
+    info = storage.account_info(account_number) if account_number else None
+    if info is None:
+        return _lookup(storage, account_number)
+    return {'success': True, 'balance': info['balance']}
+
+
+def transaction_history(storage: Storage, account_number: Optional[str],
+                        args: Mapping[str, str]) -> Dict[str, Any]:
+    error = _lookup(storage, account_number)
+    if error:
+        return error
+    
+    # Without paging parameters the full history is returned, oldest first
+    if not any(key in args for key in HISTORY_ARGS):
+        transactions = [t.to_dict() for t in storage.transactions(account_number)]
+        return {'success': True, 'transactions': transactions}
+    
+    # Paged history is returned newest first; pass next_cursor back to get older entries
+    try:
+        limit = min(int(args.get('limit', 50)), MAX_PAGE_SIZE)
+        since = args.get('since')
+        until = args.get('until')
+        page, next_cursor = storage.transaction_page(
+            account_number,
+            limit=limit,
+            cursor=args.get('cursor'),
+            since=datetime.fromisoformat(since) if since else None,
+            until=datetime.fromisoformat(until) if until else None
+        )
+    except ValueError as error:
+        return {'success': False, 'message': str(error)}
+    
+    transactions = [t.to_dict() for t in page]
+    return {'success': True, 'transactions': transactions, 'next_cursor': next_cursor}
+
+
+def cached_balance(cache: ResponseCache, storage: Storage, account_number: Optional[str],
+                   if_none_match: Optional[str] = None) -> CachedResponse:
+    return _cached(cache, storage, account_number, ('balance',), if_none_match,
+                   lambda: balance(storage, account_number))
+
+
+def cached_transaction_history(cache: ResponseCache, storage: Storage, account_number: Optional[str],
+                               args: Mapping[str, str], if_none_match: Optional[str] = None) -> CachedResponse:
+    page = ('history',) + tuple((key, args[key]) for key in HISTORY_ARGS if key in args)
+    return _cached(cache, storage, account_number, page, if_none_match,
+                   lambda: transaction_history(storage, account_number, args))
+
+
+def _cached(cache: ResponseCache, storage: Storage, account_number: Optional[str], page: Tuple,
+            if_none_match: Optional[str], build: Callable[[], Dict[str, Any]]) -> CachedResponse:
+    """Answer from the account's version: 304 if the client has it, else the cached or freshly built body
+    
+    The version is read before the body is built, and accounts bump it only
+    after a change is complete, so a body is never older than its version.
+    """
+    version = storage.version(account_number) if account_number else None
+    if version is None:
+        return CachedResponse(200, _serialize(build()))
+    
+    etag = cache.etag(account_number, version)
+    if etag_matches(if_none_match, etag):
+        return CachedResponse(304, b'', etag)
+    
+    key = (account_number, version) + page
+    body = cache.get(key)
+    if body is None:
+        body = _serialize(build())
+        cache.put(key, body)
+    return CachedResponse(200, body, etag)
+
+
+def _serialize(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
+
+def subscribe_events(push: PushHub, storage: Storage, account_number: Optional[str],
+                     deliver: Deliver) -> Tuple[Optional[Subscription], Optional[Dict[str, Any]]]:
+    """Start an /events stream for the session's account, or return the error response to send instead"""
+    error = _lookup(storage, account_number)
+    if error:
+        return None, error
+    return push.subscribe(account_number, deliver), None
+
+
+def transfer(storage: Storage, from_account_num: Optional[str], to_account_num: str,
+             amount: Amount) -> Dict[str, Any]:
+    if not from_account_num:
+        return {'success': False, 'message': 'No account selected'}
+    
+    amount = Money.of(amount)
+    if storage.transfer(from_account_num, to_account_num, amount):
+        return {'success': True, 'message': f'Successfully transferred R{amount}'}
+    return {'success': False, 'message': 'Transfer failed'}
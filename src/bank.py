@@ -1,13 +1,95 @@
-from typing import Dict, List, Optional
-from .account import Account, SavingsAccount, CurrentAccount
+import threading
+import weakref
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from .account import ACCOUNT_NUMBER_WIDTH, Account, SavingsAccount, CurrentAccount
+from .aggregates import BankAggregates
+from .ids import IdAllocator
+from .indexes import AccountIndexes
+from .events import (AccountClosed, AccountCreated, AccountStatusChanged, BatchTransferCompleted, Deposited,
+                     EventBus, InterestApplied, OperationRejected, TransferCompleted, Withdrawn, console_bus)
+from .ledger import Ledger
+from .limits import VelocityLimits
+from .locks import LockManager
+from .metrics import Metrics
+from .money import Amount, Money, RATE_SCALE, format_cents, from_cents, monthly_interest_cents, to_cents
+from .snapshot import SnapshotImage
+from .store import TransactionStore, to_micros
+from .tiering import ROW, Segments, TieredRows
+from .transaction import Transaction
 
 class AxizuloAfricanBank:
-    """Main banking system class"""
+    """Main banking system class
     
-    def __init__(self):
+    With a ``cold_storage`` directory, transaction history is tiered so memory
+    stops growing with it: each account keeps its ``hot_transactions`` most
+    recent row references in memory, the shared store keeps its newest
+    ``hot_rows`` rows, and everything older moves to memory-mapped segment
+    files there. The ledger remains the durable record.
+    
+    Operation latencies, rejection reasons and account and transaction
+    counts are recorded in ``metrics``, which is disabled unless one is given.
+    
+    With ``limits``, every withdrawal and transfer debit must also fit the
+    accounts' sliding-window count and value limits.
+    
+    As one ``shard=(index, count)`` of a ``sharding.ShardedBank``, the bank
+    only issues account numbers whose sequence is ``index`` modulo ``count``,
+    and takes part in cross-shard transfers through ``prepare_credit``,
+    ``debit_transfer``, ``credit_transfer``, ``abort_credit`` and
+    ``settle_transfer``.
+    
+    Recovering from a snapshot image does not rebuild its accounts: each is
+    hydrated from the memory-mapped image the first time it is looked up, so
+    startup costs the same however many accounts there are. With
+    ``resident_limit``, once more accounts than that are resident, a sweep
+    evicts those unused since the previous sweep and unchanged since the
+    image was written; a checkpoint writes a new image, after which every
+    account qualifies.
+    """
+    
+    def __init__(self, ledger: Optional[Ledger] = None, lock_stripes: int = 256,
+                 events: Optional[EventBus] = None, cold_storage: Optional[str] = None,
+                 hot_transactions: int = 100, hot_rows: Optional[int] = None,
+                 metrics: Optional[Metrics] = None, shard: Optional[Tuple[int, int]] = None,
+                 limits: Optional[VelocityLimits] = None, resident_limit: Optional[int] = None):
         self._name = "Axizulo African Bank"
-        self._accounts: Dict[str, Account] = {}
+        self._accounts: Dict[str, Account] = {}  # Resident accounts
+        self._image: Optional[SnapshotImage] = None  # Holds the dormant accounts
+        self._dormant = 0  # Accounts only in the image
+        self._hydrate_lock = threading.Lock()  # Serializes hydration, eviction and image changes
+        self._resident_limit = resident_limit
+        self._next_sweep = resident_limit or 0
         self._currency = "ZAR"  # South African Rand
+        # Shared columnar history for every account
+        self._transactions = TransactionStore(cold_storage, hot_rows)
+        self._history_rows = Segments(cold_storage, "rows", ROW.size) if cold_storage is not None else None
+        self._hot_transactions = hot_transactions
+        index, count = shard if shard is not None else (0, 1)
+        self._account_numbers = IdAllocator(ACCOUNT_NUMBER_WIDTH, start=index or count, step=count)
+        # Cross-shard transfers in flight, by transfer ID: (from, to, cents)
+        self._pending_credits: Dict[str, Tuple[str, str, int]] = {}  # Accepted here, not yet credited
+        self._owed_credits: Dict[str, Tuple[str, str, int]] = {}  # Debited here, credit not yet confirmed
+        self._locks = LockManager(lock_stripes)
+        self._aggregates = BankAggregates()
+        self._indexes = AccountIndexes()
+        self._events = events if events is not None else console_bus()
+        self._metrics = metrics if metrics is not None else Metrics(enabled=False)
+        self._metrics.add_gauge("axizulo_accounts", "Accounts, open or closed", self.get_account_count)
+        self._metrics.add_gauge("axizulo_active_accounts", "Active accounts",
+                                lambda: self._aggregates.to_dict()['active_accounts'])
+        self._metrics.add_gauge("axizulo_transactions", "Transactions recorded", lambda: len(self._transactions))
+        self._limits = limits
+        self._ledger = ledger
+        
+        # Rebuild state from the durable ledger before serving any request
+        if self._ledger is not None:
+            self._ledger.recover(self)
+            if self._limits is not None:
+                for account in self._accounts.values():
+                    self._limits.restore(account)
     
     @property
     def name(self) -> str:
@@ -17,99 +99,739 @@ class AxizuloAfricanBank:
     def currency(self) -> str:
         return self._currency
     
+    @property
+    def ledger(self) -> Optional[Ledger]:
+        return self._ledger
+    
+    @property
+    def locks(self) -> LockManager:
+        return self._locks
+    
+    @property
+    def aggregates(self) -> BankAggregates:
+        return self._aggregates
+    
+    @property
+    def indexes(self) -> AccountIndexes:
+        return self._indexes
+    
+    @property
+    def events(self) -> EventBus:
+        return self._events
+    
+    @property
+    def metrics(self) -> Metrics:
+        return self._metrics
+    
+    @property
+    def limits(self) -> Optional[VelocityLimits]:
+        return self._limits
+    
+    @property
+    def resident_count(self) -> int:
+        """Accounts held as objects; the rest are only in the snapshot image"""
+        return len(self._accounts)
+    
+    def _reject(self, operation: str, reason: str, account_number: Optional[str] = None) -> None:
+        """Publish and count why a bank operation was refused"""
+        if self._metrics.enabled:
+            self._metrics.rejected(operation, reason)
+        if self._events.enabled:
+            self._events.publish(OperationRejected(operation, account_number, reason))
+    
     def create_account(self, account_holder: str, account_type: str = "savings", 
-                      initial_deposit: float = 0.0, **kwargs) -> Optional[Account]:
+                      initial_deposit: Amount = 0.0, **kwargs) -> Optional[Account]:
         """Create a new bank account"""
+        start = self._metrics.start("create_account") if self._metrics.enabled else 0
         account_holder = account_holder.strip()
         
         if not account_holder:
-            print("Account holder name cannot be empty.")
+            self._reject("create_account", "Account holder name cannot be empty.")
             return None
         
+        initial_deposit = Money.of(initial_deposit)
         if initial_deposit < 0:
-            print("Initial deposit cannot be negative.")
+            self._reject("create_account", "Initial deposit cannot be negative.")
             return None
         
         account = None
         
         if account_type.lower() == "savings":
             interest_rate = kwargs.get('interest_rate', 2.5)
-            account = SavingsAccount(account_holder, initial_deposit, interest_rate)
+            account = SavingsAccount(account_holder, initial_deposit, interest_rate, self._transactions,
+                                     self._new_account_number())
         elif account_type.lower() == "current":
             overdraft_limit = kwargs.get('overdraft_limit', 1000.0)
-            account = CurrentAccount(account_holder, initial_deposit, overdraft_limit)
+            account = CurrentAccount(account_holder, initial_deposit, overdraft_limit, self._transactions,
+                                     self._new_account_number())
         else:
-            print(f"Unknown account type: {account_type}")
+            self._reject("create_account", f"Unknown account type: {account_type}")
             return None
         
-        self._accounts[account.account_number] = account
-        
-        print(f"\n=== Account Created Successfully ===")
-        print(f"Bank: {self._name}")
-        print(f"Account Holder: {account_holder}")
-        print(f"Account Number: {account.account_number}")
-        print(f"Account Type: {account_type.title()}")
-        print(f"Initial Balance: R{initial_deposit:.2f}")
-        print("====================================\n")
+        # Log the account before it becomes visible so no posting can precede it
+        self._tier_history(account)
+        account._lock = self._locks.lock_for(account.account_number)
+        seq = None
+        account._events = self._events
+        account._metrics = self._metrics
+        account._limits = self._limits
+        with account._lock:
+            account._aggregates = self._aggregates
+            self._aggregates.add_account(account)
+            if self._ledger is not None:
+                account._ledger = self._ledger
+                seq = self._ledger.log_open(account)
+            self._accounts[account.account_number] = account
+            account._indexes = self._indexes
+            self._indexes.add_account(account)
+        account._commit(seq)
         
+        if self._events.enabled:
+            self._events.publish(AccountCreated(self._name, account_holder, account.account_number,
+                                                account_type, initial_deposit))
+        if start:
+            self._metrics.observe("create_account", start)
         return account
     
+    def _new_account_number(self) -> str:
+        """Allocate the next account number, skipping any already in use"""
+        while True:
+            account_number = self._account_numbers.next_id()
+            if account_number not in self._accounts and (self._image is None
+                                                         or self._image.find(account_number) is None):
+                return account_number
+    
+    def _restore_account(self, account_type: str, account_number: str, account_holder: str,
+                         is_active: bool = True, **kwargs) -> Account:
+        """Register a recovered account without logging or publishing events"""
+        account_class = SavingsAccount if account_type == "savings" else CurrentAccount
+        account = account_class._restore(account_number, account_holder, is_active,
+                                         store=self._transactions, **kwargs)
+        self._register_restored(account)
+        return account
+    
+    def _register_restored(self, account: Account) -> None:
+        """Wire an account rebuilt outside the bank (recovery, bulk import) into it"""
+        account_number = account.account_number
+        seq = self._account_numbers.parse(account_number)
+        if seq is not None:
+            self._account_numbers.observe(seq)
+        self._tier_history(account)
+        self._wire(account)
+        self._aggregates.add_account(account)
+        self._accounts[account_number] = account
+        self._indexes.add_account(account)
+    
+    def _wire(self, account: Account) -> None:
+        """Connect an account to the bank's shared lock stripes, ledger, totals, indexes and feeds"""
+        account._ledger = self._ledger
+        account._lock = self._locks.lock_for(account.account_number)
+        account._aggregates = self._aggregates
+        account._indexes = self._indexes
+        account._events = self._events
+        account._metrics = self._metrics
+        account._limits = self._limits
+    
+    def _tier_history(self, account: Account) -> None:
+        """Give a new account tiered history rows when cold storage is configured"""
+        if self._history_rows is not None:
+            account._rows = TieredRows(self._history_rows, self._hot_transactions, account._rows)
+    
     def get_account(self, account_number: str) -> Optional[Account]:
         """Retrieve account by account number"""
-        return self._accounts.get(account_number)
+        account = self._accounts.get(account_number)
+        if account is not None:
+            account._recently_used = True
+            return account
+        return self._hydrate(account_number) if self._image is not None else None
+    
+    def _hydrate(self, account_number: str) -> Optional[Account]:
+        """Build a dormant account from the snapshot image and make it resident"""
+        with self._hydrate_lock:
+            account = self._accounts.get(account_number)
+            if account is not None:
+                return account
+            image = self._image
+            position = image.find(account_number)
+            if position is None:
+                return None
+            record = image.record(position)
+            if record.account_type == "savings":
+                account = SavingsAccount._restore(account_number, record.account_holder, record.is_active,
+                                                  store=self._transactions,
+                                                  interest_rate=record.option / RATE_SCALE)
+            else:
+                account = CurrentAccount._restore(account_number, record.account_holder, record.is_active,
+                                                  store=self._transactions, overdraft_limit=Money(record.option))
+            account._balance = record.balance_cents
+            if self._history_rows is not None:
+                account._rows = TieredRows(self._history_rows, self._hot_transactions, image.history(record))
+            else:
+                account._rows = image.rows(record)
+            account._version = record.version
+            account._recently_used = True
+            # Totals and indexes already count it from the image
+            self._wire(account)
+            if self._limits is not None:
+                self._limits.restore(account)
+            self._accounts[account_number] = account
+            self._dormant -= 1
+            if self._resident_limit is not None and len(self._accounts) > self._next_sweep:
+                self._sweep()
+        return account
+    
+    def evict_idle(self) -> int:
+        """Return resident accounts unused since the last sweep to the snapshot image; returns how many
+        
+        As in CLOCK page replacement, a sweep evicts an account only if no
+        lookup has used it since the previous sweep, and otherwise clears its
+        mark. Only accounts the image holds exactly as they are, with no
+        reference held outside the bank, are evicted, so the next lookup
+        rebuilds the same account and no caller keeps a stale copy.
+        """
+        with self._hydrate_lock:
+            return self._sweep()
+    
+    def _sweep(self) -> int:
+        """evict_idle() with the hydrate lock held"""
+        image = self._image
+        evicted = 0
+        if image is not None:
+            for account_number in list(self._accounts):
+                account = self._accounts[account_number]
+                if account._recently_used:
+                    account._recently_used = False
+                    continue
+                position = image.find(account_number)
+                if position is None or image.record(position).version != account.version:
+                    continue  # Changed since the image was written
+                del self._accounts[account_number]
+                self._indexes.forget(account)
+                # Drop the bank's last reference: the object only outlives it if
+                # something outside the bank still holds it, and then it stays
+                alive = weakref.ref(account)
+                del account
+                account = alive()
+                if account is not None:
+                    self._accounts[account_number] = account
+                    continue
+                evicted += 1
+            self._dormant += evicted
+        self._next_sweep = max(self._resident_limit or 0, 2 * len(self._accounts))
+        return evicted
+    
+    def _load_image(self, image: SnapshotImage) -> None:
+        """Recover from a snapshot image, leaving every account in it dormant (used by ledger recovery)"""
+        self._transactions.attach_image(image)
+        self._image = image
+        self._dormant = len(image)
+        self._account_numbers.observe(image.last_account)
+        self._aggregates.restore(image.aggregates)
+        self._indexes.defer(self._image_entries)
+    
+    def _adopt_image(self, image: SnapshotImage) -> None:
+        """Switch to an image just checkpointed from this bank; the accounts it holds become evictable
+        
+        An image no newer than the current one is closed and ignored, as
+        going back would drop rows the store only holds in the newer image.
+        """
+        with self._hydrate_lock:
+            if self._image is not None and image.seq <= self._image.seq:
+                image.close()
+                return
+            self._transactions.attach_image(image)
+            self._image = image
+            if self._resident_limit is not None:
+                self._sweep()
+    
+    def _image_entries(self) -> Iterator[Tuple[str, str, str, bool, int]]:
+        """(number, holder, type, active, balance) of every account in the image, as it stands now"""
+        for record in self._image.records():
+            account = self._accounts.get(record.account_number)
+            if account is None:
+                yield (record.account_number, record.account_holder, record.account_type, record.is_active,
+                       record.balance_cents)
+            else:
+                yield (account.account_number, account.account_holder, record.account_type, account.is_active,
+                       account.balance_cents)
+    
+    def get_transaction(self, transaction_id: str) -> Optional[Transaction]:
+        """Look up any transaction in the bank by ID in O(1) (for dispute handling)"""
+        row = self._transactions.find(transaction_id)
+        return self._transactions.transaction(row) if row is not None else None
     
     def close_account(self, account_number: str) -> bool:
         """Close an existing account"""
-        account = self._accounts.get(account_number)
+        account = self.get_account(account_number)
         
         if not account:
-            print("Account not found.")
+            self._reject("close_account", "Account not found.", account_number)
             return False
         
-        if account.balance > 0:
-            print(f"Cannot close account with balance. Please withdraw R{account.balance:.2f} first.")
+        with account._lock:
+            balance = account.balance_cents
+            if balance <= 0:
+                seq = account._set_active(False)
+        
+        if balance > 0:
+            self._reject("close_account",
+                         f"Cannot close account with balance. Please withdraw R{format_cents(balance)} first.",
+                         account_number)
             return False
         
-        account.deactivate()
+        account._commit(seq)
         # In a real system, you might want to remove or archive the account
-        print(f"Account {account_number} has been closed.")
+        if self._events.enabled:
+            self._events.publish(AccountStatusChanged(account_number, False))
+            self._events.publish(AccountClosed(account_number))
         return True
     
     def get_all_accounts(self) -> List[Account]:
-        """Get all accounts (for admin purposes)"""
-        return list(self._accounts.values())
+        """Get all accounts (for admin purposes), hydrating any still dormant"""
+        if self._image is None:
+            return list(self._accounts.values())
+        # Holding every account here keeps sweeps from evicting those hydrated first
+        accounts = {record.account_number: self.get_account(record.account_number)
+                    for record in self._image.records()}
+        for account in list(self._accounts.values()):
+            accounts.setdefault(account.account_number, account)
+        return list(accounts.values())
+    
+    def find_accounts(self, holder: Optional[str] = None, holder_prefix: Optional[str] = None,
+                      account_type: Optional[str] = None, is_active: Optional[bool] = None,
+                      min_balance: Optional[Amount] = None, max_balance: Optional[Amount] = None,
+                      limit: Optional[int] = None) -> List[Account]:
+        """Find accounts through the secondary indexes (for admin purposes)
+        
+        Holder matches are case-insensitive; balance bounds are inclusive, so
+        accounts overdrawn beyond R500 are ``find_accounts(max_balance=-500.01)``.
+        Results are ordered by balance when a balance bound is given,
+        otherwise by account number.
+        """
+        numbers = self._indexes.query(
+            holder, holder_prefix, account_type, is_active,
+            None if min_balance is None else to_cents(min_balance),
+            None if max_balance is None else to_cents(max_balance))
+        if limit is not None:
+            numbers = numbers[:limit]
+        return [self.get_account(number) for number in numbers]
     
     def get_total_bank_balance(self) -> float:
         """Get total balance of all accounts"""
-        return sum(account.balance for account in self._accounts.values())
+        return from_cents(self._aggregates.total_balance)
     
-    def transfer_funds(self, from_account_num: str, to_account_num: str, amount: float) -> bool:
+    def snapshot_balances(self, timestamp: datetime) -> Dict[str, float]:
+        """Every account's balance as it stood at a past moment (for statements and regulatory snapshots)
+        
+        Each account answers from the running balances in its history with one
+        binary search, so the snapshot costs O(log n) per account instead of a
+        replay. Changes made while it runs are all later than any past
+        timestamp, so they never show up in it.
+        """
+        image = self._image
+        if image is None:
+            return {account.account_number: account.balance_at(timestamp) for account in list(self._accounts.values())}
+        
+        # Dormant accounts answer straight from their history in the image
+        micros = to_micros(timestamp)
+        store = self._transactions
+        accounts = dict(self._accounts)
+        balances = {}
+        for record in image.records():
+            account = accounts.pop(record.account_number, None)
+            if account is not None:
+                balances[record.account_number] = account.balance_at(timestamp)
+                continue
+            rows = image.history(record)
+            position = bisect_right(rows, micros, key=store.timestamp)
+            balances[record.account_number] = from_cents(store.balance(rows[position - 1]) if position else 0)
+        for account in accounts.values():
+            balances[account.account_number] = account.balance_at(timestamp)
+        return balances
+    
+    def get_account_count(self) -> int:
+        """Get the number of accounts without building a list"""
+        return len(self._accounts) + self._dormant
+    
+    def get_bank_summary(self) -> Dict[str, Any]:
+        """Get the maintained bank-wide totals in rands (for admin dashboards)"""
+        summary = self._aggregates.to_dict()
+        for key in ('total_balance', 'total_deposits', 'overdraft_exposure'):
+            summary[key] = from_cents(summary[key])
+        summary['balance_by_type'] = {account_type: from_cents(balance)
+                                      for account_type, balance in summary['balance_by_type'].items()}
+        return summary
+    
+    def check_aggregates(self) -> Dict[str, Tuple[Any, Any]]:
+        """Compare maintained totals against a full recompute; returns exact mismatches only (in cents)"""
+        with self._locks.acquire_all():
+            maintained = self._aggregates.to_dict()
+            expected = self._recompute_aggregates().to_dict()
+        
+        mismatches = {}
+        for key, value in expected.items():
+            if key == 'balance_by_type':
+                for account_type in set(value) | set(maintained[key]):
+                    actual = maintained[key].get(account_type, 0)
+                    if actual != value.get(account_type, 0):
+                        mismatches[f"{key}.{account_type}"] = (value.get(account_type, 0), actual)
+            elif maintained[key] != value:
+                mismatches[key] = (value, maintained[key])
+        return mismatches
+    
+    def _recompute_aggregates(self) -> BankAggregates:
+        """Totals from a full scan, reading dormant accounts from the image (caller holds all locks)"""
+        image = self._image
+        accounts = dict(self._accounts)
+        aggregates = BankAggregates.compute(accounts.values())
+        if image is not None:
+            # Only resident accounts change, so a dormant one is exactly as the image holds it
+            for record in image.records():
+                if record.account_number not in accounts:
+                    account_class = SavingsAccount if record.account_type == "savings" else CurrentAccount
+                    aggregates.add(account_class.__name__, record.is_active, record.balance_cents)
+        return aggregates
+    
+    def transfer_funds(self, from_account_num: str, to_account_num: str, amount: Amount) -> bool:
         """Transfer funds between accounts"""
-        from_account = self._accounts.get(from_account_num)
-        to_account = self._accounts.get(to_account_num)
+        start = self._metrics.start("transfer") if self._metrics.enabled else 0
+        amount = to_cents(amount)
+        from_account = self.get_account(from_account_num)
+        to_account = self.get_account(to_account_num)
         
-        if not from_account or not to_account:
-            print("One or both accounts not found.")
+        # Both accounts are locked in stripe order, so opposing transfers cannot deadlock
+        with self._locks.acquire(from_account_num, to_account_num):
+            error = self._check_transfer(from_account, to_account, amount)
+            if error is None:
+                error = from_account._check_debit(amount)
+            if not error:
+                # Both legs are applied together and journaled as a single ledger record
+                debit = from_account._post("withdrawal", amount, f"Transfer to {to_account_num}")
+                from_balance = from_account.balance_cents
+                credit = to_account._post("deposit", amount, f"Transfer from {from_account_num}")
+                to_balance = to_account.balance_cents
+                seq = None
+                if self._ledger is not None:
+                    seq = self._ledger.log_transfer(from_account, debit, to_account, credit)
+        
+        if error:
+            self._reject("transfer", error, from_account_num)
             return False
         
+        if seq is not None:
+            self._ledger.commit(seq)
+        if self._events.enabled:
+            self._events.publish(TransferCompleted(from_account_num, to_account_num, amount,
+                                                   from_balance, to_balance))
+        if start:
+            self._metrics.observe("transfer", start)
+        return True
+    
+    @staticmethod
+    def _check_transfer(from_account: Optional[Account], to_account: Optional[Account],
+                        amount: int) -> Optional[str]:
+        """Return the reason a transfer is invalid regardless of funds, or None"""
+        if not from_account or not to_account:
+            return "One or both accounts not found."
+        
         if not from_account.is_active or not to_account.is_active:
-            print("One or both accounts are inactive.")
-            return False
+            return "One or both accounts are inactive."
         
         if amount <= 0:
-            print("Transfer amount must be positive.")
-            return False
+            return "Transfer amount must be positive."
+        
+        return None
+    
+    def transfer_batch(self, transfers: Iterable[Tuple[str, str, Amount]], atomic: bool = True) -> Dict[str, Any]:
+        """Apply many (from, to, amount) transfers at once and report per-item results"""
+        start = self._metrics.start("transfer_batch") if self._metrics.enabled else 0
+        transfers = [(from_account_num, to_account_num, to_cents(amount))
+                     for from_account_num, to_account_num, amount in transfers]
+        involved = {number for from_account_num, to_account_num, _ in transfers
+                    for number in (from_account_num, to_account_num)}
+        
+        with self._locks.acquire(*involved):
+            results, applied = self._apply_batch(transfers, atomic)
+            seq = None
+            if applied and self._ledger is not None:
+                seq = self._ledger.log_batch(applied)
+        
+        if seq is not None:
+            self._ledger.commit(seq)
+        failed = len(results) - len(applied)
+        if self._events.enabled:
+            self._events.publish(BatchTransferCompleted(len(applied), failed))
+        if failed and self._metrics.enabled:
+            for result in results:
+                if not result['success']:
+                    self._metrics.rejected("transfer_batch", result['message'])
+        if start:
+            self._metrics.observe("transfer_batch", start)
+        return {'success': failed == 0, 'applied': len(applied), 'failed': failed, 'results': results}
+    
+    def _apply_batch(self, transfers: List[Tuple[str, str, int]], atomic: bool) -> Tuple[List[Dict[str, Any]], list]:
+        """Validate and post a batch of cent amounts (caller holds the locks of every involved account)"""
+        results: List[Dict[str, Any]] = []
+        legs: List[Tuple[Account, Account, int]] = []
+        
+        for index, (from_account_num, to_account_num, amount) in enumerate(transfers):
+            from_account = self.get_account(from_account_num)
+            to_account = self.get_account(to_account_num)
+            error = self._check_transfer(from_account, to_account, amount)
+            if error is None and from_account is to_account:
+                error = "Cannot transfer to the same account."
+            results.append({'index': index, 'success': error is None, 'message': error or "Transferred"})
+            legs.append((from_account, to_account, amount))
+        
+        if atomic:
+            # All-or-nothing: net the batch so each account only has to cover its
+            # overall debit, and apply nothing unless every item can be applied
+            net: Dict[str, int] = defaultdict(int)
+            for result, (from_account, to_account, amount) in zip(results, legs):
+                if result['success']:
+                    net[from_account.account_number] -= amount
+                    net[to_account.account_number] += amount
+            
+            shortfalls = {}
+            for account_number, movement in net.items():
+                if movement < 0:
+                    error = self.get_account(account_number)._check_withdrawal(-movement)
+                    if error:
+                        shortfalls[account_number] = error
+            # Velocity limits count every debit, however the batch nets out
+            if self._limits is not None:
+                debits: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+                for result, (from_account, _, amount) in zip(results, legs):
+                    if result['success']:
+                        totals = debits[from_account.account_number]
+                        totals[0] += 1
+                        totals[1] += amount
+                for account_number, (count, amount) in debits.items():
+                    error = self._limits.check(self.get_account(account_number), amount, count)
+                    if error and account_number not in shortfalls:
+                        shortfalls[account_number] = error
+            
+            for result, (from_account, _, _) in zip(results, legs):
+                if result['success'] and from_account.account_number in shortfalls:
+                    result['success'] = False
+                    result['message'] = shortfalls[from_account.account_number]
+            
+            if not all(result['success'] for result in results):
+                for result in results:
+                    if result['success']:
+                        result['success'] = False
+                        result['message'] = "Batch rejected."
+        
+        # Per-item mode checks funds as it goes; valid items apply in order
+        applied = []
+        for result, (from_account, to_account, amount) in zip(results, legs):
+            if not result['success']:
+                continue
+            if not atomic:
+                error = from_account._check_debit(amount)
+                if error:
+                    result['success'] = False
+                    result['message'] = error
+                    continue
+            elif self._limits is not None:
+                self._limits.record(from_account, amount)
+            debit = from_account._post("withdrawal", amount, f"Transfer to {to_account.account_number}")
+            credit = to_account._post("deposit", amount, f"Transfer from {from_account.account_number}")
+            applied.append((from_account, debit, to_account, credit))
         
-        # Withdraw from source account
-        if from_account.withdraw(amount, f"Transfer to {to_account_num}"):
-            # Deposit to target account
-            if to_account.deposit(amount, f"Transfer from {from_account_num}"):
-                print(f"Successfully transferred R{amount:.2f} from {from_account_num} to {to_account_num}")
-                return True
+        return results, applied
+    
+    def run_interest(self, as_of: Optional[datetime] = None, chunk_size: int = 10000) -> Dict[str, Any]:
+        """Apply monthly interest to every active savings account as one batch job
+        
+        as_of backdates the postings; it cannot lie in the future.
+        """
+        if as_of is not None and as_of > datetime.now():
+            raise ValueError("Interest cannot be applied as of a future date.")
+        start = self._metrics.start("interest") if self._metrics.enabled else 0
+        timestamp = to_micros(as_of) if as_of is not None else None
+        numbers = self._interest_candidates()
+        credited = 0
+        total_interest = 0
+        
+        # Work in chunks so live traffic can interleave between them; only the
+        # chunk's dormant accounts are hydrated, just before they are credited
+        for offset in range(0, len(numbers), chunk_size):
+            chunk = [account for account in map(self.get_account, numbers[offset:offset + chunk_size])
+                     if isinstance(account, SavingsAccount)]
+            with self._locks.acquire_all():
+                count, chunk_total, seq = self._post_interest(chunk, timestamp)
+            if seq is not None:
+                self._ledger.commit(seq)
+            credited += count
+            total_interest += chunk_total
+        
+        if self._events.enabled:
+            self._events.publish(InterestApplied(credited, total_interest))
+        if start:
+            self._metrics.observe("interest", start)
+        return {'accounts': credited, 'total_interest': from_cents(total_interest)}
+    
+    def _interest_candidates(self) -> List[str]:
+        """Numbers of the savings accounts that may earn interest, read from the image for dormant ones"""
+        accounts = dict(self._accounts)
+        numbers = [number for number, account in accounts.items() if isinstance(account, SavingsAccount)]
+        image = self._image
+        if image is not None:
+            # A dormant account that would earn nothing is never hydrated
+            numbers.extend(record.account_number for record in image.records()
+                           if record.account_number not in accounts and record.account_type == "savings"
+                           and record.is_active and monthly_interest_cents(record.balance_cents, record.option) > 0)
+        return numbers
+    
+    def _post_interest(self, accounts: List[SavingsAccount],
+                       timestamp: Optional[int]) -> Tuple[int, int, Optional[int]]:
+        """Compute and post interest for a chunk of accounts (caller holds all locks)"""
+        # Same formula as SavingsAccount.calculate_interest, evaluated column-wise
+        interest = [monthly_interest_cents(account._balance, account._interest_rate) for account in accounts]
+        eligible = [(account, amount) for account, amount in zip(accounts, interest)
+                    if amount > 0 and account._is_active]
+        if not eligible:
+            return 0, 0, None
+        
+        amounts = [amount for _, amount in eligible]
+        balances = [account._balance + amount for account, amount in eligible]
+        timestamps = None
+        if timestamp is not None:
+            # A backdated posting still goes after the account's newest row, so
+            # its history stays ordered by time
+            latest = self._transactions.timestamp
+            timestamps = [max(timestamp, latest(account._rows[-1])) if account._rows else timestamp
+                          for account, _ in eligible]
+        first_row = self._transactions.append_many("deposit", amounts, "Monthly interest", timestamps, balances)
+        for row, (account, amount) in enumerate(eligible, first_row):
+            account._rows.append(row)
+            account._adjust_balance(amount)
+        
+        seq = None
+        if self._ledger is not None:
+            seq = self._ledger.log_interest([(account, row) for row, (account, _) in enumerate(eligible, first_row)])
+        return len(eligible), sum(amounts), seq
+    
+    # Cross-shard transfers: the destination accepts, the source debits (the
+    # commit point), the destination credits and the source settles
+    def prepare_credit(self, transfer_id: str, from_account_num: str, to_account_num: str,
+                       amount: int) -> Optional[str]:
+        """Accept an incoming transfer of cents for a later credit; returns the reason to refuse, or None"""
+        to_account = self.get_account(to_account_num)
+        with self._locks.acquire(to_account_num):
+            if to_account is None:
+                error = "One or both accounts not found."
+            elif not to_account.is_active:
+                error = "One or both accounts are inactive."
+            elif amount <= 0:
+                error = "Transfer amount must be positive."
+            else:
+                error = None
+                transfer = self._pending_credits[transfer_id] = (from_account_num, to_account_num, amount)
+                seq = None
+                if self._ledger is not None:
+                    seq = self._ledger.log_transfer_step(transfer_id, "prepare", transfer)
+        
+        if error:
+            self._reject("transfer", error, from_account_num)
+            return error
+        if seq is not None:
+            self._ledger.commit(seq)
+        return None
+    
+    def debit_transfer(self, transfer_id: str, from_account_num: str, to_account_num: str,
+                       amount: int) -> Optional[str]:
+        """Debit the source of an accepted transfer, committing it; returns the reason to refuse, or None
+        
+        Once this succeeds the credit is owed and must be delivered, even
+        after a crash, so it is journaled in the same record as the debit.
+        """
+        from_account = self.get_account(from_account_num)
+        with self._locks.acquire(from_account_num):
+            if from_account is None:
+                error = "One or both accounts not found."
+            elif not from_account.is_active:
+                error = "One or both accounts are inactive."
             else:
-                # Rollback withdrawal if deposit fails
-                from_account.deposit(amount, "Rollback failed transfer")
-                print("Transfer failed. Rolling back transaction.")
+                error = from_account._check_debit(amount)
+            if not error:
+                row = from_account._post("withdrawal", amount, f"Transfer to {to_account_num}")
+                balance = from_account.balance_cents
+                transfer = self._owed_credits[transfer_id] = (from_account_num, to_account_num, amount)
+                seq = None
+                if self._ledger is not None:
+                    seq = self._ledger.log_transfer_step(transfer_id, "debit", transfer, from_account, row)
+        
+        if error:
+            self._reject("transfer", error, from_account_num)
+            return error
+        if seq is not None:
+            self._ledger.commit(seq)
+        if self._events.enabled:
+            self._events.publish(Withdrawn(from_account_num, amount, balance, f"Transfer to {to_account_num}"))
+        return None
+    
+    def credit_transfer(self, transfer_id: str) -> bool:
+        """Credit an accepted transfer whose source was debited; False if it was already credited"""
+        transfer = self._pending_credits.get(transfer_id)
+        if transfer is None:
+            return False
+        from_account_num, to_account_num, amount = transfer
+        to_account = self.get_account(to_account_num)
+        with self._locks.acquire(to_account_num):
+            if self._pending_credits.pop(transfer_id, None) is None:
                 return False
+            # An accepted credit is owed even if the account was closed meanwhile
+            row = to_account._post("deposit", amount, f"Transfer from {from_account_num}")
+            balance = to_account.balance_cents
+            seq = None
+            if self._ledger is not None:
+                seq = self._ledger.log_transfer_step(transfer_id, "credit", account=to_account, row=row)
         
-        return False
+        if seq is not None:
+            self._ledger.commit(seq)
+        if self._events.enabled:
+            self._events.publish(Deposited(to_account_num, amount, balance, f"Transfer from {from_account_num}"))
+        return True
+    
+    def abort_credit(self, transfer_id: str) -> None:
+        """Forget an accepted transfer whose source refused the debit"""
+        self._finish_transfer(self._pending_credits, transfer_id, "abort", 1)
+    
+    def settle_transfer(self, transfer_id: str) -> None:
+        """Forget an owed credit once the destination has confirmed it"""
+        self._finish_transfer(self._owed_credits, transfer_id, "settle", 0)
+    
+    def _finish_transfer(self, table: Dict[str, Tuple[str, str, int]], transfer_id: str, step: str,
+                         leg: int) -> None:
+        """Drop a transfer from an in-flight table under the lock of its account here (leg 0 or 1)"""
+        transfer = table.get(transfer_id)
+        if transfer is None:
+            return
+        with self._locks.acquire(transfer[leg]):
+            if table.pop(transfer_id, None) is None:
+                return
+            seq = self._ledger.log_transfer_step(transfer_id, step) if self._ledger is not None else None
+        if seq is not None:
+            self._ledger.commit(seq)
+    
+    def in_flight_transfers(self) -> Dict[str, Dict[str, Tuple[str, str, int]]]:
+        """Cross-shard transfers this bank has accepted or debited but not finished"""
+        return {'pending': dict(self._pending_credits), 'owed': dict(self._owed_credits)}
+    
+    def checkpoint(self) -> Optional[int]:
+        """Snapshot the bank to the ledger so recovery replays fewer records"""
+        if self._ledger is None:
+            return None
+        return self._ledger.checkpoint()
+    
+    def close(self) -> None:
+        """Flush and close the ledger and release the cold storage and snapshot image, if any"""
+        if self._ledger is not None:
+            self._ledger.close()
+        self._transactions.close()
+        if self._history_rows is not None:
+            self._history_rows.close()
+        if self._image is not None:
+            self._image.close()
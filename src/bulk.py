@@ -0,0 +1,303 @@
+import csv
+import json
+from bisect import bisect_left
+from datetime import datetime
+from itertools import groupby, islice
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, TextIO, Tuple, TYPE_CHECKING
+from .account import CurrentAccount, SavingsAccount
+from .events import BulkImportCompleted
+from .indexes import ACCOUNT_TYPES
+from .money import Money, format_cents
+from .store import TYPE_CODES, from_micros, to_micros
+
+if TYPE_CHECKING:
+    from .account import Account
+    from .bank import AxizuloAfricanBank
+
+# Column order for CSV files; JSON Lines records use the same field names,
+# with each account's history nested under "transactions"
+ACCOUNT_FIELDS = ["account_number", "account_type", "account_holder", "is_active",
+                  "interest_rate", "overdraft_limit", "balance"]
+TRANSACTION_FIELDS = ["account_number", "transaction_id", "transaction_type", "amount",
+                      "description", "timestamp"]
+
+MAX_REPORTED_ERRORS = 100  # Only the count grows past this, so memory stays constant
+POSTING_CHUNK = 10000  # Transactions per ledger record when importing a long history
+
+# (transaction_id or None, type, amount in cents, description, timestamp in microseconds or None)
+Entry = Tuple[Optional[str], str, int, str, Optional[int]]
+
+
+# Import
+def import_accounts(bank: 'AxizuloAfricanBank', records: Iterable[Mapping[str, Any]]) -> Dict[str, Any]:
+    """Bulk-load accounts, each with an optional nested history, into bank
+    
+    Records are applied one at a time as they are read, so any iterable (a
+    file reader, a generator) is loaded in constant memory. Unlike
+    create_account there are no per-account events or checks on the history:
+    each account and its transactions are logged as one ledger record and the
+    ledger is committed once at the end. An ``opening_balance`` field posts a
+    single opening transaction, for books migrated without history. A bad
+    record is counted and reported without stopping the import.
+    """
+    report = _Report()
+    for number, record in enumerate(records, 1):
+        try:
+            _, seq, posted = _import_account(bank, record)
+        except (ValueError, TypeError) as error:
+            report.fail(number, error)
+            continue
+        report.accounts += 1
+        report.transactions += posted
+        report.seq = seq
+    return report.finish(bank)
+
+
+def import_transactions(bank: 'AxizuloAfricanBank', rows: Iterable[Mapping[str, Any]]) -> Dict[str, Any]:
+    """Bulk-load transaction rows (with an account_number column) into existing accounts
+    
+    Consecutive rows for the same account are posted together under one lock
+    and logged as one ledger record. Each account's rows must be in time order
+    and must not predate the history it already has.
+    """
+    report = _Report()
+    numbered = enumerate(rows, 1)
+    for account_number, group in groupby(numbered, key=lambda item: item[1].get("account_number")):
+        account = bank.get_account(account_number) if account_number else None
+        while True:
+            chunk = list(islice(group, POSTING_CHUNK))
+            if not chunk:
+                break
+            if account is None:
+                for number, _ in chunk:
+                    report.fail(number, f"Account not found: {account_number}")
+                continue
+            entries = []
+            for number, row in chunk:
+                try:
+                    entries.append((number, _parse_transaction(row)))
+                except (ValueError, TypeError) as error:
+                    report.fail(number, error)
+            _import_postings(bank, account, entries, report)
+    return report.finish(bank)
+
+
+def _import_account(bank: 'AxizuloAfricanBank', record: Mapping[str, Any]) -> Tuple['Account', Optional[int], int]:
+    account_type = str(record.get("account_type") or "savings").lower()
+    if account_type not in ACCOUNT_TYPES.values():
+        raise ValueError(f"Unknown account type: {account_type}")
+    account_holder = str(record.get("account_holder") or "").strip()
+    if not account_holder:
+        raise ValueError("Account holder name cannot be empty.")
+    is_active = _parse_bool(record.get("is_active"))
+    
+    options: Dict[str, Any] = {}
+    if account_type == "savings" and not _blank(record.get("interest_rate")):
+        options["interest_rate"] = float(record["interest_rate"])
+    if account_type == "current" and not _blank(record.get("overdraft_limit")):
+        options["overdraft_limit"] = Money.of(record["overdraft_limit"])
+    
+    entries = []
+    if not _blank(record.get("opening_balance")):
+        opening = Money.of(record["opening_balance"])
+        if opening:
+            entries.append((None, "deposit" if opening > 0 else "withdrawal", abs(opening), "Opening balance", None))
+    entries.extend(_parse_transaction(transaction) for transaction in record.get("transactions") or ())
+    _check_entries(bank, entries)
+    
+    account_number = str(record.get("account_number") or bank._new_account_number())
+    account_class = SavingsAccount if account_type == "savings" else CurrentAccount
+    account = account_class._restore(account_number, account_holder, is_active, store=bank._transactions, **options)
+    with bank.locks.lock_for(account_number):
+        if bank.get_account(account_number) is not None:
+            raise ValueError(f"Duplicate account number: {account_number}")
+        # Post the history before the account is registered, so the bank-wide
+        # aggregates and indexes take in its final balance once
+        for transaction_id, transaction_type, amount, description, timestamp in entries:
+            account._post(transaction_type, amount, description, transaction_id, timestamp)
+        bank._register_restored(account)
+        seq = bank.ledger.log_open(account) if bank.ledger is not None else None
+    return account, seq, len(entries)
+
+
+def _import_postings(bank: 'AxizuloAfricanBank', account: 'Account', entries: List[Tuple[int, Entry]],
+                     report: '_Report') -> None:
+    """Post parsed rows to one account, skipping (and reporting) rows that would break its history"""
+    store = bank._transactions
+    with account._lock:
+        last_timestamp = store.timestamp(account._rows[-1]) if len(account._rows) else 0
+        seen = set()
+        rows = []
+        for number, (transaction_id, transaction_type, amount, description, timestamp) in entries:
+            if timestamp is not None and timestamp < last_timestamp:
+                report.fail(number, "Transaction is older than the account's history.")
+                continue
+            if transaction_id is not None and (transaction_id in seen or store.find(transaction_id) is not None):
+                report.fail(number, f"Duplicate transaction ID: {transaction_id}")
+                continue
+            if transaction_id is not None:
+                seen.add(transaction_id)
+            rows.append(account._post(transaction_type, amount, description, transaction_id, timestamp))
+            if timestamp is not None:
+                last_timestamp = timestamp
+        if rows and bank.ledger is not None:
+            report.seq = bank.ledger.log_import(account, rows)
+    report.transactions += len(rows)
+
+
+def _check_entries(bank: 'AxizuloAfricanBank', entries: List[Entry]) -> None:
+    """Reject duplicate transaction IDs and out-of-order timestamps before anything is applied"""
+    seen = set()
+    last_timestamp = 0
+    for transaction_id, _, _, _, timestamp in entries:
+        if transaction_id is not None:
+            if transaction_id in seen or bank._transactions.find(transaction_id) is not None:
+                raise ValueError(f"Duplicate transaction ID: {transaction_id}")
+            seen.add(transaction_id)
+        if timestamp is not None:
+            if timestamp < last_timestamp:
+                raise ValueError("Transactions must be in time order.")
+            last_timestamp = timestamp
+
+
+def _parse_transaction(row: Mapping[str, Any]) -> Entry:
+    transaction_type = str(row.get("transaction_type") or "").lower()
+    if transaction_type not in TYPE_CODES:
+        raise ValueError(f"Unknown transaction type: {transaction_type}")
+    amount = Money.of(row.get("amount"))
+    if amount <= 0:
+        raise ValueError("Transaction amount must be positive.")
+    timestamp = row.get("timestamp")
+    return (row.get("transaction_id") or None, transaction_type, amount,
+            str(row.get("description") or transaction_type.title()),
+            None if _blank(timestamp) else to_micros(datetime.fromisoformat(timestamp)))
+
+
+def _parse_bool(value: Any) -> bool:
+    if _blank(value):
+        return True
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("true", "1", "yes"):
+        return True
+    if text in ("false", "0", "no"):
+        return False
+    raise ValueError(f"Invalid boolean: {value!r}")
+
+
+def _blank(value: Any) -> bool:
+    return value is None or value == ""
+
+
+class _Report:
+    """Running totals for one import call"""
+    
+    def __init__(self):
+        self.accounts = 0
+        self.transactions = 0
+        self.failed = 0
+        self.errors: List[str] = []
+        self.seq: Optional[int] = None  # Last ledger record written
+    
+    def fail(self, number: int, error: Any) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"record {number}: {error}")
+    
+    def finish(self, bank: 'AxizuloAfricanBank') -> Dict[str, Any]:
+        """Make the import durable, publish one summary event and return the report"""
+        if self.seq is not None:
+            bank.ledger.commit(self.seq)
+        if bank.events.enabled:
+            bank.events.publish(BulkImportCompleted(self.accounts, self.transactions, self.failed))
+        return {"accounts": self.accounts, "transactions": self.transactions,
+                "failed": self.failed, "errors": self.errors}
+
+
+# Export
+def export_accounts(bank: 'AxizuloAfricanBank') -> Iterator[Dict[str, Any]]:
+    """Yield every account with its history as of one consistent point in time
+    
+    All account locks are held just long enough to note the length of the
+    shared transaction store and copy the account list; rows are immutable
+    once written, so the export then streams without blocking postings.
+    Balances and histories include exactly the transactions before the cut;
+    the active flag is read as each account is exported.
+    """
+    with bank.locks.acquire_all():
+        cut = len(bank._transactions)
+        accounts = bank.get_all_accounts()
+    
+    store = bank._transactions
+    for account in accounts:
+        rows = account._rows
+        rows = rows[:bisect_left(rows, cut)]
+        transactions = []
+        balance = 0
+        for row in rows:
+            transaction_id, transaction_type, amount, description, timestamp = store.record(row)
+            balance += amount if transaction_type == "deposit" else -amount
+            transactions.append({
+                "transaction_id": transaction_id,
+                "transaction_type": transaction_type,
+                "amount": format_cents(amount),
+                "description": description,
+                "timestamp": from_micros(timestamp).isoformat()
+            })
+        account_type = ACCOUNT_TYPES[account.__class__.__name__]
+        yield {
+            "account_number": account.account_number,
+            "account_type": account_type,
+            "account_holder": account.account_holder,
+            "is_active": account.is_active,
+            "interest_rate": account.interest_rate if account_type == "savings" else None,
+            "overdraft_limit": format_cents(account._overdraft_limit) if account_type == "current" else None,
+            "balance": format_cents(balance),
+            "transactions": transactions
+        }
+
+
+# File formats
+def write_jsonl(records: Iterable[Mapping[str, Any]], stream: TextIO) -> int:
+    """Write one JSON object per line and return the number of records"""
+    count = 0
+    for record in records:
+        stream.write(json.dumps(record, separators=(",", ":")) + "\n")
+        count += 1
+    return count
+
+
+def read_jsonl(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    """Yield the JSON object on each non-blank line"""
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def write_csv(records: Iterable[Mapping[str, Any]], accounts_stream: TextIO,
+              transactions_stream: Optional[TextIO] = None) -> int:
+    """Write accounts, and their histories if a second stream is given, as two CSV files"""
+    accounts = csv.DictWriter(accounts_stream, ACCOUNT_FIELDS, extrasaction="ignore")
+    accounts.writeheader()
+    transactions = None
+    if transactions_stream is not None:
+        transactions = csv.DictWriter(transactions_stream, TRANSACTION_FIELDS)
+        transactions.writeheader()
+    
+    count = 0
+    for record in records:
+        row = dict(record)
+        row["is_active"] = "true" if record.get("is_active", True) else "false"
+        accounts.writerow(row)
+        if transactions is not None:
+            account_number = record["account_number"]
+            for transaction in record.get("transactions") or ():
+                transactions.writerow({"account_number": account_number, **transaction})
+        count += 1
+    return count
+
+
+def read_csv(stream: TextIO) -> Iterator[Dict[str, str]]:
+    """Yield each row of a CSV file with a header line as a dict"""
+    return csv.DictReader(stream)
@@ -0,0 +1,68 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class ResponseCache:
+    """Bounded LRU cache of serialized API responses
+    
+    Keys include the account's version, so an entry never goes stale: a
+    mutation bumps the version and later requests simply miss, while the old
+    entries age out of the LRU. ETags are built from the same version plus a
+    per-process epoch, so a tag issued before a restart never matches a
+    recovered account that happens to reach the same version. Processes
+    sharing one database pass its ``epoch`` so their tags agree.
+    """
+    
+    def __init__(self, max_entries: int = 10000, epoch: Optional[str] = None):
+        self._max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._epoch = epoch if epoch is not None else os.urandom(4).hex()
+        self._hits = 0
+        self._misses = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @property
+    def hits(self) -> int:
+        return self._hits
+    
+    @property
+    def misses(self) -> int:
+        return self._misses
+    
+    def etag(self, account_number: str, version: int) -> str:
+        return f'"{self._epoch}-{account_number}-{version}"'
+    
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return body
+    
+    def put(self, key: Hashable, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches etag (weak comparison, as RFC 9110 requires)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
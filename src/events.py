@@ -0,0 +1,209 @@
+import queue
+import sys
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, TextIO
+from .money import format_cents
+
+
+# Domain events (amounts and balances are integer cents)
+@dataclass(frozen=True)
+class AccountCreated:
+    bank_name: str
+    account_holder: str
+    account_number: str
+    account_type: str
+    initial_deposit: int
+    
+    def message(self) -> str:
+        return (f"\n=== Account Created Successfully ===\n"
+                f"Bank: {self.bank_name}\n"
+                f"Account Holder: {self.account_holder}\n"
+                f"Account Number: {self.account_number}\n"
+                f"Account Type: {self.account_type.title()}\n"
+                f"Initial Balance: R{format_cents(self.initial_deposit)}\n"
+                f"====================================\n")
+
+
+@dataclass(frozen=True)
+class Deposited:
+    account_number: str
+    amount: int
+    balance: int
+    description: str
+    
+    def message(self) -> str:
+        return f"Successfully deposited R{format_cents(self.amount)}. New balance: R{format_cents(self.balance)}"
+
+
+@dataclass(frozen=True)
+class Withdrawn:
+    account_number: str
+    amount: int
+    balance: int
+    description: str
+    
+    def message(self) -> str:
+        return f"Successfully withdrew R{format_cents(self.amount)}. New balance: R{format_cents(self.balance)}"
+
+
+@dataclass(frozen=True)
+class TransferCompleted:
+    from_account: str
+    to_account: str
+    amount: int
+    from_balance: int
+    to_balance: int
+    
+    def message(self) -> str:
+        return (f"Successfully withdrew R{format_cents(self.amount)}. New balance: R{format_cents(self.from_balance)}\n"
+                f"Successfully deposited R{format_cents(self.amount)}. New balance: R{format_cents(self.to_balance)}\n"
+                f"Successfully transferred R{format_cents(self.amount)} from {self.from_account} to {self.to_account}")
+
+
+@dataclass(frozen=True)
+class BatchTransferCompleted:
+    applied: int
+    failed: int
+    
+    def message(self) -> str:
+        return f"Batch transfer complete: {self.applied} applied, {self.failed} failed."
+
+
+@dataclass(frozen=True)
+class BulkImportCompleted:
+    accounts: int
+    transactions: int
+    failed: int
+    
+    def message(self) -> str:
+        return (f"Bulk import complete: {self.accounts} accounts and {self.transactions} transactions "
+                f"imported, {self.failed} records failed.")
+
+
+@dataclass(frozen=True)
+class InterestApplied:
+    accounts: int
+    total_interest: int
+    
+    def message(self) -> str:
+        return f"Monthly interest of R{format_cents(self.total_interest)} applied to {self.accounts} savings accounts."
+
+
+@dataclass(frozen=True)
+class AccountStatusChanged:
+    account_number: str
+    is_active: bool
+    
+    def message(self) -> str:
+        return "Account has been activated." if self.is_active else "Account has been deactivated."
+
+
+@dataclass(frozen=True)
+class AccountClosed:
+    account_number: str
+    
+    def message(self) -> str:
+        return f"Account {self.account_number} has been closed."
+
+
+@dataclass(frozen=True)
+class OperationRejected:
+    operation: str
+    account_number: Optional[str]
+    reason: str
+    
+    def message(self) -> str:
+        return self.reason
+
+
+# Sinks
+class ConsoleSink:
+    """Print each event's message synchronously (the CLI's original output)"""
+    
+    def __init__(self, stream: Optional[TextIO] = None):
+        self._stream = stream
+    
+    def handle(self, event) -> None:
+        print(event.message(), file=self._stream or sys.stdout)
+
+
+class NullSink:
+    """Discard every event (for batch jobs)"""
+    
+    def handle(self, event) -> None:
+        pass
+
+
+class BufferedSink:
+    """Queue events and write them from a background thread, off the request path"""
+    
+    def __init__(self, stream: Optional[TextIO] = None, max_batch: int = 1000):
+        self._stream = stream
+        self._max_batch = max_batch
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write_loop, name="event-writer", daemon=True)
+        self._writer.start()
+    
+    def handle(self, event) -> None:
+        self._queue.put(event)
+    
+    def _write_loop(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self._max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            closing = batch[-1] is None
+            lines = [event.message() for event in batch if event is not None]
+            if lines:
+                stream = self._stream or sys.stdout
+                stream.write("\n".join(lines) + "\n")
+                stream.flush()
+            if closing:
+                return
+    
+    def close(self) -> None:
+        """Write every queued event and stop the writer"""
+        self._queue.put(None)
+        self._writer.join()
+
+
+class EventBus:
+    """Publishes domain events to pluggable sinks"""
+    
+    def __init__(self, sinks: Optional[List] = None):
+        self._sinks: List = []
+        self._enabled = False
+        for sink in sinks or []:
+            self.subscribe(sink)
+    
+    @property
+    def enabled(self) -> bool:
+        """False when only null sinks listen, so publishers can skip building events"""
+        return self._enabled
+    
+    def subscribe(self, sink) -> None:
+        # Copy-on-write so publish() can iterate without holding a lock
+        self._sinks = self._sinks + [sink]
+        self._enabled = any(not isinstance(existing, NullSink) for existing in self._sinks)
+    
+    def unsubscribe(self, sink) -> None:
+        self._sinks = [existing for existing in self._sinks if existing is not sink]
+        self._enabled = any(not isinstance(existing, NullSink) for existing in self._sinks)
+    
+    def publish(self, event) -> None:
+        for sink in self._sinks:
+            sink.handle(event)
+
+
+def console_bus() -> EventBus:
+    """Event bus that prints every event, matching the original console output"""
+    return EventBus([ConsoleSink()])
+
+
+# Used by accounts that are not registered with a bank
+default_bus = console_bus()
@@ -0,0 +1,72 @@
+import threading
+from typing import Optional
+
+
+def luhn_digit(number: int) -> int:
+    """Luhn (mod 10) check digit for a non-negative integer"""
+    total = 0
+    double = True  # The rightmost payload digit is doubled once the check digit is appended
+    while number:
+        number, digit = divmod(number, 10)
+        if double:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+        double = not double
+    return (10 - total % 10) % 10
+
+
+class IdAllocator:
+    """Issues monotonic, never-repeating IDs: a zero-padded sequence plus a check digit
+    
+    IDs are decimal strings of ``width + 1`` characters. The Luhn check digit
+    catches single-digit typos and most transpositions, so a mistyped ID is
+    rejected by ``parse()`` without a lookup. ``observe()`` moves the sequence
+    past IDs restored from storage so they are never issued again. With a
+    ``step``, only sequences congruent to ``start`` modulo ``step`` are
+    issued, so several allocators can share one ID space without overlap.
+    """
+    
+    def __init__(self, width: int, start: int = 1, step: int = 1):
+        self._width = width
+        self._limit = 10 ** width
+        self._start = start
+        self._step = step
+        self._next = start
+        self._lock = threading.Lock()
+    
+    @property
+    def last_seq(self) -> int:
+        return self._next - self._step
+    
+    def next_seq(self) -> int:
+        return self.reserve(1)
+    
+    def next_id(self) -> str:
+        return self.format(self.next_seq())
+    
+    def reserve(self, count: int) -> int:
+        """Reserve count sequence numbers, step apart, and return the first"""
+        with self._lock:
+            first = self._next
+            if first + (count - 1) * self._step >= self._limit:
+                raise OverflowError("ID sequence exhausted.")
+            self._next = first + count * self._step
+        return first
+    
+    def format(self, seq: int) -> str:
+        return f"{seq:0{self._width}d}{luhn_digit(seq)}"
+    
+    def parse(self, identifier: str) -> Optional[int]:
+        """Return the sequence number of a well-formed ID, or None"""
+        if len(identifier) != self._width + 1 or not (identifier.isascii() and identifier.isdigit()):
+            return None
+        seq = int(identifier[:-1])
+        return seq if luhn_digit(seq) == int(identifier[-1]) else None
+    
+    def observe(self, seq: int) -> None:
+        """Make sure an already used sequence number is never issued again"""
+        with self._lock:
+            if seq >= self._next:
+                self._next = seq + 1 + (self._start - seq - 1) % self._step
@@ -0,0 +1,297 @@
+import threading
+from bisect import bisect_left, insort
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .account import Account
+
+ACCOUNT_TYPES = {"SavingsAccount": "savings", "CurrentAccount": "current"}
+_MAX_CHAR = chr(0x10FFFF)  # Sorts after every character, so prefix + _MAX_CHAR bounds a prefix range
+_SEPARATOR = "\x00"  # Between holder and account number in holder keys
+
+
+class SortedIndex:
+    """Sorted list of keys split into short runs
+    
+    Inserts and deletes only shift one run instead of the whole list, so they
+    stay cheap with millions of keys, while range scans read runs in order.
+    Keys include the account number, which keeps them unique.
+    """
+    
+    RUN_LENGTH = 1000
+    
+    def __init__(self, keys: Iterable[Any] = ()):
+        self.rebuild(keys)
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def __iter__(self) -> Iterator[Any]:
+        return chain.from_iterable(self._runs)
+    
+    def rebuild(self, keys: Iterable[Any]) -> None:
+        """Replace the contents with keys, sorting them in one pass"""
+        keys = sorted(keys)
+        size = self.RUN_LENGTH
+        self._runs: List[List[Any]] = [keys[i:i + size] for i in range(0, len(keys), size)]
+        self._maxes = [run[-1] for run in self._runs]
+        self._length = len(keys)
+    
+    def add(self, key: Any) -> None:
+        runs, maxes = self._runs, self._maxes
+        if not runs:
+            runs.append([key])
+            maxes.append(key)
+        else:
+            i = bisect_left(maxes, key)
+            if i == len(maxes):
+                i -= 1
+                runs[i].append(key)
+                maxes[i] = key
+            else:
+                insort(runs[i], key)
+            run = runs[i]
+            if len(run) > 2 * self.RUN_LENGTH:
+                half = len(run) // 2
+                runs[i:i + 1] = [run[:half], run[half:]]
+                maxes[i:i + 1] = [run[half - 1], run[-1]]
+        self._length += 1
+    
+    def remove(self, key: Any) -> None:
+        runs, maxes = self._runs, self._maxes
+        i = bisect_left(maxes, key)
+        run = runs[i] if i < len(runs) else []
+        j = bisect_left(run, key)
+        if j == len(run) or run[j] != key:
+            raise KeyError(key)
+        del run[j]
+        if run:
+            maxes[i] = run[-1]
+        else:
+            del runs[i]
+            del maxes[i]
+        self._length -= 1
+    
+    def _position(self, key: Any) -> Tuple[int, int]:
+        """(run, offset) of the first key >= key"""
+        i = bisect_left(self._maxes, key)
+        if i == len(self._runs):
+            return i, 0
+        return i, bisect_left(self._runs[i], key)
+    
+    def count(self, low: Any = None, high: Any = None) -> int:
+        """Number of keys with low <= key < high (None means unbounded)"""
+        def rank(key):
+            if key is None:
+                return self._length
+            i, j = self._position(key)
+            return sum(len(run) for run in self._runs[:i]) + j
+        return max(0, rank(high) - (0 if low is None else rank(low)))
+    
+    def irange(self, low: Any = None, high: Any = None) -> Iterator[Any]:
+        """Keys with low <= key < high in ascending order"""
+        i, j = (0, 0) if low is None else self._position(low)
+        for run in self._runs[i:]:
+            for key in run[j:] if j else run:
+                if high is not None and key >= high:
+                    return
+                yield key
+            j = 0
+
+
+class AccountIndexes:
+    """Secondary indexes over the bank's accounts for admin queries
+    
+    Holder names (case-insensitive, for prefix search), account type and
+    active status are indexed as accounts are added or change status. Balances
+    change on every posting, so postings only mark the account dirty and the
+    sorted balance index catches up on the next query, keeping the posting
+    path O(1). Keys are flat strings and ints rather than tuples, which sort
+    and bisect several times faster: ``"holder\\x00number"`` and
+    ``(balance << 32) + slot``.
+    
+    Accounts left dormant in a snapshot image are indexed from it, through a
+    loader that runs on the first query rather than at startup.
+    """
+    
+    # When more than this fraction of accounts is dirty, re-sort instead of patching
+    REBUILD_FRACTION = 0.125
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._slots: Dict[str, int] = {}  # Account number -> dense slot used in balance keys
+        self._numbers: List[str] = []
+        self._slot_holders: List[str] = []  # Casefolded, by slot
+        self._loader: Optional[Callable[[], Iterable[Tuple[str, str, str, bool, int]]]] = None
+        self._holders = SortedIndex()  # Casefolded holder + _SEPARATOR + account number
+        self._new_holders: List[str] = []
+        self._by_type: Dict[str, Set[str]] = {account_type: set() for account_type in ACCOUNT_TYPES.values()}
+        self._by_status: Dict[bool, Set[str]] = {True: set(), False: set()}
+        self._balances = SortedIndex()  # (balance << 32) + slot
+        self._indexed_balance: List[Optional[int]] = []  # By slot; None until first indexed
+        self._dirty: Set['Account'] = set()
+    
+    def add_account(self, account: 'Account') -> None:
+        """Start indexing an account"""
+        with self._lock:
+            self._add(account.account_number, account.account_holder, ACCOUNT_TYPES[account.__class__.__name__],
+                      account.is_active, None)
+            self._dirty.add(account)
+    
+    def _add(self, number: str, holder: str, account_type: str, is_active: bool,
+             balance: Optional[int]) -> None:
+        """Give an account a slot (caller holds the lock)"""
+        holder = holder.casefold()
+        self._slots[number] = len(self._numbers)
+        self._numbers.append(number)
+        self._slot_holders.append(holder)
+        self._indexed_balance.append(balance)
+        self._new_holders.append(f"{holder}{_SEPARATOR}{number}")
+        self._by_type[account_type].add(number)
+        self._by_status[is_active].add(number)
+    
+    def defer(self, loader: Callable[[], Iterable[Tuple[str, str, str, bool, int]]]) -> None:
+        """Index accounts from loader's (number, holder, type, active, balance) tuples on the next query
+        
+        Accounts indexed by then are skipped, as the loader may still list them.
+        """
+        with self._lock:
+            self._loader = loader
+    
+    def forget(self, account: 'Account') -> None:
+        """Apply an account's pending balance change before the bank drops its object"""
+        with self._lock:
+            slot = self._slots.get(account.account_number)
+            if account in self._dirty:
+                self._dirty.discard(account)
+                if slot is not None:  # Otherwise the loader still has to index it
+                    self._index_balance(slot, account.balance_cents)
+    
+    def balance_changed(self, account: 'Account') -> None:
+        """Note a balance change; applied to the balance index on the next query"""
+        self._dirty.add(account)
+    
+    def status_changed(self, account: 'Account', is_active: bool) -> None:
+        number = account.account_number
+        with self._lock:
+            self._by_status[not is_active].discard(number)
+            self._by_status[is_active].add(number)
+    
+    def _refresh(self) -> None:
+        """Fold new holders and dirty balances into the sorted indexes (caller holds the lock)"""
+        loader = self._loader
+        if loader is not None:
+            self._loader = None
+            for number, holder, account_type, is_active, balance in loader():
+                if number not in self._slots:
+                    self._add(number, holder, account_type, is_active, balance)
+        
+        if self._new_holders:
+            if len(self._new_holders) > len(self._holders) * self.REBUILD_FRACTION:
+                self._holders.rebuild(chain(self._holders, self._new_holders))
+            else:
+                for key in self._new_holders:
+                    self._holders.add(key)
+            self._new_holders = []
+        
+        # pop() is atomic, so postings racing with the drain are either applied now or stay dirty
+        dirty, slots, indexed = self._dirty, self._slots, self._indexed_balance
+        changed = []
+        while dirty:
+            account = dirty.pop()
+            changed.append((slots[account.account_number], account.balance_cents))
+        # Loaded slots are not in the balance index yet, so loading always re-sorts
+        if loader is not None or len(changed) > len(self._balances) * self.REBUILD_FRACTION:
+            for slot, balance in changed:
+                indexed[slot] = balance
+            self._balances.rebuild([(balance << 32) + slot for slot, balance in enumerate(indexed)])
+            return
+        for slot, balance in changed:
+            self._index_balance(slot, balance)
+    
+    def _index_balance(self, slot: int, balance: int) -> None:
+        """Move a slot's key in the balance index (caller holds the lock)"""
+        old_balance = self._indexed_balance[slot]
+        if old_balance == balance:
+            return
+        if old_balance is not None:
+            self._balances.remove((old_balance << 32) + slot)
+        self._balances.add((balance << 32) + slot)
+        self._indexed_balance[slot] = balance
+    
+    def query(self, holder: Optional[str] = None, holder_prefix: Optional[str] = None,
+              account_type: Optional[str] = None, is_active: Optional[bool] = None,
+              min_balance: Optional[int] = None, max_balance: Optional[int] = None) -> List[str]:
+        """Account numbers matching every given filter (balances in cents, both bounds inclusive)
+        
+        The smallest candidate set drives the scan: the intersection of the
+        type and status sets, or a range of the holder or balance index. The
+        other filters are checked per candidate. Results are ordered by
+        balance when a balance bound is given, otherwise by account number.
+        """
+        by_balance = min_balance is not None or max_balance is not None
+        with self._lock:
+            self._refresh()
+            holders, slots, indexed = self._slot_holders, self._slots, self._indexed_balance
+            
+            # Each candidate source: (size, iterator of account numbers, filter it covers)
+            sources = []
+            members = None
+            sets = []
+            if account_type is not None:
+                sets.append(self._by_type.get(account_type.lower(), set()))
+            if is_active is not None:
+                sets.append(self._by_status[bool(is_active)])
+            if sets:
+                sets.sort(key=len)
+                members = sets[0].intersection(*sets[1:])
+                sources.append((len(members), iter(members), "sets"))
+            
+            name = prefix = None
+            if holder is not None or holder_prefix is not None:
+                if holder is not None:
+                    name = holder.strip().casefold()
+                    low, high = name + _SEPARATOR, name + _SEPARATOR + _MAX_CHAR
+                if holder_prefix is not None:
+                    prefix = holder_prefix.casefold()
+                    if name is None:
+                        low, high = prefix, prefix + _MAX_CHAR
+                sources.append((self._holders.count(low, high),
+                                (key.rpartition(_SEPARATOR)[2] for key in self._holders.irange(low, high)),
+                                "holder"))
+            
+            numbers = self._numbers
+            if by_balance:
+                low = None if min_balance is None else min_balance << 32
+                high = None if max_balance is None else (max_balance + 1) << 32
+                sources.append((self._balances.count(low, high),
+                                (numbers[key & 0xFFFFFFFF] for key in self._balances.irange(low, high)),
+                                "balance"))
+            if not sources:
+                sources.append((len(numbers), iter(list(numbers)), None))
+            _, candidates, covered = min(sources, key=lambda source: source[0])
+            
+            checks = []
+            if members is not None and covered != "sets":
+                checks.append(members.__contains__)
+            if name is not None and covered != "holder":
+                checks.append(lambda number: holders[slots[number]] == name)
+            if prefix is not None and (covered != "holder" or name is not None):
+                checks.append(lambda number: holders[slots[number]].startswith(prefix))
+            if min_balance is not None and covered != "balance":
+                checks.append(lambda number: indexed[slots[number]] >= min_balance)
+            if max_balance is not None and covered != "balance":
+                checks.append(lambda number: indexed[slots[number]] <= max_balance)
+            
+            if checks:
+                matches = [number for number in candidates if all(check(number) for check in checks)]
+            else:
+                matches = list(candidates)
+            if covered == "balance":
+                pass  # Already in balance order
+            elif by_balance:
+                matches.sort(key=lambda number: (indexed[slots[number]] << 32) + slots[number])
+            else:
+                matches.sort()
+            return matches
@@ -0,0 +1,438 @@
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+from .money import Money
+from .snapshot import SnapshotImage, capture, write_image
+
+if TYPE_CHECKING:
+    from .account import Account
+    from .bank import AxizuloAfricanBank
+
+
+class Ledger:
+    """Append-only write-ahead ledger with group commit, snapshots and replay
+    
+    Every state change is written as one JSON line to the current log segment.
+    A background writer drains all pending records with a single write and
+    fsync, so concurrent callers share the cost of each fsync (group commit).
+    Records are queued while the caller holds its account locks, so per-account
+    order is preserved; ``commit()`` is then called after the locks are
+    released. With ``sync=True`` it blocks until the record is durable; with
+    ``sync=False`` it returns immediately and the writer keeps at most one batch
+    in flight.
+    
+    Amounts are written as integer cents. Older logs stored float rands, so a
+    float amount found during replay is converted instead.
+    """
+    
+    SEGMENT_PREFIX = "ledger-"
+    SNAPSHOT_PREFIX = "snapshot-"
+    
+    def __init__(self, directory: str, sync: bool = True, snapshot_every: Optional[int] = None):
+        self._directory = directory
+        self._sync = sync
+        self._snapshot_every = snapshot_every
+        os.makedirs(directory, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._has_pending = threading.Condition(self._lock)
+        self._has_flushed = threading.Condition(self._lock)
+        self._io_lock = threading.Lock()  # Held by the writer while touching the segment file
+        self._pending: List[str] = []
+        self._last_seq = 0
+        self._durable_seq = 0
+        self._written_seq = 0
+        self._snapshot_seq = 0
+        self._checkpointing = False  # An automatic checkpoint is running
+        self._checkpointer: Optional[threading.Thread] = None
+        self._checkpoint_lock = threading.Lock()  # One checkpoint at a time, automatic or not
+        self._checkpoint_error: Optional[BaseException] = None
+        self._batches = 0
+        self._closing = False
+        self._error: Optional[BaseException] = None
+        self._bank: Optional['AxizuloAfricanBank'] = None
+        
+        self._file = None
+        self._writer = threading.Thread(target=self._write_loop, name="ledger-writer", daemon=True)
+    
+    @property
+    def directory(self) -> str:
+        return self._directory
+    
+    @property
+    def last_seq(self) -> int:
+        return self._last_seq
+    
+    @property
+    def durable_seq(self) -> int:
+        return self._durable_seq
+    
+    @property
+    def batch_count(self) -> int:
+        """Writes (each with one fsync) made by the writer; below last_seq when commits were grouped"""
+        return self._batches
+    
+    @property
+    def checkpoint_error(self) -> Optional[BaseException]:
+        """Why the last automatic checkpoint failed, or None; commit() never raises it"""
+        return self._checkpoint_error
+    
+    # Recovery
+    def recover(self, bank: 'AxizuloAfricanBank') -> int:
+        """Load the latest snapshot into bank, replay newer records and start logging"""
+        self._bank = bank
+        snapshot = self._latest_file(self.SNAPSHOT_PREFIX)
+        if snapshot is None:
+            pass
+        elif snapshot.endswith(SnapshotImage.SUFFIX):
+            self._snapshot_seq = self._load_image(bank, snapshot)
+        else:
+            self._snapshot_seq = self._load_snapshot(bank, snapshot)
+        self._last_seq = self._snapshot_seq
+        
+        replayed = 0
+        for segment in self._segments():
+            for record in self._read_segment(segment):
+                if record["seq"] <= self._last_seq:
+                    continue
+                self._apply(bank, record)
+                self._last_seq = record["seq"]
+                replayed += 1
+        
+        self._durable_seq = self._written_seq = self._last_seq
+        # Always append to a fresh segment so new records never follow a torn tail
+        self._file = open(self._segment_path(self._last_seq + 1), "wb")
+        self._writer.start()
+        return replayed
+    
+    def _apply(self, bank: 'AxizuloAfricanBank', record: Dict[str, Any]) -> None:
+        """Apply one ledger record to bank without re-logging it"""
+        op = record["op"]
+        if op == "open":
+            options = dict(record.get("options", {}))
+            if "overdraft_limit" in options:
+                options["overdraft_limit"] = self._cents(options["overdraft_limit"])
+            account = bank._restore_account(record["type"], record["acc"], record["holder"],
+                                            record.get("active", True), **options)
+            for entry in record["txns"]:
+                self._replay_posting(account, entry)
+        elif op == "post":
+            self._replay_posting(bank.get_account(record["acc"]), record["txn"])
+        elif op == "transfer":
+            self._replay_posting(bank.get_account(record["from"]), record["debit"])
+            self._replay_posting(bank.get_account(record["to"]), record["credit"])
+        elif op == "batch":
+            for from_account_num, to_account_num, debit, credit in record["transfers"]:
+                self._replay_posting(bank.get_account(from_account_num), debit)
+                self._replay_posting(bank.get_account(to_account_num), credit)
+        elif op == "interest":
+            for account_number, entry in record["txns"]:
+                self._replay_posting(bank.get_account(account_number), entry)
+        elif op == "import":
+            account = bank.get_account(record["acc"])
+            for entry in record["txns"]:
+                self._replay_posting(account, entry)
+        elif op == "status":
+            bank.get_account(record["acc"])._change_status(record["active"])
+        elif op == "xfer":
+            self._apply_transfer_step(bank, record)
+        else:
+            raise ValueError(f"Unknown ledger operation: {op}")
+    
+    @classmethod
+    def _apply_transfer_step(cls, bank: 'AxizuloAfricanBank', record: Dict[str, Any]) -> None:
+        """Replay one step of a cross-shard transfer into the bank's in-flight tables"""
+        transfer_id, step = record["id"], record["step"]
+        if step == "prepare":
+            bank._pending_credits[transfer_id] = (record["from"], record["to"], record["amount"])
+        elif step == "debit":
+            cls._replay_posting(bank.get_account(record["from"]), record["txn"])
+            bank._owed_credits[transfer_id] = (record["from"], record["to"], record["amount"])
+        elif step == "credit":
+            _, to_account_num, _ = bank._pending_credits.pop(transfer_id)
+            cls._replay_posting(bank.get_account(to_account_num), record["txn"])
+        elif step == "abort":
+            bank._pending_credits.pop(transfer_id, None)
+        elif step == "settle":
+            bank._owed_credits.pop(transfer_id, None)
+        else:
+            raise ValueError(f"Unknown transfer step: {step}")
+    
+    @staticmethod
+    def _cents(value) -> Money:
+        """Read a logged amount: integer cents, or float rands from older logs"""
+        return Money(value) if type(value) is int else Money.of(value)
+    
+    @classmethod
+    def _replay_posting(cls, account: 'Account', entry: List[Any]) -> None:
+        transaction_id, transaction_type, amount, description, timestamp = entry
+        account._post(transaction_type, cls._cents(amount), description, transaction_id, timestamp)
+    
+    # Logging
+    def log_open(self, account: 'Account') -> int:
+        """Log account creation together with its opening transactions"""
+        return self.append(self._account_record(account))
+    
+    def log_posting(self, account: 'Account', row: int) -> int:
+        """Log a single deposit or withdrawal"""
+        return self.append({"op": "post", "acc": account.account_number, "txn": account._store.record(row)})
+    
+    def log_transfer(self, from_account: 'Account', debit: int, to_account: 'Account', credit: int) -> int:
+        """Log both legs of a transfer as one atomic record"""
+        return self.append({
+            "op": "transfer",
+            "from": from_account.account_number,
+            "to": to_account.account_number,
+            "debit": from_account._store.record(debit),
+            "credit": to_account._store.record(credit)
+        })
+    
+    def log_batch(self, transfers: List[Tuple['Account', int, 'Account', int]]) -> int:
+        """Log every leg of a transfer batch as one atomic record"""
+        return self.append({
+            "op": "batch",
+            "transfers": [[from_account.account_number, to_account.account_number,
+                           from_account._store.record(debit), to_account._store.record(credit)]
+                          for from_account, debit, to_account, credit in transfers]
+        })
+    
+    def log_interest(self, postings: List[Tuple['Account', int]]) -> int:
+        """Log a chunk of bulk interest postings as one record"""
+        return self.append({
+            "op": "interest",
+            "txns": [[account.account_number, account._store.record(row)] for account, row in postings]
+        })
+    
+    def log_import(self, account: 'Account', rows: List[int]) -> int:
+        """Log transactions bulk-loaded into an existing account as one record"""
+        return self.append({"op": "import", "acc": account.account_number,
+                            "txns": [account._store.record(row) for row in rows]})
+    
+    def log_status(self, account_number: str, is_active: bool) -> int:
+        """Log account activation or deactivation"""
+        return self.append({"op": "status", "acc": account_number, "active": is_active})
+    
+    def log_transfer_step(self, transfer_id: str, step: str, transfer: Optional[Tuple[str, str, int]] = None,
+                          account: Optional['Account'] = None, row: Optional[int] = None) -> int:
+        """Log one step of a cross-shard transfer, with the posting it made here, if any"""
+        record: Dict[str, Any] = {"op": "xfer", "id": transfer_id, "step": step}
+        if transfer is not None:
+            record["from"], record["to"], record["amount"] = transfer
+        if account is not None:
+            record["txn"] = account._store.record(row)
+        return self.append(record)
+    
+    def _account_record(self, account: 'Account') -> Dict[str, Any]:
+        """Describe an account and its full history as an "open" record"""
+        info = account.get_account_info()
+        options = {}
+        if hasattr(account, 'interest_rate'):
+            options['interest_rate'] = account.interest_rate
+        if hasattr(account, 'overdraft_limit'):
+            options['overdraft_limit'] = account._overdraft_limit
+        return {
+            "op": "open",
+            "acc": info['account_number'],
+            "type": "savings" if info['account_type'] == "SavingsAccount" else "current",
+            "holder": info['account_holder'],
+            "active": info['is_active'],
+            "options": options,
+            "txns": [account._store.record(row) for row in account._rows]
+        }
+    
+    def append(self, record: Dict[str, Any]) -> int:
+        """Queue a record for the writer and return its sequence number"""
+        with self._lock:
+            if self._file is None or self._closing:
+                raise RuntimeError("Ledger is not open for writing.")
+            self._last_seq += 1
+            seq = self._last_seq
+            record["seq"] = seq
+            self._pending.append(json.dumps(record, separators=(",", ":")) + "\n")
+            self._has_pending.notify()
+        return seq
+    
+    def commit(self, seq: int) -> None:
+        """Wait until a record is durable (in sync mode); call without holding account locks"""
+        if self._sync:
+            with self._lock:
+                self._wait_durable(seq)
+        
+        if self._snapshot_every and seq - self._snapshot_seq >= self._snapshot_every:
+            # Only the first caller past the threshold starts a checkpoint, and
+            # it runs in the background so no caller waits for the image
+            with self._lock:
+                if self._checkpointing or self._closing:
+                    return
+                self._checkpointing = True
+                self._checkpointer = threading.Thread(target=self._auto_checkpoint, name="ledger-checkpoint",
+                                                      daemon=True)
+                self._checkpointer.start()
+    
+    def _auto_checkpoint(self) -> None:
+        try:
+            self.checkpoint()
+            self._checkpoint_error = None
+        except Exception as error:
+            # Every change is already applied and journaled; a failed
+            # checkpoint only leaves more of the log to replay
+            self._checkpoint_error = error
+        finally:
+            self._checkpointing = False
+    
+    def flush(self) -> None:
+        """Block until every record appended so far is durable"""
+        with self._lock:
+            self._wait_durable(self._last_seq)
+    
+    def _wait_durable(self, seq: int) -> None:
+        # Caller holds self._lock
+        while self._durable_seq < seq:
+            if self._error is not None:
+                raise RuntimeError("Ledger writer failed.") from self._error
+            self._has_flushed.wait()
+    
+    def _write_loop(self) -> None:
+        while True:
+            with self._lock:
+                while not self._pending and not self._closing:
+                    self._has_pending.wait()
+                if not self._pending:
+                    return
+                batch, self._pending = self._pending, []
+                batch_seq = self._last_seq
+            
+            try:
+                with self._io_lock:
+                    self._file.write("".join(batch).encode("utf-8"))
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                    self._written_seq = batch_seq
+                    self._batches += 1
+            except BaseException as error:
+                with self._lock:
+                    self._error = error
+                    self._has_flushed.notify_all()
+                return
+            
+            with self._lock:
+                self._durable_seq = batch_seq
+                self._has_flushed.notify_all()
+    
+    # Snapshots
+    def checkpoint(self) -> int:
+        """Write a snapshot image of the attached bank and drop log segments it covers
+        
+        Only resident accounts are copied while the locks are held; the rest
+        of the image is streamed from the previous one and the transaction
+        store afterwards. The bank then reads dormant accounts and old rows
+        from the new image. Checkpoints run one at a time, so images are
+        written, adopted and pruned in sequence order.
+        """
+        if self._bank is None:
+            raise RuntimeError("Ledger has no bank attached. Call recover() first.")
+        with self._checkpoint_lock:
+            return self._checkpoint()
+    
+    def _checkpoint(self) -> int:
+        """checkpoint() with the checkpoint lock held"""
+        # Every mutation is queued while its account lock is held, so with all
+        # locks taken the in-memory state matches the ledger up to last_seq
+        with self._bank.locks.acquire_all(), self._lock:
+            if self._last_seq == self._snapshot_seq:
+                return self._snapshot_seq
+            seq = self._last_seq
+            cut = capture(self._bank)
+            in_flight = self._bank.in_flight_transfers()
+            self._snapshot_seq = seq
+        
+        self.flush()
+        with self._io_lock:
+            self._file.close()
+            self._file = open(self._segment_path(self._written_seq + 1), "ab")
+        
+        path = os.path.join(self._directory, f"{self.SNAPSHOT_PREFIX}{seq:012d}{SnapshotImage.SUFFIX}")
+        tmp_path = path + ".tmp"
+        write_image(tmp_path, seq, cut, in_flight, self._bank)
+        os.replace(tmp_path, path)
+        self._bank._adopt_image(SnapshotImage(path))
+        self._prune(seq)
+        return seq
+    
+    def _load_image(self, bank: 'AxizuloAfricanBank', path: str) -> int:
+        image = SnapshotImage(path)
+        bank._load_image(image)
+        self._load_transfers(bank, image.transfers)
+        return image.seq
+    
+    def _load_snapshot(self, bank: 'AxizuloAfricanBank', path: str) -> int:
+        """Load a JSON lines snapshot, as written before snapshot images"""
+        with open(path, encoding="utf-8") as snapshot:
+            header = json.loads(snapshot.readline())
+            for line in snapshot:
+                self._apply(bank, json.loads(line))
+        self._load_transfers(bank, header.get("transfers", {}))
+        return header["seq"]
+    
+    @staticmethod
+    def _load_transfers(bank: 'AxizuloAfricanBank', transfers: Dict[str, Dict[str, list]]) -> None:
+        for transfer_id, transfer in transfers.get("pending", {}).items():
+            bank._pending_credits[transfer_id] = tuple(transfer)
+        for transfer_id, transfer in transfers.get("owed", {}).items():
+            bank._owed_credits[transfer_id] = tuple(transfer)
+    
+    def _prune(self, snapshot_seq: int) -> None:
+        """Remove older snapshots and segments whose records are all covered"""
+        for name in os.listdir(self._directory):
+            if name.endswith(".tmp"):
+                continue  # Another checkpoint's image, still being written
+            if name.startswith(self.SNAPSHOT_PREFIX) and self._seq_of(name) < snapshot_seq:
+                os.remove(os.path.join(self._directory, name))
+        
+        segments = self._segments()
+        for current, following in zip(segments, segments[1:]):
+            if self._seq_of(os.path.basename(following)) <= snapshot_seq + 1:
+                os.remove(current)
+    
+    # Files
+    def _segment_path(self, first_seq: int) -> str:
+        return os.path.join(self._directory, f"{self.SEGMENT_PREFIX}{first_seq:012d}.log")
+    
+    def _segments(self) -> List[str]:
+        names = sorted(name for name in os.listdir(self._directory)
+                       if name.startswith(self.SEGMENT_PREFIX) and name.endswith(".log"))
+        return [os.path.join(self._directory, name) for name in names]
+    
+    def _latest_file(self, prefix: str) -> Optional[str]:
+        names = sorted(name for name in os.listdir(self._directory)
+                       if name.startswith(prefix) and name.endswith((".jsonl", SnapshotImage.SUFFIX)))
+        return os.path.join(self._directory, names[-1]) if names else None
+    
+    @staticmethod
+    def _seq_of(name: str) -> int:
+        return int(name.split("-", 1)[1].split(".", 1)[0])
+    
+    @staticmethod
+    def _read_segment(path: str):
+        with open(path, "rb") as segment:
+            for line in segment:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # Torn write at the tail of a crashed segment
+                    return
+    
+    def close(self) -> None:
+        """Finish a running automatic checkpoint, flush outstanding records and stop the writer"""
+        with self._lock:
+            if self._file is None or self._closing:
+                return
+            self._closing = True
+            checkpointer = self._checkpointer
+        if checkpointer is not None:
+            checkpointer.join()
+        with self._lock:
+            self._has_pending.notify()
+        self._writer.join()
+        self._file.close()
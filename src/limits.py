@@ -0,0 +1,187 @@
+import time
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Iterable, List, Optional
+from .money import Amount, format_cents, to_cents
+
+if TYPE_CHECKING:
+    from .account import Account
+
+HOUR = 3600.0
+DAY = 86400.0
+_UNLIMITED = 2 ** 63 - 1  # Stands in for a missing cap, so the debit path never tests for None
+LIMIT_REACHED = "limit reached:"  # In every reason check() gives, after the limit's name
+
+
+@dataclass(frozen=True)
+class Limit:
+    """A cap on the number and/or value of debits from one account within a sliding window (seconds)"""
+    window: float
+    max_count: Optional[int] = None
+    max_value: Optional[Amount] = None  # Rands
+    buckets: int = 60  # Resolution of the window; memory per account grows with it
+    
+    @property
+    def name(self) -> str:
+        return {HOUR: "Hourly", DAY: "Daily"}.get(self.window, f"{self.window:g}-second")
+
+
+class _Wheel:
+    """One account's debits under one limit, bucketed by time; ``head`` is the newest bucket number"""
+    
+    __slots__ = ("head", "counts", "values", "count", "value")
+    
+    def __init__(self, slots: int):
+        self.head = 0
+        self.counts = array('q', [0]) * slots
+        self.values = array('q', [0]) * slots  # Cents
+        self.count = 0  # Totals over every slot
+        self.value = 0
+    
+    def advance(self, bucket: int) -> None:
+        """Move the head to a bucket, emptying the slots of buckets that left the window"""
+        steps = bucket - self.head
+        if steps <= 0:
+            return  # Same bucket, or the clock stepped back: keep counting in the newest
+        slots = len(self.counts)
+        if steps >= slots:
+            self.counts = array('q', [0]) * slots
+            self.values = array('q', [0]) * slots
+            self.count = self.value = 0
+        else:
+            counts, values = self.counts, self.values
+            for expired in range(self.head + 1, bucket + 1):
+                slot = expired % slots
+                self.count -= counts[slot]
+                self.value -= values[slot]
+                counts[slot] = values[slot] = 0
+        self.head = bucket
+    
+    def add(self, count: int, value: int) -> None:
+        slot = self.head % len(self.counts)
+        self.counts[slot] += count
+        self.values[slot] += value
+        self.count += count
+        self.value += value
+
+
+class _Windows:
+    """An account's wheels, plus the debits made since they were last brought up to date
+    
+    Until ``until``, when the next bucket of any wheel begins, new debits
+    all belong to the wheels' current buckets, so they are only added to
+    ``pending`` and checked against the headroom the wheels had left.
+    """
+    
+    __slots__ = ("wheels", "until", "pending_count", "pending_value", "count_room", "value_room")
+    
+    def __init__(self, wheels: List[_Wheel]):
+        self.wheels = wheels
+        self.until = 0.0
+        self.pending_count = 0
+        self.pending_value = 0
+        self.count_room = 0
+        self.value_room = 0
+
+
+class VelocityLimits:
+    """Sliding-window limits on debit count and value, checked inline before every debit
+    
+    Each account keeps one time wheel per limit: ``buckets + 1`` slots of
+    ``window / buckets`` seconds holding the count and value of its debits,
+    plus running totals. When a bucket boundary passes, the wheels drop the
+    slots that left the window and note the headroom left under every
+    limit; between boundaries a debit is only compared with that headroom
+    and added to a pending total. Either way a check costs O(1) and never
+    scans the history, and memory per account is fixed by the bucket
+    counts. A debit is counted for at least ``window`` seconds and at most
+    one bucket longer, so a limit is never under-enforced. Accounts only
+    get wheels on their first debit.
+    
+    Every method expects the caller to hold the account's lock. The bank
+    rebuilds the wheels from recent history when it recovers from its
+    ledger, so a restart does not reset the windows.
+    """
+    
+    def __init__(self, limits: Iterable[Limit], clock: Callable[[], float] = time.time):
+        self._limits = list(limits)
+        for limit in self._limits:
+            if limit.window <= 0 or limit.buckets < 1:
+                raise ValueError("A limit needs a positive window and at least one bucket.")
+        # Per limit: (bucket width, max count, max value in cents)
+        self._rules = [(limit.window / limit.buckets,
+                        limit.max_count if limit.max_count is not None else _UNLIMITED,
+                        to_cents(limit.max_value) if limit.max_value is not None else _UNLIMITED)
+                       for limit in self._limits]
+        self._clock = clock
+    
+    @property
+    def limits(self) -> List[Limit]:
+        return list(self._limits)
+    
+    def _sync(self, account: 'Account', now: float) -> _Windows:
+        """Add the pending debits to the wheels, move them to now and recompute the headroom"""
+        windows = account._velocity
+        if windows is None:
+            windows = account._velocity = _Windows([_Wheel(limit.buckets + 1) for limit in self._limits])
+        wheels = windows.wheels
+        if windows.pending_count:
+            for wheel in wheels:
+                wheel.add(windows.pending_count, windows.pending_value)
+            windows.pending_count = windows.pending_value = 0
+        
+        until = float("inf")
+        count_room = value_room = _UNLIMITED
+        for wheel, (width, max_count, max_value) in zip(wheels, self._rules):
+            wheel.advance(int(now // width))
+            until = min(until, (wheel.head + 1) * width)
+            count_room = min(count_room, max_count - wheel.count)
+            value_room = min(value_room, max_value - wheel.value)
+        windows.until, windows.count_room, windows.value_room = until, count_room, value_room
+        return windows
+    
+    def check(self, account: 'Account', amount: int, count: int = 1) -> Optional[str]:
+        """Return the reason count debits totalling amount cents would break a limit, or None"""
+        wheels = self._sync(account, self._clock()).wheels
+        for limit, wheel, (_, max_count, max_value) in zip(self._limits, wheels, self._rules):
+            if wheel.count + count > max_count:
+                return f"{limit.name} debit {LIMIT_REACHED} at most {max_count} debits."
+            if wheel.value + amount > max_value:
+                return (f"{limit.name} value {LIMIT_REACHED} "
+                        f"R{format_cents(max(max_value - wheel.value, 0))} available.")
+        return None
+    
+    def record(self, account: 'Account', amount: int, count: int = 1, at: Optional[float] = None) -> None:
+        """Count debits totalling amount cents, made now or at a given time"""
+        windows = self._sync(account, self._clock() if at is None else at)
+        windows.pending_count += count
+        windows.pending_value += amount
+    
+    def admit(self, account: 'Account', amount: int) -> Optional[str]:
+        """Check one debit and count it if it is allowed; returns the reason to refuse, or None"""
+        now = self._clock()
+        windows = account._velocity
+        if windows is None or now >= windows.until:
+            windows = self._sync(account, now)
+        if windows.pending_count >= windows.count_room or windows.pending_value + amount > windows.value_room:
+            error = self.check(account, amount)
+            if error is None:
+                self.record(account, amount)
+            return error
+        windows.pending_count += 1
+        windows.pending_value += amount
+        return None
+    
+    def restore(self, account: 'Account') -> None:
+        """Rebuild an account's wheels from its history within the longest window"""
+        if not self._limits:
+            return
+        store = account._store
+        rows = account._rows
+        cutoff = self._clock() - max(limit.window for limit in self._limits)
+        account._velocity = None
+        for position in range(bisect_left(rows, int(cutoff * 1_000_000), key=store.timestamp), len(rows)):
+            row = rows[position]
+            if store.transaction_type(row) == "withdrawal":
+                self.record(account, store.amount(row), at=store.timestamp(row) / 1_000_000)
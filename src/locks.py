@@ -0,0 +1,49 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List
+
+
+class LockManager:
+    """Striped account locks, always acquired in stripe order so they cannot deadlock
+    
+    Each account number hashes to one of ``stripes`` re-entrant locks. Operations
+    that touch several accounts take every stripe they need in ascending stripe
+    order, so two transfers in opposite directions never wait on each other.
+    """
+    
+    def __init__(self, stripes: int = 256):
+        self._stripes = [threading.RLock() for _ in range(stripes)]
+    
+    @property
+    def stripes(self) -> int:
+        return len(self._stripes)
+    
+    def stripe_of(self, account_number: str) -> int:
+        return hash(account_number) % len(self._stripes)
+    
+    def lock_for(self, account_number: str) -> threading.RLock:
+        """Get the lock guarding a single account"""
+        return self._stripes[self.stripe_of(account_number)]
+    
+    @contextmanager
+    def acquire(self, *account_numbers: str) -> Iterator[None]:
+        """Hold the locks for every given account, taken in deterministic order"""
+        indexes = sorted({self.stripe_of(number) for number in account_numbers})
+        yield from self._hold([self._stripes[index] for index in indexes])
+    
+    @contextmanager
+    def acquire_all(self) -> Iterator[None]:
+        """Hold every stripe, pausing all account mutations (used for snapshots)"""
+        yield from self._hold(self._stripes)
+    
+    @staticmethod
+    def _hold(locks: List[threading.RLock]) -> Iterator[None]:
+        acquired = []
+        try:
+            for lock in locks:
+                lock.acquire()
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
@@ -0,0 +1,170 @@
+import itertools
+import re
+import threading
+from time import perf_counter_ns
+from typing import Callable, Dict, Iterator, List, Tuple
+
+# Latency buckets are powers of two nanoseconds, from about 1us to 2s, so an
+# observation is filed by elapsed.bit_length() with no search
+BUCKET_BITS = range(10, 32)
+LATENCY_BUCKETS = tuple(2 ** bits / 1e9 for bits in BUCKET_BITS)  # Upper bounds in seconds
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+MAX_REJECTION_SERIES = 200  # Distinct (operation, reason) pairs before the rest count as "other"
+
+_ROW_SIZE = 65  # Counts by bit length (0-63), then the sum in ns
+
+
+def _reason_label(reason: str) -> str:
+    """First sentence of a rejection reason, which never contains amounts or names"""
+    return re.split(r"[.:]", reason, maxsplit=1)[0].strip()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items())
+
+
+def _count_value(counter: Iterator[int]) -> int:
+    """Current value of an itertools.count without advancing it"""
+    return int(repr(counter)[len("count("):-1])
+
+
+class Metrics:
+    """Operation counts, sampled latency histograms, rejections and gauges for Prometheus
+    
+    Instrumented code calls ``start(operation)`` only when ``enabled``, so a
+    disabled registry costs one attribute check per operation, and it can be
+    switched at runtime. Every call is counted exactly by an
+    ``itertools.count``, which advances atomically without a lock; only one
+    call in ``sample_every`` reads the clock and is timed, which keeps the
+    enabled cost to a few percent of a deposit. Gauges are read only when
+    metrics are rendered, so account and transaction counts cost nothing
+    per operation.
+    """
+    
+    def __init__(self, enabled: bool = True, sample_every: int = 16):
+        if sample_every < 1 or sample_every & (sample_every - 1):
+            raise ValueError("sample_every must be a power of two")
+        self.enabled = enabled
+        self._sample_every = sample_every
+        self._sample_mask = sample_every - 1
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Iterator[int]] = {}
+        self._operations: Dict[str, List[int]] = {}  # Counts by bit length, then the sum in ns
+        self._requests: Dict[str, List[int]] = {}
+        self._responses: Dict[Tuple[str, int], int] = {}
+        self._rejections: Dict[Tuple[str, str], int] = {}
+        self._gauges: List[Tuple[str, str, Callable[[], float]]] = []
+    
+    def start(self, operation: str) -> int:
+        """Count one call; returns its start time if it is sampled for latency, else 0"""
+        try:
+            counter = self._counters[operation]
+        except KeyError:
+            with self._lock:
+                counter = self._counters.setdefault(operation, itertools.count())
+        if next(counter) & self._sample_mask:
+            return 0
+        return perf_counter_ns()
+    
+    def observe(self, operation: str, start: int) -> None:
+        """Record the latency of a sampled call that completed"""
+        elapsed = perf_counter_ns() - start
+        with self._lock:
+            self._record(self._operations, operation, elapsed)
+    
+    def observe_request(self, route: str, status: int, start: int) -> None:
+        """Record an HTTP request by route template and response status"""
+        elapsed = perf_counter_ns() - start
+        key = (route, status)
+        with self._lock:
+            self._record(self._requests, route, elapsed)
+            self._responses[key] = self._responses.get(key, 0) + 1
+    
+    def rejected(self, operation: str, reason: str) -> None:
+        key = (operation, _reason_label(reason))
+        with self._lock:
+            if key not in self._rejections and len(self._rejections) >= MAX_REJECTION_SERIES:
+                key = (operation, "other")
+            self._rejections[key] = self._rejections.get(key, 0) + 1
+    
+    def add_gauge(self, name: str, help_text: str, read: Callable[[], float]) -> None:
+        """Report read() as a gauge each time metrics are rendered"""
+        self._gauges.append((name, help_text, read))
+    
+    @staticmethod
+    def _record(table: Dict[str, List[int]], key: str, elapsed: int) -> None:
+        row = table.get(key)
+        if row is None:
+            row = table[key] = [0] * _ROW_SIZE
+        row[elapsed.bit_length()] += 1
+        row[-1] += elapsed
+    
+    def operation_count(self, operation: str) -> int:
+        counter = self._counters.get(operation)
+        return _count_value(counter) if counter is not None else 0
+    
+    def sampled_count(self, operation: str) -> int:
+        with self._lock:
+            row = self._operations.get(operation)
+            return sum(row[:-1]) if row else 0
+    
+    def sampled_seconds(self, operation: str) -> float:
+        """Total latency recorded for an operation's sampled calls"""
+        with self._lock:
+            row = self._operations.get(operation)
+            return row[-1] / 1e9 if row else 0.0
+    
+    def rejection_count(self, operation: str, reason: str) -> int:
+        with self._lock:
+            return self._rejections.get((operation, _reason_label(reason)), 0)
+    
+    def render(self) -> str:
+        """Current values in the Prometheus text exposition format"""
+        with self._lock:
+            counts = {operation: _count_value(counter) for operation, counter in self._counters.items()}
+            operations = {key: list(row) for key, row in self._operations.items()}
+            requests = {key: list(row) for key, row in self._requests.items()}
+            responses = dict(self._responses)
+            rejections = dict(self._rejections)
+        
+        lines = ["# HELP axizulo_operations_total Bank operations attempted",
+                 "# TYPE axizulo_operations_total counter"]
+        lines += [f"axizulo_operations_total{{{_labels(operation=operation)}}} {count}"
+                  for operation, count in sorted(counts.items())]
+        self._render_histogram(lines, "axizulo_operation_duration_seconds",
+                               f"Time taken by completed bank operations, sampled 1 in {self._sample_every}",
+                               "operation", operations)
+        lines += ["# HELP axizulo_operation_rejections_total Bank operations refused, by reason",
+                  "# TYPE axizulo_operation_rejections_total counter"]
+        lines += [f"axizulo_operation_rejections_total{{{_labels(operation=operation, reason=reason)}}} {count}"
+                  for (operation, reason), count in sorted(rejections.items())]
+        self._render_histogram(lines, "axizulo_http_request_duration_seconds",
+                               "Time taken to handle HTTP requests, by route", "route", requests)
+        lines += ["# HELP axizulo_http_responses_total HTTP responses, by route and status",
+                  "# TYPE axizulo_http_responses_total counter"]
+        lines += [f"axizulo_http_responses_total{{{_labels(route=route, status=status)}}} {count}"
+                  for (route, status), count in sorted(responses.items())]
+        for name, help_text, read in self._gauges:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {read()}"]
+        return "\n".join(lines) + "\n"
+    
+    @staticmethod
+    def _render_histogram(lines: List[str], name: str, help_text: str, label: str,
+                          table: Dict[str, List[int]]) -> None:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for key, row in sorted(table.items()):
+            labels = _labels(**{label: key})
+            for bits, bound in zip(BUCKET_BITS, LATENCY_BUCKETS):
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {sum(row[:bits + 1])}')
+            count = sum(row[:-1])
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"{name}_sum{{{labels}}} {row[-1] / 1e9:.9f}")
+            lines.append(f"{name}_count{{{labels}}} {count}")
+
+
+# Standalone accounts report to this until a bank registers them
+disabled_metrics = Metrics(enabled=False)
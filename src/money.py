@@ -0,0 +1,144 @@
+import math
+from decimal import Decimal, ROUND_HALF_EVEN
+from typing import Union
+
+CENTS_PER_RAND = 100
+RATE_SCALE = 10_000  # Interest rates are held in ten-thousandths of a percent
+# Below this many cents a float rounds back to the exact cent when printed to 2 places
+_FLOAT_SAFE_CENTS = 2 ** 45
+
+Amount = Union['Money', int, float, str, Decimal]
+
+
+class Money(int):
+    """An amount of money in integer cents
+    
+    Money is a plain int underneath, so comparisons and hashing run at native
+    integer speed. Wrapping a count of cents in Money marks it as already
+    converted: ``to_cents`` passes it through unchanged instead of reading it
+    as whole rands, which is how the web and CLI layers hand parsed amounts to
+    the core. Adding, subtracting and negating (and so ``sum``) keep that mark;
+    other arithmetic returns plain ints.
+    """
+    
+    __slots__ = ()
+    
+    @classmethod
+    def parse(cls, text: str) -> 'Money':
+        """Parse user input such as "1234.5", "R 1,000.00" or "-3" """
+        return cls(parse_cents(text))
+    
+    @classmethod
+    def of(cls, amount: Amount) -> 'Money':
+        """Convert any supported amount to Money"""
+        return amount if type(amount) is cls else cls(to_cents(amount))
+    
+    def __add__(self, other):
+        result = int.__add__(self, other)
+        return result if result is NotImplemented else Money(result)
+    
+    def __radd__(self, other):
+        result = int.__radd__(self, other)
+        return result if result is NotImplemented else Money(result)
+    
+    def __sub__(self, other):
+        result = int.__sub__(self, other)
+        return result if result is NotImplemented else Money(result)
+    
+    def __rsub__(self, other):
+        result = int.__rsub__(self, other)
+        return result if result is NotImplemented else Money(result)
+    
+    def __neg__(self) -> 'Money':
+        return Money(int.__neg__(self))
+    
+    def __abs__(self) -> 'Money':
+        return Money(int.__abs__(self))
+    
+    def __str__(self) -> str:
+        return format_cents(self)
+    
+    def __repr__(self) -> str:
+        return f"Money('{format_cents(self)}')"
+
+
+def parse_cents(text: str) -> int:
+    """Parse a decimal string with at most two decimal places into cents"""
+    # Fast path for the common "1234.56" / "-1234.56" form sent by the web and CLI
+    if text[-3:-2] == "." and text.isascii():
+        digits = text.replace(".", "", 1)
+        if digits.isdigit() or (digits[:1] == "-" and digits[1:].isdigit()):
+            return int(digits)
+    
+    body = text.strip()
+    if body[:1] in ("R", "r"):
+        body = body[1:].lstrip()
+    body = body.replace(",", "")
+    
+    negative = body[:1] == "-"
+    if body[:1] in ("-", "+"):
+        body = body[1:]
+    
+    whole, _, fraction = body.partition(".")
+    digits = whole + fraction
+    if not digits or len(fraction) > 2 or not (digits.isascii() and digits.isdigit()):
+        raise ValueError(f"Invalid amount: {text!r}")
+    
+    cents = int(whole or "0") * CENTS_PER_RAND + (int(fraction.ljust(2, "0")) if fraction else 0)
+    return -cents if negative else cents
+
+
+def to_cents(amount: Amount) -> int:
+    """Convert an amount in rands to cents; Money values are already cents"""
+    kind = type(amount)
+    if kind is Money:
+        return amount
+    if kind is float:
+        if not math.isfinite(amount):
+            raise ValueError(f"Invalid amount: {amount}")
+        return round(amount * CENTS_PER_RAND)
+    if kind is int:
+        return amount * CENTS_PER_RAND
+    if kind is str:
+        return parse_cents(amount)
+    if isinstance(amount, Decimal):
+        if not amount.is_finite():
+            raise ValueError(f"Invalid amount: {amount}")
+        return int((amount * CENTS_PER_RAND).to_integral_value(ROUND_HALF_EVEN))
+    if isinstance(amount, int) and not isinstance(amount, bool):
+        return int(amount) * CENTS_PER_RAND
+    if isinstance(amount, float):
+        return to_cents(float(amount))
+    raise TypeError(f"Unsupported amount type: {kind.__name__}")
+
+
+def from_cents(cents: int) -> float:
+    """Cents as a float number of rands, for JSON and display"""
+    return cents / CENTS_PER_RAND
+
+
+def format_cents(cents: int) -> str:
+    """Format cents as rands with two decimals, e.g. -50050 -> "-500.50" """
+    if -_FLOAT_SAFE_CENTS < cents < _FLOAT_SAFE_CENTS:
+        return f"{cents / CENTS_PER_RAND:.2f}"
+    whole, fraction = divmod(-cents if cents < 0 else cents, CENTS_PER_RAND)
+    return f"{'-' if cents < 0 else ''}{whole}.{fraction:02d}"
+
+
+def div_round(numerator: int, denominator: int) -> int:
+    """Integer division rounded half to even (banker's rounding); denominator > 0"""
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and quotient & 1):
+        quotient += 1
+    return quotient
+
+
+def to_rate_units(rate: Union[int, float, str, Decimal]) -> int:
+    """Convert an annual percentage rate (e.g. 2.5) to integer rate units"""
+    return int((Decimal(str(rate)) * RATE_SCALE).to_integral_value(ROUND_HALF_EVEN))
+
+
+def monthly_interest_cents(balance: int, rate_units: int) -> int:
+    """One month of interest on a balance in cents, rounded half to even"""
+    return div_round(balance * rate_units, 100 * RATE_SCALE * 12)
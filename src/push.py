@@ -0,0 +1,163 @@
+import json
+import queue
+import threading
+from typing import Any, Callable, Dict, Optional, Set, TYPE_CHECKING
+from .events import (AccountClosed, AccountStatusChanged, BatchTransferCompleted, BulkImportCompleted,
+                     Deposited, InterestApplied, TransferCompleted, Withdrawn)
+
+if TYPE_CHECKING:
+    from .bank import AxizuloAfricanBank
+
+Deliver = Callable[[bytes], None]
+
+KEEPALIVE = b": keep-alive\n\n"  # SSE comment line; stops proxies closing idle streams
+
+# Events that can touch any number of accounts; every watched account is checked instead
+_BULK_EVENTS = (BatchTransferCompleted, InterestApplied, BulkImportCompleted)
+
+
+def sse_frame(event: str, payload: Dict[str, Any], event_id: Optional[int] = None) -> bytes:
+    """Encode one Server-Sent Events message"""
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n".encode('utf-8')
+
+
+class _Feed:
+    """What subscribers of one account were last sent, and who they are"""
+    
+    __slots__ = ("version", "length", "subscribers")
+    
+    def __init__(self, version: int, length: int):
+        self.version = version
+        self.length = length  # History length at the last update
+        self.subscribers: Set['Subscription'] = set()
+
+
+class Subscription:
+    """One open push channel; cancel() it when the client goes away"""
+    
+    def __init__(self, hub: 'PushHub', account_number: str, deliver: Deliver):
+        self._hub = hub
+        self.account_number = account_number
+        self.deliver = deliver
+    
+    def cancel(self) -> None:
+        self._hub._unsubscribe(self)
+
+
+class PushHub:
+    """Event sink that pushes balance and new-transaction deltas to subscribed sessions
+    
+    handle() runs on the publisher's thread and only queues the affected
+    account numbers. A dispatcher thread drains the queue, coalescing repeat
+    changes, and for each account with subscribers builds one delta: the
+    balance, status and version plus only the transactions posted since the
+    last update. It is serialized once as an SSE frame and handed to every
+    subscriber's deliver callback, which must not block (a queue put, or
+    ``loop.call_soon_threadsafe`` for asyncio servers). Idle subscribers cost
+    a set entry and nothing per posting.
+    """
+    
+    def __init__(self, bank: 'AxizuloAfricanBank'):
+        self._bank = bank
+        self._lock = threading.Lock()
+        self._feeds: Dict[str, _Feed] = {}
+        self._pending: 'queue.SimpleQueue[Optional[str]]' = queue.SimpleQueue()
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="push-dispatcher", daemon=True)
+        self._dispatcher.start()
+        bank.events.subscribe(self)
+    
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(feed.subscribers) for feed in self._feeds.values())
+    
+    def subscribe(self, account_number: str, deliver: Deliver) -> Optional[Subscription]:
+        """Start pushing an account's updates; the current state is delivered first
+        
+        Returns None when the account does not exist.
+        """
+        account = self._bank.get_account(account_number)
+        if account is None:
+            return None
+        subscription = Subscription(self, account_number, deliver)
+        with self._lock:
+            feed = self._feeds.get(account_number)
+            if feed is None:
+                with account._lock:
+                    feed = self._feeds[account_number] = _Feed(account.version, account.transaction_count)
+            feed.subscribers.add(subscription)
+            version = feed.version
+        deliver(sse_frame("balance", {'balance': account.balance, 'is_active': account.is_active}, version))
+        return subscription
+    
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            feed = self._feeds.get(subscription.account_number)
+            if feed is not None:
+                feed.subscribers.discard(subscription)
+                if not feed.subscribers:
+                    del self._feeds[subscription.account_number]
+    
+    # Event sink
+    def handle(self, event) -> None:
+        if isinstance(event, (Deposited, Withdrawn, AccountStatusChanged, AccountClosed)):
+            numbers = (event.account_number,)
+        elif isinstance(event, TransferCompleted):
+            numbers = (event.from_account, event.to_account)
+        elif isinstance(event, _BULK_EVENTS):
+            numbers = ("",)  # Check every watched account
+        else:
+            return
+        feeds = self._feeds
+        for number in numbers:
+            if not number or number in feeds:
+                self._pending.put(number)
+    
+    def close(self) -> None:
+        """Stop listening, deliver queued updates and stop the dispatcher"""
+        self._bank.events.unsubscribe(self)
+        self._pending.put(None)
+        self._dispatcher.join()
+    
+    def _dispatch_loop(self) -> None:
+        while True:
+            numbers = {self._pending.get()}
+            while True:
+                try:
+                    numbers.add(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            closing = None in numbers
+            numbers.discard(None)
+            if "" in numbers:
+                numbers = set(self._feeds)
+            for number in numbers:
+                self._push(number)
+            if closing:
+                return
+    
+    def _push(self, account_number: str) -> None:
+        """Send subscribers of one account everything that changed since their last update"""
+        account = self._bank.get_account(account_number)
+        with self._lock:
+            feed = self._feeds.get(account_number)
+            if feed is None or account is None:
+                return
+            with account._lock:
+                version = account.version
+                if version == feed.version:
+                    return
+                rows = account._rows[feed.length:]
+                balance, is_active = account.balance, account.is_active
+            feed.version, feed.length = version, feed.length + len(rows)
+            subscribers = list(feed.subscribers)
+        
+        transaction = account._store.transaction
+        frame = sse_frame("update", {
+            'balance': balance,
+            'is_active': is_active,
+            'transactions': [transaction(row).to_dict() for row in rows],
+        }, version)
+        for subscription in subscribers:
+            subscription.deliver(frame)
@@ -0,0 +1,227 @@
+import heapq
+import itertools
+import threading
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+from .account import INSUFFICIENT_FUNDS
+from .limits import LIMIT_REACHED
+from .money import Amount, Money, from_cents, to_cents
+from .store import from_micros, to_micros
+
+if TYPE_CHECKING:
+    from .bank import AxizuloAfricanBank
+
+
+def _transient(reason: str) -> bool:
+    """Whether a failed payment may succeed later: short of funds or over a velocity limit"""
+    return reason.startswith(INSUFFICIENT_FUNDS) or LIMIT_REACHED in reason
+
+
+class _Order:
+    """A scheduled payment; ``due`` is the occurrence being paid, ``run_at`` when it is next tried"""
+    
+    __slots__ = ("order_id", "from_account", "to_account", "amount", "due", "run_at", "every", "remaining",
+                 "attempts", "queued", "cancelled")
+    
+    def __init__(self, order_id: str, from_account: str, to_account: str, amount: int, due: int,
+                 every: Optional[int], remaining: Optional[int]):
+        self.order_id = order_id
+        self.from_account = from_account
+        self.to_account = to_account
+        self.amount = amount  # Cents
+        self.due = due  # Microseconds
+        self.run_at = due
+        self.every = every  # Microseconds; None for a one-off future-dated payment
+        self.remaining = remaining  # Payments left; None for no end
+        self.attempts = 0  # Failed tries of the current occurrence
+        self.queued = False
+        self.cancelled = False
+
+
+class Scheduler:
+    """Standing orders and future-dated payments, executed in bulk as they fall due
+    
+    Orders wait in a heap keyed by the time they are next tried, so a tick
+    pops just the due orders (O(log n) each) and never looks at the rest;
+    the due payments go to the bank as non-atomic ``transfer_batch`` calls
+    of up to ``batch_size`` items, one lock acquisition and ledger record
+    per batch instead of per payment. A payment refused for funds or a
+    velocity limit is retried ``retry_delay`` later, up to ``max_retries``
+    times; after that the occurrence is missed and a standing order moves
+    on to its next one. Any other refusal (an account gone or inactive)
+    cancels the order. An order that fell behind, say while nothing was
+    ticking, catches up one payment per tick.
+    
+    Orders are held in memory only and are not journaled with the bank's
+    ledger: after a restart the bank recovers its accounts but the
+    scheduler starts empty, so callers must keep their own record of
+    standing orders and schedule() them again. Call tick() from a job
+    runner, or start() a thread that ticks on an interval.
+    """
+    
+    def __init__(self, bank: 'AxizuloAfricanBank', max_retries: int = 3,
+                 retry_delay: timedelta = timedelta(hours=1), batch_size: int = 1000,
+                 clock: Callable[[], datetime] = datetime.now):
+        self._bank = bank
+        self._max_retries = max_retries
+        self._retry_delay = int(retry_delay.total_seconds() * 1_000_000)
+        self._batch_size = batch_size
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tick_lock = threading.Lock()  # One tick at a time
+        self._heap: List[tuple] = []  # (run_at, sequence, order)
+        self._sequence = itertools.count()
+        self._ids = itertools.count(1)
+        self._orders: Dict[str, _Order] = {}
+        self._dead = 0  # Cancelled orders still in the heap; they are skipped when popped
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._orders)
+    
+    def schedule(self, from_account_num: str, to_account_num: str, amount: Amount, first_due: datetime,
+                 every: Optional[timedelta] = None, times: Optional[int] = None) -> str:
+        """Add a payment due at first_due, repeating every interval if one is given, and return its order ID
+        
+        times caps the number of payments a standing order makes. Raises
+        ValueError for an invalid order. The order lasts only as long as this
+        scheduler; it is not recovered after a restart.
+        """
+        cents = to_cents(amount)
+        if cents <= 0:
+            raise ValueError("Payment amount must be positive.")
+        if from_account_num == to_account_num:
+            raise ValueError("Cannot transfer to the same account.")
+        if not self._bank.get_account(from_account_num) or not self._bank.get_account(to_account_num):
+            raise ValueError("One or both accounts not found.")
+        if every is not None and every <= timedelta(0):
+            raise ValueError("A standing order needs a positive interval.")
+        if times is not None and times < 1:
+            raise ValueError("A standing order must make at least one payment.")
+        
+        interval = int(every.total_seconds() * 1_000_000) if every is not None else None
+        with self._lock:
+            order = _Order(f"SO{next(self._ids):08d}", from_account_num, to_account_num, cents,
+                           to_micros(first_due), interval, 1 if interval is None else times)
+            self._orders[order.order_id] = order
+            self._push(order)
+        return order.order_id
+    
+    def cancel(self, order_id: str) -> bool:
+        """Cancel an order; a payment already being executed still goes through"""
+        with self._lock:
+            order = self._orders.pop(order_id, None)
+            if order is None:
+                return False
+            order.cancelled = True
+            if order.queued:
+                self._dead += 1
+                if self._dead > 64 and self._dead * 2 > len(self._heap):
+                    self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+                    heapq.heapify(self._heap)
+                    self._dead = 0
+            return True
+    
+    def get_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            order = self._orders.get(order_id)
+            if order is None:
+                return None
+            return {
+                'order_id': order.order_id,
+                'from_account': order.from_account,
+                'to_account': order.to_account,
+                'amount': from_cents(order.amount),
+                'next_due': from_micros(order.due),
+                'next_attempt': from_micros(order.run_at),
+                'every': timedelta(microseconds=order.every) if order.every is not None else None,
+                'remaining': order.remaining,
+                'attempts': order.attempts,
+            }
+    
+    def _push(self, order: _Order) -> None:
+        """Queue an order at its run_at time (caller holds the lock)"""
+        order.queued = True
+        heapq.heappush(self._heap, (order.run_at, next(self._sequence), order))
+    
+    def _pop_due(self, now: int) -> List[_Order]:
+        with self._lock:
+            heap = self._heap
+            due = []
+            while heap and heap[0][0] <= now:
+                order = heapq.heappop(heap)[2]
+                order.queued = False
+                if order.cancelled:
+                    self._dead -= 1
+                else:
+                    due.append(order)
+            return due
+    
+    def tick(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Execute every order due by now and report what happened to each"""
+        now_micros = to_micros(now or self._clock())
+        with self._tick_lock:
+            due = self._pop_due(now_micros)
+            counts = {'paid': 0, 'retrying': 0, 'missed': 0, 'cancelled': 0}
+            results: List[Dict[str, Any]] = []
+            for start in range(0, len(due), self._batch_size):
+                chunk = due[start:start + self._batch_size]
+                report = self._bank.transfer_batch(
+                    [(order.from_account, order.to_account, Money(order.amount)) for order in chunk], atomic=False)
+                with self._lock:
+                    for order, result in zip(chunk, report['results']):
+                        outcome = self._settle(order, result, now_micros)
+                        counts[outcome] += 1
+                        results.append({'order_id': order.order_id, 'success': result['success'],
+                                        'message': result['message'], 'outcome': outcome})
+        return {'due': len(due), **counts, 'results': results}
+    
+    def _settle(self, order: _Order, result: Dict[str, Any], now: int) -> str:
+        """Requeue or retire an order after a payment attempt (caller holds the lock)"""
+        if result['success']:
+            outcome = "paid"
+        elif not _transient(result['message']):
+            outcome = "cancelled"
+        elif order.attempts < self._max_retries:
+            order.attempts += 1
+            order.run_at = now + self._retry_delay
+            if not order.cancelled:
+                self._push(order)
+            return "retrying"
+        else:
+            outcome = "missed"
+        
+        order.attempts = 0
+        if order.remaining is not None and outcome == "paid":
+            order.remaining -= 1
+        if outcome == "cancelled" or order.every is None or order.remaining == 0:
+            if not order.cancelled:
+                order.cancelled = True
+                del self._orders[order.order_id]
+            return outcome
+        order.due += order.every
+        order.run_at = order.due
+        if not order.cancelled:
+            self._push(order)
+        return outcome
+    
+    def start(self, interval: float = 1.0) -> None:
+        """Tick on a background thread every interval seconds until stop()"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="scheduler", daemon=True)
+        self._thread.start()
+    
+    def _run(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.tick()
+    
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
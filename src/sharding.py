@@ -0,0 +1,293 @@
+import itertools
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from .account import ACCOUNT_NUMBER_WIDTH
+from .bank import AxizuloAfricanBank
+from .events import EventBus
+from .ids import IdAllocator
+from .ledger import Ledger
+from .money import Amount, from_cents, to_cents
+
+_account_numbers = IdAllocator(ACCOUNT_NUMBER_WIDTH)  # Only used to parse account numbers
+
+
+def shard_of(account_number: str, shards: int) -> Optional[int]:
+    """Index of the shard that owns an account number, or None if the number is malformed"""
+    seq = _account_numbers.parse(account_number)
+    return seq % shards if seq is not None else None
+
+
+# Operations a shard process answers; each takes the shard's bank and returns something picklable
+def _create_account(bank: AxizuloAfricanBank, account_holder: str, account_type: str, initial_deposit: Amount,
+                    options: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    account = bank.create_account(account_holder, account_type, initial_deposit, **options)
+    return account.get_account_info() if account is not None else None
+
+
+def _account_info(bank: AxizuloAfricanBank, account_number: str) -> Optional[Dict[str, Any]]:
+    account = bank.get_account(account_number)
+    return account.get_account_info() if account is not None else None
+
+
+def _deposit(bank: AxizuloAfricanBank, account_number: str, amount: Amount, description: str) -> bool:
+    account = bank.get_account(account_number)
+    return account is not None and account.deposit(amount, description)
+
+
+def _withdraw(bank: AxizuloAfricanBank, account_number: str, amount: Amount, description: str) -> bool:
+    account = bank.get_account(account_number)
+    return account is not None and account.withdraw(amount, description)
+
+
+def _totals(bank: AxizuloAfricanBank) -> Dict[str, int]:
+    owed = bank.in_flight_transfers()['owed']
+    return {'balance': bank.aggregates.total_balance, 'owed': sum(amount for _, _, amount in owed.values()),
+            'accounts': bank.get_account_count()}
+
+
+_OPERATIONS: Dict[str, Callable[..., Any]] = {
+    "create_account": _create_account,
+    "account_info": _account_info,
+    "deposit": _deposit,
+    "withdraw": _withdraw,
+    "transfer": AxizuloAfricanBank.transfer_funds,
+    "prepare_credit": AxizuloAfricanBank.prepare_credit,
+    "debit_transfer": AxizuloAfricanBank.debit_transfer,
+    "credit_transfer": AxizuloAfricanBank.credit_transfer,
+    "abort_credit": AxizuloAfricanBank.abort_credit,
+    "settle_transfer": AxizuloAfricanBank.settle_transfer,
+    "in_flight_transfers": AxizuloAfricanBank.in_flight_transfers,
+    "totals": _totals,
+    "checkpoint": AxizuloAfricanBank.checkpoint,
+}
+
+
+def _serve_shard(index: int, count: int, connection, directory: Optional[str], sync: bool, threads: int) -> None:
+    """Shard process: own one bank and answer (call_id, operation, args) requests until None arrives
+    
+    With threads, requests run on a pool so ledger commits from concurrent
+    calls share each fsync; without, they run in arrival order on this thread.
+    """
+    ledger = Ledger(os.path.join(directory, f"shard-{index}"), sync=sync) if directory is not None else None
+    bank = AxizuloAfricanBank(ledger=ledger, events=EventBus(), shard=(index, count))
+    send_lock = threading.Lock()
+    
+    def run(call_id: int, operation: str, args: tuple) -> None:
+        try:
+            reply = (call_id, _OPERATIONS[operation](bank, *args), None)
+        except Exception as error:
+            reply = (call_id, None, error)
+        with send_lock:
+            connection.send(reply)
+    
+    pool = ThreadPoolExecutor(threads, thread_name_prefix=f"shard-{index}") if threads else None
+    try:
+        while True:
+            request = connection.recv()
+            if request is None:
+                break
+            if pool is None:
+                run(*request)
+            else:
+                pool.submit(run, *request)
+    except EOFError:
+        pass  # The coordinator went away; close the ledger cleanly all the same
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        bank.close()
+        connection.close()
+
+
+class _ShardClient:
+    """Coordinator end of one shard process; any number of threads may have calls outstanding"""
+    
+    def __init__(self, context, index: int, count: int, directory: Optional[str], sync: bool, threads: int):
+        self.index = index
+        self._connection, worker_end = context.Pipe()
+        self._process = context.Process(target=_serve_shard, name=f"bank-shard-{index}", daemon=True,
+                                        args=(index, count, worker_end, directory, sync, threads))
+        self._process.start()
+        worker_end.close()
+        self._lock = threading.Lock()  # Serializes sends and guards _calls
+        self._calls: Dict[int, Future] = {}
+        self._call_ids = itertools.count()
+        self._stopped = False
+        self._receiver = threading.Thread(target=self._receive_loop, name=f"shard-{index}-replies", daemon=True)
+        self._receiver.start()
+    
+    def submit(self, operation: str, *args) -> Future:
+        future: Future = Future()
+        call_id = next(self._call_ids)
+        with self._lock:
+            if self._stopped:
+                raise RuntimeError(f"Shard {self.index} is not running.")
+            self._calls[call_id] = future
+            self._connection.send((call_id, operation, args))
+        return future
+    
+    def call(self, operation: str, *args) -> Any:
+        return self.submit(operation, *args).result()
+    
+    def _receive_loop(self) -> None:
+        while True:
+            try:
+                call_id, result, error = self._connection.recv()
+            except (EOFError, OSError):
+                break
+            with self._lock:
+                future = self._calls.pop(call_id)
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+        
+        with self._lock:
+            self._stopped = True
+            calls, self._calls = self._calls, {}
+        for future in calls.values():
+            future.set_exception(RuntimeError(f"Shard {self.index} stopped."))
+    
+    def close(self) -> None:
+        with self._lock:
+            if not self._stopped:
+                self._connection.send(None)
+        self._process.join()
+        self._receiver.join()
+        self._connection.close()
+
+
+class ShardedBank:
+    """Accounts partitioned by account number across worker processes, each owning a bank shard
+    
+    Every shard is an ``AxizuloAfricanBank`` in its own process, so shards
+    run on separate cores instead of sharing one GIL. Shard ``i`` issues the
+    account numbers whose sequence is ``i`` modulo the shard count, so any
+    number routes to its owner without a lookup table; new accounts go to
+    the shards in turn. Requests travel over one pipe per shard, and many
+    threads may have calls outstanding on each.
+    
+    A transfer within one shard is that shard's ``transfer_funds``. Across
+    shards it runs in two phases under a unique transfer ID: the destination
+    accepts the credit, then the source debits the funds, which commits the
+    transfer (if the source refuses, the destination drops it). The
+    destination then credits the funds and the source settles. With a
+    ``directory``, each shard journals every step in its own ledger, and on
+    start the coordinator finishes any committed transfer a crash
+    interrupted and drops the rest, so money is never lost or credited
+    twice. That guarantee needs ``sync=True``, and the directory must always
+    be opened with the same number of shards.
+    """
+    
+    def __init__(self, shards: int = 2, directory: Optional[str] = None, sync: bool = True,
+                 threads: Optional[int] = None):
+        if shards < 1:
+            raise ValueError("A sharded bank needs at least one shard.")
+        if threads is None:
+            threads = 8 if directory is not None else 0
+        # Spawned, not forked: a fork could inherit locks held by the coordinator's threads
+        context = multiprocessing.get_context("spawn")
+        self._shards = [_ShardClient(context, index, shards, directory, sync, threads) for index in range(shards)]
+        self._placement = itertools.count()
+        self._recovered_transfers = self._recover_transfers()
+    
+    @property
+    def shard_count(self) -> int:
+        return len(self._shards)
+    
+    @property
+    def recovered_transfers(self) -> int:
+        """Cross-shard transfers found half done at start and finished or dropped"""
+        return self._recovered_transfers
+    
+    def shard_for(self, account_number: str) -> Optional[int]:
+        return shard_of(account_number, len(self._shards))
+    
+    def _owner(self, account_number: str) -> Optional[_ShardClient]:
+        index = shard_of(account_number, len(self._shards))
+        return self._shards[index] if index is not None else None
+    
+    def create_account(self, account_holder: str, account_type: str = "savings",
+                       initial_deposit: Amount = 0.0, **kwargs) -> Optional[Dict[str, Any]]:
+        """Open an account on the next shard in turn; returns its details, or None if refused"""
+        shard = self._shards[next(self._placement) % len(self._shards)]
+        return shard.call("create_account", account_holder, account_type, initial_deposit, kwargs)
+    
+    def get_account_info(self, account_number: str) -> Optional[Dict[str, Any]]:
+        shard = self._owner(account_number)
+        return shard.call("account_info", account_number) if shard is not None else None
+    
+    def get_balance(self, account_number: str) -> Optional[float]:
+        info = self.get_account_info(account_number)
+        return info['balance'] if info is not None else None
+    
+    def deposit(self, account_number: str, amount: Amount, description: str = "Deposit") -> bool:
+        shard = self._owner(account_number)
+        return shard is not None and shard.call("deposit", account_number, amount, description)
+    
+    def withdraw(self, account_number: str, amount: Amount, description: str = "Withdrawal") -> bool:
+        shard = self._owner(account_number)
+        return shard is not None and shard.call("withdraw", account_number, amount, description)
+    
+    def transfer_funds(self, from_account_num: str, to_account_num: str, amount: Amount) -> bool:
+        """Transfer funds between any two accounts; True once the destination has been credited"""
+        source = self._owner(from_account_num)
+        destination = self._owner(to_account_num)
+        if source is None or destination is None:
+            return False
+        if source is destination:
+            return source.call("transfer", from_account_num, to_account_num, amount)
+        
+        amount = to_cents(amount)
+        transfer_id = uuid.uuid4().hex
+        if destination.call("prepare_credit", transfer_id, from_account_num, to_account_num, amount) is not None:
+            return False
+        if source.call("debit_transfer", transfer_id, from_account_num, to_account_num, amount) is not None:
+            destination.call("abort_credit", transfer_id)
+            return False
+        destination.call("credit_transfer", transfer_id)
+        source.call("settle_transfer", transfer_id)
+        return True
+    
+    def _recover_transfers(self) -> int:
+        """Finish cross-shard transfers that were debited and drop those that were not"""
+        in_flight = [shard.call("in_flight_transfers") for shard in self._shards]
+        accepted = {transfer_id: shard for shard, tables in zip(self._shards, in_flight)
+                    for transfer_id in tables['pending']}
+        resolved = 0
+        for shard, tables in zip(self._shards, in_flight):
+            for transfer_id in tables['owed']:
+                destination = accepted.pop(transfer_id, None)
+                if destination is not None:
+                    destination.call("credit_transfer", transfer_id)
+                shard.call("settle_transfer", transfer_id)  # Without a pending credit it was already made
+                resolved += 1
+        for transfer_id, destination in accepted.items():
+            destination.call("abort_credit", transfer_id)  # Accepted but never debited
+            resolved += 1
+        return resolved
+    
+    def _totals(self) -> List[Dict[str, int]]:
+        futures = [shard.submit("totals") for shard in self._shards]
+        return [future.result() for future in futures]
+    
+    def get_total_bank_balance(self) -> float:
+        """Balances on every shard plus credits still owed; exact while no transfer is in flight"""
+        return from_cents(sum(totals['balance'] + totals['owed'] for totals in self._totals()))
+    
+    def get_account_count(self) -> int:
+        return sum(totals['accounts'] for totals in self._totals())
+    
+    def checkpoint(self) -> List[Optional[int]]:
+        """Snapshot every shard's ledger"""
+        futures = [shard.submit("checkpoint") for shard in self._shards]
+        return [future.result() for future in futures]
+    
+    def close(self) -> None:
+        """Stop every shard process, closing its ledger"""
+        for shard in self._shards:
+            shard.close()
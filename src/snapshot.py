@@ -0,0 +1,244 @@
+import heapq
+import json
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+from .account import SavingsAccount
+from .store import COLUMNS, StringTable
+
+if TYPE_CHECKING:
+    from .bank import AxizuloAfricanBank
+
+MAGIC = b"AXZIMG01"
+_HEADER = struct.Struct("<8sQQ")  # Magic, then the offset and length of the JSON footer
+NUMBER_SIZE = 16  # Account numbers are stored NUL-padded, so byte order is string order
+# Number, type code, active flag, then balance, option, version, history run (offset, length) and holder (offset, length)
+_ACCOUNT = struct.Struct(f"<{NUMBER_SIZE}sBB6x7q")
+ACCOUNT_KINDS = ("savings", "current")
+
+
+class ImageAccount(NamedTuple):
+    """An account as a snapshot image holds it"""
+    account_number: str
+    account_type: str
+    is_active: bool
+    balance_cents: int
+    option: int  # Interest rate in rate units for savings, overdraft limit in cents for current accounts
+    version: int
+    rows_offset: int
+    rows_count: int
+    account_holder: str
+
+
+class SnapshotImage:
+    """A checkpoint of a bank in one binary file, read through mmap and never loaded whole
+    
+    Accounts are fixed-width records sorted by account number, so one is
+    found by binary search; each points to its history, a run of row numbers
+    in the transaction store. The store's columns follow in row order with
+    its dense ID -> row index, then holder names and descriptions as UTF-8
+    text with offset tables. A JSON footer holds the section offsets and
+    everything small: counts, the ledger sequence, bank-wide totals,
+    in-flight transfers and legacy transaction IDs. Opening an image only
+    reads the footer, so it costs the same however many accounts it holds;
+    pages are read from the page cache as accounts are used.
+    """
+    
+    SUFFIX = ".img"
+    
+    def __init__(self, path: str):
+        self._path = path
+        with open(path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, footer, length = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a snapshot image: {path}")
+        meta = json.loads(self._map[footer:footer + length])
+        view = memoryview(self._map)
+        sections = {name: view[start:start + size] for name, (start, size) in meta["sections"].items()}
+        
+        self.seq: int = meta["seq"]
+        self.row_count: int = meta["rows"]
+        self.id_count: int = meta["ids"]
+        self.last_id: int = meta["last_id"]
+        self.last_timestamp: int = meta["last_timestamp"]
+        self.last_account: int = meta["last_account"]
+        self.legacy_ids: List[str] = meta["legacy_ids"]
+        self.legacy_rows: Dict[str, int] = meta["legacy_rows"]
+        self.aggregates: Dict[str, Any] = meta["aggregates"]
+        self.transfers: Dict[str, Dict[str, list]] = meta["transfers"]
+        self.columns = {name: sections[name].cast(typecode) for name, typecode in COLUMNS.items()}
+        self.id_rows = sections["id_index"].cast('q')
+        self._count = meta["accounts"]
+        self._accounts = meta["sections"]["accounts"][0]
+        self._rows = sections["rows"].cast('q')
+        self._holders = sections["holders"]
+        self._description_offsets = sections["description_offsets"].cast('q')
+        self._description_text = sections["description_text"]
+        self._views = [view, *sections.values(), *self.columns.values(), self.id_rows, self._rows,
+                       self._description_offsets]
+    
+    @property
+    def path(self) -> str:
+        return self._path
+    
+    @property
+    def description_count(self) -> int:
+        return len(self._description_offsets) - 1
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def _number_at(self, position: int) -> bytes:
+        start = self._accounts + position * _ACCOUNT.size
+        return self._map[start:start + NUMBER_SIZE]
+    
+    def find(self, account_number: str) -> Optional[int]:
+        """Position of an account's record, or None; O(log n) over the mapped records"""
+        key = account_number.encode("utf-8")
+        if len(key) > NUMBER_SIZE:
+            return None
+        key = key.ljust(NUMBER_SIZE, b"\0")
+        position = bisect_left(range(self._count), key, key=self._number_at)
+        return position if position < self._count and self._number_at(position) == key else None
+    
+    def record(self, position: int) -> ImageAccount:
+        number, kind, active, balance, option, version, rows_offset, rows_count, holder_offset, holder_length = \
+            _ACCOUNT.unpack_from(self._map, self._accounts + position * _ACCOUNT.size)
+        holder = self._holders[holder_offset:holder_offset + holder_length].tobytes().decode("utf-8")
+        return ImageAccount(number.rstrip(b"\0").decode("utf-8"), ACCOUNT_KINDS[kind], bool(active), balance,
+                            option, version, rows_offset, rows_count, holder)
+    
+    def records(self) -> Iterator[ImageAccount]:
+        """Every account, in account number order"""
+        for position in range(self._count):
+            yield self.record(position)
+    
+    def history(self, record: ImageAccount) -> memoryview:
+        """An account's history row numbers, straight from the map"""
+        return self._rows[record.rows_offset:record.rows_offset + record.rows_count]
+    
+    def rows(self, record: ImageAccount) -> array:
+        """A copy of an account's history row numbers, for an account being hydrated"""
+        rows = array('q')
+        rows.frombytes(self.history(record).cast("B"))
+        return rows
+    
+    def strings(self, extra: List[str]) -> StringTable:
+        """The image's descriptions followed by extra, as a description table"""
+        return StringTable(self._description_offsets, self._description_text, extra)
+    
+    def close(self) -> None:
+        """Unmap the file; left to the garbage collector while a reader still holds a view"""
+        for view in reversed(self._views):
+            view.release()
+        try:
+            self._map.close()
+        except BufferError:
+            pass
+
+
+# (record, its history) where the history is a copy for resident accounts and None for ones left in the image
+_Entry = Tuple[ImageAccount, Optional[array]]
+
+
+def capture(bank: 'AxizuloAfricanBank') -> Dict[str, Any]:
+    """Copy what an image needs from a bank that must hold every account lock
+    
+    Only resident accounts are copied. Dormant ones are unchanged since the
+    bank's current image, and store rows never change once written, so the
+    rest is read from the image and the store after the locks are released.
+    """
+    accounts: Dict[str, _Entry] = {}
+    with bank._hydrate_lock:
+        resident = list(bank._accounts.values())
+        image = bank._image
+    for account in resident:
+        savings = isinstance(account, SavingsAccount)
+        rows = account._rows[:]
+        record = ImageAccount(account.account_number, ACCOUNT_KINDS[not savings], account.is_active,
+                              account.balance_cents,
+                              account._interest_rate if savings else account._overdraft_limit,
+                              account.version, 0, len(rows), account.account_holder)
+        accounts[account.account_number] = (record, rows)
+    return {
+        'accounts': accounts,
+        'image': image,
+        'store': bank._transactions.cut(),
+        'aggregates': bank.aggregates.to_dict(),
+        'last_account': bank._account_numbers.last_seq,
+    }
+
+
+def _entries(cut: Dict[str, Any]) -> Iterator[_Entry]:
+    """Resident and dormant accounts merged in account number order"""
+    accounts, image = cut['accounts'], cut['image']
+    resident = (accounts[number] for number in sorted(accounts))
+    if image is None:
+        return resident
+    dormant = ((record, None) for record in image.records() if record.account_number not in accounts)
+    return heapq.merge(resident, dormant, key=lambda entry: entry[0].account_number.encode("utf-8"))
+
+
+def _write_section(handle: BinaryIO, sections: Dict[str, List[int]], name: str,
+                   chunks: Iterable[Union[bytes, memoryview]]) -> None:
+    start = handle.tell()
+    for chunk in chunks:
+        handle.write(chunk)
+    sections[name] = [start, handle.tell() - start]
+    handle.write(b"\0" * (-handle.tell() % 8))  # Keep every section 8-byte aligned
+
+
+def write_image(path: str, seq: int, cut: Dict[str, Any], transfers: Dict[str, Dict[str, tuple]],
+                bank: 'AxizuloAfricanBank') -> None:
+    """Write a captured bank to path as a snapshot image and fsync it"""
+    store, image, counts = bank._transactions, cut['image'], cut['store']
+    sections: Dict[str, List[int]] = {}
+    
+    def histories() -> Iterator[Union[array, memoryview]]:
+        for record, rows in _entries(cut):
+            yield rows if rows is not None else image.history(record)
+    
+    def records() -> Iterator[bytes]:
+        rows_offset = holder_offset = 0
+        for record, _ in _entries(cut):
+            number = record.account_number.encode("utf-8")
+            if len(number) > NUMBER_SIZE:
+                raise ValueError(f"Account number too long for a snapshot image: {record.account_number}")
+            holder_length = len(record.account_holder.encode("utf-8"))
+            yield _ACCOUNT.pack(number, ACCOUNT_KINDS.index(record.account_type), record.is_active,
+                                record.balance_cents, record.option, record.version, rows_offset,
+                                record.rows_count, holder_offset, holder_length)
+            rows_offset += record.rows_count
+            holder_offset += holder_length
+    
+    with open(path, "wb") as handle:
+        handle.write(b"\0" * _HEADER.size)
+        _write_section(handle, sections, "rows", histories())
+        _write_section(handle, sections, "holders",
+                       (record.account_holder.encode("utf-8") for record, _ in _entries(cut)))
+        _write_section(handle, sections, "accounts", records())
+        count = sections["accounts"][1] // _ACCOUNT.size
+        for name in COLUMNS:
+            _write_section(handle, sections, name, store.column_chunks(name, counts['rows']))
+        _write_section(handle, sections, "id_index", store.id_index_chunks(counts['ids']))
+        offsets, text = store.descriptions(counts['descriptions'])
+        _write_section(handle, sections, "description_offsets", [offsets])
+        _write_section(handle, sections, "description_text", [text])
+        
+        footer = json.dumps({
+            "seq": seq, "accounts": count, "rows": counts['rows'], "ids": counts['ids'],
+            "last_id": counts['last_id'], "last_timestamp": counts['last_timestamp'],
+            "last_account": cut['last_account'], "legacy_ids": counts['legacy_ids'],
+            "legacy_rows": counts['legacy_rows'], "aggregates": cut['aggregates'], "transfers": transfers,
+            "sections": sections,
+        }, separators=(",", ":")).encode("utf-8")
+        position = handle.tell()
+        handle.write(footer)
+        handle.seek(0)
+        handle.write(_HEADER.pack(MAGIC, position, len(footer)))
+        handle.flush()
+        os.fsync(handle.fileno())
@@ -0,0 +1,193 @@
+import multiprocessing
+import os
+import time
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+from .indexes import ACCOUNT_TYPES
+from .money import format_cents
+from .store import from_micros, to_micros
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+if TYPE_CHECKING:
+    from .account import Account
+    from .bank import AxizuloAfricanBank
+
+INTEREST_DESCRIPTION = "Monthly interest"  # Description the bank gives interest postings
+RULE = "=" * 72
+THIN_RULE = "-" * 72
+
+
+@dataclass(frozen=True)
+class Statement:
+    """One account's activity over a period; money in integer cents"""
+    account_number: str
+    account_holder: str
+    account_type: str
+    start: datetime
+    end: datetime  # Exclusive
+    opening_balance: int
+    closing_balance: int
+    interest: int
+    transactions: List[Tuple[str, str, int, str, int]]  # As TransactionStore.record()
+
+
+def month_period(year: int, month: int) -> Tuple[datetime, datetime]:
+    """Start and (exclusive) end of a calendar month"""
+    start = datetime(year, month, 1)
+    end = datetime(year + month // 12, month % 12 + 1, 1)
+    return start, end
+
+
+def build_statement(account: 'Account', start: datetime, end: datetime,
+                    row_limit: Optional[int] = None) -> Statement:
+    """Build an account's statement for [start, end) from its history
+    
+    History is ordered by time, so the period is found by binary search and
+    the opening balance is the running balance kept on the row before it.
+    Rows at or past row_limit (a store length noted earlier) are ignored.
+    """
+    store = account._store
+    rows = account._rows
+    if row_limit is not None:
+        rows = rows[:bisect_left(rows, row_limit)]
+    first = bisect_left(rows, to_micros(start), key=store.timestamp)
+    last = bisect_left(rows, to_micros(end), key=store.timestamp)
+    
+    opening = store.balance(rows[first - 1]) if first else 0
+    transactions = [store.record(row) for row in rows[first:last]]
+    closing = opening
+    interest = 0
+    for _, transaction_type, amount, description, _ in transactions:
+        if transaction_type == "deposit":
+            closing += amount
+            if description == INTEREST_DESCRIPTION:
+                interest += amount
+        else:
+            closing -= amount
+    
+    return Statement(account.account_number, account.account_holder, ACCOUNT_TYPES[account.__class__.__name__],
+                     start, end, opening, closing, interest, transactions)
+
+
+def render_statement(statement: Statement, bank_name: str = "Axizulo African Bank") -> str:
+    """Render a statement as plain text"""
+    last_day = statement.end - timedelta(microseconds=1)
+    lines = [
+        RULE,
+        f"{bank_name} - Account Statement",
+        f"Account: {statement.account_number} ({statement.account_type.title()})",
+        f"Holder:  {statement.account_holder}",
+        f"Period:  {statement.start:%Y-%m-%d} to {last_day:%Y-%m-%d}",
+        THIN_RULE,
+        f"{'Opening balance':58s}R{format_cents(statement.opening_balance):>13s}",
+    ]
+    balance = statement.opening_balance
+    for transaction_id, transaction_type, amount, description, timestamp in statement.transactions:
+        signed = amount if transaction_type == "deposit" else -amount
+        balance += signed
+        lines.append(f"{from_micros(timestamp):%Y-%m-%d %H:%M}  {transaction_id:12s}  {description[:18]:18s}"
+                     f"{'+' if signed > 0 else '-'}R{format_cents(amount):>11s} R{format_cents(balance):>13s}")
+    lines += [
+        THIN_RULE,
+        f"{'Interest earned':58s}R{format_cents(statement.interest):>13s}",
+        f"{'Closing balance':58s}R{format_cents(statement.closing_balance):>13s}",
+        "",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+# Work shared with forked worker processes, which inherit it instead of receiving a copy per task
+_job: Dict[str, Any] = {}
+
+
+def _render_chunk(first: int, last: int) -> Tuple[str, int, int]:
+    """Render the statements of accounts[first:last]; returns (text, accounts, transactions)"""
+    accounts, row_limit, start, end, bank_name = (_job["accounts"], _job["row_limit"], _job["start"],
+                                                  _job["end"], _job["bank_name"])
+    parts = []
+    transactions = 0
+    for account in accounts[first:last]:
+        statement = build_statement(account, start, end, row_limit)
+        parts.append(render_statement(statement, bank_name))
+        transactions += len(statement.transactions)
+    return "".join(parts), last - first, transactions
+
+
+def generate_statements(bank: 'AxizuloAfricanBank', start: datetime, end: datetime, path: str,
+                        workers: Optional[int] = None, chunk_size: int = 1000) -> Dict[str, Any]:
+    """Render every account's statement for [start, end) into one text file
+    
+    Accounts are split into chunks rendered by a pool of forked worker
+    processes (one per core by default; workers=0, or a platform without
+    fork, renders in this process). The writer keeps only a small window of
+    chunks in flight and writes them in account order as they complete, so
+    memory stays bounded however many accounts there are. Like an export,
+    every statement stops at the same consistent cut, taken by briefly
+    holding all account locks. Returns the counts, elapsed time, throughput
+    and peak resident memory of the run.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if "fork" not in multiprocessing.get_all_start_methods():
+        workers = 0
+    
+    with bank.locks.acquire_all():
+        row_limit = len(bank._transactions)
+        accounts = bank.get_all_accounts()
+    
+    began = time.perf_counter()
+    totals = [0, 0]
+    
+    def write(result: Tuple[str, int, int]) -> None:
+        text, count, transactions = result
+        output.write(text)
+        totals[0] += count
+        totals[1] += transactions
+    
+    chunks = ((first, min(first + chunk_size, len(accounts))) for first in range(0, len(accounts), chunk_size))
+    _job.update(accounts=accounts, row_limit=row_limit, start=start, end=end, bank_name=bank.name)
+    pool = None
+    try:
+        with open(path, "w", encoding="utf-8") as output:
+            if workers == 0:
+                for chunk in chunks:
+                    write(_render_chunk(*chunk))
+            else:
+                pool = multiprocessing.get_context("fork").Pool(workers)
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.apply_async(_render_chunk, chunk))
+                    if len(pending) >= 2 * workers:
+                        write(pending.popleft().get())
+                while pending:
+                    write(pending.popleft().get())
+    finally:
+        if pool is not None:
+            pool.terminate()  # Every result has been collected, unless an error cut the run short
+            pool.join()
+        _job.clear()
+    
+    elapsed = time.perf_counter() - began
+    return {
+        "accounts": totals[0],
+        "transactions": totals[1],
+        "workers": workers,
+        "seconds": elapsed,
+        "accounts_per_sec": totals[0] / elapsed if elapsed else 0.0,
+        "peak_rss_kb": _peak_rss_kb(),
+    }
+
+
+def _peak_rss_kb() -> Optional[int]:
+    """Largest resident set of this process or any worker (KiB on Linux; None where unsupported)"""
+    if resource is None:
+        return None
+    return max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
@@ -0,0 +1,495 @@
+import abc
+import os
+import sqlite3
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from .account import (ACCOUNT_NUMBER_WIDTH, INSUFFICIENT_FUNDS, CurrentAccount, SavingsAccount, _decode_cursor,
+                      _encode_cursor)
+from .bank import AxizuloAfricanBank
+from .ids import IdAllocator
+from .money import Amount, Money, RATE_SCALE, format_cents, from_cents, to_cents, to_rate_units
+from .store import TransactionStore, from_micros, to_micros
+from .transaction import Transaction
+
+
+class Storage(abc.ABC):
+    """Where the web handlers keep accounts
+    
+    The handlers in api.py and app.py only go through this interface, so
+    the backend can change without them. ``MemoryStorage``, the default,
+    keeps accounts in an ``AxizuloAfricanBank`` in this process, with its
+    ledger, push updates and metrics. ``SQLiteStorage`` keeps them in one
+    database file that every worker process shares. Account details follow
+    ``Account.get_account_info()``, plus ``interest_rate`` or
+    ``overdraft_limit`` by account type. A backend must implement every
+    abstract method before it can be instantiated.
+    """
+    
+    # ETag epoch shared by every process using this storage; None for a per-process one
+    epoch: Optional[str] = None
+    
+    @abc.abstractmethod
+    def create_account(self, account_holder: str, account_type: str = "savings",
+                       initial_deposit: Amount = 0.0, **options) -> Optional[str]:
+        """Open an account; returns its number, or None if it was refused"""
+        raise NotImplementedError
+    
+    @abc.abstractmethod
+    def account_info(self, account_number: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+    
+    @abc.abstractmethod
+    def version(self, account_number: str) -> Optional[int]:
+        """The account's version (see ``Account.version``), or None if there is no such account"""
+        raise NotImplementedError
+    
+    @abc.abstractmethod
+    def deposit(self, account_number: str, amount: Amount, description: str = "Deposit") -> Optional[float]:
+        """Deposit and return the new balance, or None if the deposit was refused"""
+        raise NotImplementedError
+    
+    @abc.abstractmethod
+    def withdraw(self, account_number: str, amount: Amount, description: str = "Withdrawal") -> Optional[float]:
+        """Withdraw and return the new balance, or None if the withdrawal was refused"""
+        raise NotImplementedError
+    
+    @abc.abstractmethod
+    def transfer(self, from_account_num: str, to_account_num: str, amount: Amount) -> bool:
+        raise NotImplementedError
+    
+    @abc.abstractmethod
+    def transfer_batch(self, transfers: Iterable[Tuple[str, str, Amount]], atomic: bool = True) -> Dict[str, Any]:
+        """Apply (from, to, amount) transfers, reporting like ``AxizuloAfricanBank.transfer_batch``"""
+        raise NotImplementedError
+    
+    @abc.abstractmethod
+    def transactions(self, account_number: str) -> List[Transaction]:
+        """Full history, oldest first"""
+        raise NotImplementedError
+    
+    @abc.abstractmethod
+    def recent_transactions(self, account_number: str, count: int = 5) -> List[Transaction]:
+        """The last count transactions, oldest first"""
+        raise NotImplementedError
+    
+    @abc.abstractmethod
+    def transaction_page(self, account_number: str, limit: int = 50, cursor: Optional[str] = None,
+                         since: Optional[datetime] = None,
+                         until: Optional[datetime] = None) -> Tuple[List[Transaction], Optional[str]]:
+        """One page of history, newest first, plus the cursor for the next (older) page"""
+        raise NotImplementedError
+    
+    @abc.abstractmethod
+    def close(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryStorage(Storage):
+    """The default backend: accounts live in an AxizuloAfricanBank in this process"""
+    
+    def __init__(self, bank: AxizuloAfricanBank):
+        self._bank = bank
+    
+    @property
+    def bank(self) -> AxizuloAfricanBank:
+        return self._bank
+    
+    def create_account(self, account_holder: str, account_type: str = "savings",
+                       initial_deposit: Amount = 0.0, **options) -> Optional[str]:
+        account = self._bank.create_account(account_holder, account_type, initial_deposit, **options)
+        return account.account_number if account is not None else None
+    
+    def account_info(self, account_number: str) -> Optional[Dict[str, Any]]:
+        account = self._bank.get_account(account_number)
+        if account is None:
+            return None
+        info = account.get_account_info()
+        if isinstance(account, SavingsAccount):
+            info['interest_rate'] = account.interest_rate
+        elif isinstance(account, CurrentAccount):
+            info['overdraft_limit'] = account.overdraft_limit
+        return info
+    
+    def version(self, account_number: str) -> Optional[int]:
+        account = self._bank.get_account(account_number)
+        return account.version if account is not None else None
+    
+    def deposit(self, account_number: str, amount: Amount, description: str = "Deposit") -> Optional[float]:
+        account = self._bank.get_account(account_number)
+        if account is None or not account.deposit(amount, description):
+            return None
+        return account.balance
+    
+    def withdraw(self, account_number: str, amount: Amount, description: str = "Withdrawal") -> Optional[float]:
+        account = self._bank.get_account(account_number)
+        if account is None or not account.withdraw(amount, description):
+            return None
+        return account.balance
+    
+    def transfer(self, from_account_num: str, to_account_num: str, amount: Amount) -> bool:
+        return self._bank.transfer_funds(from_account_num, to_account_num, amount)
+    
+    def transfer_batch(self, transfers: Iterable[Tuple[str, str, Amount]], atomic: bool = True) -> Dict[str, Any]:
+        return self._bank.transfer_batch(transfers, atomic=atomic)
+    
+    def transactions(self, account_number: str) -> List[Transaction]:
+        account = self._bank.get_account(account_number)
+        return account.get_transaction_history() if account is not None else []
+    
+    def recent_transactions(self, account_number: str, count: int = 5) -> List[Transaction]:
+        account = self._bank.get_account(account_number)
+        return account.get_recent_transactions(count) if account is not None else []
+    
+    def transaction_page(self, account_number: str, limit: int = 50, cursor: Optional[str] = None,
+                         since: Optional[datetime] = None,
+                         until: Optional[datetime] = None) -> Tuple[List[Transaction], Optional[str]]:
+        account = self._bank.get_account(account_number)
+        if account is None:
+            return [], None
+        return account.get_transaction_page(limit, cursor, since, until)
+    
+    def close(self) -> None:
+        self._bank.close()
+
+
+_account_numbers = IdAllocator(ACCOUNT_NUMBER_WIDTH)
+_transaction_ids = IdAllocator(TransactionStore.ID_WIDTH)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS accounts (
+    seq INTEGER PRIMARY KEY,
+    holder TEXT NOT NULL,
+    type TEXT NOT NULL,
+    balance INTEGER NOT NULL,
+    interest_rate INTEGER,
+    overdraft_limit INTEGER,
+    active INTEGER NOT NULL,
+    version INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    seq INTEGER PRIMARY KEY,
+    account INTEGER NOT NULL REFERENCES accounts (seq),
+    type TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    description TEXT NOT NULL,
+    timestamp INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transactions_by_account ON transactions (account, seq);
+"""
+
+# Every statement is a fixed string with ? parameters, so each connection
+# compiles it once and reuses the prepared statement from its cache
+_INSERT_ACCOUNT = ("INSERT INTO accounts (holder, type, balance, interest_rate, overdraft_limit, active, version) "
+                   "VALUES (?, ?, 0, ?, ?, 1, 0)")
+_SELECT_ACCOUNT = ("SELECT holder, type, balance, interest_rate, overdraft_limit, active, version "
+                   "FROM accounts WHERE seq = ?")
+_SELECT_VERSION = "SELECT version FROM accounts WHERE seq = ?"
+_SELECT_FOR_POSTING = "SELECT type, balance, overdraft_limit, active FROM accounts WHERE seq = ?"
+_ADJUST_BALANCE = "UPDATE accounts SET balance = balance + ?, version = version + 1 WHERE seq = ?"
+_INSERT_TRANSACTION = ("INSERT INTO transactions (account, type, amount, description, timestamp) "
+                       "VALUES (?, ?, ?, ?, ?)")
+_SELECT_HISTORY = "SELECT seq, type, amount, description, timestamp FROM transactions WHERE account = ? ORDER BY seq"
+_SELECT_RECENT = ("SELECT seq, type, amount, description, timestamp FROM transactions WHERE account = ? "
+                  "ORDER BY seq DESC LIMIT ?")
+_SELECT_PAGE = ("SELECT seq, type, amount, description, timestamp FROM transactions "
+                "WHERE account = ? AND seq < ? AND timestamp BETWEEN ? AND ? ORDER BY seq DESC LIMIT ?")
+
+_NO_CURSOR = 2 ** 63 - 1  # Beyond every transaction seq and timestamp
+
+
+def _transaction(row: Tuple[int, str, int, str, int]) -> Transaction:
+    seq, transaction_type, amount, description, timestamp = row
+    return Transaction(_transaction_ids.format(seq), transaction_type, Money(amount), description,
+                       from_micros(timestamp))
+
+
+def _deposit_error(active: int, amount: int) -> Optional[str]:
+    """Same rules and reasons as Account._check_deposit"""
+    if not active:
+        return "Account is inactive. Cannot deposit."
+    if amount <= 0:
+        return "Deposit amount must be positive."
+    return None
+
+
+def _withdrawal_error(account_type: str, balance: int, overdraft_limit: Optional[int], active: int,
+                      amount: int) -> Optional[str]:
+    """Same rules and reasons as SavingsAccount and CurrentAccount._check_withdrawal"""
+    if not active:
+        return "Account is inactive. Cannot withdraw."
+    if amount <= 0:
+        return "Withdrawal amount must be positive."
+    if account_type == "current":
+        available = balance + overdraft_limit
+        if amount > available:
+            return f"{INSUFFICIENT_FUNDS} Available: R{format_cents(available)}"
+    elif amount > balance:
+        return INSUFFICIENT_FUNDS
+    return None
+
+
+class SQLiteStorage(Storage):
+    """Accounts in an embedded SQLite database that several worker processes can share
+    
+    The database runs in WAL mode, so readers never wait for the writer and
+    a commit appends to the log instead of rewriting pages. Each thread
+    lazily opens its own connection and keeps it; SQLite connections are
+    not safe to share between threads. Every change runs in one ``BEGIN
+    IMMEDIATE`` transaction that takes the write lock before reading the
+    balances it checks, so a transfer debits and credits atomically and two
+    processes can never both spend the same funds. Writers in this process
+    queue on a lock first; those in other processes wait up to
+    ``busy_timeout`` seconds for SQLite's. With
+    ``sync=True`` every commit is fsynced; with ``sync=False`` the last
+    commits can be lost on power failure, though never half applied.
+    """
+    
+    def __init__(self, path: str, sync: bool = True, busy_timeout: float = 5.0):
+        self._path = path
+        self._sync = sync
+        self._busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Writers in this process queue here rather than in SQLite's busy handler, which polls with sleeps
+        self._write_lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        with self._transaction() as connection:
+            for statement in _SCHEMA.split(";"):
+                if statement.strip():
+                    connection.execute(statement)
+            connection.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('epoch', ?)", (os.urandom(4).hex(),))
+            self.epoch = connection.execute("SELECT value FROM meta WHERE key = 'epoch'").fetchone()[0]
+    
+    @property
+    def path(self) -> str:
+        return self._path
+    
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Autocommit mode: transactions are begun explicitly, as BEGIN IMMEDIATE
+            connection = sqlite3.connect(self._path, timeout=self._busy_timeout, isolation_level=None,
+                                         check_same_thread=False, cached_statements=64)
+            connection.execute(f"PRAGMA synchronous={'FULL' if self._sync else 'NORMAL'}")
+            with self._lock:
+                self._connections.append(connection)
+            self._local.connection = connection
+        return connection
+    
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connection()
+        with self._write_lock:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+    
+    @staticmethod
+    def _post(connection: sqlite3.Connection, account: int, transaction_type: str, amount: int,
+              description: str, timestamp: int) -> None:
+        connection.execute(_INSERT_TRANSACTION, (account, transaction_type, amount, description, timestamp))
+        connection.execute(_ADJUST_BALANCE, (amount if transaction_type == "deposit" else -amount, account))
+    
+    def create_account(self, account_holder: str, account_type: str = "savings",
+                       initial_deposit: Amount = 0.0, **options) -> Optional[str]:
+        account_holder = account_holder.strip()
+        initial_deposit = to_cents(initial_deposit)
+        account_type = account_type.lower()
+        if not account_holder or initial_deposit < 0 or account_type not in ("savings", "current"):
+            return None
+        
+        interest_rate = to_rate_units(options.get('interest_rate', 2.5)) if account_type == "savings" else None
+        overdraft_limit = to_cents(options.get('overdraft_limit', 1000.0)) if account_type == "current" else None
+        with self._transaction() as connection:
+            seq = connection.execute(_INSERT_ACCOUNT, (account_holder, account_type, interest_rate,
+                                                       overdraft_limit)).lastrowid
+            if initial_deposit > 0:
+                self._post(connection, seq, "deposit", initial_deposit, "Initial deposit", to_micros(datetime.now()))
+        return _account_numbers.format(seq)
+    
+    def account_info(self, account_number: str) -> Optional[Dict[str, Any]]:
+        seq = _account_numbers.parse(account_number)
+        row = self._connection().execute(_SELECT_ACCOUNT, (seq,)).fetchone() if seq is not None else None
+        if row is None:
+            return None
+        holder, account_type, balance, interest_rate, overdraft_limit, active, _ = row
+        info = {
+            'account_number': account_number,
+            'account_holder': holder,
+            'balance': from_cents(balance),
+            'is_active': bool(active),
+            'account_type': "SavingsAccount" if account_type == "savings" else "CurrentAccount",
+        }
+        if account_type == "savings":
+            info['interest_rate'] = interest_rate / RATE_SCALE
+        else:
+            info['overdraft_limit'] = from_cents(overdraft_limit)
+        return info
+    
+    def version(self, account_number: str) -> Optional[int]:
+        seq = _account_numbers.parse(account_number)
+        row = self._connection().execute(_SELECT_VERSION, (seq,)).fetchone() if seq is not None else None
+        return row[0] if row is not None else None
+    
+    def deposit(self, account_number: str, amount: Amount, description: str = "Deposit") -> Optional[float]:
+        return self._post_one(account_number, "deposit", to_cents(amount), description)
+    
+    def withdraw(self, account_number: str, amount: Amount, description: str = "Withdrawal") -> Optional[float]:
+        return self._post_one(account_number, "withdrawal", to_cents(amount), description)
+    
+    def _post_one(self, account_number: str, transaction_type: str, amount: int,
+                  description: str) -> Optional[float]:
+        seq = _account_numbers.parse(account_number)
+        if seq is None:
+            return None
+        with self._transaction() as connection:
+            row = connection.execute(_SELECT_FOR_POSTING, (seq,)).fetchone()
+            if row is None:
+                return None
+            account_type, balance, overdraft_limit, active = row
+            if transaction_type == "deposit":
+                error = _deposit_error(active, amount)
+            else:
+                error = _withdrawal_error(account_type, balance, overdraft_limit, active, amount)
+            if error:
+                return None
+            self._post(connection, seq, transaction_type, amount, description, to_micros(datetime.now()))
+        return from_cents(balance + amount if transaction_type == "deposit" else balance - amount)
+    
+    def _transfer_error(self, connection: sqlite3.Connection, from_seq: Optional[int], to_seq: Optional[int],
+                        amount: int, check_funds: bool = True) -> Optional[str]:
+        """Same checks and reasons as AxizuloAfricanBank.transfer_funds, inside a write transaction"""
+        source = connection.execute(_SELECT_FOR_POSTING, (from_seq,)).fetchone() if from_seq is not None else None
+        destination = connection.execute(_SELECT_FOR_POSTING, (to_seq,)).fetchone() if to_seq is not None else None
+        if source is None or destination is None:
+            return "One or both accounts not found."
+        if not source[3] or not destination[3]:
+            return "One or both accounts are inactive."
+        if amount <= 0:
+            return "Transfer amount must be positive."
+        return _withdrawal_error(*source, amount) if check_funds else None
+    
+    def _apply_transfer(self, connection: sqlite3.Connection, from_account_num: str, to_account_num: str,
+                        amount: int, timestamp: int) -> None:
+        self._post(connection, _account_numbers.parse(from_account_num), "withdrawal", amount,
+                   f"Transfer to {to_account_num}", timestamp)
+        self._post(connection, _account_numbers.parse(to_account_num), "deposit", amount,
+                   f"Transfer from {from_account_num}", timestamp)
+    
+    def transfer(self, from_account_num: str, to_account_num: str, amount: Amount) -> bool:
+        amount = to_cents(amount)
+        with self._transaction() as connection:
+            if self._transfer_error(connection, _account_numbers.parse(from_account_num),
+                                    _account_numbers.parse(to_account_num), amount):
+                return False
+            self._apply_transfer(connection, from_account_num, to_account_num, amount, to_micros(datetime.now()))
+        return True
+    
+    def transfer_batch(self, transfers: Iterable[Tuple[str, str, Amount]], atomic: bool = True) -> Dict[str, Any]:
+        transfers = [(from_account_num, to_account_num, to_cents(amount))
+                     for from_account_num, to_account_num, amount in transfers]
+        results: List[Dict[str, Any]] = []
+        timestamp = to_micros(datetime.now())
+        with self._transaction() as connection:
+            # Per-item mode checks funds as it goes; atomic mode checks them on the net
+            for index, (from_account_num, to_account_num, amount) in enumerate(transfers):
+                error = self._transfer_error(connection, _account_numbers.parse(from_account_num),
+                                             _account_numbers.parse(to_account_num), amount, check_funds=not atomic)
+                if error is None and from_account_num == to_account_num:
+                    error = "Cannot transfer to the same account."
+                results.append({'index': index, 'success': error is None, 'message': error or "Transferred"})
+                if error is None and not atomic:
+                    self._apply_transfer(connection, from_account_num, to_account_num, amount, timestamp)
+            
+            if atomic and self._check_batch(connection, transfers, results):
+                for from_account_num, to_account_num, amount in transfers:
+                    self._apply_transfer(connection, from_account_num, to_account_num, amount, timestamp)
+        applied = sum(result['success'] for result in results)
+        failed = len(results) - applied
+        return {'success': failed == 0, 'applied': applied, 'failed': failed, 'results': results}
+    
+    @staticmethod
+    def _check_batch(connection: sqlite3.Connection, transfers: List[Tuple[str, str, int]],
+                     results: List[Dict[str, Any]]) -> bool:
+        """Same netting and reasons as AxizuloAfricanBank._apply_batch; return whether every item can apply"""
+        # All-or-nothing: net the batch so each account only has to cover its
+        # overall debit, and apply nothing unless every item can be applied
+        net: Dict[str, int] = defaultdict(int)
+        for result, (from_account_num, to_account_num, amount) in zip(results, transfers):
+            if result['success']:
+                net[from_account_num] -= amount
+                net[to_account_num] += amount
+        
+        shortfalls = {}
+        for account_number, movement in net.items():
+            if movement < 0:
+                source = connection.execute(_SELECT_FOR_POSTING, (_account_numbers.parse(account_number),)).fetchone()
+                error = _withdrawal_error(*source, -movement)
+                if error:
+                    shortfalls[account_number] = error
+        
+        for result, (from_account_num, _, _) in zip(results, transfers):
+            if result['success'] and from_account_num in shortfalls:
+                result['success'] = False
+                result['message'] = shortfalls[from_account_num]
+        
+        if all(result['success'] for result in results):
+            return True
+        for result in results:
+            if result['success']:
+                result['success'] = False
+                result['message'] = "Batch rejected."
+        return False
+    
+    def transactions(self, account_number: str) -> List[Transaction]:
+        seq = _account_numbers.parse(account_number)
+        if seq is None:
+            return []
+        return [_transaction(row) for row in self._connection().execute(_SELECT_HISTORY, (seq,))]
+    
+    def recent_transactions(self, account_number: str, count: int = 5) -> List[Transaction]:
+        seq = _account_numbers.parse(account_number)
+        if seq is None or count <= 0:
+            return []
+        rows = self._connection().execute(_SELECT_RECENT, (seq, count)).fetchall()
+        return [_transaction(row) for row in reversed(rows)]
+    
+    def transaction_page(self, account_number: str, limit: int = 50, cursor: Optional[str] = None,
+                         since: Optional[datetime] = None,
+                         until: Optional[datetime] = None) -> Tuple[List[Transaction], Optional[str]]:
+        if limit <= 0:
+            raise ValueError("Page limit must be positive.")
+        seq = _account_numbers.parse(account_number)
+        if seq is None:
+            return [], None
+        # The cursor is the seq of the oldest row already returned
+        before = _decode_cursor(cursor) if cursor is not None else _NO_CURSOR
+        rows = self._connection().execute(_SELECT_PAGE, (
+            seq, before, to_micros(since) if since else 0, to_micros(until) if until else _NO_CURSOR, limit + 1,
+        )).fetchall()
+        next_cursor = _encode_cursor(rows[limit - 1][0]) if len(rows) > limit else None
+        return [_transaction(row) for row in rows[:limit]], next_cursor
+    
+    def close(self) -> None:
+        """Close every thread's connection"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
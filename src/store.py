@@ -0,0 +1,472 @@
+import struct
+import threading
+import time
+from array import array
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple, Union
+from .ids import IdAllocator
+from .money import Money
+from .tiering import Segments
+from .transaction import Transaction
+
+if TYPE_CHECKING:
+    from .snapshot import SnapshotImage
+
+TRANSACTION_TYPES = ("deposit", "withdrawal")
+TYPE_CODES = {name: code for code, name in enumerate(TRANSACTION_TYPES)}
+
+# Typecode of each column; the cold tier keeps one fixed-width segment per column
+COLUMNS = {"ids": "q", "types": "b", "amounts": "q", "timestamps": "q", "descriptions": "i", "balances": "q"}
+_CELLS = {name: struct.Struct(typecode) for name, typecode in COLUMNS.items()}
+_ROW = _CELLS["ids"]
+
+
+def to_micros(timestamp: datetime) -> int:
+    """Convert a naive local datetime to integer microseconds since the epoch"""
+    return int(timestamp.replace(microsecond=0).timestamp()) * 1_000_000 + timestamp.microsecond
+
+
+def from_micros(micros: int) -> datetime:
+    """Convert integer microseconds since the epoch to a naive local datetime"""
+    seconds, microsecond = divmod(micros, 1_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=microsecond)
+
+
+class _Columns:
+    """The typed arrays holding a store's in-memory rows, which start at row ``base``"""
+    
+    __slots__ = ("base", "ids", "types", "amounts", "timestamps", "descriptions", "balances")
+    
+    def __init__(self, base: int = 0):
+        self.base = base
+        self.ids = array(COLUMNS["ids"])  # Sequence number, or -1 - index into the legacy ID table
+        self.types = array(COLUMNS["types"])
+        self.amounts = array(COLUMNS["amounts"])  # Cents
+        self.timestamps = array(COLUMNS["timestamps"])
+        self.descriptions = array(COLUMNS["descriptions"])
+        self.balances = array(COLUMNS["balances"])  # The account's balance in cents once the row was applied
+    
+    def after(self, count: int) -> '_Columns':
+        """A copy without the first count rows"""
+        columns = _Columns(self.base + count)
+        for name in COLUMNS:
+            setattr(columns, name, getattr(self, name)[count:])
+        return columns
+
+
+class _IdIndex:
+    """In-memory part of the dense id -> row index, covering sequence numbers from ``base`` on"""
+    
+    __slots__ = ("base", "rows")
+    
+    def __init__(self, base: int = 0, rows: Optional[array] = None):
+        self.base = base
+        self.rows = rows if rows is not None else array('q', [-1])  # -1 where unused
+
+
+class StringTable:
+    """A snapshot image's strings, decoded from the map when read, followed by strings added since"""
+    
+    def __init__(self, offsets: memoryview, text: memoryview, extra: Optional[List[str]] = None):
+        self._offsets = offsets  # Byte offset of each string in text, plus the end of the last
+        self._text = text
+        self._count = len(offsets) - 1
+        self._extra = extra if extra is not None else []
+    
+    def __len__(self) -> int:
+        return self._count + len(self._extra)
+    
+    def __getitem__(self, index: int) -> str:
+        if index < self._count:
+            return self._text[self._offsets[index]:self._offsets[index + 1]].tobytes().decode("utf-8")
+        return self._extra[index - self._count]
+    
+    def append(self, text: str) -> None:
+        self._extra.append(text)
+    
+    @staticmethod
+    def dump(strings: Union['StringTable', List[str]], count: int) -> Tuple[array, bytes]:
+        """The first count strings as (offsets, UTF-8 text), copying image strings without decoding them"""
+        offsets = array('q', [0])
+        parts = []
+        first = 0
+        if isinstance(strings, StringTable):
+            first = min(count, strings._count)
+            offsets = array('q', strings._offsets[:first + 1])
+            parts.append(strings._text[:offsets[-1]].tobytes())
+        position = offsets[-1]
+        for index in range(first, count):
+            data = strings[index].encode("utf-8")
+            position += len(data)
+            offsets.append(position)
+            parts.append(data)
+        return offsets, b"".join(parts)
+
+
+class TransactionStore:
+    """Columnar, array-backed storage for transactions shared across a bank
+    
+    Each transaction is one row spread over typed arrays (id, type code,
+    amount in integer cents, timestamp in microseconds, an interned
+    description id and the account's running balance after it), which costs a few dozen bytes instead of a full
+    ``Transaction`` object.
+    ``Transaction`` instances are only built when a row is read.
+    
+    Transaction IDs are sequence numbers issued by the store itself (12 digits
+    including a check digit), and a dense id -> row array resolves any ID in
+    O(1). IDs from older ledgers (six random hex digits) are kept in a side
+    table so they still resolve.
+    
+    Given a cold directory, the store is tiered: once twice ``hot_rows`` rows
+    are in memory, all but the newest ``hot_rows`` are moved to append-only
+    per-column segment files and read back through mmap. The id -> row index
+    is tiered the same way by sequence number. Row numbers never change, so
+    nothing that refers to a row notices which tier it is in.
+    
+    Below both sits an optional snapshot image (``attach_image``): the
+    columns, ID index and descriptions of rows up to a checkpoint, mapped
+    from the image file. Rows are written to an image in row order, so
+    switching to a newer image only drops the hot rows it now covers.
+    """
+    
+    ID_WIDTH = 11
+    HOT_ROWS = 1 << 20
+    
+    def __init__(self, cold_directory: Optional[str] = None, hot_rows: Optional[int] = None):
+        self._lock = threading.Lock()
+        self._last_timestamp = 0
+        self._id_allocator = IdAllocator(self.ID_WIDTH)
+        self._id_index = _IdIndex()
+        self._legacy_ids: List[str] = []
+        self._legacy_rows: Dict[str, int] = {}
+        # Swapped whole when rows move to the cold tier, so lock-free readers see one consistent set
+        self._hot = _Columns()
+        self._cold: Optional[Dict[str, Segments]] = None
+        self._cold_index: Optional[Segments] = None
+        self._image: Optional['SnapshotImage'] = None
+        # Row and sequence number of the first cold segment record, when an image sits below the segments
+        self._cold_shift = 0
+        self._id_shift = 0
+        if cold_directory is not None:
+            self._cold = {name: Segments(cold_directory, name, array(typecode).itemsize)
+                          for name, typecode in COLUMNS.items()}
+            self._cold_index = Segments(cold_directory, "id-index", _ROW.size)
+        self._hot_rows = hot_rows or self.HOT_ROWS
+        self._description_table: Union[List[str], StringTable] = []
+        self._description_ids: Dict[str, int] = {}  # Only for descriptions added since the image
+    
+    def __len__(self) -> int:
+        hot = self._hot
+        return hot.base + len(hot.ids)
+    
+    @property
+    def cold_rows(self) -> int:
+        """Number of rows held in the cold tier"""
+        return self._hot.base
+    
+    def append(self, transaction_type: str, amount: int, description: str,
+               timestamp: Optional[int] = None, transaction_id: Optional[str] = None, balance: int = 0) -> int:
+        """Append a transaction row and return its row number
+        
+        A new ID is allocated unless transaction_id is given (ledger replay).
+        balance is the account's balance in cents with this row applied.
+        """
+        type_code = TYPE_CODES[transaction_type]
+        
+        with self._lock:
+            hot = self._hot
+            row = hot.base + len(hot.ids)
+            seq = self._assign_id(transaction_id, row)
+            # Keep fresh timestamps monotonic so history can be binary searched by time
+            if timestamp is None:
+                timestamp = max(time.time_ns() // 1000, self._last_timestamp)
+            self._last_timestamp = max(self._last_timestamp, timestamp)
+            description_id = self._intern(description)
+            
+            hot.ids.append(seq)
+            hot.types.append(type_code)
+            hot.amounts.append(amount)
+            hot.timestamps.append(timestamp)
+            hot.descriptions.append(description_id)
+            hot.balances.append(balance)
+            if self._cold is not None and len(hot.ids) >= 2 * self._hot_rows:
+                self._spill()
+        return row
+    
+    def append_many(self, transaction_type: str, amounts: List[int], description: str,
+                    timestamps: Optional[List[int]] = None, balances: Optional[List[int]] = None) -> int:
+        """Append rows sharing a type and description; return the first row number
+        
+        Without timestamps the rows are stamped now. Given timestamps are kept
+        as they are and leave the store's clock alone, so a backdated batch
+        never moves later fresh rows.
+        """
+        type_code = TYPE_CODES[transaction_type]
+        count = len(amounts)
+        
+        with self._lock:
+            if timestamps is None:
+                timestamp = max(time.time_ns() // 1000, self._last_timestamp)
+                self._last_timestamp = timestamp
+                timestamps = array('q', [timestamp]) * count
+            
+            description_id = self._intern(description)
+            hot = self._hot
+            first_row = hot.base + len(hot.ids)
+            first_seq = self._id_allocator.reserve(count)
+            self._index(first_seq, first_row, count)
+            hot.ids.extend(range(first_seq, first_seq + count))
+            hot.types.extend(array('b', [type_code]) * count)
+            hot.amounts.extend(amounts)
+            hot.timestamps.extend(timestamps)
+            hot.descriptions.extend(array('i', [description_id]) * count)
+            hot.balances.extend(balances if balances is not None else array('q', [0]) * count)
+            if self._cold is not None and len(hot.ids) >= 2 * self._hot_rows:
+                self._spill()
+        return first_row
+    
+    def _spill(self) -> None:
+        """Move all but the newest hot_rows rows to the cold segments (caller holds the lock)"""
+        hot = self._hot
+        count = len(hot.ids) - self._hot_rows
+        for name, segments in self._cold.items():
+            segments.append(getattr(hot, name)[:count].tobytes())
+        self._hot = hot.after(count)
+    
+    def _cold_value(self, name: str, row: int) -> int:
+        """Read one column of a row below the hot columns, from the image or the cold segments"""
+        image = self._image
+        if image is not None and row < image.row_count:
+            return image.columns[name][row]
+        mapping, offset = self._cold[name].view(row - self._cold_shift)
+        return _CELLS[name].unpack_from(mapping, offset)[0]
+    
+    def attach_image(self, image: 'SnapshotImage') -> None:
+        """Read the rows, IDs and descriptions an image holds from it
+        
+        An empty store (recovery) starts after the image. Otherwise the image
+        was just written from this store and repeats rows it already has, so
+        the hot rows and IDs it covers are dropped and the cold segments only
+        serve what lies above it.
+        """
+        with self._lock:
+            if self._image is not None and image.row_count < self._image.row_count:
+                raise ValueError("Snapshot image is older than the one attached.")
+            hot, index = self._hot, self._id_index
+            cold_rows = len(self._cold["ids"]) if self._cold is not None else 0
+            cold_ids = len(self._cold_index) if self._cold_index is not None else 0
+            if len(self) == 0:
+                self._legacy_ids = list(image.legacy_ids)
+                self._legacy_rows = dict(image.legacy_rows)
+            self._id_allocator.observe(image.last_id)
+            self._last_timestamp = max(self._last_timestamp, image.last_timestamp)
+            
+            count = image.description_count
+            table = self._description_table
+            self._description_table = image.strings([table[i] for i in range(count, len(table))])
+            self._description_ids = {text: i for text, i in self._description_ids.items() if i >= count}
+            # Readers check the image first, so it goes in before the rows it covers leave the hot tier
+            self._image = image
+            if hot.base <= image.row_count:
+                self._hot = hot.after(image.row_count - hot.base) if len(self) else _Columns(image.row_count)
+                self._cold_shift = image.row_count - cold_rows
+            if index.base <= image.id_count:
+                self._id_index = _IdIndex(image.id_count, index.rows[image.id_count - index.base:])
+                self._id_shift = image.id_count - cold_ids
+    
+    def cut(self) -> Dict[str, Any]:
+        """Row, ID and description counts to write to an image (caller holds every account lock)"""
+        with self._lock:
+            index = self._id_index
+            return {
+                'rows': len(self),
+                'ids': index.base + len(index.rows),
+                'descriptions': len(self._description_table),
+                'legacy_ids': self._legacy_ids[:],
+                'legacy_rows': dict(self._legacy_rows),
+                'last_id': self._id_allocator.last_seq,
+                'last_timestamp': self._last_timestamp,
+            }
+    
+    def column_chunks(self, name: str, count: int) -> Iterator[Union[bytes, memoryview]]:
+        """The raw cells of one column for rows up to count, from whichever tier holds them"""
+        image, hot, shift = self._image, self._hot, self._cold_shift
+        position = 0
+        if image is not None:
+            position = min(count, image.row_count)
+            yield image.columns[name][:position]
+        while position < min(count, hot.base):
+            take = min(count, hot.base) - position
+            yield self._cold[name].read(position - shift, take)
+            position += take
+        if position < count:
+            yield getattr(hot, name)[position - hot.base:count - hot.base].tobytes()
+    
+    def id_index_chunks(self, count: int) -> Iterator[Union[bytes, memoryview]]:
+        """The dense ID -> row index for sequence numbers below count"""
+        image, index, shift = self._image, self._id_index, self._id_shift
+        position = 0
+        if image is not None:
+            position = min(count, image.id_count)
+            yield image.id_rows[:position]
+        if position < min(count, index.base):
+            yield self._cold_index.read(position - shift, min(count, index.base) - position)
+            position = min(count, index.base)
+        if position < count:
+            yield index.rows[position - index.base:count - index.base].tobytes()
+    
+    def descriptions(self, count: int) -> Tuple[array, bytes]:
+        """The first count descriptions as (offsets, UTF-8 text)"""
+        return StringTable.dump(self._description_table, count)
+    
+    def close(self) -> None:
+        """Release the cold segments, if any"""
+        if self._cold is not None:
+            for segments in self._cold.values():
+                segments.close()
+            self._cold_index.close()
+    
+    def _assign_id(self, transaction_id: Optional[str], row: int) -> int:
+        """Allocate or register the ID of a new row and index it (caller holds the lock)"""
+        if transaction_id is None:
+            seq = self._id_allocator.next_seq()
+        else:
+            seq = self._id_allocator.parse(transaction_id)
+            if seq is None:
+                # Legacy random IDs can repeat; the first row keeps the ID
+                self._legacy_rows.setdefault(transaction_id, row)
+                self._legacy_ids.append(transaction_id)
+                return -len(self._legacy_ids)
+            if self._row_for(seq) >= 0:
+                raise ValueError(f"Duplicate transaction ID: {transaction_id}")
+            self._id_allocator.observe(seq)
+        self._index(seq, row, 1)
+        return seq
+    
+    def _index(self, first_seq: int, first_row: int, count: int) -> None:
+        """Point count consecutive IDs at consecutive rows (caller holds the lock)"""
+        index = self._id_index
+        if first_seq < index.base:
+            image = self._image
+            if image is not None and first_seq < image.id_count:
+                raise ValueError("Transaction ID is older than the snapshot image.")
+            # Replayed or imported IDs below the in-memory range are patched in the cold tier
+            cold = min(count, index.base - first_seq)
+            self._cold_index.update(first_seq - self._id_shift,
+                                    array('q', range(first_row, first_row + cold)).tobytes())
+            first_seq, first_row, count = first_seq + cold, first_row + cold, count - cold
+            if not count:
+                return
+        rows = index.rows
+        start = first_seq - index.base
+        end = start + count
+        if len(rows) < end:
+            rows.extend(array('q', [-1]) * (end - len(rows)))
+        if count == 1:
+            rows[start] = first_row
+        else:
+            rows[start:end] = array('q', range(first_row, first_row + count))
+        if self._cold_index is not None and len(rows) >= 2 * self._hot_rows:
+            spilled = len(rows) - self._hot_rows
+            self._cold_index.append(rows[:spilled].tobytes())
+            self._id_index = _IdIndex(index.base + spilled, rows[spilled:])
+    
+    def _row_for(self, seq: int) -> int:
+        """Row of a sequence number, or -1"""
+        index = self._id_index
+        i = seq - index.base
+        if i >= 0:
+            return index.rows[i] if i < len(index.rows) else -1
+        image = self._image
+        if image is not None and seq < image.id_count:
+            return image.id_rows[seq]
+        mapping, offset = self._cold_index.view(seq - self._id_shift)
+        return _ROW.unpack_from(mapping, offset)[0]
+    
+    def find(self, transaction_id: str) -> Optional[int]:
+        """Return the row holding a transaction ID in O(1), or None"""
+        seq = self._id_allocator.parse(transaction_id)
+        if seq is None:
+            return self._legacy_rows.get(transaction_id)
+        row = self._row_for(seq)
+        return row if row >= 0 else None
+    
+    def _intern(self, description: str) -> int:
+        """Return the id of a description, adding it to the table (caller holds the lock)"""
+        description_id = self._description_ids.get(description)
+        if description_id is None:
+            description_id = len(self._description_table)
+            self._description_table.append(description)
+            self._description_ids[description] = description_id
+        return description_id
+    
+    def _format_id(self, seq: int) -> str:
+        return self._id_allocator.format(seq) if seq > 0 else self._legacy_ids[-1 - seq]
+    
+    # Column accessors; rows before the hot columns' base are read from the cold tier
+    def transaction_id(self, row: int) -> str:
+        hot = self._hot
+        i = row - hot.base
+        return self._format_id(hot.ids[i] if i >= 0 else self._cold_value("ids", row))
+    
+    def transaction_type(self, row: int) -> str:
+        hot = self._hot
+        i = row - hot.base
+        return TRANSACTION_TYPES[hot.types[i] if i >= 0 else self._cold_value("types", row)]
+    
+    def amount(self, row: int) -> int:
+        hot = self._hot
+        i = row - hot.base
+        return hot.amounts[i] if i >= 0 else self._cold_value("amounts", row)
+    
+    def signed_amount(self, row: int) -> int:
+        """Amount with withdrawals negative, as applied to the balance"""
+        hot = self._hot
+        i = row - hot.base
+        if i >= 0:
+            return -hot.amounts[i] if hot.types[i] else hot.amounts[i]
+        amount = self._cold_value("amounts", row)
+        return -amount if self._cold_value("types", row) else amount
+    
+    def description(self, row: int) -> str:
+        hot = self._hot
+        i = row - hot.base
+        return self._description_table[hot.descriptions[i] if i >= 0 else self._cold_value("descriptions", row)]
+    
+    def timestamp(self, row: int) -> int:
+        hot = self._hot
+        i = row - hot.base
+        return hot.timestamps[i] if i >= 0 else self._cold_value("timestamps", row)
+    
+    def balance(self, row: int) -> int:
+        """The account's balance in cents right after this row was applied"""
+        hot = self._hot
+        i = row - hot.base
+        return hot.balances[i] if i >= 0 else self._cold_value("balances", row)
+    
+    def _fields(self, row: int) -> Tuple[int, int, int, int, int]:
+        """(id column, amount, timestamp, description id, type code) of a row in either tier"""
+        hot = self._hot
+        i = row - hot.base
+        if i < 0:
+            value = self._cold_value
+            return (value("ids", row), value("amounts", row), value("timestamps", row),
+                    value("descriptions", row), value("types", row))
+        return hot.ids[i], hot.amounts[i], hot.timestamps[i], hot.descriptions[i], hot.types[i]
+    
+    def record(self, row: int) -> Tuple[str, str, int, str, int]:
+        """Return (transaction_id, type, amount_cents, description, timestamp_us) for a row"""
+        seq, amount, timestamp, description_id, type_code = self._fields(row)
+        return (self._format_id(seq), TRANSACTION_TYPES[type_code], amount,
+                self._description_table[description_id], timestamp)
+    
+    def transaction(self, row: int) -> Transaction:
+        """Materialize a row as a Transaction object"""
+        seq, amount, timestamp, description_id, type_code = self._fields(row)
+        return Transaction(
+            transaction_id=self._format_id(seq),
+            transaction_type=TRANSACTION_TYPES[type_code],
+            amount=Money(amount),
+            description=self._description_table[description_id],
+            timestamp=from_micros(timestamp)
+        )
@@ -0,0 +1,201 @@
+import glob
+import mmap
+import os
+import struct
+import threading
+from array import array
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+ROW = struct.Struct("q")  # A row number, in the same native layout as array('q')
+
+
+class Segments:
+    """Append-only fixed-width records spread over segment files and read through mmap
+    
+    Record i lives in file ``i // segment_records``. Writes go through a normal
+    file handle; readers map a segment when they first reach it and remap it
+    only when it has grown past the mapped length, so cold reads touch the
+    page cache instead of process memory. The files are scratch space: the
+    ledger stays the durable record, so any segments left by an earlier run
+    are deleted on open.
+    """
+    
+    SEGMENT_RECORDS = 1 << 22
+    
+    def __init__(self, directory: str, name: str, record_size: int, segment_records: Optional[int] = None):
+        self._directory = directory
+        self._name = name
+        self._record_size = record_size
+        self._segment_records = segment_records or self.SEGMENT_RECORDS
+        self._lock = threading.Lock()
+        self._count = 0
+        self._writer = None  # Handle of the last segment, which takes appends
+        self._maps: List[Optional[Tuple[mmap.mmap, int]]] = []  # Per segment: (map, records mapped)
+        os.makedirs(directory, exist_ok=True)
+        for path in glob.glob(os.path.join(directory, f"{name}-*.seg")):
+            os.remove(path)
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    @property
+    def record_size(self) -> int:
+        return self._record_size
+    
+    def append(self, data: bytes) -> int:
+        """Append whole records and return the index of the first"""
+        size = self._record_size
+        with self._lock:
+            first = self._count
+            view = memoryview(data)
+            while view:
+                segment, offset = divmod(self._count, self._segment_records)
+                if offset == 0:
+                    self._open_segment(segment)
+                room = (self._segment_records - offset) * size
+                self._writer.write(view[:room])
+                self._count += len(view[:room]) // size
+                view = view[room:]
+            self._writer.flush()  # Make the records visible to readers' maps
+        return first
+    
+    def update(self, index: int, data: bytes) -> None:
+        """Overwrite records in place from index on; readers' maps see the change"""
+        size = self._record_size
+        with self._lock:
+            view = memoryview(data)
+            while view:
+                segment, offset = divmod(index, self._segment_records)
+                room = (self._segment_records - offset) * size
+                fd = os.open(self._path(segment), os.O_WRONLY)
+                try:
+                    os.pwrite(fd, view[:room], offset * size)
+                finally:
+                    os.close(fd)
+                index += len(view[:room]) // size
+                view = view[room:]
+    
+    def _open_segment(self, segment: int) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._writer = open(self._path(segment), "wb")
+        self._maps.append(None)
+    
+    def _path(self, segment: int) -> str:
+        return os.path.join(self._directory, f"{self._name}-{segment:06d}.seg")
+    
+    def view(self, index: int) -> Tuple[mmap.mmap, int]:
+        """Return (map, byte offset) of record index, mapping its segment if needed"""
+        segment, offset = divmod(index, self._segment_records)
+        mapped = self._maps[segment]
+        if mapped is None or offset >= mapped[1]:
+            with self._lock:
+                mapped = self._maps[segment]
+                if mapped is None or offset >= mapped[1]:
+                    with open(self._path(segment), "rb") as handle:
+                        mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+                    # The old map, if any, is released once no reader still holds it
+                    mapped = self._maps[segment] = (mapping, len(mapping) // self._record_size)
+        return mapped[0], offset * self._record_size
+    
+    def read(self, first: int, count: int) -> bytes:
+        """Return count consecutive records starting at first as bytes"""
+        parts = []
+        while count > 0:
+            mapping, offset = self.view(first)
+            take = min(count, self._segment_records - first % self._segment_records)
+            parts.append(mapping[offset:offset + take * self._record_size])
+            first += take
+            count -= take
+        return b"".join(parts)
+    
+    def close(self) -> None:
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            self._maps = [None] * len(self._maps)
+
+
+class TieredRows:
+    """An account's history row numbers, with only the most recent kept in memory
+    
+    Behaves like the ``array('q')`` it replaces for what accounts and readers
+    use: len(), indexing, slicing with step 1, iteration and append (bisect
+    works through indexing). Once more than twice ``keep`` rows are in memory,
+    all but the last ``keep`` are appended to a shared row segment as one
+    extent. The whole state is swapped in one assignment, so readers that do
+    not hold the account lock always see a consistent history.
+    """
+    
+    def __init__(self, segments: Segments, keep: int, rows: Iterable[int] = ()):
+        self._segments = segments
+        self._keep = max(1, keep)
+        # (start positions of the cold extents, their first records, cold row count, hot rows)
+        self._state: Tuple[array, array, int, array] = (array('q'), array('q'), 0, array('q', rows))
+        self._spill_if_full()
+    
+    def __len__(self) -> int:
+        _, _, cold, hot = self._state
+        return cold + len(hot)
+    
+    @property
+    def cold_count(self) -> int:
+        return self._state[2]
+    
+    def append(self, row: int) -> None:
+        """Add a row (caller holds the account lock)"""
+        self._state[3].append(row)
+        self._spill_if_full()
+    
+    def _spill_if_full(self) -> None:
+        starts, firsts, cold, hot = self._state
+        if len(hot) < 2 * self._keep:
+            return
+        count = len(hot) - self._keep
+        first = self._segments.append(hot[:count].tobytes())
+        starts, firsts = array('q', starts), array('q', firsts)
+        starts.append(cold)
+        firsts.append(first)
+        self._state = (starts, firsts, cold + count, hot[count:])
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[int, array]:
+        starts, firsts, cold, hot = self._state
+        length = cold + len(hot)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(length)
+            if step != 1:
+                raise ValueError("TieredRows only supports contiguous slices")
+            return self._slice(start, stop, (starts, firsts, cold, hot))
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("history index out of range")
+        if index >= cold:
+            return hot[index - cold]
+        extent = bisect_right(starts, index) - 1
+        mapping, offset = self._segments.view(firsts[extent] + index - starts[extent])
+        return ROW.unpack_from(mapping, offset)[0]
+    
+    def _slice(self, start: int, stop: int, state: Tuple[array, array, int, array]) -> array:
+        starts, firsts, cold, hot = state
+        rows = array('q')
+        position = start
+        while position < min(stop, cold):
+            extent = bisect_right(starts, position) - 1
+            end = starts[extent + 1] if extent + 1 < len(starts) else cold
+            take = min(stop, end) - position
+            rows.frombytes(self._segments.read(firsts[extent] + position - starts[extent], take))
+            position += take
+        if stop > cold:
+            rows.extend(hot[max(start, cold) - cold:stop - cold])
+        return rows
+    
+    def __iter__(self) -> Iterator[int]:
+        state = self._state
+        _, _, cold, hot = state
+        # Cold rows are read one extent-sized batch at a time
+        if cold:
+            yield from self._slice(0, cold, state)
+        yield from hot[:]
@@ -1,16 +1,20 @@
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from .money import Amount, format_cents, from_cents, to_cents
 
 class Transaction:
     """Encapsulates transaction data and operations"""
     
-    def __init__(self, transaction_id: str, transaction_type: str, amount: float, 
-                 description: str = ""):
+    __slots__ = ('_transaction_id', '_transaction_type', '_amount', '_description',
+                 '_timestamp', '_status')
+    
+    def __init__(self, transaction_id: str, transaction_type: str, amount: Amount, 
+                 description: str = "", timestamp: Optional[datetime] = None):
         self._transaction_id = transaction_id
         self._transaction_type = transaction_type  # 'deposit' or 'withdrawal'
-        self._amount = amount
+        self._amount = to_cents(amount)  # Integer cents
         self._description = description
-        self._timestamp = datetime.now()
+        self._timestamp = timestamp or datetime.now()
         self._status = "completed"
     
     # Getters for encapsulation
@@ -24,6 +28,10 @@ class Transaction:
     
     @property
     def amount(self) -> float:
+        return from_cents(self._amount)
+    
+    @property
+    def amount_cents(self) -> int:
         return self._amount
     
     @property
@@ -43,7 +51,7 @@ class Transaction:
         return {
             'transaction_id': self._transaction_id,
             'type': self._transaction_type,
-            'amount': self._amount,
+            'amount': from_cents(self._amount),
             'description': self._description,
             'timestamp': self._timestamp.strftime("%Y-%m-%d %H:%M:%S"),
             'status': self._status
@@ -51,4 +59,4 @@ class Transaction:
     
     def __str__(self) -> str:
         return (f"Transaction {self._transaction_id}: {self._transaction_type} "
-                f"of R{self._amount:.2f} at {self._timestamp.strftime('%Y-%m-%d %H:%M')}")
+                f"of R{format_cents(self._amount)} at {self._timestamp.strftime('%Y-%m-%d %H:%M')}")
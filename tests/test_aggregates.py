@@ -0,0 +1,41 @@
+import unittest
+from src.bank import AxizuloAfricanBank
+
+class TestBankAggregates(unittest.TestCase):
+    
+    def setUp(self):
+        self.bank = AxizuloAfricanBank()
+        self.savings = self.bank.create_account("Saver", "savings", 1000.0)
+        self.current = self.bank.create_account("Spender", "current", 100.0, overdraft_limit=500.0)
+    
+    def test_totals_follow_every_change(self):
+        self.current.withdraw(300.0)
+        self.bank.transfer_funds(self.savings.account_number, self.current.account_number, 50.0)
+        self.savings.deposit(25.0)
+        self.bank.run_interest()
+        
+        summary = self.bank.get_bank_summary()
+        self.assertAlmostEqual(summary['total_balance'], self.savings.balance + self.current.balance)
+        self.assertAlmostEqual(summary['balance_by_type']['SavingsAccount'], self.savings.balance)
+        self.assertEqual(summary['balance_by_type']['CurrentAccount'], -150.0)
+        self.assertEqual(summary['overdraft_exposure'], 150.0)
+        self.assertAlmostEqual(summary['total_deposits'], self.savings.balance)
+        self.assertEqual(self.bank.check_aggregates(), {})
+    
+    def test_active_and_inactive_counts(self):
+        self.current.withdraw(100.0)
+        self.bank.close_account(self.current.account_number)
+        self.assertEqual(self.bank.aggregates.active_accounts, 1)
+        self.assertEqual(self.bank.aggregates.inactive_accounts, 1)
+        self.current.activate()
+        self.assertEqual(self.bank.aggregates.active_accounts, 2)
+        self.assertEqual(self.bank.get_account_count(), 2)
+    
+    def test_checker_reports_drift(self):
+        self.bank.aggregates.balance_changed(self.savings, 0, 1000)
+        mismatches = self.bank.check_aggregates()
+        self.assertIn('total_balance', mismatches)
+        self.assertEqual(mismatches['total_balance'], (110000, 111000))
+
+if __name__ == '__main__':
+    unittest.main()
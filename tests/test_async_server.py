@@ -0,0 +1,110 @@
+import asyncio
+import json
+import unittest
+from flask import Flask
+from async_app import AsyncBankServer
+from src.bank import AxizuloAfricanBank
+from src.cache import ResponseCache
+from src.events import EventBus
+from src.storage import MemoryStorage
+
+class TestAsyncServer(unittest.TestCase):
+    
+    def setUp(self):
+        self.flask_app = Flask(__name__)
+        self.flask_app.secret_key = 'test-secret'
+        self.bank = AxizuloAfricanBank(events=EventBus())
+        self.account = self.bank.create_account("Test User", "savings", 100.0)
+        self.other = self.bank.create_account("Other User", "current", 0.0)
+        self.cache = ResponseCache()
+        serializer = self.flask_app.session_interface.get_signing_serializer(self.flask_app)
+        self.cookie = f"session={serializer.dumps({'account_number': self.account.account_number})}"
+    
+    def exchange(self, *requests):
+        """Send requests over one keep-alive connection and return (status, body) pairs
+        
+        A request may carry a dict of extra headers as a fifth item; response
+        headers are kept in self.response_headers.
+        """
+        async def run():
+            server = AsyncBankServer(MemoryStorage(self.bank), self.flask_app, workers=4, cache=self.cache)
+            await server.start('127.0.0.1', 0)
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+            responses = []
+            self.response_headers = []
+            for method, target, body, cookie, *extra in requests:
+                body = body if isinstance(body, bytes) else body.encode()
+                head = f"{method} {target} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n"
+                if cookie:
+                    head += f"Cookie: {cookie}\r\n"
+                for name, value in (extra[0] if extra else {}).items():
+                    head += f"{name}: {value}\r\n"
+                writer.write(head.encode() + b"\r\n" + body)
+                status = int((await reader.readline()).split()[1])
+                headers = {}
+                while (line := await reader.readline()) != b"\r\n":
+                    name, _, value = line.decode().partition(":")
+                    headers[name.lower()] = value.strip()
+                payload = await reader.readexactly(int(headers.get("content-length", 0)))
+                responses.append((status, json.loads(payload) if payload else None))
+                self.response_headers.append(headers)
+            writer.close()
+            await server.stop()
+            return responses
+        return asyncio.run(run())
+    
+    def test_routes_share_flask_session(self):
+        target = self.other.account_number
+        responses = self.exchange(
+            ("POST", "/deposit", "amount=50&description=Salary", self.cookie),
+            ("POST", "/withdraw", "amount=20", self.cookie),
+            ("POST", "/transfer", f"to_account={target}&amount=30", self.cookie),
+            ("GET", "/balance", "", self.cookie),
+            ("GET", "/transaction_history?limit=2", "", self.cookie),
+        )
+        self.assertEqual(responses[0], (200, {'success': True, 'message': 'Successfully deposited R50.00', 'balance': 150.0}))
+        self.assertEqual(responses[1][1]['balance'], 130.0)
+        self.assertEqual(responses[2][1], {'success': True, 'message': 'Successfully transferred R30.00'})
+        self.assertEqual(responses[3][1], {'success': True, 'balance': 100.0})
+        self.assertEqual([t['amount'] for t in responses[4][1]['transactions']], [30.0, 20.0])
+        self.assertEqual(self.other.balance, 30.0)
+    
+    def test_rejects_bad_session_and_requests(self):
+        responses = self.exchange(
+            ("GET", "/balance", "", "session=forged"),
+            ("GET", "/balance", "", None),
+            ("POST", "/deposit", "", self.cookie),
+        )
+        self.assertEqual(responses[0], (200, {'success': False, 'message': 'No account selected'}))
+        self.assertEqual(responses[1][1]['message'], 'No account selected')
+        self.assertEqual(responses[2][0], 400)
+    
+    def test_conditional_requests(self):
+        responses = self.exchange(("GET", "/balance", "", self.cookie))
+        etag = self.response_headers[0]["etag"]
+        self.assertEqual(self.response_headers[0]["vary"], "Cookie")
+        
+        responses = self.exchange(
+            ("GET", "/balance", "", self.cookie, {"If-None-Match": etag}),
+            ("GET", "/transaction_history?limit=5", "", self.cookie, {"If-None-Match": f'W/{etag}'}),
+            ("POST", "/deposit", "amount=5", self.cookie),
+            ("GET", "/balance", "", self.cookie, {"If-None-Match": etag}),
+        )
+        self.assertEqual(responses[0], (304, None))
+        self.assertNotIn("content-length", self.response_headers[0])
+        self.assertEqual(responses[1], (304, None))
+        self.assertEqual(responses[3], (200, {'success': True, 'balance': 105.0}))
+        self.assertNotEqual(self.response_headers[3]["etag"], etag)
+    
+    def test_malformed_requests_get_bad_request(self):
+        responses = self.exchange(("POST", "/deposit", b"amount=\xff", self.cookie))
+        self.assertEqual(responses[0][0], 400)
+        responses = self.exchange(("GET", "/balance", "", self.cookie, {"X-Padding": "a" * 70000}))
+        self.assertEqual(responses[0][0], 400)
+        self.assertEqual(self.account.balance, 100.0)
+    
+    def test_unknown_route(self):
+        self.assertEqual(self.exchange(("GET", "/missing", "", None))[0][0], 404)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+from datetime import datetime, timedelta
 from src.bank import AxizuloAfricanBank
 from src.account import SavingsAccount, CurrentAccount
 
@@ -38,11 +39,116 @@ class TestBankingApplication(unittest.TestCase):
         transactions = self.test_account.get_transaction_history()
         self.assertEqual(len(transactions), 3)  # Initial deposit + our two transactions
     
+    def test_transaction_pagination(self):
+        for i in range(1, 8):
+            self.test_account.deposit(float(i))
+        first_page, cursor = self.test_account.get_transaction_page(limit=3)
+        self.assertEqual([t.amount for t in first_page], [7.0, 6.0, 5.0])
+        second_page, cursor = self.test_account.get_transaction_page(limit=3, cursor=cursor)
+        self.assertEqual([t.amount for t in second_page], [4.0, 3.0, 2.0])
+        last_page, cursor = self.test_account.get_transaction_page(limit=3, cursor=cursor)
+        self.assertEqual([t.amount for t in last_page], [1.0, 1000.0])
+        self.assertIsNone(cursor)
+        self.assertEqual([t.amount for t in self.test_account.get_recent_transactions(2)], [6.0, 7.0])
+        with self.assertRaises(ValueError):
+            self.test_account.get_transaction_page(cursor="not-a-cursor")
+    
+    def test_transaction_page_time_bounds(self):
+        account = SavingsAccount("Test User")
+        for day in range(1, 6):
+            timestamp = int(datetime(2024, 1, day).timestamp()) * 1_000_000
+            account._post("deposit", day * 100, "Deposit", timestamp=timestamp)
+        page, cursor = account.get_transaction_page(since=datetime(2024, 1, 2), until=datetime(2024, 1, 4))
+        self.assertEqual([t.amount for t in page], [4.0, 3.0, 2.0])
+        self.assertIsNone(cursor)
+    
+    def test_transfer_batch_is_atomic(self):
+        other = self.bank.create_account("Other User", "savings", 0.0)
+        report = self.bank.transfer_batch([
+            (self.test_account.account_number, other.account_number, 600.0),
+            (self.test_account.account_number, other.account_number, 600.0),
+        ])
+        self.assertFalse(report['success'])
+        self.assertEqual(report['applied'], 0)
+        self.assertEqual(self.test_account.balance, 1000.0)
+        self.assertEqual(other.balance, 0.0)
+    
+    def test_transfer_batch_nets_movements(self):
+        other = self.bank.create_account("Other User", "savings", 0.0)
+        report = self.bank.transfer_batch([
+            (other.account_number, self.test_account.account_number, 0.0),
+            (self.test_account.account_number, other.account_number, 1000.0),
+            (other.account_number, self.test_account.account_number, 400.0),
+        ], atomic=False)
+        self.assertEqual(report['applied'], 2)
+        self.assertEqual(report['results'][0]['message'], "Transfer amount must be positive.")
+        # The first leg alone overdraws the account, but the batch nets to a fundable debit
+        report = self.bank.transfer_batch([
+            (other.account_number, self.test_account.account_number, 700.0),
+            (self.test_account.account_number, other.account_number, 100.0),
+        ])
+        self.assertTrue(report['success'])
+        self.assertEqual(self.test_account.balance, 1000.0)
+        self.assertEqual(other.balance, 0.0)
+    
+    def test_balance_at_past_timestamps(self):
+        current = self.bank.create_account("Current User", "current", 100.0)
+        current.withdraw(150.0)
+        self.bank.transfer_funds(current.account_number, self.test_account.account_number, 25.0)
+        self.bank.run_interest()
+        current.deposit(500.0)
+        
+        history = current.get_transaction_history()
+        self.assertEqual([current.balance_at(t.timestamp) for t in history], [100.0, -50.0, -75.0, 425.0])
+        self.assertEqual(current.balance_at(history[0].timestamp - timedelta(microseconds=1)), 0.0)
+        self.assertEqual(current.balance_at(datetime.now()), current.balance)
+        
+        credited = self.test_account.get_transaction_history()[1].timestamp  # Before interest was paid
+        snapshot = self.bank.snapshot_balances(credited)
+        self.assertEqual(snapshot, {self.test_account.account_number: 1025.0, current.account_number: -75.0})
+        self.assertEqual(self.bank.snapshot_balances(datetime.now())[self.test_account.account_number],
+                         self.test_account.balance)
+    
     def test_savings_account_interest(self):
         savings_account = SavingsAccount("Test User", 1000.0, 5.0)
         interest = savings_account.calculate_interest()
         self.assertAlmostEqual(interest, (1000.0 * 5.0) / 100 / 12, places=2)
     
+    def test_run_interest_matches_per_account_path(self):
+        batch_bank = AxizuloAfricanBank()
+        loop_bank = AxizuloAfricanBank()
+        for i, (deposit, rate) in enumerate([(1000.0, 2.5), (250.5, 5.0), (0.0, 3.0), (99.99, 7.25)]):
+            batch_bank.create_account(f"User {i}", "savings", deposit, interest_rate=rate)
+            loop_bank.create_account(f"User {i}", "savings", deposit, interest_rate=rate)
+        batch_bank.create_account("Current User", "current", 500.0)
+        
+        summary = batch_bank.run_interest()
+        for account in loop_bank.get_all_accounts():
+            account.apply_interest()
+        
+        self.assertEqual(summary['accounts'], 3)
+        self.assertEqual([a.balance for a in batch_bank.get_all_accounts()][:4],
+                         [a.balance for a in loop_bank.get_all_accounts()])
+        self.assertEqual(batch_bank.get_all_accounts()[1].get_transaction_history()[-1].description,
+                         "Monthly interest")
+    
+    def test_run_interest_as_of(self):
+        month_end = datetime.now()
+        later = self.bank.create_account("Later User", "savings", 500.0)
+        
+        # Backdated rows keep their date, unless the account has newer history
+        self.bank.run_interest(as_of=month_end)
+        self.assertEqual(self.test_account.get_transaction_history()[-1].timestamp, month_end)
+        opened, interest = later.get_transaction_history()
+        self.assertEqual(interest.timestamp, opened.timestamp)
+        self.assertEqual(self.test_account.balance_at(month_end), self.test_account.balance)
+        
+        # A future date is refused rather than pushing later postings forward
+        with self.assertRaises(ValueError):
+            self.bank.run_interest(as_of=datetime.now() + timedelta(days=30))
+        self.test_account.deposit(1.0)
+        self.assertLess(self.test_account.get_transaction_history()[-1].timestamp, datetime.now() + timedelta(days=1))
+    
     def test_current_account_overdraft(self):
         current_account = CurrentAccount("Test User", 100.0, 500.0)
         # Try to withdraw more than balance but within overdraft
@@ -0,0 +1,28 @@
+import json
+import unittest
+from benchmarks.suite import compare, run_suite
+
+class TestBenchmarkSuite(unittest.TestCase):
+    
+    def test_run_suite_reports_json_metrics(self):
+        report = run_suite(["deposit", "get_total_bank_balance[1000000]"], quick=True)
+        self.assertEqual(list(report["results"]), ["deposit"])  # The 1M-account case is skipped in quick mode
+        result = json.loads(json.dumps(report))["results"]["deposit"]
+        self.assertEqual(result["iterations"], 5000)
+        self.assertGreater(result["ops_per_sec"], 0)
+        self.assertLessEqual(result["p50_us"], result["p99_us"])
+    
+    def test_compare_flags_regressions(self):
+        baseline = {"results": {"fast": {"ops_per_sec": 1000.0, "p50_us": 10.0},
+                                "slow": {"ops_per_sec": 1000.0, "p50_us": 10.0}}}
+        current = {"results": {"fast": {"ops_per_sec": 900.0, "p50_us": 11.0},
+                               "slow": {"ops_per_sec": 500.0, "p50_us": 20.0},
+                               "new": {"ops_per_sec": 1.0, "p50_us": 1.0}}}
+        rows = {row["name"]: row for row in compare(current, baseline, threshold=0.25)}
+        self.assertEqual(set(rows), {"fast", "slow"})
+        self.assertFalse(rows["fast"]["regression"])
+        self.assertTrue(rows["slow"]["regression"])
+        self.assertAlmostEqual(rows["slow"]["ops_per_sec_change"], -0.5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import io
+import shutil
+import tempfile
+import unittest
+from src import bulk
+from src.bank import AxizuloAfricanBank
+from src.events import BulkImportCompleted, EventBus
+from src.ledger import Ledger
+
+class RecordingSink:
+    def __init__(self):
+        self.events = []
+    
+    def handle(self, event):
+        self.events.append(event)
+
+class TestBulkImportExport(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.source = AxizuloAfricanBank(events=EventBus())
+        self.savings = self.source.create_account("Test User", "savings", 1000.0, interest_rate=5.0)
+        self.current = self.source.create_account("Other User", "current", 100.0, overdraft_limit=500.0)
+        self.savings.deposit(250.0, "Salary")
+        self.current.withdraw(400.0)
+        self.source.transfer_funds(self.savings.account_number, self.current.account_number, 300.0)
+        self.current.deactivate()
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+    
+    def assertSameBank(self, bank):
+        self.assertEqual(bank.get_account_count(), self.source.get_account_count())
+        for account in self.source.get_all_accounts():
+            restored = bank.get_account(account.account_number)
+            self.assertEqual(restored.get_account_info(), account.get_account_info())
+            self.assertEqual([t.to_dict() for t in restored.get_transaction_history()],
+                             [t.to_dict() for t in account.get_transaction_history()])
+        self.assertEqual(bank.check_aggregates(), {})
+    
+    def test_jsonl_round_trip(self):
+        stream = io.StringIO()
+        self.assertEqual(bulk.write_jsonl(bulk.export_accounts(self.source), stream), 2)
+        
+        sink = RecordingSink()
+        bank = AxizuloAfricanBank(events=EventBus([sink]))
+        stream.seek(0)
+        report = bulk.import_accounts(bank, bulk.read_jsonl(stream))
+        
+        self.assertEqual(report, {"accounts": 2, "transactions": 6, "failed": 0, "errors": []})
+        self.assertEqual(sink.events, [BulkImportCompleted(2, 6, 0)])
+        self.assertSameBank(bank)
+        transaction = self.savings.get_transaction_history()[-1]
+        self.assertEqual(bank.get_transaction(transaction.transaction_id).to_dict(), transaction.to_dict())
+        self.assertEqual(bank.get_account(self.current.account_number).overdraft_limit, 500.0)
+    
+    def test_csv_round_trip_is_durable(self):
+        accounts, transactions = io.StringIO(), io.StringIO()
+        bulk.write_csv(bulk.export_accounts(self.source), accounts, transactions)
+        self.assertEqual(accounts.getvalue().splitlines()[0],
+                         "account_number,account_type,account_holder,is_active,interest_rate,overdraft_limit,balance")
+        
+        bank = AxizuloAfricanBank(ledger=Ledger(self.directory), events=EventBus())
+        accounts.seek(0)
+        transactions.seek(0)
+        self.assertEqual(bulk.import_accounts(bank, bulk.read_csv(accounts))["accounts"], 2)
+        self.assertEqual(bulk.import_transactions(bank, bulk.read_csv(transactions))["transactions"], 6)
+        self.assertSameBank(bank)
+        
+        bank.close()
+        recovered = AxizuloAfricanBank(ledger=Ledger(self.directory), events=EventBus())
+        self.assertSameBank(recovered)
+        recovered.close()
+    
+    def test_bad_records_are_reported_and_skipped(self):
+        bank = AxizuloAfricanBank(events=EventBus())
+        # Numbered accounts first, so new numbers are allocated past them
+        records = [
+            {"account_number": self.savings.account_number, "account_holder": "Migrated User"},
+            {"account_number": self.savings.account_number, "account_holder": "Duplicate"},
+            {"account_holder": "New Customer", "account_type": "current", "opening_balance": "-120.50"},
+            {"account_holder": "", "account_type": "savings"},
+            {"account_holder": "Bad Type", "account_type": "cheque"},
+            {"account_holder": "Bad Amount", "transactions": [{"transaction_type": "deposit", "amount": "1.234"}]},
+            {"account_holder": "Out Of Order", "transactions": [
+                {"transaction_type": "deposit", "amount": "5", "timestamp": "2024-02-01T00:00:00"},
+                {"transaction_type": "deposit", "amount": "5", "timestamp": "2024-01-01T00:00:00"}]},
+        ]
+        report = bulk.import_accounts(bank, records)
+        
+        self.assertEqual((report["accounts"], report["failed"]), (2, 5))
+        self.assertEqual(report["errors"][0], f"record 2: Duplicate account number: {self.savings.account_number}")
+        self.assertEqual(report["errors"][1], "record 4: Account holder name cannot be empty.")
+        self.assertEqual(report["errors"][-1], "record 7: Transactions must be in time order.")
+        opened = bank.find_accounts(holder="New Customer")[0]
+        self.assertEqual(opened.balance, -120.5)
+        self.assertEqual(opened.get_transaction_history()[0].description, "Opening balance")
+        self.assertEqual(bank.get_account_count(), 2)
+        self.assertEqual(bank.check_aggregates(), {})
+    
+    def test_export_is_a_consistent_cut(self):
+        records = bulk.export_accounts(self.source)
+        first = next(records)  # The cut is taken when the export starts
+        self.source.transfer_funds(self.savings.account_number, self.current.account_number, 50.0)
+        self.source.create_account("Late User", "savings", 10.0)
+        rest = list(records)
+        
+        exported = {record["account_number"]: record for record in [first] + rest}
+        self.assertEqual(len(exported), 2)
+        self.assertEqual(exported[self.savings.account_number]["balance"], "950.00")
+        self.assertEqual(exported[self.current.account_number]["balance"], "0.00")
+        self.assertEqual(len(exported[self.current.account_number]["transactions"]), 3)
+
+if __name__ == '__main__':
+    unittest.main()
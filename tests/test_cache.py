@@ -0,0 +1,67 @@
+import json
+import unittest
+from src import api
+from src.bank import AxizuloAfricanBank
+from src.cache import ResponseCache, etag_matches
+from src.events import EventBus
+from src.storage import MemoryStorage
+
+class TestResponseCache(unittest.TestCase):
+    
+    def setUp(self):
+        self.bank = AxizuloAfricanBank(events=EventBus())
+        self.account = self.bank.create_account("Test User", "savings", 100.0)
+        self.other = self.bank.create_account("Other User", "current", 0.0)
+        self.cache = ResponseCache(max_entries=3)
+        self.storage = MemoryStorage(self.bank)
+    
+    def test_lru_eviction(self):
+        for key in "abc":
+            self.cache.put(key, key.encode())
+        self.assertEqual(self.cache.get("a"), b"a")  # Now most recently used
+        self.cache.put("d", b"d")
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual([self.cache.get(key) for key in "acd"], [b"a", b"c", b"d"])
+        self.assertEqual((self.cache.hits, self.cache.misses, len(self.cache)), (4, 1, 3))
+    
+    def test_etag_matching(self):
+        etag = self.cache.etag("0000000018", 3)
+        self.assertTrue(etag_matches(etag, etag))
+        self.assertTrue(etag_matches(f'"other", W/{etag}', etag))
+        self.assertTrue(etag_matches("*", etag))
+        self.assertFalse(etag_matches(None, etag))
+        self.assertFalse(etag_matches(ResponseCache().etag("0000000018", 3), etag))  # Another process epoch
+    
+    def test_every_mutation_bumps_the_version(self):
+        versions = [self.account.version]
+        for mutate in (lambda: self.account.deposit(10),
+                       lambda: self.account.withdraw(5),
+                       lambda: self.bank.transfer_funds(self.account.account_number, self.other.account_number, 1),
+                       lambda: self.bank.run_interest(),
+                       lambda: self.account.deactivate()):
+            mutate()
+            versions.append(self.account.version)
+        self.assertEqual(versions, sorted(set(versions)))
+        self.assertFalse(self.account.withdraw(1_000_000))
+        self.assertEqual(self.account.version, versions[-1])  # Rejected operations change nothing
+    
+    def test_cached_handlers(self):
+        number = self.account.account_number
+        first = api.cached_balance(self.cache, self.storage, number)
+        self.assertEqual((first.status, json.loads(first.body)), (200, {"success": True, "balance": 100.0}))
+        self.assertEqual(api.cached_balance(self.cache, self.storage, number).body, first.body)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(api.cached_balance(self.cache, self.storage, number, first.etag), (304, b"", first.etag))
+        
+        page = api.cached_transaction_history(self.cache, self.storage, number, {"limit": "1"})
+        self.account.deposit(25, "Salary")
+        self.assertEqual(api.cached_balance(self.cache, self.storage, number, first.etag).status, 200)
+        newer = api.cached_transaction_history(self.cache, self.storage, number, {"limit": "1"}, page.etag)
+        self.assertEqual(json.loads(newer.body)["transactions"][0]["description"], "Salary")
+        
+        missing = api.cached_balance(self.cache, self.storage, None)
+        self.assertEqual((missing.status, missing.etag), (200, None))
+        self.assertEqual(json.loads(missing.body)["message"], "No account selected")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import io
+import unittest
+from src.bank import AxizuloAfricanBank
+from src.events import BufferedSink, ConsoleSink, Deposited, EventBus, NullSink, OperationRejected
+
+class RecordingSink:
+    def __init__(self):
+        self.events = []
+    
+    def handle(self, event):
+        self.events.append(event)
+
+class TestEvents(unittest.TestCase):
+    
+    def test_operations_publish_domain_events(self):
+        sink = RecordingSink()
+        bank = AxizuloAfricanBank(events=EventBus([sink]))
+        account = bank.create_account("Test User", "savings", 100.0)
+        account.deposit(50.0, "Salary")
+        account.withdraw(500.0)
+        
+        kinds = [type(event).__name__ for event in sink.events]
+        self.assertEqual(kinds, ["AccountCreated", "Deposited", "OperationRejected"])
+        self.assertEqual(sink.events[1], Deposited(account.account_number, 5000, 15000, "Salary"))
+        self.assertEqual(sink.events[2], OperationRejected("withdrawal", account.account_number, "Insufficient funds."))
+    
+    def test_console_sink_keeps_original_output(self):
+        stream = io.StringIO()
+        bank = AxizuloAfricanBank(events=EventBus([ConsoleSink(stream)]))
+        account = bank.create_account("Test User", "savings", 100.0)
+        account.deposit(50.0)
+        self.assertEqual(stream.getvalue(),
+                         "\n=== Account Created Successfully ===\n"
+                         "Bank: Axizulo African Bank\n"
+                         "Account Holder: Test User\n"
+                         f"Account Number: {account.account_number}\n"
+                         "Account Type: Savings\n"
+                         "Initial Balance: R100.00\n"
+                         "====================================\n\n"
+                         "Successfully deposited R50.00. New balance: R150.00\n")
+    
+    def test_buffered_sink_writes_in_background(self):
+        stream = io.StringIO()
+        sink = BufferedSink(stream)
+        bank = AxizuloAfricanBank(events=EventBus([sink]))
+        account = bank.create_account("Test User", "savings", 0.0)
+        for _ in range(3):
+            account.deposit(1.0)
+        sink.close()
+        self.assertEqual(stream.getvalue().count("Successfully deposited"), 3)
+    
+    def test_null_sink_disables_publishing(self):
+        bus = EventBus([NullSink()])
+        self.assertFalse(bus.enabled)
+        bus.subscribe(RecordingSink())
+        self.assertTrue(bus.enabled)
+
+if __name__ == '__main__':
+    unittest.main()
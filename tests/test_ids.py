@@ -0,0 +1,94 @@
+import shutil
+import tempfile
+import unittest
+from src.bank import AxizuloAfricanBank
+from src.ids import IdAllocator, luhn_digit
+from src.ledger import Ledger
+from src.store import TransactionStore
+
+class TestIdAllocator(unittest.TestCase):
+    
+    def test_ids_are_monotonic_and_check_digit_protected(self):
+        allocator = IdAllocator(5)
+        ids = [allocator.next_id() for _ in range(100)]
+        self.assertEqual(ids[0], "000018")
+        self.assertEqual(ids, sorted(set(ids)))
+        self.assertEqual(luhn_digit(7992739871), 3)
+        
+        self.assertEqual(allocator.parse(ids[41]), 42)
+        self.assertIsNone(allocator.parse("000428"))  # Typo in the check digit
+        self.assertIsNone(allocator.parse("000248"))  # Transposed digits
+        self.assertIsNone(allocator.parse("00042"))
+        self.assertIsNone(allocator.parse("abcdef"))
+    
+    def test_observe_skips_restored_ids(self):
+        allocator = IdAllocator(5)
+        allocator.observe(500)
+        allocator.observe(10)
+        self.assertEqual(allocator.next_seq(), 501)
+        self.assertEqual(allocator.reserve(10), 502)
+        self.assertEqual(allocator.last_seq, 511)
+        with self.assertRaises(OverflowError):
+            allocator.reserve(100000)
+
+
+class TestTransactionLookup(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+    
+    def test_get_transaction_finds_any_account_transaction(self):
+        bank = AxizuloAfricanBank()
+        savings = bank.create_account("Test User", "savings", 1000.0)
+        current = bank.create_account("Other User", "current", 100.0)
+        self.assertNotEqual(savings.account_number, current.account_number)
+        self.assertIsNone(bank._account_numbers.parse("0000000011"))
+        bank.transfer_funds(savings.account_number, current.account_number, 250.0)
+        bank.run_interest()
+        
+        for account in (savings, current):
+            for transaction in account.get_transaction_history():
+                found = bank.get_transaction(transaction.transaction_id)
+                self.assertEqual(found.to_dict(), transaction.to_dict())
+        self.assertIsNone(bank.get_transaction("000000009990"))
+        self.assertIsNone(bank.get_transaction("not-an-id"))
+    
+    def test_ids_survive_recovery_and_are_not_reissued(self):
+        bank = AxizuloAfricanBank(ledger=Ledger(self.directory))
+        first = bank.create_account("First User", "savings", 100.0)
+        second = bank.create_account("Second User", "current", 50.0)
+        first.deposit(10.0)
+        second.deposit(20.0)
+        bank.checkpoint()  # The snapshot groups rows by account, reordering the store
+        first.withdraw(5.0)
+        history = {t.transaction_id: t.to_dict() for account in (first, second)
+                   for t in account.get_transaction_history()}
+        bank.close()
+        
+        recovered = AxizuloAfricanBank(ledger=Ledger(self.directory))
+        for transaction_id, record in history.items():
+            self.assertEqual(recovered.get_transaction(transaction_id).to_dict(), record)
+        
+        third = recovered.create_account("Third User", "savings", 1.0)
+        self.assertNotIn(third.account_number, (first.account_number, second.account_number))
+        self.assertNotIn(third.get_transaction_history()[0].transaction_id, history)
+        recovered.close()
+    
+    def test_legacy_ids_resolve_and_duplicates_are_rejected(self):
+        store = TransactionStore()
+        row = store.append("deposit", 100, "Imported", transaction_id="ABC123")
+        self.assertEqual(store.find("ABC123"), row)
+        self.assertEqual(store.transaction(row).transaction_id, "ABC123")
+        
+        issued = store.transaction(store.append("deposit", 100, "Deposit")).transaction_id
+        with self.assertRaises(ValueError):
+            store.append("deposit", 100, "Replayed", transaction_id=issued)
+        # Old random IDs could repeat, so a repeated legacy ID keeps its first row
+        store.append("deposit", 100, "Imported", transaction_id="ABC123")
+        self.assertEqual(store.find("ABC123"), row)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import random
+import unittest
+from src.bank import AxizuloAfricanBank
+from src.events import EventBus
+from src.indexes import SortedIndex
+
+class TestSortedIndex(unittest.TestCase):
+    
+    def test_matches_a_sorted_list(self):
+        class ShortRuns(SortedIndex):
+            RUN_LENGTH = 4  # Force many runs and splits
+        
+        generator = random.Random(1)
+        index = ShortRuns()
+        expected = []
+        for step in range(2000):
+            if expected and generator.random() < 0.4:
+                key = expected.pop(generator.randrange(len(expected)))
+                index.remove(key)
+            else:
+                key = (generator.randint(-50, 50), step)
+                index.add(key)
+                expected.append(key)
+        expected.sort()
+        self.assertEqual(list(index), expected)
+        self.assertEqual(len(index), len(expected))
+        low, high = (-10,), (20,)
+        self.assertEqual(list(index.irange(low, high)), [k for k in expected if low <= k < high])
+        self.assertEqual(index.count(low, high), len([k for k in expected if low <= k < high]))
+        with self.assertRaises(KeyError):
+            index.remove((1000, 0))
+
+
+class TestAccountQueries(unittest.TestCase):
+    
+    def setUp(self):
+        self.bank = AxizuloAfricanBank(events=EventBus())
+        generator = random.Random(7)
+        names = ["Thabo Mokoena", "thandi Nkosi", "Sipho Dlamini", "Lerato Mokoena", "Zanele Khumalo"]
+        for i in range(300):
+            account_type = "current" if i % 3 else "savings"
+            self.bank.create_account(generator.choice(names), account_type, generator.randint(0, 2000))
+        accounts = self.bank.get_all_accounts()
+        for _ in range(600):
+            account = generator.choice(accounts)
+            if generator.random() < 0.5:
+                account.deposit(generator.randint(1, 500))
+            else:
+                account.withdraw(generator.randint(1, 2500))
+        for account in accounts[::7]:
+            account.deactivate()
+    
+    def scan(self, predicate):
+        return sorted(a.account_number for a in self.bank.get_all_accounts() if predicate(a))
+    
+    def numbers(self, accounts):
+        return [account.account_number for account in accounts]
+    
+    def test_holder_lookups_are_case_insensitive(self):
+        self.assertEqual(self.numbers(self.bank.find_accounts(holder="THABO mokoena")),
+                         self.scan(lambda a: a.account_holder == "Thabo Mokoena"))
+        self.assertEqual(self.numbers(self.bank.find_accounts(holder_prefix="Tha")),
+                         self.scan(lambda a: a.account_holder.lower().startswith("tha")))
+        self.assertEqual(self.bank.find_accounts(holder_prefix="Nobody"), [])
+    
+    def test_type_status_and_balance_filters_combine(self):
+        inactive_current = self.bank.find_accounts(account_type="current", is_active=False)
+        self.assertEqual(self.numbers(inactive_current),
+                         self.scan(lambda a: a.__class__.__name__ == "CurrentAccount" and not a.is_active))
+        
+        overdrawn = self.bank.find_accounts(max_balance=-100.01)
+        self.assertTrue(overdrawn)
+        self.assertEqual(sorted(self.numbers(overdrawn)), self.scan(lambda a: a.balance < -100))
+        self.assertEqual([a.balance for a in overdrawn], sorted(a.balance for a in overdrawn))
+        
+        rich_savings = self.bank.find_accounts(holder_prefix="s", account_type="SAVINGS",
+                                               min_balance=500, max_balance=1500, limit=3)
+        expected = sorted((a.balance, a.account_number) for a in self.bank.get_all_accounts()
+                          if a.account_holder.startswith("S") and a.__class__.__name__ == "SavingsAccount"
+                          and 500 <= a.balance <= 1500)
+        self.assertEqual(self.numbers(rich_savings), [number for _, number in expected[:3]])
+    
+    def test_index_follows_later_changes(self):
+        self.bank.find_accounts(min_balance=0)  # Build the balance index
+        account = self.bank.find_accounts(holder="Zanele Khumalo", is_active=True)[0]
+        account.deposit(1_000_000)
+        self.assertEqual(self.numbers(self.bank.find_accounts(min_balance=900_000)), [account.account_number])
+        account.deactivate()
+        self.assertNotIn(account.account_number, self.numbers(self.bank.find_accounts(is_active=True)))
+        new = self.bank.create_account("Zola Khumalo", "current", 5.0)
+        self.assertEqual(self.numbers(self.bank.find_accounts(holder_prefix="zol")), [new.account_number])
+        self.assertEqual(len(self.bank.find_accounts()), self.bank.get_account_count())
+
+if __name__ == '__main__':
+    unittest.main()
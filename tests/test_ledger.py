@@ -0,0 +1,142 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from src.bank import AxizuloAfricanBank
+from src.ledger import Ledger
+
+class TestLedger(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+    
+    def reopen(self, bank, **kwargs):
+        bank.close()
+        return AxizuloAfricanBank(ledger=Ledger(self.directory, **kwargs))
+    
+    def test_replay_restores_accounts_and_history(self):
+        bank = AxizuloAfricanBank(ledger=Ledger(self.directory))
+        savings = bank.create_account("Test User", "savings", 1000.0, interest_rate=5.0)
+        current = bank.create_account("Other User", "current", 100.0, overdraft_limit=500.0)
+        savings.deposit(250.0, "Salary")
+        current.withdraw(400.0)
+        bank.transfer_funds(savings.account_number, current.account_number, 300.0)
+        bank.transfer_batch([(current.account_number, savings.account_number, 100.0),
+                             (savings.account_number, current.account_number, 100.0)])
+        bank.run_interest()
+        current.deactivate()
+        
+        recovered = self.reopen(bank)
+        restored_savings = recovered.get_account(savings.account_number)
+        restored_current = recovered.get_account(current.account_number)
+        
+        self.assertEqual(restored_savings.balance, savings.balance)
+        self.assertEqual(restored_savings.balance, 953.96)  # 950.00 + 3.958... interest rounded to the cent
+        self.assertEqual(restored_savings.interest_rate, 5.0)
+        self.assertEqual(restored_current.balance, 0.0)
+        self.assertEqual(restored_current.overdraft_limit, 500.0)
+        self.assertFalse(restored_current.is_active)
+        self.assertEqual([t.to_dict() for t in restored_savings.get_transaction_history()],
+                         [t.to_dict() for t in savings.get_transaction_history()])
+        recovered.close()
+    
+    def test_checkpoint_truncates_log_and_recovers(self):
+        bank = AxizuloAfricanBank(ledger=Ledger(self.directory))
+        account = bank.create_account("Test User", "savings", 100.0)
+        for _ in range(10):
+            account.deposit(10.0)
+        bank.checkpoint()
+        account.withdraw(50.0)
+        
+        recovered = self.reopen(bank)
+        self.assertEqual(recovered.get_account(account.account_number).balance, 150.0)
+        self.assertEqual(len(recovered.get_account(account.account_number).get_transaction_history()), 12)
+        snapshots = [name for name in os.listdir(self.directory) if name.startswith(Ledger.SNAPSHOT_PREFIX)]
+        self.assertEqual(len(snapshots), 1)
+        recovered.close()
+    
+    def test_periodic_snapshots(self):
+        bank = AxizuloAfricanBank(ledger=Ledger(self.directory, snapshot_every=5))
+        account = bank.create_account("Test User", "savings", 0.0)
+        for _ in range(12):
+            account.deposit(1.0)
+        bank.ledger.close()
+        self.assertTrue(any(name.startswith(Ledger.SNAPSHOT_PREFIX) for name in os.listdir(self.directory)))
+        
+        recovered = self.reopen(bank)
+        self.assertEqual(recovered.get_account(account.account_number).balance, 12.0)
+        recovered.close()
+    
+    def test_torn_tail_is_ignored(self):
+        bank = AxizuloAfricanBank(ledger=Ledger(self.directory))
+        account = bank.create_account("Test User", "savings", 100.0)
+        account.deposit(20.0)
+        bank.close()
+        segment = sorted(name for name in os.listdir(self.directory) if name.endswith(".log"))[-1]
+        with open(os.path.join(self.directory, segment), "ab") as log:
+            log.write(b'{"op":"post","acc":"')
+        
+        recovered = AxizuloAfricanBank(ledger=Ledger(self.directory))
+        restored = recovered.get_account(account.account_number)
+        self.assertEqual(restored.balance, 120.0)
+        restored.deposit(5.0)
+        
+        again = self.reopen(recovered)
+        self.assertEqual(again.get_account(account.account_number).balance, 125.0)
+        again.close()
+    
+    def test_group_commit_batches_concurrent_writers(self):
+        ledger = Ledger(self.directory)
+        bank = AxizuloAfricanBank(ledger=ledger)
+        accounts = [bank.create_account(f"User {i}", "savings", 0.0) for i in range(8)]
+        
+        def post(account):
+            for _ in range(50):
+                ledger.commit(ledger.log_posting(account, account._post("deposit", 100, "Deposit")))
+        
+        threads = [threading.Thread(target=post, args=(account,)) for account in accounts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(ledger.durable_seq, ledger.last_seq)
+        # Writers waiting on the same fsync share it
+        self.assertLess(ledger.batch_count, ledger.last_seq)
+        
+        recovered = self.reopen(bank)
+        self.assertEqual(recovered.get_total_bank_balance(), 400.0)
+        recovered.close()
+    
+    def test_concurrent_commits_checkpoint_once(self):
+        ledger = Ledger(self.directory, sync=False, snapshot_every=20)
+        bank = AxizuloAfricanBank(ledger=ledger)
+        accounts = [bank.create_account(f"User {i}", "savings", 0.0) for i in range(8)]
+        errors = []
+        
+        def deposit(account):
+            try:
+                for _ in range(50):
+                    account.deposit(1.0)
+            except Exception as error:
+                errors.append(error)
+        
+        threads = [threading.Thread(target=deposit, args=(account,)) for account in accounts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        
+        # Closing waits for the background checkpoint
+        recovered = self.reopen(bank)
+        self.assertIsNone(ledger.checkpoint_error)
+        self.assertFalse([name for name in os.listdir(self.directory) if name.endswith(".tmp")])
+        self.assertEqual(recovered.get_total_bank_balance(), 400.0)
+        recovered.close()
+
+if __name__ == '__main__':
+    unittest.main()
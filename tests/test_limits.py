@@ -0,0 +1,89 @@
+import shutil
+import tempfile
+import unittest
+from src.bank import AxizuloAfricanBank
+from src.events import EventBus
+from src.ledger import Ledger
+from src.limits import DAY, HOUR, Limit, VelocityLimits
+
+class FakeClock:
+    
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestVelocityLimits(unittest.TestCase):
+    
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limits = VelocityLimits([Limit(HOUR, max_count=3), Limit(DAY, max_value=500.0, buckets=24)],
+                                     clock=self.clock)
+        self.bank = AxizuloAfricanBank(events=EventBus(), limits=self.limits)
+        self.account = self.bank.create_account("Test User", "current", 1000.0)
+        self.other = self.bank.create_account("Other User", "savings", 1000.0)
+    
+    def test_count_limit_slides_with_the_window(self):
+        self.assertTrue(self.account.withdraw(10))
+        self.clock.now += 1200
+        self.assertTrue(self.bank.transfer_funds(self.account.account_number, self.other.account_number, 10))
+        self.assertTrue(self.account.withdraw(10))
+        self.assertFalse(self.account.withdraw(10))  # Fourth debit within the hour
+        self.assertTrue(self.other.withdraw(10))  # Limits are per account
+        self.assertTrue(self.account.deposit(10))  # Only debits count
+        
+        self.clock.now += 2400  # The first debit is exactly an hour old; one bucket later it leaves the window
+        self.assertFalse(self.account.withdraw(10))
+        self.clock.now += 60
+        self.assertTrue(self.account.withdraw(10))
+        self.assertEqual(self.account.balance, 970.0)
+    
+    def test_value_limit_and_rejection_reasons(self):
+        self.assertTrue(self.account.withdraw(400))
+        self.assertFalse(self.bank.transfer_funds(self.account.account_number, self.other.account_number, 150))
+        self.assertEqual(self.limits.check(self.account, 15000), "Daily value limit reached: R100.00 available.")
+        self.assertFalse(self.account.withdraw(5000))  # Refused for funds, so not counted
+        self.assertEqual(self.limits.check(self.account, 10000), None)
+        self.clock.now += 2 * HOUR
+        self.assertEqual(self.limits.check(self.account, 1, count=2), None)
+        self.clock.now += DAY
+        self.assertTrue(self.account.withdraw(500))
+        
+        with self.assertRaises(ValueError):
+            VelocityLimits([Limit(0, max_count=1)])
+    
+    def test_batches_count_every_debit(self):
+        number, other = self.account.account_number, self.other.account_number
+        # Atomic batches check gross debits, even when the account nets out positive
+        report = self.bank.transfer_batch([(number, other, 1), (other, number, 100)] + [(number, other, 1)] * 3)
+        self.assertEqual(report['applied'], 0)
+        self.assertEqual(report['results'][0]['message'], "Hourly debit limit reached: at most 3 debits.")
+        
+        report = self.bank.transfer_batch([(number, other, 1)] * 2)
+        self.assertEqual(report['applied'], 2)
+        report = self.bank.transfer_batch([(number, other, 1)] * 2, atomic=False)
+        self.assertEqual((report['applied'], report['failed']), (1, 1))
+        self.assertFalse(self.account.withdraw(1))
+    
+    def test_windows_are_rebuilt_on_recovery(self):
+        directory = tempfile.mkdtemp()
+        try:
+            # Ledger timestamps are wall-clock, so this bank uses the real clock
+            limits = [Limit(HOUR, max_count=2)]
+            bank = AxizuloAfricanBank(ledger=Ledger(directory), events=EventBus(), limits=VelocityLimits(limits))
+            account = bank.create_account("Test User", "savings", 100.0)
+            self.assertTrue(account.withdraw(10))
+            self.assertTrue(account.withdraw(10))
+            self.assertFalse(account.withdraw(10))
+            bank.close()
+            
+            restored = AxizuloAfricanBank(ledger=Ledger(directory), events=EventBus(), limits=VelocityLimits(limits))
+            self.assertFalse(restored.get_account(account.account_number).withdraw(10))
+            restored.close()
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import contextlib
+import io
+import random
+import sys
+import threading
+import unittest
+from src.bank import AxizuloAfricanBank
+from src.locks import LockManager
+
+class TestLockManager(unittest.TestCase):
+    
+    def test_acquire_orders_and_releases_stripes(self):
+        locks = LockManager(stripes=8)
+        with locks.acquire("B", "A", "A"):
+            self.assertTrue(locks.lock_for("A")._is_owned())
+            self.assertTrue(locks.lock_for("B")._is_owned())
+        self.assertFalse(locks.lock_for("A")._is_owned())
+    
+    def test_concurrent_transfers_conserve_balances(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            bank = AxizuloAfricanBank()
+            accounts = [bank.create_account(f"User {i}", "current", 100.0, overdraft_limit=100.0)
+                        for i in range(4)]
+            numbers = [account.account_number for account in accounts]
+            total_before = bank.get_total_bank_balance()
+            stranded = []  # Deposits whose matching withdrawal lost a race for funds
+            
+            def worker(seed):
+                generator = random.Random(seed)
+                for _ in range(1000):
+                    source, target = generator.sample(numbers, 2)
+                    bank.transfer_funds(source, target, generator.randint(1, 150))
+                    account = bank.get_account(source)
+                    if account.deposit(5.0) and not account.withdraw(5.0):
+                        stranded.append(5.0)
+            
+            # Switch threads very often so unsynchronized read-modify-writes would show up
+            interval = sys.getswitchinterval()
+            sys.setswitchinterval(1e-6)
+            try:
+                threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(8)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join(timeout=60)
+                    self.assertFalse(thread.is_alive(), "Transfer workers deadlocked")
+            finally:
+                sys.setswitchinterval(interval)
+        
+        self.assertAlmostEqual(bank.get_total_bank_balance(), total_before + sum(stranded), places=6)
+        self.assertEqual(bank.check_aggregates(), {})
+        for account in accounts:
+            self.assertGreaterEqual(account.balance, -account.overdraft_limit)
+            history_total = sum(t.amount if t.transaction_type == "deposit" else -t.amount
+                                for t in account.get_transaction_history())
+            self.assertAlmostEqual(account.balance, history_total, places=6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import threading
+import unittest
+from src.bank import AxizuloAfricanBank
+from src.events import EventBus
+from src.metrics import Metrics
+
+class TestMetrics(unittest.TestCase):
+    
+    def setUp(self):
+        self.metrics = Metrics(sample_every=1)
+        self.bank = AxizuloAfricanBank(events=EventBus(), metrics=self.metrics)
+        self.account = self.bank.create_account("Test User", "savings", 100.0)
+        self.other = self.bank.create_account("Other User", "current", 0.0)
+    
+    def test_operations_and_rejections_are_counted(self):
+        self.account.deposit(50)
+        self.account.withdraw(20)
+        self.assertFalse(self.other.withdraw(5000))
+        self.assertFalse(self.account.withdraw(5000))
+        self.bank.transfer_funds(self.account.account_number, self.other.account_number, 10)
+        self.bank.transfer_batch([(self.account.account_number, "0000000000", 1)])
+        self.bank.run_interest()
+        
+        counts = {operation: self.metrics.operation_count(operation)
+                  for operation in ("create_account", "deposit", "withdrawal", "transfer", "transfer_batch", "interest")}
+        self.assertEqual(counts, {"create_account": 2, "deposit": 1, "withdrawal": 3, "transfer": 1,
+                                  "transfer_batch": 1, "interest": 1})
+        self.assertEqual(self.metrics.sampled_count("withdrawal"), 1)  # Only completed calls are timed
+        # Amounts are cut from reasons, so both shortfalls share one series
+        self.assertEqual(self.metrics.rejection_count("withdrawal", "Insufficient funds"), 2)
+        self.assertEqual(self.metrics.rejection_count("transfer_batch", "One or both accounts not found."), 1)
+    
+    def test_interest_latency_covers_every_chunk(self):
+        for i in range(4):
+            self.bank.create_account(f"Saver {i}", "savings", 100.0)
+        for chunk_size in (10000, 2):
+            self.bank.run_interest(chunk_size=chunk_size)
+        self.assertEqual(self.metrics.sampled_count("interest"), 2)
+        self.assertLess(self.metrics.sampled_seconds("interest"), 5.0)
+    
+    def test_prometheus_text(self):
+        self.account.deposit(50)
+        self.account.withdraw(500)
+        self.metrics.observe_request("/deposit", 200, 0)
+        text = self.metrics.render()
+        
+        self.assertIn('axizulo_operations_total{operation="deposit"} 1\n', text)
+        self.assertIn('axizulo_operation_rejections_total{operation="withdrawal",reason="Insufficient funds"} 1\n',
+                      text)
+        self.assertIn('axizulo_operation_duration_seconds_count{operation="deposit"} 1\n', text)
+        self.assertIn('axizulo_http_responses_total{route="/deposit",status="200"} 1\n', text)
+        for gauge in ("axizulo_accounts 2", "axizulo_active_accounts 2", "axizulo_transactions 2"):
+            self.assertIn(f"\n{gauge}\n", text)
+        buckets = [int(line.rsplit(" ", 1)[1]) for line in text.splitlines()
+                   if line.startswith('axizulo_operation_duration_seconds_bucket{operation="deposit"')]
+        self.assertEqual(buckets, sorted(buckets))
+        self.assertEqual(buckets[-1], 1)
+        self.assertTrue(text.endswith("\n"))
+    
+    def test_disabled_and_sampled(self):
+        self.metrics.enabled = False
+        self.account.deposit(10)
+        self.account.withdraw(5000)
+        self.assertEqual(self.metrics.operation_count("deposit"), 0)
+        self.assertEqual(self.metrics.rejection_count("withdrawal", "Insufficient funds"), 0)
+        
+        sampled = Metrics(sample_every=4)
+        account = AxizuloAfricanBank(events=EventBus(), metrics=sampled).create_account("Sampled", "savings", 0.0)
+        threads = [threading.Thread(target=lambda: [account.deposit(1) for _ in range(250)]) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sampled.operation_count("deposit"), 1000)
+        self.assertEqual(sampled.sampled_count("deposit"), 250)
+        with self.assertRaises(ValueError):
+            Metrics(sample_every=3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from decimal import Decimal
+from src.bank import AxizuloAfricanBank
+from src.events import EventBus
+from src.money import (Money, div_round, format_cents, monthly_interest_cents, parse_cents, to_cents,
+                       to_rate_units)
+
+class TestMoney(unittest.TestCase):
+    
+    def test_parse_and_format(self):
+        self.assertEqual(parse_cents("1234.56"), 123456)
+        self.assertEqual(parse_cents("-0.05"), -5)
+        self.assertEqual(parse_cents("R 1,000.5"), 100050)
+        self.assertEqual(parse_cents(" 7 "), 700)
+        for text in ("", ".", "1.234", "1e3", "1_000.00", "--1", "nan"):
+            with self.assertRaises(ValueError):
+                parse_cents(text)
+        self.assertEqual(format_cents(-50050), "-500.50")
+        self.assertEqual(format_cents(5), "0.05")
+        self.assertEqual(format_cents(10 ** 20), "1000000000000000000.00")
+        self.assertEqual(str(Money.parse("12.3")), "12.30")
+    
+    def test_to_cents(self):
+        self.assertEqual(to_cents(0.29), 29)
+        self.assertEqual(to_cents(5), 500)
+        self.assertEqual(to_cents(Decimal("1.005")), 100)
+        self.assertEqual(to_cents("2.50"), 250)
+        self.assertEqual(to_cents(Money(5)), 5)  # Already cents
+        self.assertEqual(to_cents(Money(150) + Money(150)), 300)
+        self.assertEqual(to_cents(Money(150) - 50), 100)
+        self.assertEqual(to_cents(-Money(150)), -150)
+        self.assertEqual(to_cents(sum([Money(1), Money(2)])), 3)
+        self.assertEqual(type(2.5 + Money(1)), float)
+        with self.assertRaises(ValueError):
+            to_cents(float("inf"))
+        with self.assertRaises(TypeError):
+            to_cents(None)
+    
+    def test_interest_rounds_half_to_even(self):
+        self.assertEqual(div_round(5, 2), 2)
+        self.assertEqual(div_round(7, 2), 4)
+        self.assertEqual(div_round(-5, 2), -2)
+        self.assertEqual(to_rate_units(2.125), 21250)
+        self.assertEqual(monthly_interest_cents(100000, to_rate_units(5.0)), 417)
+    
+    def test_postings_do_not_drift(self):
+        bank = AxizuloAfricanBank(events=EventBus())
+        account = bank.create_account("Test User", "savings", 0.0)
+        for _ in range(1000):
+            account.deposit(0.1)
+        self.assertEqual(account.balance_cents, 10000)
+        self.assertEqual(account.balance, 100.0)
+        self.assertEqual(bank.check_aggregates(), {})
+
+if __name__ == '__main__':
+    unittest.main()
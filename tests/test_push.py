@@ -0,0 +1,181 @@
+import asyncio
+import json
+import os
+import re
+import unittest
+from flask import Flask, render_template
+from async_app import AsyncBankServer
+from src.bank import AxizuloAfricanBank
+from src.events import EventBus
+from src.push import PushHub
+from src.storage import MemoryStorage
+
+def parse_frame(frame: bytes):
+    """(event, id, data) from one Server-Sent Events message"""
+    fields = dict(line.split(": ", 1) for line in frame.decode().strip().split("\n"))
+    return fields["event"], int(fields["id"]), json.loads(fields["data"])
+
+
+class TestPushHub(unittest.TestCase):
+    
+    def setUp(self):
+        self.bank = AxizuloAfricanBank(events=EventBus())
+        self.accounts = [self.bank.create_account(f"User {i}", "savings", 100.0) for i in range(10)]
+        self.hub = PushHub(self.bank)
+        self.received = {account.account_number: [] for account in self.accounts}
+    
+    def subscribe(self, account, count=1):
+        frames = self.received[account.account_number]
+        return [self.hub.subscribe(account.account_number, frames.append) for _ in range(count)]
+    
+    def updates(self, account):
+        frames = [parse_frame(frame) for frame in self.received[account.account_number]]
+        return [frame for frame in frames if frame[0] == "update"]
+    
+    def test_deltas_reach_only_the_accounts_subscribers(self):
+        for account in self.accounts:
+            self.subscribe(account, 1000)
+        self.assertEqual(self.hub.subscriber_count, 10000)
+        first, second = self.accounts[:2]
+        
+        first.deposit(25, "Salary")
+        first.withdraw(5)
+        self.bank.transfer_funds(first.account_number, second.account_number, 20.0)
+        self.hub.close()
+        
+        updates = self.updates(first)
+        self.assertEqual(len(updates) % 1000, 0)
+        posted = [t for _, _, data in updates[::1000] for t in data["transactions"]]
+        self.assertEqual([(t["type"], t["amount"]) for t in posted],
+                         [("deposit", 25.0), ("withdrawal", 5.0), ("withdrawal", 20.0)])
+        self.assertEqual((updates[-1][1], updates[-1][2]["balance"]), (first.version, 100.0))
+        self.assertEqual(self.updates(second)[-1][2]["balance"], 120.0)
+        self.assertTrue(all(not self.updates(account) for account in self.accounts[2:]))
+    
+    def test_bulk_operations_update_every_watched_account(self):
+        watched, unwatched = self.accounts[0], self.accounts[1]
+        self.subscribe(watched, 3)
+        self.bank.run_interest()
+        self.bank.transfer_batch([(unwatched.account_number, watched.account_number, 10.0)])
+        self.hub.close()
+        
+        transactions = [t for _, _, data in self.updates(watched)[::3] for t in data["transactions"]]
+        self.assertEqual(len(transactions), 2)  # Interest, then the incoming transfer
+        self.assertEqual(self.updates(watched)[-1][2]["balance"], watched.balance)
+        self.assertEqual(self.received[unwatched.account_number], [])
+    
+    def test_cancelled_subscriptions_stop_receiving(self):
+        account = self.accounts[0]
+        subscriptions = self.subscribe(account, 2)
+        self.assertIsNone(self.hub.subscribe("0000000000", print))
+        for subscription in subscriptions:
+            subscription.cancel()
+        self.assertEqual(self.hub.subscriber_count, 0)
+        account.deposit(10)
+        self.hub.close()
+        self.assertEqual(len(self.received[account.account_number]), 2)  # Just the initial balances
+
+
+class TestEventStreams(unittest.TestCase):
+    
+    IDLE_STREAMS = 500
+    
+    def setUp(self):
+        self.flask_app = Flask(__name__)
+        self.flask_app.secret_key = 'test-secret'
+        self.bank = AxizuloAfricanBank(events=EventBus())
+        self.account = self.bank.create_account("Test User", "savings", 100.0)
+        self.idle = self.bank.create_account("Idle User", "current", 0.0)
+        self.hub = PushHub(self.bank)
+        serializer = self.flask_app.session_interface.get_signing_serializer(self.flask_app)
+        self.cookies = {account.account_number: f"session={serializer.dumps({'account_number': account.account_number})}"
+                        for account in (self.account, self.idle)}
+    
+    def tearDown(self):
+        self.hub.close()
+    
+    async def open_stream(self, port, account):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(f"GET /events HTTP/1.1\r\nHost: test\r\nCookie: {self.cookies[account.account_number]}\r\n\r\n"
+                     .encode())
+        head = await reader.readuntil(b"\r\n\r\n")
+        self.assertIn(b"Content-Type: text/event-stream", head)
+        self.assertEqual(parse_frame(await reader.readuntil(b"\n\n"))[0], "balance")
+        return reader, writer
+    
+    async def request(self, port, method, target, body, account):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(f"{method} {target} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n"
+                     f"Cookie: {self.cookies[account.account_number]}\r\nConnection: close\r\n\r\n{body}".encode())
+        response = await reader.read()
+        writer.close()
+        return json.loads(response.partition(b"\r\n\r\n")[2])
+    
+    def test_many_idle_subscribers(self):
+        async def run():
+            server = AsyncBankServer(MemoryStorage(self.bank), self.flask_app, workers=4, push=self.hub)
+            await server.start('127.0.0.1', 0)
+            port = server.port
+            idle = [await self.open_stream(port, self.idle) for _ in range(self.IDLE_STREAMS)]
+            watching = [await self.open_stream(port, self.account) for _ in range(10)]
+            self.assertEqual(self.hub.subscriber_count, self.IDLE_STREAMS + 10)
+            
+            # The loop still answers ordinary requests with every stream open
+            self.assertEqual((await self.request(port, "GET", "/balance", "", self.account))["balance"], 100.0)
+            await self.request(port, "POST", "/deposit", "amount=50&description=Salary", self.account)
+            for reader, _ in watching:
+                event, version, update = parse_frame(await asyncio.wait_for(reader.readuntil(b"\n\n"), 5))
+                self.assertEqual((event, version, update["balance"]), ("update", self.account.version, 150.0))
+                self.assertEqual([t["description"] for t in update["transactions"]], ["Salary"])
+            
+            await asyncio.sleep(0.05)
+            for reader, _ in idle:
+                self.assertEqual(len(reader._buffer), 0)  # Nothing was pushed to other accounts' streams
+            
+            for _, writer in idle + watching:
+                writer.close()
+            for _ in range(100):
+                if self.hub.subscriber_count == 0:
+                    break
+                await asyncio.sleep(0.01)
+            self.assertEqual(self.hub.subscriber_count, 0)
+            await server.stop()
+        asyncio.run(run())
+    
+    def test_events_requires_a_session(self):
+        async def run():
+            server = AsyncBankServer(MemoryStorage(self.bank), self.flask_app, workers=4, push=self.hub)
+            await server.start('127.0.0.1', 0)
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+            writer.write(b"GET /events HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n")
+            response = await reader.read()
+            await server.stop()
+            return json.loads(response.partition(b"\r\n\r\n")[2])
+        self.assertEqual(asyncio.run(run()), {'success': False, 'message': 'No account selected'})
+
+
+class TestDashboard(unittest.TestCase):
+    
+    def test_pushed_rows_follow_rendered_order(self):
+        bank = AxizuloAfricanBank(events=EventBus())
+        account = bank.create_account("Test User", "savings", 100.0)
+        for i in range(6):
+            account.deposit(1.0, f"Deposit {i}")
+        storage = MemoryStorage(bank)
+        
+        app = Flask(__name__, template_folder=os.path.join(os.path.dirname(__file__), os.pardir, "templates"))
+        with app.test_request_context():
+            page = render_template("dashboard.html", account=storage.account_info(account.account_number),
+                                   transactions=storage.recent_transactions(account.account_number, 5),
+                                   events_url="/events")
+        
+        # The server lists the last five oldest first...
+        rendered = re.findall(r"<td>(Deposit \d)</td>", page)
+        self.assertEqual(rendered, [f"Deposit {i}" for i in range(1, 6)])
+        # ...so pushed rows are appended and the oldest trimmed from the top
+        script = page[page.index("function addTransactions"):]
+        self.assertIn("rows.insertRow(-1)", script)
+        self.assertIn("rows.deleteRow(0)", script)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from datetime import datetime, timedelta
+from src.bank import AxizuloAfricanBank
+from src.events import EventBus
+from src.limits import DAY, Limit, VelocityLimits
+from src.scheduler import Scheduler
+
+START = datetime(2024, 1, 1, 9, 0)
+
+class TestScheduler(unittest.TestCase):
+    
+    def setUp(self):
+        self.bank = AxizuloAfricanBank(events=EventBus())
+        self.payer = self.bank.create_account("Test User", "savings", 100.0)
+        self.payee = self.bank.create_account("Other User", "current", 0.0)
+        self.scheduler = Scheduler(self.bank, max_retries=2, retry_delay=timedelta(hours=1))
+    
+    def test_standing_orders_pay_each_interval(self):
+        weekly = self.scheduler.schedule(self.payer.account_number, self.payee.account_number, 10,
+                                         START, every=timedelta(days=7), times=3)
+        once = self.scheduler.schedule(self.payer.account_number, self.payee.account_number, 5,
+                                       START + timedelta(days=1))
+        
+        self.assertEqual(self.scheduler.tick(START - timedelta(seconds=1))['due'], 0)
+        report = self.scheduler.tick(START)
+        self.assertEqual((report['due'], report['paid']), (1, 1))
+        self.assertEqual(self.scheduler.get_order(weekly)['next_due'], START + timedelta(days=7))
+        self.assertEqual(self.scheduler.get_order(weekly)['remaining'], 2)
+        
+        # A tick three weeks on pays the one-off and one weekly payment; the other catches up next tick
+        report = self.scheduler.tick(START + timedelta(days=21))
+        self.assertEqual((report['due'], report['paid']), (2, 2))
+        self.assertIsNone(self.scheduler.get_order(once))
+        self.assertEqual(self.scheduler.tick(START + timedelta(days=21))['paid'], 1)
+        self.assertIsNone(self.scheduler.get_order(weekly))
+        self.assertEqual(self.scheduler.pending_count, 0)
+        self.assertEqual(self.payee.balance, 35.0)
+        self.assertEqual(self.scheduler.tick(START + timedelta(days=60))['due'], 0)
+    
+    def test_insufficient_funds_are_retried_then_missed(self):
+        monthly = self.scheduler.schedule(self.payer.account_number, self.payee.account_number, 150,
+                                          START, every=timedelta(days=30))
+        report = self.scheduler.tick(START)
+        self.assertEqual(report['retrying'], 1)
+        self.assertEqual(report['results'][0]['message'], "Insufficient funds.")
+        self.assertEqual(self.scheduler.tick(START + timedelta(minutes=30))['due'], 0)  # Not yet time to retry
+        
+        self.payer.deposit(100)
+        report = self.scheduler.tick(START + timedelta(hours=1))
+        self.assertEqual(report['paid'], 1)
+        self.assertEqual(self.payer.balance, 50.0)
+        # Payment is still counted from the original due date
+        self.assertEqual(self.scheduler.get_order(monthly)['next_due'], START + timedelta(days=30))
+        
+        outcomes = [self.scheduler.tick(START + timedelta(days=30, hours=hours))['results'][0]['outcome']
+                    for hours in range(3)]
+        self.assertEqual(outcomes, ["retrying", "retrying", "missed"])
+        order = self.scheduler.get_order(monthly)
+        self.assertEqual((order['next_due'], order['attempts']), (START + timedelta(days=60), 0))
+    
+    def test_limit_and_overdraft_refusals_are_retried(self):
+        bank = AxizuloAfricanBank(events=EventBus(), limits=VelocityLimits([Limit(DAY, max_count=1)]))
+        payer = bank.create_account("Test User", "current", 0.0, overdraft_limit=50)
+        payee = bank.create_account("Other User", "savings", 0.0)
+        scheduler = Scheduler(bank)
+        for amount in (10, 10, 100):
+            scheduler.schedule(payer.account_number, payee.account_number, amount, START)
+        
+        report = scheduler.tick(START)
+        self.assertEqual((report['paid'], report['retrying'], report['cancelled']), (1, 2, 0))
+        self.assertEqual(sorted(result['message'].split(":")[0] for result in report['results'][1:]),
+                         ["Daily debit limit reached", "Insufficient funds. Available"])
+    
+    def test_orders_can_be_cancelled(self):
+        number, other = self.payer.account_number, self.payee.account_number
+        orders = [self.scheduler.schedule(number, other, 1, START + timedelta(minutes=i)) for i in range(100)]
+        for order_id in orders[:90]:
+            self.assertTrue(self.scheduler.cancel(order_id))
+        self.assertFalse(self.scheduler.cancel(orders[0]))
+        self.assertEqual(self.scheduler.pending_count, 10)
+        self.assertEqual(self.scheduler.tick(START + timedelta(hours=2))['paid'], 10)
+        
+        # A closed account cancels its standing orders
+        standing = self.scheduler.schedule(other, number, 1, START, every=timedelta(days=1))
+        self.payee.withdraw(self.payee.balance)
+        self.assertTrue(self.bank.close_account(other))
+        report = self.scheduler.tick(START)
+        self.assertEqual(report['cancelled'], 1)
+        self.assertIsNone(self.scheduler.get_order(standing))
+        
+        for bad in [(number, number, 1), (number, "0000000000", 1), (number, other, 0)]:
+            with self.assertRaises(ValueError):
+                self.scheduler.schedule(*bad, START)
+        with self.assertRaises(ValueError):
+            self.scheduler.schedule(number, other, 1, START, every=timedelta(0))
+
+if __name__ == '__main__':
+    unittest.main()
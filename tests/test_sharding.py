@@ -0,0 +1,126 @@
+import random
+import shutil
+import tempfile
+import threading
+import unittest
+from src.bank import AxizuloAfricanBank
+from src.events import EventBus
+from src.ids import IdAllocator
+from src.ledger import Ledger
+from src.sharding import ShardedBank, shard_of
+
+class TestShardedBank(unittest.TestCase):
+    
+    def setUp(self):
+        self.bank = ShardedBank(shards=3)
+        self.accounts = [self.bank.create_account(f"User {i}", "savings", 100.0)['account_number'] for i in range(9)]
+    
+    def tearDown(self):
+        self.bank.close()
+    
+    def test_accounts_are_spread_and_routed_by_number(self):
+        self.assertEqual([self.bank.shard_for(number) for number in self.accounts], [0, 1, 2] * 3)
+        self.assertEqual(len(set(self.accounts)), 9)
+        self.assertEqual(self.bank.get_account_count(), 9)
+        self.assertEqual(self.bank.get_account_info(self.accounts[4])['account_holder'], "User 4")
+        self.assertIsNone(shard_of("0000000035", 3))  # Bad check digit
+        self.assertIsNone(self.bank.get_balance("0000000000"))
+        
+        self.assertTrue(self.bank.deposit(self.accounts[1], 50))
+        self.assertFalse(self.bank.withdraw(self.accounts[2], 500))
+        self.assertEqual(self.bank.get_balance(self.accounts[1]), 150.0)
+        
+        allocator = IdAllocator(5, start=2, step=3)
+        self.assertEqual([allocator.next_seq() for _ in range(3)], [2, 5, 8])
+        allocator.observe(12)
+        self.assertEqual(allocator.next_seq(), 14)
+    
+    def test_transfers_within_and_across_shards(self):
+        first, second, third, fourth = self.accounts[:4]  # Shards 0, 1, 2 and 0
+        self.assertTrue(self.bank.transfer_funds(first, fourth, 30))
+        self.assertTrue(self.bank.transfer_funds(first, second, 20))
+        self.assertFalse(self.bank.transfer_funds(second, third, 500))  # Insufficient funds
+        self.assertFalse(self.bank.transfer_funds(third, "0000000000", 5))
+        self.assertFalse(self.bank.transfer_funds(third, second, -5))
+        
+        self.assertEqual([self.bank.get_balance(number) for number in (first, second, third, fourth)],
+                         [50.0, 120.0, 100.0, 130.0])
+        self.assertEqual(self.bank.get_total_bank_balance(), 900.0)
+    
+    def test_concurrent_transfers_conserve_money(self):
+        results = []
+        
+        def client(seed):
+            rng = random.Random(seed)
+            for _ in range(150):
+                from_account, to_account = rng.sample(self.accounts, 2)
+                results.append(self.bank.transfer_funds(from_account, to_account, rng.randint(1, 80)))
+        
+        threads = [threading.Thread(target=client, args=(seed,)) for seed in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        balances = [self.bank.get_balance(number) for number in self.accounts]
+        self.assertEqual(len(results), 900)
+        self.assertIn(False, results)  # Some transfers ran short of funds
+        self.assertEqual(round(sum(balances), 2), 900.0)
+        self.assertEqual(self.bank.get_total_bank_balance(), 900.0)
+        self.assertTrue(all(balance >= 0 for balance in balances))
+
+
+class TestCrossShardRecovery(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+    
+    def test_interrupted_transfers_are_finished_or_dropped(self):
+        bank = ShardedBank(shards=2, directory=self.directory)
+        source, destination = (bank.create_account(f"User {i}", "savings", 100.0)['account_number'] for i in range(2))
+        self.assertTrue(bank.transfer_funds(source, destination, 10))
+        
+        # Stop one transfer right after its commit point and another before it
+        shards = bank._shards
+        shards[1].call("prepare_credit", "committed", source, destination, 2500)
+        self.assertIsNone(shards[0].call("debit_transfer", "committed", source, destination, 2500))
+        shards[1].call("prepare_credit", "undecided", source, destination, 4000)
+        bank.close()
+        
+        bank = ShardedBank(shards=2, directory=self.directory)
+        try:
+            self.assertEqual(bank.recovered_transfers, 2)
+            self.assertEqual((bank.get_balance(source), bank.get_balance(destination)), (65.0, 135.0))
+            self.assertEqual(bank.get_total_bank_balance(), 200.0)
+            in_flight = [shard.call("in_flight_transfers") for shard in bank._shards]
+            self.assertEqual(in_flight, [{'pending': {}, 'owed': {}}] * 2)
+        finally:
+            bank.close()
+    
+    def test_in_flight_transfers_survive_a_checkpoint(self):
+        bank = AxizuloAfricanBank(ledger=Ledger(self.directory), events=EventBus(), shard=(1, 2))
+        account = bank.create_account("Test User", "savings", 100.0)
+        self.assertEqual(bank.debit_transfer("out", account.account_number, "0000000026", 4000), None)
+        self.assertEqual(bank.prepare_credit("in", "0000000026", account.account_number, 500), None)
+        self.assertEqual(bank.prepare_credit("refused", "0000000026", "0000000000", 500),
+                         "One or both accounts not found.")
+        bank.checkpoint()
+        bank.close()
+        
+        restored = AxizuloAfricanBank(ledger=Ledger(self.directory), events=EventBus(), shard=(1, 2))
+        self.assertEqual(restored.in_flight_transfers(), {
+            'pending': {"in": ("0000000026", account.account_number, 500)},
+            'owed': {"out": (account.account_number, "0000000026", 4000)},
+        })
+        self.assertTrue(restored.credit_transfer("in"))
+        self.assertFalse(restored.credit_transfer("in"))
+        restored.settle_transfer("out")
+        self.assertEqual(restored.get_account(account.account_number).balance, 65.0)
+        self.assertEqual(restored._account_numbers.parse(restored.create_account("Next", "savings").account_number), 3)
+        restored.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+from src.bank import AxizuloAfricanBank
+from src.events import EventBus
+from src.ledger import Ledger
+from src.snapshot import SnapshotImage
+from src.tiering import TieredRows
+
+class TestSnapshotImage(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+    
+    def open(self, **kwargs):
+        return AxizuloAfricanBank(ledger=Ledger(self.directory), events=EventBus(), **kwargs)
+    
+    def reopen(self, bank):
+        bank.close()
+        return self.open()
+    
+    @staticmethod
+    def describe(account):
+        return account.get_account_info(), [str(t) for t in account.get_transaction_history()]
+    
+    def populate(self, bank, count=40):
+        accounts = []
+        for i in range(count):
+            if i % 2:
+                accounts.append(bank.create_account(f"User {i}", "savings", 100 + i, interest_rate=3.25))
+            else:
+                accounts.append(bank.create_account(f"User {i}", "current", 100 + i, overdraft_limit=250))
+        for account in accounts[:10]:
+            account.withdraw(5, "Coffee")
+        bank.transfer_funds(accounts[0].account_number, accounts[1].account_number, 30)
+        return accounts
+    
+    def test_accounts_stay_dormant_until_used(self):
+        bank = self.open()
+        accounts = self.populate(bank)
+        accounts[3].deactivate()
+        bank.checkpoint()
+        accounts[2].deposit(7)
+        summary = bank.get_bank_summary()
+        transaction_id = accounts[1].get_transaction_history()[-1].transaction_id
+        expected = [self.describe(account) for account in accounts[:4]]
+        bank.close()
+        self.assertTrue(any(name.endswith(SnapshotImage.SUFFIX) for name in os.listdir(self.directory)))
+        
+        recovered = self.open()
+        # Only the account changed after the checkpoint was rebuilt, by log replay
+        self.assertEqual(recovered.resident_count, 1)
+        self.assertEqual(recovered.get_account_count(), 40)
+        self.assertEqual(recovered.get_bank_summary(), summary)
+        self.assertEqual(recovered.get_transaction(transaction_id).description,
+                         f"Transfer from {accounts[0].account_number}")
+        self.assertEqual(recovered.resident_count, 1)
+        
+        for original, described in zip(accounts, expected):
+            self.assertEqual(self.describe(recovered.get_account(original.account_number)), described)
+        self.assertEqual(recovered.get_account(accounts[1].account_number).interest_rate, 3.25)
+        self.assertEqual(recovered.get_account(accounts[0].account_number).overdraft_limit, 250.0)
+        self.assertEqual(recovered.resident_count, 4)
+        self.assertIsNone(recovered.get_account("0000000000"))
+        
+        self.assertEqual([a.account_number for a in recovered.find_accounts(holder="user 3")],
+                         [accounts[3].account_number])
+        self.assertEqual(len(recovered.find_accounts(account_type="savings", is_active=True)), 19)
+        self.assertEqual(len(recovered.find_accounts(min_balance=130)), 10)
+        # Bulk reads take dormant accounts straight from the image
+        resident = recovered.resident_count
+        self.assertEqual(recovered.check_aggregates(), {})
+        self.assertEqual(recovered.resident_count, resident)
+        
+        # New accounts never reuse a number held only by the image
+        created = recovered.create_account("New User", "savings", 1)
+        self.assertNotIn(created.account_number, [account.account_number for account in accounts])
+        self.assertEqual(recovered.get_account_count(), 41)
+        recovered.close()
+    
+    def test_only_idle_unchanged_unreferenced_accounts_are_evicted(self):
+        bank = self.open()
+        accounts = self.populate(bank, 10)
+        bank.checkpoint()
+        bank.close()
+        
+        recovered = self.open()
+        numbers = [account.account_number for account in accounts]
+        held = recovered.get_account(numbers[0])
+        changed = recovered.get_account(numbers[1])
+        changed.deposit(1)
+        for number in numbers[2:]:
+            recovered.get_account(number)
+        
+        # The first sweep only clears the marks set by the lookups
+        self.assertEqual(recovered.evict_idle(), 0)
+        self.assertEqual(recovered.evict_idle(), 8)
+        self.assertEqual(recovered.resident_count, 2)
+        self.assertIs(recovered.get_account(numbers[0]), held)
+        self.assertEqual(recovered.get_account(numbers[2]).balance, accounts[2].balance)
+        self.assertEqual(len(recovered.find_accounts(min_balance=101)), 5)
+        
+        # Once checkpointed the changed account matches the image and can go too
+        recovered.checkpoint()
+        del changed
+        recovered.evict_idle()
+        recovered.evict_idle()
+        self.assertEqual(recovered.resident_count, 1)  # Still held
+        self.assertEqual(recovered.get_account(numbers[1]).balance, accounts[1].balance + 1)
+        self.assertEqual(recovered.check_aggregates(), {})
+        recovered.close()
+    
+    def test_resident_limit_bounds_hydrated_accounts(self):
+        bank = self.open()
+        accounts = self.populate(bank, 200)
+        first = accounts[5].get_transaction_history()[0].transaction_id
+        bank.checkpoint()
+        bank.close()
+        
+        recovered = self.open(resident_limit=50)
+        for account in accounts:
+            self.assertEqual(recovered.get_account(account.account_number).balance, account.balance)
+        self.assertLessEqual(recovered.resident_count, 100)
+        
+        # A later image still answers for IDs and rows of the first one
+        recovered.get_account(accounts[5].account_number).deposit(10)
+        recovered.checkpoint()
+        recovered.close()
+        recovered = self.open(resident_limit=50)
+        self.assertEqual(recovered.get_transaction(first).amount, 105.0)
+        self.assertEqual(recovered.get_account(accounts[5].account_number).balance, 110.0)
+        self.assertEqual(sum(account.balance for account in recovered.get_all_accounts()),
+                         sum(account.balance for account in accounts) + 10)
+        recovered.close()
+    
+    def test_bulk_jobs_hydrate_only_what_they_change(self):
+        bank = self.open()
+        accounts = self.populate(bank, 20)
+        accounts[3].withdraw(accounts[3].balance)  # Earns no interest
+        before = datetime.now()
+        expected = bank.snapshot_balances(before)
+        bank.checkpoint()
+        bank.close()
+        
+        recovered = self.open()
+        self.assertEqual(recovered.snapshot_balances(before), expected)
+        self.assertEqual(recovered.resident_count, 0)
+        self.assertEqual(recovered.run_interest()['accounts'], 9)
+        self.assertEqual(recovered.resident_count, 9)
+        self.assertEqual(recovered.check_aggregates(), {})
+        self.assertEqual(recovered.resident_count, 9)
+        recovered.close()
+    
+    def test_hydrated_history_is_tiered(self):
+        cold = os.path.join(self.directory, "cold")
+        bank = self.open()
+        account = bank.create_account("Busy User", "savings", 1.0)
+        for _ in range(30):
+            account.deposit(1.0)
+        history = [str(t) for t in account.get_transaction_history()]
+        bank.checkpoint()
+        bank.close()
+        
+        recovered = self.open(cold_storage=cold, hot_transactions=4)
+        hydrated = recovered.get_account(account.account_number)
+        self.assertIsInstance(hydrated._rows, TieredRows)
+        self.assertEqual(hydrated._rows.cold_count, 27)
+        self.assertEqual([str(t) for t in hydrated.get_transaction_history()], history)
+        hydrated.deposit(1.0)
+        self.assertEqual(hydrated.balance, 32.0)
+        recovered.close()
+    
+    def test_concurrent_checkpoints_adopt_images_in_order(self):
+        ledger = Ledger(self.directory, sync=False, snapshot_every=20)
+        bank = AxizuloAfricanBank(ledger=ledger, events=EventBus(), resident_limit=4)
+        numbers = [bank.create_account(f"User {i}", "savings", 0.0).account_number for i in range(8)]
+        errors = []
+        
+        def run(task):
+            try:
+                task()
+            except Exception as error:
+                errors.append(error)
+        
+        def deposit(number):
+            for _ in range(50):
+                bank.get_account(number).deposit(1)
+        
+        def checkpoint():
+            for _ in range(20):
+                bank.checkpoint()
+        
+        tasks = [lambda number=number: deposit(number) for number in numbers] + [checkpoint, checkpoint]
+        threads = [threading.Thread(target=run, args=(task,)) for task in tasks]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        
+        # An image no newer than the current one is ignored
+        bank.checkpoint()
+        current = bank._image
+        bank._adopt_image(SnapshotImage(current.path))
+        self.assertIs(bank._image, current)
+        
+        recovered = self.reopen(bank)
+        self.assertIsNone(ledger.checkpoint_error)
+        self.assertEqual(recovered.get_total_bank_balance(), 400.0)
+        self.assertEqual(recovered.check_aggregates(), {})
+        recovered.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from src.bank import AxizuloAfricanBank
+from src.events import EventBus
+from src.statements import (INTEREST_DESCRIPTION, build_statement, generate_statements, month_period,
+                            render_statement)
+from src.store import to_micros
+
+class TestStatements(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.bank = AxizuloAfricanBank(events=EventBus())
+        self.accounts = []
+        for i in range(25):
+            account = self.bank.create_account(f"Statement User {i}", "current" if i % 2 else "savings", 0.0)
+            for month in (1, 2):
+                for day, (transaction_type, cents, description) in enumerate([
+                        ("deposit", 100000 + i, "Salary"),
+                        ("withdrawal", 2550, "Groceries"),
+                        ("deposit", 1234, INTEREST_DESCRIPTION),
+                        ("withdrawal", 999, "Airtime")]):
+                    timestamp = to_micros(datetime(2024, month, 10 + day))
+                    account._post(transaction_type, cents, description, timestamp=timestamp)
+            self.accounts.append(account)
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+    
+    def test_month_period(self):
+        self.assertEqual(month_period(2024, 2), (datetime(2024, 2, 1), datetime(2024, 3, 1)))
+        self.assertEqual(month_period(2024, 12), (datetime(2024, 12, 1), datetime(2025, 1, 1)))
+    
+    def test_statement_balances(self):
+        account = self.accounts[3]
+        net = 100003 - 2550 + 1234 - 999
+        statement = build_statement(account, *month_period(2024, 2))
+        self.assertEqual(statement.opening_balance, net)
+        self.assertEqual(statement.closing_balance, 2 * net)
+        self.assertEqual(statement.interest, 1234)
+        self.assertEqual(len(statement.transactions), 4)
+        self.assertEqual(statement.account_type, "current")
+        
+        text = render_statement(statement)
+        self.assertIn("Period:  2024-02-01 to 2024-02-29", text)
+        self.assertIn("Closing balance" + " " * 43 + "R      1953.76", text)
+        
+        empty = build_statement(account, *month_period(2023, 12))
+        self.assertEqual((empty.opening_balance, empty.closing_balance, empty.transactions), (0, 0, []))
+    
+    def test_parallel_output_matches_serial(self):
+        serial, parallel = os.path.join(self.directory, "serial.txt"), os.path.join(self.directory, "parallel.txt")
+        start, end = month_period(2024, 1)
+        report = generate_statements(self.bank, start, end, serial, workers=0, chunk_size=4)
+        self.assertEqual((report["accounts"], report["transactions"]), (25, 100))
+        generate_statements(self.bank, start, end, parallel, workers=2, chunk_size=4)
+        
+        with open(serial, encoding="utf-8") as first, open(parallel, encoding="utf-8") as second:
+            text = first.read()
+            self.assertEqual(text, second.read())
+        self.assertEqual(text.count("Account Statement"), 25)
+        self.assertLess(text.index(self.accounts[0].account_number), text.index(self.accounts[24].account_number))
+    
+    def test_statements_stop_at_the_cut(self):
+        period = month_period(2024, 2)
+        cut = len(self.bank._transactions)
+        before = build_statement(self.accounts[0], *period)
+        self.accounts[0]._post("deposit", 500, "Late", timestamp=to_micros(datetime(2024, 2, 28)))
+        
+        self.assertEqual(build_statement(self.accounts[0], *period, row_limit=cut), before)
+        self.assertEqual(build_statement(self.accounts[0], *period).closing_balance, before.closing_balance + 500)
+
+if __name__ == '__main__':
+    unittest.main()
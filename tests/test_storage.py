@@ -0,0 +1,151 @@
+import os
+import random
+import shutil
+import tempfile
+import threading
+import unittest
+from src import api
+from src.bank import AxizuloAfricanBank
+from src.cache import ResponseCache
+from src.events import EventBus
+from src.storage import MemoryStorage, SQLiteStorage, Storage
+
+class TestSQLiteStorage(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "bank.db")
+        self.storage = SQLiteStorage(self.path, sync=False)
+        self.savings = self.storage.create_account("Test User", "savings", 100.0)
+        self.current = self.storage.create_account("Other User", "current", 0.0)
+    
+    def tearDown(self):
+        self.storage.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+    
+    def test_accounts_match_the_memory_backend(self):
+        memory = MemoryStorage(AxizuloAfricanBank(events=EventBus()))
+        numbers = [memory.create_account("Test User", "savings", 100.0),
+                   memory.create_account("Other User", "current", 0.0)]
+        self.assertEqual([self.savings, self.current], numbers)
+        for number in numbers:
+            self.assertEqual(self.storage.account_info(number), memory.account_info(number))
+        
+        self.assertIsNone(self.storage.create_account("  ", "savings"))
+        self.assertIsNone(self.storage.create_account("Test User", "cheque"))
+        self.assertIsNone(self.storage.account_info("0000000000"))
+        self.assertIsNone(self.storage.version("not a number"))
+        
+        class Incomplete(Storage):
+            def close(self):
+                pass
+        
+        with self.assertRaises(TypeError):
+            Incomplete()
+    
+    def test_deposits_and_withdrawals(self):
+        version = self.storage.version(self.savings)
+        self.assertEqual(self.storage.deposit(self.savings, 50), 150.0)
+        self.assertEqual(self.storage.withdraw(self.savings, 20.5), 129.5)
+        self.assertIsNone(self.storage.withdraw(self.savings, 500))  # Savings cannot go negative
+        self.assertIsNone(self.storage.deposit(self.savings, -5))
+        self.assertEqual(self.storage.withdraw(self.current, 900), -900.0)  # Within the overdraft
+        self.assertIsNone(self.storage.withdraw(self.current, 200))
+        self.assertEqual(self.storage.version(self.savings), version + 2)
+        
+        history = self.storage.transactions(self.savings)
+        self.assertEqual([(t.transaction_type, float(t.amount)) for t in history],
+                         [("deposit", 100.0), ("deposit", 50.0), ("withdrawal", 20.5)])
+        self.assertEqual([t.transaction_id for t in self.storage.recent_transactions(self.savings, 2)],
+                         [t.transaction_id for t in history[1:]])
+    
+    def test_transfers_are_atomic(self):
+        self.assertTrue(self.storage.transfer(self.savings, self.current, 30))
+        self.assertFalse(self.storage.transfer(self.savings, self.current, 500))
+        self.assertFalse(self.storage.transfer(self.savings, "0000000000", 5))
+        self.assertEqual(self.storage.account_info(self.current)['balance'], 30.0)
+        
+        report = self.storage.transfer_batch([(self.savings, self.current, 10), (self.current, self.savings, 5000)])
+        self.assertEqual((report['applied'], report['failed']), (0, 2))
+        self.assertEqual(report['results'][0]['message'], "Batch rejected.")
+        self.assertEqual(self.storage.account_info(self.savings)['balance'], 70.0)
+        
+        report = self.storage.transfer_batch([(self.savings, self.current, 10), (self.savings, self.savings, 1)],
+                                             atomic=False)
+        self.assertEqual((report['applied'], report['failed']), (1, 1))
+        self.assertEqual(report['results'][1]['message'], "Cannot transfer to the same account.")
+        self.assertEqual(self.storage.account_info(self.savings)['balance'], 60.0)
+    
+    def test_atomic_batches_net_like_the_memory_backend(self):
+        memory = MemoryStorage(AxizuloAfricanBank(events=EventBus()))
+        memory.create_account("Test User", "savings", 100.0)
+        memory.create_account("Other User", "current", 0.0)
+        # The first leg alone overdraws the savings account; the batch nets to a fundable debit
+        batches = [
+            [(self.savings, self.current, 150), (self.current, self.savings, 80)],
+            [(self.savings, self.current, 100), (self.current, self.savings, 10)],
+            [(self.savings, self.current, 5), (self.current, "0000000000", 1)],
+        ]
+        for transfers in batches:
+            self.assertEqual(self.storage.transfer_batch(transfers), memory.transfer_batch(transfers))
+            for number in (self.savings, self.current):
+                self.assertEqual(self.storage.account_info(number)['balance'], memory.account_info(number)['balance'])
+        self.assertEqual(self.storage.account_info(self.savings)['balance'], 30.0)
+    
+    def test_history_pages(self):
+        for amount in range(1, 8):
+            self.storage.deposit(self.current, amount)
+        page, cursor = self.storage.transaction_page(self.current, limit=3)
+        self.assertEqual([float(t.amount) for t in page], [7.0, 6.0, 5.0])
+        pages = [page]
+        while cursor is not None:
+            page, cursor = self.storage.transaction_page(self.current, limit=3, cursor=cursor)
+            pages.append(page)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        with self.assertRaises(ValueError):
+            self.storage.transaction_page(self.current, cursor="garbage")
+        
+        result = api.transaction_history(self.storage, self.current, {'limit': '2'})
+        self.assertEqual([t['amount'] for t in result['transactions']], [7.0, 6.0])
+    
+    def test_workers_share_one_database(self):
+        # A second storage on the same file stands in for another worker process
+        other = SQLiteStorage(self.path, sync=False)
+        try:
+            self.assertEqual(other.epoch, self.storage.epoch)
+            first = ResponseCache(epoch=self.storage.epoch)
+            second = ResponseCache(epoch=other.epoch)
+            before = api.cached_balance(first, self.storage, self.savings)
+            self.assertEqual(api.cached_balance(second, other, self.savings).etag, before.etag)
+            
+            self.assertEqual(other.deposit(self.savings, 25), 125.0)
+            self.assertEqual(self.storage.account_info(self.savings)['balance'], 125.0)
+            self.assertEqual(api.cached_balance(first, self.storage, self.savings, before.etag).status, 200)
+            number = other.create_account("Third User", "savings")
+            self.assertTrue(self.storage.transfer(self.savings, number, 25))
+        finally:
+            other.close()
+    
+    def test_concurrent_transfers_conserve_money(self):
+        accounts = [self.storage.create_account(f"User {i}", "savings", 100.0) for i in range(6)]
+        results = []
+        
+        def client(seed):
+            rng = random.Random(seed)
+            for _ in range(100):
+                from_account, to_account = rng.sample(accounts, 2)
+                results.append(self.storage.transfer(from_account, to_account, rng.randint(1, 80)))
+        
+        threads = [threading.Thread(target=client, args=(seed,)) for seed in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        balances = [self.storage.account_info(number)['balance'] for number in accounts]
+        self.assertEqual(len(results), 400)
+        self.assertEqual(round(sum(balances), 2), 600.0)
+        self.assertTrue(all(balance >= 0 for balance in balances))
+
+if __name__ == '__main__':
+    unittest.main()
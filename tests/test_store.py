@@ -0,0 +1,43 @@
+import unittest
+from datetime import datetime
+from src.bank import AxizuloAfricanBank
+from src.store import TransactionStore, from_micros, to_micros
+
+class TestTransactionStore(unittest.TestCase):
+    
+    def setUp(self):
+        self.store = TransactionStore()
+    
+    def test_rows_materialize_as_transactions(self):
+        row = self.store.append("withdrawal", 7550, "ATM withdrawal")
+        transaction = self.store.transaction(row)
+        self.assertEqual(transaction.transaction_id, "000000000018")
+        self.assertEqual(self.store.find(transaction.transaction_id), row)
+        self.assertEqual(transaction.transaction_type, "withdrawal")
+        self.assertEqual(transaction.amount, 75.5)
+        self.assertEqual(transaction.description, "ATM withdrawal")
+        self.assertEqual(transaction.status, "completed")
+        self.assertEqual(self.store.signed_amount(row), -7550)
+    
+    def test_descriptions_are_interned(self):
+        for i in range(100):
+            self.store.append("deposit", 100, "Deposit")
+        self.assertEqual(len(self.store), 100)
+        self.assertEqual(len(self.store._description_table), 1)
+    
+    def test_timestamp_round_trip(self):
+        now = datetime(2024, 3, 1, 12, 30, 45, 123456)
+        self.assertEqual(from_micros(to_micros(now)), now)
+    
+    def test_bank_accounts_share_one_store(self):
+        bank = AxizuloAfricanBank()
+        first = bank.create_account("First User", "savings", 100.0)
+        second = bank.create_account("Second User", "current", 50.0)
+        first.deposit(25.0)
+        self.assertIs(first._store, second._store)
+        self.assertEqual(len(first._store), 3)
+        self.assertEqual([t.amount for t in first.get_transaction_history()], [100.0, 25.0])
+        self.assertEqual(second.transaction_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
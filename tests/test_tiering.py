@@ -0,0 +1,150 @@
+import itertools
+import random
+import shutil
+import tempfile
+import unittest
+from array import array
+from bisect import bisect_left
+from src.bank import AxizuloAfricanBank
+from src.events import EventBus
+from src.ledger import Ledger
+from src.store import TransactionStore
+from src.tiering import Segments, TieredRows
+
+class TestTieredRows(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+    
+    def test_segments_span_files(self):
+        segments = Segments(self.directory, "test", 8, segment_records=5)
+        self.assertEqual(segments.append(array('q', range(12)).tobytes()), 0)
+        self.assertEqual(segments.append(array('q', range(12, 14)).tobytes()), 12)
+        rows = array('q')
+        rows.frombytes(segments.read(3, 10))
+        self.assertEqual(list(rows), list(range(3, 13)))
+        segments.close()
+        # Leftover segments are scratch and go away when reopened
+        self.assertEqual(len(Segments(self.directory, "test", 8)), 0)
+    
+    def test_behaves_like_an_array(self):
+        segments = Segments(self.directory, "rows", 8, segment_records=16)
+        generator = random.Random(3)
+        rows = TieredRows(segments, 4, [1, 2, 3])
+        expected = [1, 2, 3]
+        for _ in range(200):
+            expected.append(expected[-1] + generator.randint(1, 5))
+            rows.append(expected[-1])
+        # Other accounts' spills interleave in the shared segment
+        TieredRows(segments, 1, range(10))
+        
+        self.assertGreater(rows.cold_count, 150)
+        self.assertEqual(len(rows), len(expected))
+        self.assertEqual(list(rows), expected)
+        self.assertEqual([rows[i] for i in range(-len(expected), len(expected))], expected + expected)
+        for start, stop in [(0, 203), (5, 9), (150, 203), (-3, None), (None, 2), (10, 5)]:
+            self.assertEqual(list(rows[start:stop]), expected[start:stop])
+        for value in (0, 2, 100, expected[77], 10 ** 6):
+            self.assertEqual(bisect_left(rows, value), bisect_left(expected, value))
+        with self.assertRaises(IndexError):
+            rows[len(expected)]
+    
+    def test_store_reads_and_indexes_cold_rows(self):
+        store = TransactionStore(self.directory, hot_rows=2)
+        rows = [store.append("withdrawal" if i % 3 else "deposit", 100 + i, f"Item {i % 4}", 1000 + i)
+                for i in range(10)]
+        late = store.append("deposit", 5, "Late", 2000, store._id_allocator.format(20))
+        # An unused ID far below the in-memory part of the ID index is patched in the cold tier
+        early = store.append("deposit", 6, "Early", 2001, store._id_allocator.format(12))
+        
+        self.assertEqual(store.cold_rows, 10)
+        self.assertEqual(store.record(rows[1]), ("000000000026", "withdrawal", 101, "Item 1", 1001))
+        self.assertEqual(store.signed_amount(rows[2]), -102)
+        self.assertEqual(store.transaction(rows[0]).amount, 1.0)
+        self.assertEqual([store.find(store.transaction_id(row)) for row in rows], rows)
+        self.assertEqual((store.find(store._id_allocator.format(20)), store.find(store._id_allocator.format(12))),
+                         (late, early))
+        self.assertIsNone(store.find(store._id_allocator.format(13)))
+        with self.assertRaises(ValueError):
+            store.append("deposit", 7, "Again", 2002, store._id_allocator.format(12))
+        store.close()
+
+
+class TestTieredBank(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+    
+    def tiered_bank(self, ledger=None):
+        return AxizuloAfricanBank(ledger=ledger, events=EventBus(), cold_storage=f"{self.directory}/cold",
+                                  hot_transactions=3, hot_rows=10)
+    
+    def run_operations(self, bank):
+        generator = random.Random(11)
+        accounts = [bank.create_account(f"User {i}", "current" if i % 2 else "savings", 100.0) for i in range(5)]
+        for step in range(300):
+            account = generator.choice(accounts)
+            if generator.random() < 0.6:
+                account.deposit(generator.randint(1, 50), f"Deposit {step % 7}")
+            else:
+                account.withdraw(generator.randint(1, 20))
+        bank.transfer_funds(accounts[0].account_number, accounts[1].account_number, 10.0)
+        bank.run_interest()
+        return accounts
+    
+    def summary(self, bank):
+        return {account.account_holder: (account.balance, [(t.transaction_type, t.amount, t.description)
+                                                           for t in account.get_transaction_history()])
+                for account in bank.get_all_accounts()}
+    
+    def test_history_reads_across_tiers(self):
+        plain = AxizuloAfricanBank(events=EventBus())
+        self.run_operations(plain)
+        bank = self.tiered_bank()
+        accounts = self.run_operations(bank)
+        
+        self.assertGreater(bank._transactions.cold_rows, 250)
+        self.assertGreater(accounts[0]._rows.cold_count, 0)
+        self.assertEqual(self.summary(bank), self.summary(plain))
+        self.assertEqual(bank.check_aggregates(), {})
+        for account in accounts:
+            store = bank._transactions
+            running = list(itertools.accumulate(store.signed_amount(row) for row in account._rows))
+            self.assertEqual([store.balance(row) for row in account._rows], running)
+        
+        oldest = accounts[2].get_transaction_history()[0]
+        self.assertEqual(bank.get_transaction(oldest.transaction_id).to_dict(), oldest.to_dict())
+        self.assertEqual(len(accounts[2].get_recent_transactions(5)), 5)
+        pages = []
+        cursor = None
+        while True:
+            page, cursor = accounts[2].get_transaction_page(limit=7, cursor=cursor)
+            pages.extend(page)
+            if cursor is None:
+                break
+        self.assertEqual([t.to_dict() for t in reversed(pages)],
+                         [t.to_dict() for t in accounts[2].get_transaction_history()])
+        bank.close()
+    
+    def test_recovery_rebuilds_the_cold_tier(self):
+        bank = self.tiered_bank(Ledger(f"{self.directory}/ledger"))
+        self.run_operations(bank)
+        expected = {account.account_number: [t.to_dict() for t in account.get_transaction_history()]
+                    for account in bank.get_all_accounts()}
+        bank.checkpoint()
+        bank.close()
+        
+        recovered = self.tiered_bank(Ledger(f"{self.directory}/ledger"))
+        self.assertEqual({account.account_number: [t.to_dict() for t in account.get_transaction_history()]
+                          for account in recovered.get_all_accounts()}, expected)
+        self.assertGreater(recovered._transactions.cold_rows, 0)
+        recovered.close()
+
+if __name__ == '__main__':
+    unittest.main()